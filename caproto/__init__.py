@@ -12,6 +12,8 @@ from ._array_backend import Array
 from . import _numpy_backend  # registers backend on import
 del _numpy_backend
 from ._log import *
+from ._trace import *
+from ._capture import *
 
 import sys
 if sys.platform == 'win32':
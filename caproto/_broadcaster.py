@@ -3,6 +3,7 @@
 # UDP socket provided by a client or server implementation.
 import logging
 
+from . import _capture, _trace
 from ._commands import (Beacon, RepeaterConfirmResponse,
                         RepeaterRegisterRequest, SearchRequest, SearchResponse,
                         read_datagram)
@@ -86,14 +87,25 @@ class Broadcaster:
         bytes_to_send = b''
         total_commands = len(commands)
         tags = {'role': repr(self.our_role)}
+        trace = _trace.current_trace
         for i, command in enumerate(commands):
-            tags['counter'] = (1 + i, total_commands)
             if isinstance(command, (SearchRequest, SearchResponse)):
-                self.search_log.debug("%r", command, extra=tags)
+                log = self.search_log
             else:
-                self.log.debug("%r", command, extra=tags)
+                log = self.log
+            if log.isEnabledFor(logging.DEBUG):
+                tags['counter'] = (1 + i, total_commands)
+                log.debug("%r", command, extra=tags)
+            if trace is not None:
+                # The destination is up to the caller.
+                trace.record(True, self.our_role, None, command)
             self._process_command(self.our_role, command)
             bytes_to_send += bytes(command)
+        capture = _capture.current_capture
+        if capture is not None:
+            # The destination is up to the caller.
+            capture.record(self, 'udp', True, self.our_role, None, None,
+                           bytes_to_send)
         return bytes_to_send
 
     def recv(self, byteslike, address):
@@ -114,6 +126,10 @@ class Broadcaster:
         -------
         commands : list
         """
+        capture = _capture.current_capture
+        if capture is not None:
+            capture.record(self, 'udp', False, self.our_role, address, None,
+                           byteslike)
         try:
             commands = read_datagram(byteslike, address, self.their_role)
         except RemoteProtocolError:
@@ -125,14 +141,19 @@ class Broadcaster:
         tags = {'their_address': address,
                 'direction': '<<<---',
                 'role': repr(self.our_role)}
+        trace = _trace.current_trace
         for command in commands:
+            if trace is not None:
+                trace.record(False, self.our_role, address, command)
+            if isinstance(command, Beacon):
+                log = self.beacon_log
+            else:
+                log = self.log
+            if not log.isEnabledFor(logging.DEBUG):
+                continue
             tags['bytesize'] = len(command)
-            for address in self.our_addresses:
-                tags['our_address'] = address
-                if isinstance(command, Beacon):
-                    log = self.beacon_log
-                else:
-                    log = self.log
+            for our_address in self.our_addresses:
+                tags['our_address'] = our_address
                 log.debug("%r", command, extra=tags)
         return commands
 
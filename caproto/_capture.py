@@ -0,0 +1,224 @@
+"""
+Capture the raw Channel Access traffic of circuits and broadcasters to a file.
+
+The capture holds the bytes of each TCP stream and UDP datagram exactly as
+they were sent or received, with timestamps, so that it may later be replayed
+(see :mod:`caproto.sync.replay`). As with the message trace, the hooks are in
+the sans-I/O layer, so the traffic of every client and server in the process
+is captured.
+
+File format
+-----------
+The file starts with the 8 bytes ``CAPCAP01``. Then follow records, each a
+little-endian header ``(timestamp: f8, kind: u1, sent: u1, pad: 2 bytes,
+stream: u4, length: u4)`` followed by ``length`` bytes:
+
+* kind 0 defines a stream; the bytes are JSON with the keys ``transport``
+  (``'tcp'`` or ``'udp'``), ``our_role`` (``'CLIENT'`` or ``'SERVER'``),
+  ``their_address`` and ``our_address`` (``[host, port]`` or null).
+* kind 1 holds data, sent (``sent`` is 1) or received (0) on a stream
+  defined earlier in the file.
+"""
+import json
+import struct
+import threading
+import time
+from collections import namedtuple
+
+from ._utils import CLIENT, SERVER, CaprotoValueError
+
+__all__ = ('TrafficCapture', 'CaptureRecord', 'CaptureStream',
+           'read_capture', 'start_traffic_capture', 'stop_traffic_capture',
+           'get_traffic_capture')
+
+
+MAGIC = b'CAPCAP01'
+STREAM = 0
+DATA = 1
+_RECORD = struct.Struct('<dBBxxII')
+
+CaptureStream = namedtuple('CaptureStream',
+                           'id transport our_role their_address our_address')
+CaptureRecord = namedtuple('CaptureRecord', 'timestamp stream sent data')
+
+
+def _address(address):
+    if address is None:
+        return None
+    host, port = address[:2]
+    return [host, port]
+
+
+class TrafficCapture:
+    """
+    Write Channel Access traffic to a capture file.
+
+    Writing is safe to do from multiple threads.
+
+    Parameters
+    ----------
+    file : str or binary file-like
+        A path, or a file opened for binary writing.
+    """
+    def __init__(self, file):
+        if isinstance(file, str):
+            self._file = open(file, 'wb')
+            self._owns_file = True
+        else:
+            self._file = file
+            self._owns_file = False
+        self._lock = threading.Lock()
+        self._streams = {}
+        self.bytes_captured = 0
+        self.closed = False
+        self._file.write(MAGIC)
+
+    def __repr__(self):
+        return (f"<TrafficCapture streams={len(self._streams)} "
+                f"bytes_captured={self.bytes_captured}>")
+
+    def _stream_id(self, key, transport, our_role, their_address,
+                   our_address, timestamp):
+        'Look up the id of a stream, defining it first if it is new.'
+        try:
+            return self._streams[key]
+        except KeyError:
+            pass
+        stream_id = self._streams[key] = len(self._streams)
+        definition = json.dumps({
+            'transport': transport,
+            'our_role': our_role.name,
+            'their_address': _address(their_address),
+            'our_address': _address(our_address),
+        }).encode()
+        self._file.write(_RECORD.pack(timestamp, STREAM, 0, stream_id,
+                                      len(definition)))
+        self._file.write(definition)
+        return stream_id
+
+    def record(self, owner, transport, sent, our_role, their_address,
+               our_address, data):
+        """
+        Write some bytes sent or received.
+
+        Parameters
+        ----------
+        owner : object
+            The VirtualCircuit or Broadcaster. With ``their_address``, this
+            identifies the stream.
+        transport : {'tcp', 'udp'}
+        sent : bool
+        our_role : CLIENT or SERVER
+        their_address, our_address : tuple or None
+        data : bytes-like
+        """
+        timestamp = time.time()
+        data = memoryview(data).cast('B')
+        key = (id(owner), their_address)
+        with self._lock:
+            if self.closed:
+                return
+            stream_id = self._stream_id(key, transport, our_role,
+                                        their_address, our_address, timestamp)
+            self._file.write(_RECORD.pack(timestamp, DATA, sent, stream_id,
+                                          len(data)))
+            self._file.write(data)
+            self.bytes_captured += len(data)
+
+    def close(self):
+        'Flush the file, and close it if it was opened from a path.'
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            self._file.flush()
+            if self._owns_file:
+                self._file.close()
+
+
+def read_capture(file):
+    """
+    Read a capture file.
+
+    Parameters
+    ----------
+    file : str or binary file-like
+
+    Yields
+    ------
+    item : CaptureStream or CaptureRecord
+        Each stream is yielded where it is defined, before any of its data.
+    """
+    if isinstance(file, str):
+        with open(file, 'rb') as f:
+            yield from read_capture(f)
+        return
+    if file.read(len(MAGIC)) != MAGIC:
+        raise CaprotoValueError('Not a caproto capture file')
+    streams = {}
+    while True:
+        header = file.read(_RECORD.size)
+        if len(header) < _RECORD.size:
+            # The end, or a truncated record of a capture that was not closed.
+            return
+        timestamp, kind, sent, stream_id, length = _RECORD.unpack(header)
+        data = file.read(length)
+        if len(data) < length:
+            return
+        if kind == STREAM:
+            info = json.loads(data)
+            stream = streams[stream_id] = CaptureStream(
+                stream_id,
+                info['transport'],
+                SERVER if info['our_role'] == 'SERVER' else CLIENT,
+                tuple(info['their_address'] or ()) or None,
+                tuple(info['our_address'] or ()) or None,
+            )
+            yield stream
+        else:
+            yield CaptureRecord(timestamp, streams[stream_id], bool(sent),
+                                data)
+
+
+current_capture = None
+
+
+def start_traffic_capture(file):
+    """
+    Start capturing the traffic of all circuits and broadcasters.
+
+    This stops and replaces any capture started previously.
+
+    Parameters
+    ----------
+    file : str or binary file-like
+
+    Returns
+    -------
+    capture : TrafficCapture
+    """
+    global current_capture
+    stop_traffic_capture()
+    current_capture = TrafficCapture(file)
+    return current_capture
+
+
+def stop_traffic_capture():
+    """
+    Stop capturing traffic, and close the capture.
+
+    Returns
+    -------
+    capture : TrafficCapture or None
+        The capture, or None if none was started.
+    """
+    global current_capture
+    capture, current_capture = current_capture, None
+    if capture is not None:
+        capture.close()
+    return capture
+
+
+def get_traffic_capture():
+    'Return the active :class:`TrafficCapture`, or None.'
+    return current_capture
@@ -25,6 +25,7 @@ from ._commands import (AccessRightsResponse, ClearChannelRequest,
                         WriteNotifyResponse, WriteRequest,
                         read_from_bytestream)
 from ._constants import DEFAULT_PROTOCOL_VERSION
+from . import _capture, _trace
 from ._dbr import ChannelType, SubscriptionType, field_types, native_type
 from ._log import ComposableLogAdapter
 from ._state import ChannelState, CircuitState, get_exception
@@ -82,6 +83,10 @@ class VirtualCircuit:
         self.channels_sid = {}  # map sid to Channel
         self.states = CircuitState(self.channels)
         self._data = bytearray()
+        # Chunks of a partially-received command, and the bytes still needed
+        # to complete it.
+        self._chunks = []
+        self._num_bytes_needed = 0
         self._ioids = {}  # map ioid to Channel
         self.event_add_commands = {}  # map subscriptionid to EventAdd command
         # map subscriptionid to EventAdd command as we wait for them to die
@@ -166,17 +171,29 @@ class VirtualCircuit:
             list of buffers to send over a socket
         """
         buffers_to_send = []
-        tags = {'their_address': self.address,
-                'our_address': self.our_address,
-                'direction': '--->>>',
-                'role': repr(self.our_role)}
-        tags.update(extra or {})
+        # Only build the tags if they will be used. The logger caches whether
+        # it is enabled until a level is changed, so checking is cheap.
+        debug = self.log.isEnabledFor(logging.DEBUG)
+        if debug:
+            tags = {'their_address': self.address,
+                    'our_address': self.our_address,
+                    'direction': '--->>>',
+                    'role': repr(self.our_role)}
+            tags.update(extra or {})
+        trace = _trace.current_trace
         for command in commands:
             self._process_command(self.our_role, command)
-            tags['bytesize'] = len(command)
-            self.log.debug("%r", command, extra=tags)
+            if debug:
+                tags['bytesize'] = len(command)
+                self.log.debug("%r", command, extra=tags)
+            if trace is not None:
+                trace.record(True, self.our_role, self.address, command)
             buffers_to_send.append(memoryview(command.header))
             buffers_to_send.extend(command.buffers)
+        capture = _capture.current_capture
+        if capture is not None:
+            capture.record(self, 'tcp', True, self.our_role, self.address,
+                           self.our_address, b''.join(buffers_to_send))
         return buffers_to_send
 
     def recv(self, *buffers):
@@ -202,18 +219,40 @@ class VirtualCircuit:
             self.log.debug('Circuit disconnected')
             commands.append(DISCONNECTED)
             return commands, 0
-        self._data += b''.join(buffers)
+        capture = _capture.current_capture
+        if capture is not None:
+            capture.record(self, 'tcp', False, self.our_role, self.address,
+                           self.our_address, b''.join(buffers))
+        if total_received < self._num_bytes_needed:
+            # Still short of a complete command, such as one with a large
+            # payload. Keep copies of the chunks rather than joining them with
+            # everything received so far, which would be quadratic.
+            self._chunks.extend(bytes(byteslike) for byteslike in buffers)
+            self._num_bytes_needed -= total_received
+            return commands, self._num_bytes_needed
+
+        # Parse from a view, so that each command does not copy the rest of
+        # the data. The commands reference this data, so it is never resized;
+        # only the incomplete remainder is copied, once, to be cached.
+        data = memoryview(bytearray().join([self._data, *self._chunks,
+                                            *buffers]))
+        self._chunks.clear()
+        trace = _trace.current_trace
         while True:
-            (self._data,
+            (data,
              command,
-             num_bytes_needed) = read_from_bytestream(self._data,
+             num_bytes_needed) = read_from_bytestream(data,
                                                       self.their_role)
             if command is not NEED_DATA:
                 commands.append(command)
+                if trace is not None:
+                    trace.record(False, self.our_role, self.address, command)
             else:
                 # Less than a full command's worth of bytes are cached. Wait
                 # for more bytes to come in before continuing parsing.
                 break
+        self._data = bytearray(data)
+        self._num_bytes_needed = num_bytes_needed
         return commands, num_bytes_needed
 
     def process_command(self, command):
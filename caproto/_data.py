@@ -270,10 +270,14 @@ class ChannelData:
         Though this is not a record, the channel access protocol supports
         querying the record type.  This can be set to mimic an actual
         record or be set to something arbitrary.  Defaults to 'caproto'.
+    access_security_group : str, optional
+        The access security group (ASG) name, used when the server has an
+        access security configuration.  Defaults to 'DEFAULT'.
     """
     data_type = ChannelType.LONG
     default_value: Any = 0
     _compatible_array_types = {}
+    _write_observers = ()
     max_subscription_backlog: int
 
     def __init__(
@@ -286,6 +290,7 @@ class ChannelData:
         string_encoding="latin-1",
         reported_record_type="caproto",
         max_subscription_backlog: int = constants.MAX_SUBSCRIPTION_BACKLOG,
+        access_security_group: str = 'DEFAULT',
     ):
         if timestamp is None:
             timestamp = time.time()
@@ -301,6 +306,7 @@ class ChannelData:
         self._max_length = max_length
         self.string_encoding = string_encoding
         self.reported_record_type = reported_record_type
+        self.access_security_group = access_security_group
 
         if self._max_length is None:
             # Use the current length as maximum, if unspecified.
@@ -337,6 +343,7 @@ class ChannelData:
         state = dict(self.__dict__)
         state.pop("_queues", None)
         state.pop("_snapshots", None)
+        state.pop("_write_observers", None)
         return state
 
     def calculate_length(self, value):
@@ -402,12 +409,35 @@ class ChannelData:
             'string_encoding': self.string_encoding,
             'reported_record_type': self.reported_record_type,
             'max_length': self._max_length,
+            'access_security_group': self.access_security_group,
             **copy.deepcopy(self._data)
         }
         return ((), kwargs)
 
     value = _read_only_property('value')
 
+    def add_write_observer(self, callback):
+        """
+        Add a callback to be called after each successful write.
+
+        Observers are called synchronously with this instance as the only
+        argument, after the new value and metadata have been stored and before
+        subscribers are notified.  They should be fast and must not block.
+
+        Parameters
+        ----------
+        callback : callable
+            Expected signature: ``f(channeldata)``
+        """
+        self._write_observers = self._write_observers + (callback, )
+
+    def remove_write_observer(self, callback):
+        """Remove a callback previously added by ``add_write_observer``."""
+        self._write_observers = tuple(
+            observer for observer in self._write_observers
+            if observer != callback
+        )
+
     # "before" — only the last value received before the state changes from
     #     false to true is forwarded to the client.
     # "first" — only the first value received after the state changes from true
@@ -776,6 +806,8 @@ class ChannelData:
         # TODO the next 5 lines should be done in one move
         self._data['value'] = new
         await self.write_metadata(publish=False, **metadata)
+        for observer in self._write_observers:
+            observer(self)
         # Send a new event to subscribers.
         await self.publish(flags)
         # and publish any linked alarms
@@ -309,7 +309,9 @@ class TimeStamp(DbrTypeBase):
         TimeStamp
             The EPICS-compatible timestamp.
         """
-        if isinstance(timestamp, numbers.Real):
+        # Checking for float first avoids the slower numbers.Real ABC check
+        # in the common case
+        if type(timestamp) is float or isinstance(timestamp, numbers.Real):
             sec, nano = timestamp_to_epics(timestamp)
         else:
             sec, nano = tuple(timestamp)
@@ -1163,7 +1165,7 @@ def epics_timestamp_to_unix(seconds_since_epoch, nano_seconds):
 
 def timestamp_to_epics(ts):
     '''Python timestamp from EPICS TimeStamp structure'''
-    if isinstance(ts, numbers.Real):
+    if type(ts) is float or isinstance(ts, numbers.Real):
         try:
             ts = datetime.datetime.fromtimestamp(ts, datetime.UTC)
         except AttributeError:
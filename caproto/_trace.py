@@ -0,0 +1,214 @@
+"""
+A binary ring buffer of recent Channel Access messages.
+
+Unlike the ``caproto.circ`` and ``caproto.bcast`` debug logs, tracing does not
+build a log record per message: it packs the message header and a timestamp
+into a preallocated buffer, which can be inspected or dumped on demand, for
+example after something has gone wrong.
+
+>>> trace = start_message_trace(capacity=100000)
+>>> ...
+>>> trace.dump()
+"""
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from ._commands import get_command_class
+from ._headers import ExtendedMessageHeader, MessageHeader
+from ._utils import CLIENT, SERVER, CaprotoValueError
+
+__all__ = ('MessageTrace', 'TraceRecord', 'start_message_trace',
+           'stop_message_trace', 'get_message_trace')
+
+
+SENT = '--->>>'
+RECEIVED = '<<<---'
+
+# timestamp, sent (1) or received (0), our role is SERVER (1) or CLIENT (0),
+# address index, header length, and the (possibly extended) header itself.
+_RECORD = struct.Struct('<dBBxxIB24s')
+_HEADER_SIZE = struct.calcsize('>HHHHII')
+
+TraceRecord = namedtuple('TraceRecord',
+                         'timestamp direction our_role address command header')
+
+
+class MessageTrace:
+    """
+    A fixed-size history of the messages sent and received.
+
+    Each message costs one ``struct.pack_into`` into a preallocated buffer,
+    under a lock; the oldest records are overwritten once ``capacity`` is
+    reached. Message payloads are not kept.
+
+    Recording is safe to do from multiple threads.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Number of messages to keep.
+
+    Attributes
+    ----------
+    count : int
+        Total number of messages recorded.
+    """
+    def __init__(self, capacity=65536):
+        if capacity < 1:
+            raise CaprotoValueError('capacity must be positive')
+        self.capacity = capacity
+        self._buffer = bytearray(capacity * _RECORD.size)
+        self._lock = threading.Lock()
+        self._count = 0
+        self._addresses = []
+        self._address_indices = {}
+
+    def __repr__(self):
+        return (f"<MessageTrace count={self.count} "
+                f"capacity={self.capacity}>")
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def count(self):
+        return self._count
+
+    def _address_index(self, address):
+        'The index of ``address`` in the address table; call with the lock.'
+        try:
+            return self._address_indices[address]
+        except KeyError:
+            index = self._address_indices[address] = len(self._addresses)
+            self._addresses.append(address)
+            return index
+
+    def record(self, sent, our_role, address, command):
+        """
+        Record a message.
+
+        Parameters
+        ----------
+        sent : bool
+            True if the message was sent, False if it was received.
+        our_role : CLIENT or SERVER
+        address : tuple or None
+            The address of the peer, if known.
+        command : Message
+        """
+        header = bytes(command.header)
+        timestamp = time.time()
+        with self._lock:
+            index = self._count
+            _RECORD.pack_into(self._buffer,
+                              (index % self.capacity) * _RECORD.size,
+                              timestamp, sent, our_role is SERVER,
+                              self._address_index(address), len(header),
+                              header)
+            self._count = index + 1
+
+    def clear(self):
+        'Forget all recorded messages.'
+        with self._lock:
+            self._count = 0
+
+    def tobytes(self):
+        'The packed records, oldest first.'
+        with self._lock:
+            count = self._count
+            if count <= self.capacity:
+                return bytes(self._buffer[:count * _RECORD.size])
+            split = (count % self.capacity) * _RECORD.size
+            return bytes(self._buffer[split:] + self._buffer[:split])
+
+    def records(self):
+        """
+        Decode the recorded messages, oldest first.
+
+        Returns
+        -------
+        records : list of TraceRecord
+            Each has the ``timestamp``, the ``direction`` as in the debug logs,
+            ``our_role``, the peer ``address``, the ``command`` class name and
+            the ``header`` as a :class:`MessageHeader` or
+            :class:`ExtendedMessageHeader`.
+        """
+        records = []
+        for (timestamp, sent, is_server, address_index, header_size,
+             raw_header) in _RECORD.iter_unpack(self.tobytes()):
+            if header_size > _HEADER_SIZE:
+                header = ExtendedMessageHeader.from_buffer_copy(raw_header)
+            else:
+                header = MessageHeader.from_buffer_copy(raw_header)
+            our_role = SERVER if is_server else CLIENT
+            if sent:
+                sender = our_role
+            else:
+                sender = CLIENT if is_server else SERVER
+            try:
+                command = get_command_class(sender, header).__name__
+            except KeyError:
+                command = f'<unknown command {header.command}>'
+            records.append(TraceRecord(timestamp, SENT if sent else RECEIVED,
+                                       our_role, self._addresses[address_index],
+                                       command, header))
+        return records
+
+    def dump(self, file=sys.stdout):
+        'Write the recorded messages to ``file``, one per line, oldest first.'
+        for record in self.records():
+            timestamp = time.strftime('%H:%M:%S',
+                                      time.localtime(record.timestamp))
+            micros = int(record.timestamp % 1 * 1e6)
+            if record.address is None:
+                address = '*'
+            else:
+                address = '%s:%d' % record.address
+            print(f'{timestamp}.{micros:06d} {record.our_role!r} '
+                  f'{record.direction} {address} {record.command} '
+                  f'{record.header!r}', file=file)
+
+
+current_trace = None
+
+
+def start_message_trace(capacity=65536):
+    """
+    Start recording the messages of all circuits and broadcasters.
+
+    This replaces any trace started previously.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Number of messages to keep.
+
+    Returns
+    -------
+    trace : MessageTrace
+    """
+    global current_trace
+    current_trace = MessageTrace(capacity)
+    return current_trace
+
+
+def stop_message_trace():
+    """
+    Stop recording messages.
+
+    Returns
+    -------
+    trace : MessageTrace or None
+        The trace, which may still be inspected, or None if none was started.
+    """
+    global current_trace
+    trace, current_trace = current_trace, None
+    return trace
+
+
+def get_message_trace():
+    'Return the active :class:`MessageTrace`, or None.'
+    return current_trace
@@ -1118,6 +1118,7 @@ class VirtualCircuitManager:
             return
 
         tags = self._tags
+        pv_name = None
         if command is ca.DISCONNECTED:
             await self._disconnected()
         elif isinstance(command, (ca.VersionResponse,)):
@@ -1129,8 +1130,7 @@ class VirtualCircuitManager:
             ioid_info = self.ioids.pop(command.ioid)
             deadline = ioid_info['deadline']
             pv = ioid_info['pv']
-            tags = tags.copy()
-            tags['pv'] = pv.name
+            pv_name = pv.name
             if deadline is not None and time.monotonic() > deadline:
                 self.log.warning("Ignoring late response with ioid=%d regarding "
                                  "PV named %s because "
@@ -1163,13 +1163,11 @@ class VirtualCircuitManager:
                 # This method submits jobs to the Contexts's
                 # ThreadPoolExecutor for user callbacks.
                 sub.process(command)
-                tags = tags.copy()
-                tags['pv'] = sub.pv.name
+                pv_name = sub.pv.name
         elif isinstance(command, ca.AccessRightsResponse):
             pv = self.pvs[command.cid]
             pv.access_rights_changed(command.access_rights)
-            tags = tags.copy()
-            tags['pv'] = pv.name
+            pv_name = pv.name
         elif isinstance(command, ca.EventCancelResponse):
             # TODO Any way to add the pv name to tags here?
             ...
@@ -1183,14 +1181,12 @@ class VirtualCircuitManager:
                 pv.channel = chan
                 pv.channel_ready.set()
             pv.connection_state_changed('connected', chan)
-            tags = tags.copy()
-            tags['pv'] = pv.name
+            pv_name = pv.name
         elif isinstance(command, (ca.ServerDisconnResponse,
                                   ca.ClearChannelResponse)):
             pv = self.pvs[command.cid]
             pv.connection_state_changed('disconnected', None)
-            tags = tags.copy()
-            tags['pv'] = pv.name
+            pv_name = pv.name
             # NOTE: pv remains valid until server goes down
             # TODO: or do we not assume the server will remove it?
             # self._search_results.mark_channel_disconnected(
@@ -1201,11 +1197,14 @@ class VirtualCircuitManager:
             # self.received.
             ...
 
-        if not isinstance(command, ca.Message):
+        if (not isinstance(command, ca.Message) or
+                not self.log.isEnabledFor(logging.DEBUG)):
             return
 
         # Log each message with the above-gathered tags
-        tags['bytesize'] = len(command)
+        tags = {**tags, 'bytesize': len(command)}
+        if pv_name is not None:
+            tags['pv'] = pv_name
         self.log.debug("%r", command, extra=tags)
 
     async def _command_queue_loop(self):
@@ -1448,6 +1447,7 @@ class PV:
         self._circuit_manager = None
         self._channel = None
         self.subscriptions = {}
+        self.metadata_cache = common.MetadataCache()
         self._idle = False
         self._in_use = asyncio.Condition()
         self._usages = 0
@@ -1496,9 +1496,12 @@ class PV:
         self.log.info('connection state changed to %s.', state)
         self.connection_state_callback.process(self, state)
         if state == 'disconnected':
+            # The cache is filled again by the metadata subscriptions, once
+            # they are reactivated.
+            self.metadata_cache.clear()
             for sub in self.subscriptions.values():
                 with sub.callback_lock:
-                    if sub.callbacks:
+                    if sub.callbacks or sub.recorders:
                         sub.needs_reactivation = True
         if state == 'connected':
             cm = self.circuit_manager
@@ -1585,7 +1588,7 @@ class PV:
         request will be processed when they are complete.
         """
         for sub in self.subscriptions.values():
-            if sub.callbacks:
+            if sub.callbacks or sub.recorders:
                 return
         async with self._in_use:
             if not self.channel_ready.is_set():
@@ -1682,6 +1685,52 @@ class PV:
             raise common.DeadCircuitError()
         return ioid_info['response']
 
+    async def read_metadata(self, data_type='control', *,
+                            timeout=common.PV_DEFAULT_TIMEOUT,
+                            use_cache=True):
+        """
+        Read metadata such as units, limits and enum strings, from a cache.
+
+        On the first read of each ``data_type``, the metadata is read from the
+        server and a subscription is made to keep the cached copy up to date
+        when the server reports changes to properties or alarm state. Later
+        reads are served locally. Hit and miss statistics are available from
+        ``pv.metadata_cache.info()``.
+
+        Parameters
+        ----------
+        data_type : {'control', 'graphic'} or ChannelType or int ID, optional
+            A class of data types, matched to the channel's native data type,
+            or a specific CTRL or GR type. Default is 'control'.
+        timeout : number or None, optional
+            Seconds to wait before a CaprotoTimeoutError is raised. Default is
+            ``PV.timeout``, which falls back to ``PV.context.timeout`` if not
+            set. If None, never timeout.
+        use_cache : boolean, optional
+            If False, read from the server and refresh the cache regardless.
+            True by default.
+
+        Returns
+        -------
+        metadata : ctypes.BigEndianStructure
+            The metadata of the response, as in ``PV.read(...).metadata``.
+        """
+        self.metadata_cache.check_data_type(data_type)
+        if timeout is common.PV_DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        if use_cache:
+            metadata = self.metadata_cache.get(data_type)
+            if metadata is not None:
+                return metadata
+        response = await self.read(data_type=data_type, timeout=timeout)
+        self.metadata_cache.store(data_type, response.metadata)
+        recorder, created = self.metadata_cache.recorder(data_type)
+        if created:
+            sub = self.subscribe(data_type=data_type,
+                                 mask=common.METADATA_CACHE_MASK)
+            sub.add_recorder(recorder)
+        return response.metadata
+
     @ensure_connected
     async def write(self, data, *, wait=True, callback=None,
                     timeout=common.PV_DEFAULT_TIMEOUT, notify=None,
@@ -1772,7 +1821,7 @@ class PV:
         return ioid_info['response']
 
     def subscribe(self, data_type=None, data_count=None, low=0.0, high=0.0,
-                  to=0.0, mask=None):
+                  to=0.0, mask=None, *, dispatch='all'):
         """
         Start a new subscription to which user callback may be added.
 
@@ -1788,6 +1837,15 @@ class PV:
             deprecated by Channel Access, not yet implemented by caproto
         mask :  SubscriptionType, optional
             Subscribe to selective updates.
+        dispatch : {'all', 'latest'} or int, optional
+            How updates are dispatched to user callbacks. The default, 'all',
+            submits every update to every callback. If callbacks may be slower
+            than the update rate, 'latest' coalesces pending updates such that
+            callbacks receive the most recent one once they are done with the
+            previous one, and an integer N keeps at most N pending updates,
+            dropping the oldest. This also applies to iterating over the
+            subscription with ``async for``. Dropped updates are counted in
+            :attr:`Subscription.dropped`.
 
         Returns
         -------
@@ -1816,12 +1874,14 @@ class PV:
         # args and kwargs.
         bound = common.SUBSCRIBE_SIG.bind(data_type, data_count, low, high, to, mask)
         key = tuple(bound.arguments.items())
+        if dispatch != 'all':
+            key += (('dispatch', dispatch), )
         try:
             sub = self.subscriptions[key]
         except KeyError:
             sub = Subscription(self,
                                data_type, data_count,
-                               low, high, to, mask)
+                               low, high, to, mask, dispatch=dispatch)
             self.subscriptions[key] = sub
         # The actual EPICS messages will not be sent until the user adds
         # callbacks via sub.add_callback(user_func).
@@ -1932,8 +1992,20 @@ class Subscription(CallbackHandler):
 
     This object should never be instantiated directly by user code; rather
     it should be made by calling the ``subscribe()`` method on a ``PV`` object.
+
+    Attributes
+    ----------
+    dispatch : {'all', 'latest'} or int
+        The dispatch policy; see :meth:`PV.subscribe`.
+    dropped : int
+        The number of updates not dispatched to callbacks due to the dispatch
+        policy.
+    recorders : list
+        Recorders, such as :class:`~caproto.client.recorder.RingBuffer`, fed
+        with every update; see :meth:`add_recorder`.
     """
-    def __init__(self, pv, data_type, data_count, low, high, to, mask):
+    def __init__(self, pv, data_type, data_count, low, high, to, mask, *,
+                 dispatch='all'):
         super().__init__(pv)
         # Stash everything, but do not send any EPICS messages until the first
         # user callback is attached.
@@ -1949,6 +2021,15 @@ class Subscription(CallbackHandler):
         # This is related to back-compat for user callbacks that have the old
         # signature, f(response).
         self.__wrapper_weakrefs = set()
+        self.dispatch = dispatch
+        self.dropped = 0
+        self.recorders = []
+        # Updates pending dispatch, if the policy is not 'all'
+        self._dispatch_queue = collections.deque(
+            maxlen=common.get_dispatch_queue_size(dispatch))
+        self._dispatch_task = None
+        # Callback IDs of bounded ``async for`` iterators
+        self._iter_callbacks = set()
 
     @property
     def log(self):
@@ -1958,17 +2039,45 @@ class Subscription(CallbackHandler):
         return f"<Subscription to {self.pv.name!r}, id={self.subscriptionid}>"
 
     async def __aiter__(self):
-        queue = AsyncioQueue()
+        maxlen = self._dispatch_queue.maxlen
+        if maxlen is None:
+            queue = AsyncioQueue()
+
+            async def iter_callback(sub, value):
+                await queue.async_put(value)
+
+            sid = self.add_callback(iter_callback)
+            try:
+                while True:
+                    item = await queue.async_get()
+                    yield item
+            finally:
+                await self.remove_callback(sid)
+            return
+
+        # Bounded: updates arriving while the consumer is busy replace the
+        # oldest pending ones.
+        pending = collections.deque(maxlen=maxlen)
+        ready = asyncio.Event()
 
-        async def iter_callback(sub, value):
-            await queue.async_put(value)
+        def iter_callback(sub, value):
+            if len(pending) == maxlen:
+                self.dropped += 1
+            pending.append(value)
+            ready.set()
 
         sid = self.add_callback(iter_callback)
+        # Deliver directly from the event loop rather than from the dispatch
+        # task, such that the consumer alone sets the pace.
+        self._iter_callbacks.add(sid)
         try:
             while True:
-                item = await queue.async_get()
-                yield item
+                while not pending:
+                    ready.clear()
+                    await ready.wait()
+                yield pending.popleft()
         finally:
+            self._iter_callbacks.discard(sid)
             await self.remove_callback(sid)
 
     async def __aenter__(self):
@@ -2000,7 +2109,7 @@ class Subscription(CallbackHandler):
         "This is used by the Context to re-subscribe in bulk after dropping."
         # TODO: compose_command async due to ensure_connected?
         with self.callback_lock:
-            if not self.callbacks:
+            if not self.callbacks and not self.recorders:
                 return None
             cm, chan = self.pv._circuit_manager, self.pv._channel
             subscriptionid = cm._subscriptionid_counter()
@@ -2052,15 +2161,82 @@ class Subscription(CallbackHandler):
                                                    extra={'pv': self.pv.name})
 
     def process(self, command):
-        # TODO here i think we can decouple PV update rates and callback
-        # handling rates, if desirable, to not bog down performance.
-        # As implemented below, updates are blocking further messages from
-        # the CA servers from processing. (-> ThreadPool, etc.)
         pv = self.pv
-        super().process(self, command)
+        for recorder in self.recorders:
+            try:
+                recorder.append(command)
+            except Exception:
+                self.log.exception('Exception raised by recorder %r '
+                                   'processing response %r',
+                                   recorder, command)
+        if self._dispatch_queue.maxlen is None:
+            super().process(self, command)
+        else:
+            self._enqueue(command)
         self.log.debug("%r: %r", pv.name, command)
         self.most_recent_response = command
 
+    def _enqueue(self, command):
+        """
+        Queue an update for dispatch to callbacks, dropping the oldest pending
+        one if the queue is full.
+        """
+        with self.callback_lock:
+            self._last_call_values = ((self, command), {})
+            iter_callbacks = [self.callbacks[sid] for sid in self._iter_callbacks
+                              if sid in self.callbacks]
+        for ref in iter_callbacks:
+            callback = ref()
+            if callback is not None:
+                callback(self, command)
+
+        if len(self._iter_callbacks) == len(self.callbacks):
+            return
+
+        queue = self._dispatch_queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append(command)
+        if self._dispatch_task is None:
+            self._dispatch_task = self.pv.circuit_manager._tasks.create(
+                self._dispatch())
+
+    async def _dispatch(self):
+        """
+        Dispatch pending updates to callbacks, one at a time.
+
+        Each update is handed to the callbacks only after they are done with
+        the previous one, such that pending updates can be coalesced.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            while self._dispatch_queue:
+                command = self._dispatch_queue.popleft()
+                to_remove = []
+                with self.callback_lock:
+                    callbacks = [(sid, ref) for sid, ref in self.callbacks.items()
+                                 if sid not in self._iter_callbacks]
+                for cb_id, ref in callbacks:
+                    callback = ref()
+                    if callback is None:
+                        to_remove.append(cb_id)
+                        continue
+                    try:
+                        if inspect.iscoroutinefunction(callback):
+                            await callback(self, command)
+                        else:
+                            await loop.run_in_executor(
+                                None, functools.partial(callback, self, command))
+                    except Exception:
+                        self.log.exception('Exception raised by callback %r '
+                                           'processing response %r',
+                                           callback, command)
+                with self.callback_lock:
+                    for remove_id in to_remove:
+                        self.callbacks.pop(remove_id, None)
+        finally:
+            self._dispatch_task = None
+
     def add_callback(self, func):
         """
         Add a callback to receive responses.
@@ -2086,7 +2262,7 @@ class Subscription(CallbackHandler):
         """
         # Handle func with signature func(response) for back-compat.
         with self.callback_lock:
-            was_empty = not self.callbacks
+            was_empty = not self.callbacks and not self.recorders
             cb_id = super().add_callback(func)
             most_recent_response = self.most_recent_response
         if was_empty:
@@ -2119,7 +2295,43 @@ class Subscription(CallbackHandler):
         """
         with self.callback_lock:
             super().remove_callback(token)
-            if not self.callbacks:
+            if not self.callbacks and not self.recorders:
+                # Go dormant.
+                await self._unsubscribe()
+                self.most_recent_response = None
+                self.needs_reactivation = False
+
+    def add_recorder(self, recorder):
+        """
+        Feed every update to a recorder, bypassing the callback machinery.
+
+        The recorder's ``append(response)`` method is called directly from
+        the event loop as the update is received, so it must be fast and must
+        not block. The subscription is activated if it was not already.
+
+        Parameters
+        ----------
+        recorder : object
+            For example, a :class:`~caproto.client.recorder.RingBuffer`.
+        """
+        with self.callback_lock:
+            was_empty = not self.callbacks and not self.recorders
+            self.recorders.append(recorder)
+            most_recent_response = self.most_recent_response
+        if was_empty:
+            self._subscribe()
+        elif most_recent_response is not None:
+            recorder.append(most_recent_response)
+
+    async def remove_recorder(self, recorder):
+        """
+        Stop feeding updates to a recorder added by :meth:`add_recorder`.
+
+        This is a coroutine.
+        """
+        with self.callback_lock:
+            self.recorders.remove(recorder)
+            if not self.callbacks and not self.recorders:
                 # Go dormant.
                 await self._unsubscribe()
                 self.most_recent_response = None
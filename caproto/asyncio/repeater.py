@@ -0,0 +1,341 @@
+# Channel Access Repeater, asyncio implementation
+#
+# This does the same job as caproto.sync.repeater (see there for an overview
+# of what a repeater is for) with less work per datagram, to keep up with
+# bursts of beacons on hosts with many clients:
+#
+# * Datagrams are forwarded as received. Only the command headers are read, to
+#   find registrations and beacons; a datagram is copied only to fill in a
+#   beacon's server address or to drop a registration.
+# * All the datagrams waiting on the socket are read at once, then forwarded
+#   to each client joined into as few datagrams as fit.
+# * Whether clients are still running is checked (by binding to their ports)
+#   at most once per check interval, not on every registration.
+#
+# The socket is read with loop.add_reader rather than a DatagramProtocol,
+# which is handed one datagram per event loop iteration and so cannot batch.
+# This is not supported by the proactor event loop on Windows.
+
+import asyncio
+import logging
+import socket
+import struct
+import time
+
+from .._commands import RepeaterConfirmResponse, ipv4_to_int32
+from .._constants import MAX_UDP_RECV
+from .._utils import ValidationError, get_environment_variables
+from ..sync.repeater import (RepeaterAlreadyRunning, check_for_running_repeater,
+                             check_ports_in_use, checkin_threshold)
+from . import utils
+
+logger = logging.getLogger('caproto.repeater')
+
+__all__ = ('AsyncioRepeater', 'run')
+
+# Commands as (command, payload_size, data_type, data_count, parameter1,
+# parameter2) and the extension of an extended header.
+_HEADER = struct.Struct('>HHHHII')
+_EXTENDED = struct.Struct('>II')
+_BEACON = 13
+_REPEATER_REGISTER = 24
+# The largest datagram assembled from several. Any one datagram received is
+# forwarded whole, whatever its size.
+MAX_BATCH_SIZE = 1472
+# The most datagrams to read from the socket before forwarding them.
+MAX_BATCH_DATAGRAMS = 1024
+CHECK_INTERVAL = 5.0
+RECEIVE_BUFFER_SIZE = 1 << 20
+
+
+def _scan(data):
+    """
+    Find the commands in a datagram, without building them.
+
+    Returns
+    -------
+    commands : list
+        ``(start, end, command, data_count, parameter2)`` for each command.
+    """
+    commands = []
+    start = 0
+    size = len(data)
+    while start < size:
+        if size - start < _HEADER.size:
+            raise ValidationError("Not enough bytes to be a CA header")
+        (command, payload_size, _, data_count, _,
+         parameter2) = _HEADER.unpack_from(data, start)
+        header_size = _HEADER.size
+        if payload_size == 0xFFFF and data_count == 0:
+            header_size += _EXTENDED.size
+            if size - start < header_size:
+                raise ValidationError("Not enough bytes to be a CA header")
+            payload_size, data_count = _EXTENDED.unpack_from(
+                data, start + _HEADER.size)
+        end = start + header_size + payload_size
+        if end > size:
+            raise ValidationError("Datagram ends with a partial command")
+        commands.append((start, end, command, data_count, parameter2))
+        start = end
+    return commands
+
+
+def _join(datagrams):
+    "Join datagrams into as few as fit in MAX_BATCH_SIZE, keeping order."
+    if len(datagrams) == 1:
+        return datagrams
+    joined = []
+    pending = []
+    pending_size = 0
+    for datagram in datagrams:
+        if pending and pending_size + len(datagram) > MAX_BATCH_SIZE:
+            joined.append(b''.join(pending))
+            pending.clear()
+            pending_size = 0
+        pending.append(datagram)
+        pending_size += len(datagram)
+    if pending:
+        joined.append(b''.join(pending))
+    return joined
+
+
+class AsyncioRepeater:
+    """
+    Forward beacons to all registered clients on this host.
+
+    Parameters
+    ----------
+    sock : socket.socket
+        A UDP socket bound to the repeater port.
+    check_interval : float, optional
+        The least time in seconds between checks of which clients are still
+        running.
+
+    Attributes
+    ----------
+    clients : dict
+        Maps the port of each registered client to its host.
+    servers : dict
+        Maps the port of each server heard from to its host and the time its
+        last beacon arrived, as ``{'host': host, 'up_at': timestamp}``.
+    datagrams_received : int
+    datagrams_sent : int
+    datagrams_dropped : int
+        Datagrams not forwarded to a client because the socket's send buffer
+        was full.
+    """
+    def __init__(self, sock, *, check_interval=CHECK_INTERVAL):
+        self.sock = sock
+        self.check_interval = check_interval
+        self.clients = {}
+        self.servers = {}
+        self.datagrams_received = 0
+        self.datagrams_sent = 0
+        self.datagrams_dropped = 0
+        self._last_check = float('-inf')
+        self._check_handle = None
+        self._stopped = None
+
+    def __repr__(self):
+        return (f"<AsyncioRepeater clients={len(self.clients)} "
+                f"servers={len(self.servers)}>")
+
+    async def run(self):
+        "Forward datagrams until :meth:`stop` is called."
+        loop = asyncio.get_running_loop()
+        self._stopped = asyncio.Event()
+        self.sock.setblocking(False)
+        try:
+            # Room to absorb bursts of beacons. The OS may allow less.
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF,
+                                 RECEIVE_BUFFER_SIZE)
+        except OSError:
+            pass
+        host, port = self.sock.getsockname()
+        loop.add_reader(self.sock, self._read_ready)
+        logger.info("Repeater is listening on %s:%d", host, port)
+        try:
+            await self._stopped.wait()
+        finally:
+            loop.remove_reader(self.sock)
+            if self._check_handle is not None:
+                self._check_handle.cancel()
+                self._check_handle = None
+
+    def stop(self):
+        if self._stopped is not None:
+            self._stopped.set()
+
+    def _read_ready(self):
+        batch = []
+        for _ in range(MAX_BATCH_DATAGRAMS):
+            try:
+                data, address = self.sock.recvfrom(MAX_UDP_RECV)
+            except (BlockingIOError, InterruptedError):
+                break
+            except ConnectionResetError as ex:
+                # Win32: a previous send resulted in an ICMP Port Unreachable
+                # message.
+                logger.debug("UDP socket reported previous send failed "
+                             "during recvfrom: %s", ex)
+                continue
+            self.datagrams_received += 1
+            to_forward = self._received(data, address)
+            if to_forward:
+                batch.append((address[1], to_forward))
+        if batch:
+            self._fan_out(batch)
+
+    def _received(self, data, address):
+        "Handle one datagram, returning the bytes to forward, if any."
+        host, port = address
+        if port in self.clients and self.clients[port] != host:
+            # broadcast only from one interface
+            return None
+        server = self.servers.get(port)
+        if server is not None and server['host'] != host:
+            return None
+        if not data:
+            # NOTE: additional valid way of registration is an empty
+            # message, according to broadcaster source
+            if port not in self.clients:
+                self.clients[port] = host
+                logger.debug('New client %s (zero-length registration)',
+                             address)
+            return None
+        try:
+            commands = _scan(data)
+        except ValidationError:
+            logger.debug('Ignoring malformed datagram from %s', address)
+            return None
+
+        to_forward = None
+        for start, end, command, data_count, parameter2 in commands:
+            if command == _BEACON:
+                # Update our records of the last time each server checked in
+                # (i.e. issued a heartbeat).
+                self.servers[data_count] = dict(up_at=time.time(), host=host)
+                if parameter2 == 0:
+                    # As in the sync repeater, fill in the sender's address.
+                    if to_forward is None:
+                        to_forward = bytearray(data[:start])
+                    offset = len(to_forward)
+                    to_forward += data[start:end]
+                    struct.pack_into('>I', to_forward, offset + 12,
+                                     ipv4_to_int32(host))
+                    continue
+            elif command == _REPEATER_REGISTER:
+                self._register(host, port)
+                # Do not forward registration requests to other clients.
+                if to_forward is None:
+                    to_forward = bytearray(data[:start])
+                continue
+            if to_forward is not None:
+                to_forward += data[start:end]
+        if to_forward is None:
+            return data
+        return bytes(to_forward)
+
+    def _register(self, host, port):
+        if port not in self.clients:
+            self.clients[port] = host
+            logger.debug('New client %s:%d', host, port)
+        try:
+            self.sock.sendto(bytes(RepeaterConfirmResponse(host)),
+                             (host, port))
+        except OSError as ex:
+            logger.debug('Failed to confirm registration of %s:%d: %s',
+                         host, port, ex)
+            self._remove_clients([(host, port)])
+            return
+        self._check_clients()
+
+    def _check_clients(self):
+        "Drop clients that have exited, at most once per check interval."
+        now = time.monotonic()
+        wait = self._last_check + self.check_interval - now
+        if wait > 0:
+            if self._check_handle is None:
+                # Check once the interval is up, for the latest registrations.
+                self._check_handle = asyncio.get_running_loop().call_later(
+                    wait, self._scheduled_check)
+            return
+        self._last_check = now
+        self._remove_clients(list(check_ports_in_use(list(self.clients))))
+        for server_port, server_info in list(self.servers.items()):
+            if time.time() - server_info['up_at'] > checkin_threshold:
+                del self.servers[server_port]
+
+    def _scheduled_check(self):
+        self._check_handle = None
+        self._check_clients()
+
+    def _remove_clients(self, clients):
+        for host, port in clients:
+            if self.clients.pop(port, None) is not None:
+                logger.debug('Removing client %s:%d', host, port)
+        if clients:
+            logger.debug('Active clients: %d servers: %d',
+                         len(self.clients), len(self.servers))
+
+    def _fan_out(self, batch):
+        "Send the batch of datagrams to every client but their senders."
+        # Almost always, the senders are servers, not clients, so the joined
+        # datagrams are the same for every client.
+        senders = {port for port, _ in batch}
+        common = None
+        failed = []
+        for port, host in self.clients.items():
+            if port in senders:
+                datagrams = _join([data for sender, data in batch
+                                   if sender != port])
+            else:
+                if common is None:
+                    common = _join([data for _, data in batch])
+                datagrams = common
+            for datagram in datagrams:
+                try:
+                    self.sock.sendto(datagram, (host, port))
+                except BlockingIOError:
+                    self.datagrams_dropped += 1
+                except OSError:
+                    failed.append((host, port))
+                    break
+                else:
+                    self.datagrams_sent += 1
+        if failed:
+            self._remove_clients(failed)
+
+
+def run(host='0.0.0.0', *, event_loop=None, check_interval=CHECK_INTERVAL):
+    """
+    Run a repeater, unless one is already running.
+
+    Parameters
+    ----------
+    host : str, optional
+        The interface to bind to. The port is EPICS_CA_REPEATER_PORT.
+    event_loop : str, optional
+        The event loop implementation name. See
+        :func:`caproto.asyncio.utils.get_event_loop_policy`.
+    check_interval : float, optional
+        The least time in seconds between checks of which clients are still
+        running.
+    """
+    port = get_environment_variables()['EPICS_CA_REPEATER_PORT']
+    addr = (host, port)
+    logger.debug('Checking for another repeater....')
+
+    try:
+        sock = check_for_running_repeater(addr)
+    except RepeaterAlreadyRunning:
+        logger.info('Another repeater is already running; exiting.')
+        return
+
+    repeater = AsyncioRepeater(sock, check_interval=check_interval)
+    try:
+        utils.run(repeater.run(), event_loop=event_loop)
+    except KeyboardInterrupt:
+        logger.info('Keyboard interrupt; exiting.')
+    finally:
+        sock.close()
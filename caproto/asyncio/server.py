@@ -1,15 +1,23 @@
 import asyncio
+import collections
 import functools
+import time
 import warnings
 
 import caproto as ca
 
 from ..server import AsyncLibraryLayer
+from ..server.access_security import load_access_security
 from ..server.common import Context as _Context
+from ..server import instrumentation
+from ..server.common import (HIGH_LOAD_TIMEOUT, MAX_LATENCY, MAX_RECV_BYTES,
+                             RESPONSE_BATCH_THRESH, SUB_BATCH_THRESH,
+                             DisconnectedCircuit, LoopExit)
 from ..server.common import VirtualCircuit as _VirtualCircuit
-from .utils import (AsyncioQueue, _create_bound_tcp_socket, _create_udp_socket,
-                    _DatagramProtocol, _TaskHandler, _TransportWrapper,
-                    _UdpTransportWrapper)
+from .utils import (AsyncioQueue, _BufferedStreamProtocol,
+                    _create_bound_tcp_socket, _create_udp_socket,
+                    _DatagramProtocol, _TaskHandler, _UdpTransportWrapper)
+from .utils import run as _run
 
 
 class ServerExit(Exception):
@@ -19,6 +27,8 @@ class ServerExit(Exception):
 class AsyncioEvent(asyncio.Event):
     "Implement the ``timeout`` keyword to wait(), as in threading.Event."
     async def wait(self, timeout=None):
+        if self.is_set():
+            return True
         try:
             await asyncio.wait_for(super().wait(), timeout)
         except asyncio.TimeoutError:  # somehow not just a TimeoutError...
@@ -30,6 +40,50 @@ class AsyncioEvent(asyncio.Event):
 Event = AsyncioEvent
 
 
+def _set_result_unless_done(future, result):
+    if not future.done():
+        future.set_result(result)
+
+
+class _SubscriptionQueue(asyncio.Queue):
+    """
+    An asyncio.Queue which may be waited on for an item, without taking it.
+
+    Waiting uses one future, and one timer if there is a timeout, rather than
+    a task per item as with ``wait_for(queue.get(), timeout)``.
+    """
+
+    def __init__(self, maxsize=0):
+        super().__init__(maxsize)
+        self._item_waiter = None
+
+    def _put(self, item):
+        super()._put(item)
+        if self._item_waiter is not None:
+            _set_result_unless_done(self._item_waiter, True)
+
+    async def wait_for_item(self, timeout=None):
+        """
+        Wait until the queue is not empty.
+
+        Returns False if ``timeout`` seconds pass first, else True.
+        """
+        if not self.empty():
+            return True
+        loop = asyncio.get_running_loop()
+        self._item_waiter = waiter = loop.create_future()
+        timer = None
+        if timeout is not None:
+            timer = loop.call_later(timeout, _set_result_unless_done,
+                                    waiter, False)
+        try:
+            return await waiter
+        finally:
+            self._item_waiter = None
+            if timer is not None:
+                timer.cancel()
+
+
 class AsyncioAsyncLayer(AsyncLibraryLayer):
     name = 'asyncio'
     Event = AsyncioEvent
@@ -39,16 +93,24 @@ class AsyncioAsyncLayer(AsyncLibraryLayer):
 
 
 class VirtualCircuit(_VirtualCircuit):
-    "Wraps a caproto.VirtualCircuit with an asyncio client."
+    """
+    Wraps a caproto.VirtualCircuit with an asyncio client.
+
+    Received bytes are parsed as they arrive, in the protocol's
+    ``buffer_updated`` callback, and the commands queued for
+    :meth:`command_queue_loop`. :meth:`recv` only waits for the connection to
+    be lost. When the queue is full, reading is paused, and the commands
+    which did not fit are held until the queue has room again.
+    """
     TaskCancelled = asyncio.CancelledError
 
-    client: _TransportWrapper
+    client: _BufferedStreamProtocol
     context: "Context"
 
     def __init__(
         self,
         circuit: _VirtualCircuit,
-        client: _TransportWrapper,
+        client: _BufferedStreamProtocol,
         context: "Context",
         *,
         loop=None
@@ -61,22 +123,174 @@ class VirtualCircuit(_VirtualCircuit):
         self.command_queue = asyncio.Queue(ca.MAX_COMMAND_BACKLOG)
         self.new_command_condition = asyncio.Condition()
         self.events_on = asyncio.Event()
-        self.subscription_queue = asyncio.Queue(ca.MAX_TOTAL_SUBSCRIPTION_BACKLOG)
+        self.subscription_queue = _SubscriptionQueue(
+            ca.MAX_TOTAL_SUBSCRIPTION_BACKLOG
+        )
         self.write_event = Event()
         self.tasks = _TaskHandler()
         self._sub_task = None
+        self._recv_error = None
+        # Commands received while the command queue was full.
+        self._held_commands = collections.deque()
+        client.set_receiver(self._buffer_received)
 
     async def get_from_sub_queue(self, timeout=None):
         # Timeouts work very differently between our server implementations,
         # so we do this little stub in its own method.
-        try:
-            return await asyncio.wait_for(self.subscription_queue.get(), timeout)
-        except asyncio.TimeoutError:
+        queue = self.subscription_queue
+        if queue.empty() and not await queue.wait_for_item(timeout):
             return None
+        return queue.get_nowait()
+
+    async def subscription_queue_loop(self):
+        """
+        Batch queued EventAddResponses and send them.
+
+        This follows the reference implementation's two regimes, but takes
+        everything already queued without awaiting, and only waits (with one
+        timer) once the queue is empty:
+
+        * When idle, block until an update is queued, then send it along
+          with any others queued by then, for low latency.
+        * Otherwise, keep collecting until the batch exceeds
+          SUB_BATCH_THRESH bytes, the oldest command in it has waited for
+          the latency limit, or nothing new arrives for HIGH_LOAD_TIMEOUT.
+          The latency limit doubles for each such batch, up to MAX_LATENCY,
+          and is reset when idle.
+        """
+        self.events_on.set()
+        queue = self.subscription_queue
+        latency_limit = HIGH_LOAD_TIMEOUT
+        while True:
+            commands = []
+            queued_times = []
+            commands_bytes = 0
+            num_expired = 0
+            stats = instrumentation.active
+            try:
+                idle = queue.empty()
+                if idle:
+                    await queue.wait_for_item()
+                    latency_limit = HIGH_LOAD_TIMEOUT
+                started = time.monotonic()
+                deadline = started + latency_limit
+                while True:
+                    while commands_bytes <= SUB_BATCH_THRESH:
+                        try:
+                            ref = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            break
+                        command = ref()
+                        if command is None:
+                            # Dropped for a slow consumer; see the reference
+                            # implementation.
+                            num_expired += 1
+                            continue
+                        commands.append(command)
+                        commands_bytes += len(command)
+                        if stats is not None:
+                            queued_at = getattr(ref, 'queued_at', None)
+                            if queued_at is not None:
+                                queued_times.append(queued_at)
+                    if idle and commands:
+                        break
+                    if commands_bytes > SUB_BATCH_THRESH:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if commands and remaining <= 0:
+                        break
+                    # Wait briefly for more; if nothing comes, we have caught
+                    # up with the producer.
+                    if not await queue.wait_for_item(
+                            min(HIGH_LOAD_TIMEOUT, max(remaining, 0))):
+                        if commands:
+                            break
+                        # Everything collected so far had expired.
+                        idle = True
+                        await queue.wait_for_item()
+                        latency_limit = HIGH_LOAD_TIMEOUT
+                        started = time.monotonic()
+            except self.TaskCancelled:
+                break
+            try:
+                await self._send_subscription_batch(
+                    commands, commands_bytes, queued_times, num_expired,
+                    latency=time.monotonic() - started)
+                latency_limit = min(MAX_LATENCY, latency_limit * 2)
+            except DisconnectedCircuit:
+                await self._on_disconnect()
+                self.circuit.disconnect()
+                await self.context.circuit_disconnected(self)
+                break
 
     async def _send_buffers(self, *buffers):
         """Send ``buffers`` over the wire."""
-        await self.client.send(b"".join(buffers))
+        await self.client.send(*buffers)
+
+    def _buffer_received(self, data):
+        """
+        Parse and queue the commands in bytes just received.
+
+        Returns the number of bytes needed to complete the next command.
+        """
+        if self._recv_error is not None:
+            return None
+        try:
+            commands, num_bytes_needed = self.circuit.recv(data)
+        except Exception as ex:
+            self._recv_error = ex
+            self.client.close()
+            return None
+        self._queue_commands(commands)
+        return num_bytes_needed
+
+    def _queue_commands(self, commands):
+        """
+        Queue received commands, holding back those which do not fit.
+
+        This client is fast and we are not keeping up, if any do not fit.
+        Rather than let the backlog consume all available memory, reading
+        is paused until :meth:`_release_held_commands` finds room for them,
+        which slows the client down.
+        """
+        held = self._held_commands
+        queue = self.command_queue
+        for c in commands:
+            if not held:
+                try:
+                    queue.put_nowait(c)
+                    continue
+                except asyncio.QueueFull:
+                    self.log.debug('Circuit %r has a large backlog of '
+                                   'received commands; pausing reading',
+                                   self)
+                    self.client.pause_reading()
+            held.append(c)
+
+    def _release_held_commands(self):
+        "Queue held commands as there is room, resuming reading once done."
+        held = self._held_commands
+        queue = self.command_queue
+        while held and not queue.full():
+            queue.put_nowait(held.popleft())
+        if not held:
+            self.client.resume_reading()
+
+    async def recv(self):
+        """
+        Wait for the connection to be lost.
+
+        Commands are received and queued by the protocol as they arrive.
+        """
+        await self.client.wait_closed()
+        error = self._recv_error
+        if error is not None and not isinstance(error, DisconnectedCircuit):
+            raise error
+        if error is None:
+            commands, _ = self.circuit.recv(b'')
+            self._queue_commands(commands)
+        await self._on_disconnect()
+        raise DisconnectedCircuit()
 
     async def run(self):
         self.tasks.create(self.command_queue_loop())
@@ -85,7 +299,7 @@ class VirtualCircuit(_VirtualCircuit):
     async def command_queue_loop(self):
         loop = asyncio.get_running_loop()
         try:
-            return await super().command_queue_loop()
+            return await self._batched_command_queue_loop()
         except RuntimeError:
             if loop.is_closed():
                 # Intended to catch: RuntimeError: Event loop is closed
@@ -93,6 +307,77 @@ class VirtualCircuit(_VirtualCircuit):
             # And raise for everything else
             raise
 
+    async def _batched_command_queue_loop(self):
+        """
+        Process queued commands in batches, sending responses together.
+
+        A batch is everything queued by the time its first command is taken,
+        typically all of the commands parsed from one receive. Consecutive
+        reads in a batch run concurrently. Any other command runs on its own,
+        in order, after the responses gathered so far have been sent; thus
+        writes and subscriptions keep their order relative to the requests
+        around them.
+        """
+        self.write_event.set()
+        queue = self.command_queue
+        try:
+            while True:
+                batch = [await queue.get()]
+                while not queue.empty():
+                    batch.append(queue.get_nowait())
+                if self._held_commands:
+                    self._release_held_commands()
+                reads = []
+                for command in batch:
+                    if isinstance(command, (ca.ReadNotifyRequest,
+                                            ca.ReadRequest)):
+                        reads.append(command)
+                        continue
+                    if reads:
+                        await self._process_reads(reads)
+                        reads = []
+                    response = await self._command_queue_iteration(command)
+                    if response is not None:
+                        await self.send(*response)
+                    await self._wake_new_command()
+                if reads:
+                    await self._process_reads(reads)
+        except DisconnectedCircuit:
+            await self._on_disconnect()
+            self.circuit.disconnect()
+            await self.context.circuit_disconnected(self)
+        except self.TaskCancelled:
+            ...
+        except LoopExit:
+            ...
+
+    async def _process_reads(self, reads):
+        """
+        Run read requests concurrently, and send their responses in writes of
+        up to about RESPONSE_BATCH_THRESH bytes.
+        """
+        if len(reads) == 1:
+            results = [await self._command_queue_iteration(reads[0])]
+        else:
+            results = await asyncio.gather(
+                *(self._command_queue_iteration(command) for command in reads)
+            )
+        to_send = []
+        to_send_bytes = 0
+        for response in results:
+            if not response:
+                continue
+            for command in response:
+                to_send.append(command)
+                to_send_bytes += len(command)
+            if to_send_bytes >= RESPONSE_BATCH_THRESH:
+                await self.send(*to_send)
+                to_send = []
+                to_send_bytes = 0
+        if to_send:
+            await self.send(*to_send)
+        await self._wake_new_command()
+
     async def _start_write_task(self, handle_write):
         self.tasks.create(handle_write())
 
@@ -133,16 +418,15 @@ class Context(_Context):
 
     async def server_accept_loop(self, sock):
         """Start a TCP server on `sock` and listen for new connections."""
-        def _new_client(reader, writer):
-            transport = _TransportWrapper(reader, writer)
+        def _new_client(protocol):
             self.server_tasks.create(
-                self.tcp_handler(transport, transport.getpeername())
+                self.tcp_handler(protocol, protocol.getpeername())
             )
 
-        # TODO: when Python 3.7 is the minimum version, the following server
-        # can be an async context manager:
-        await asyncio.start_server(
-            _new_client,
+        await asyncio.get_running_loop().create_server(
+            functools.partial(_BufferedStreamProtocol,
+                              max_buffer_size=MAX_RECV_BYTES,
+                              connected_callback=_new_client),
             sock=sock,
         )
 
@@ -272,13 +556,15 @@ class Context(_Context):
 
 
 async def start_server(pvdb, *, interfaces=None, log_pv_names=False,
-                       startup_hook=None):
+                       startup_hook=None, access_security=None):
     '''Start an asyncio server with a given PV database'''
     ctx = Context(pvdb, interfaces)
+    ctx.access_security = load_access_security(access_security)
     return await ctx.run(log_pv_names=log_pv_names, startup_hook=startup_hook)
 
 
-def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None):
+def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None,
+        event_loop=None, access_security=None):
     """
     Run an IOC, given its PV database dictionary.
 
@@ -297,15 +583,26 @@ def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None):
 
     startup_hook : coroutine, optional
         Hook to call at startup with the ``async_lib`` shim.
+
+    event_loop : str, optional
+        The event loop implementation to use, such as 'asyncio' or 'uvloop'.
+        Defaults to the environment variable ``CAPROTO_ASYNCIO_EVENT_LOOP``
+        or the standard library asyncio event loop.  If the requested
+        implementation is not installed, the standard one is used.
+
+    access_security : str, pathlib.Path, or AccessSecurityConfig, optional
+        Access security configuration (or ACF filename) to apply to all PVs.
     """
     try:
-        asyncio.run(
+        _run(
             start_server(
                 pvdb,
                 interfaces=interfaces,
                 log_pv_names=log_pv_names,
                 startup_hook=startup_hook,
-            )
+                access_security=access_security,
+            ),
+            event_loop=event_loop,
         )
     except KeyboardInterrupt:
         ...
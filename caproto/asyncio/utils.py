@@ -1,12 +1,26 @@
 import asyncio
 import functools
 import inspect
+import logging
+import os
 import socket
 import sys
 import threading
 
 import caproto as ca
 
+logger = logging.getLogger('caproto.ctx')
+
+#: Event loop implementations which may be selected by name.  The value is the
+#: module which provides an ``EventLoopPolicy``, or None for the standard
+#: library event loop.
+EVENT_LOOPS = {
+    'asyncio': None,
+    'uvloop': 'uvloop',
+}
+
+DEFAULT_EVENT_LOOP = os.environ.get('CAPROTO_ASYNCIO_EVENT_LOOP', 'asyncio')
+
 
 class AsyncioQueue:
     '''
@@ -128,6 +142,166 @@ class _TransportWrapper:
         return f'<{self.__class__.__name__} address="{host}:{port}">'
 
 
+class _BufferedStreamProtocol(asyncio.BufferedProtocol):
+    """
+    A TCP protocol which receives into one preallocated buffer.
+
+    Each chunk is passed to the receiver callback as a memoryview onto that
+    buffer as soon as it arrives, without an intermediate StreamReader; the
+    receiver must copy whatever it keeps. Reading is paused until a receiver
+    is set with :meth:`set_receiver`.
+
+    The receiver may return the number of bytes still needed to complete the
+    message being received. If that is more than the buffer holds, those
+    bytes are received into a new buffer of exactly that size, up to
+    ``max_buffer_size``, and passed on together once it is full. Thus memory
+    is only committed as the data arrives, whatever size is claimed.
+
+    Sends are written with ``writelines`` and only wait when the transport's
+    write buffer is over its high-water mark. Otherwise, this has the same
+    API as :class:`_TransportWrapper`, except for ``recv``.
+
+    Parameters
+    ----------
+    buffer_size : int, optional
+        Size of the receive buffer.
+
+    max_buffer_size : int, optional
+        The largest buffer to allocate for the rest of a message.
+
+    connected_callback : callable, optional
+        Called with this protocol when the connection is made.
+    """
+
+    def __init__(self, buffer_size=65536, *, max_buffer_size=2 ** 20,
+                 connected_callback=None):
+        self.transport = None
+        self.receiver = None
+        self.connected_callback = connected_callback
+        self.max_buffer_size = max(max_buffer_size, buffer_size)
+        self._buffer = memoryview(bytearray(buffer_size))
+        self._large_buffer = None
+        self._large_received = 0
+        self._paused = False
+        self._drain_waiters = []
+        self._closed = get_running_loop().create_future()
+
+    def connection_made(self, transport):
+        self.transport = transport
+        if self.receiver is None:
+            transport.pause_reading()
+        if self.connected_callback is not None:
+            self.connected_callback(self)
+
+    def set_receiver(self, receiver):
+        """Set the callable which is passed each received chunk."""
+        self.receiver = receiver
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.resume_reading()
+
+    def pause_reading(self):
+        """Stop receiving, until :meth:`resume_reading`."""
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.pause_reading()
+
+    def resume_reading(self):
+        """Resume receiving, once a receiver is set."""
+        if (self.receiver is not None and self.transport is not None and
+                not self.transport.is_closing()):
+            self.transport.resume_reading()
+
+    def get_buffer(self, sizehint):
+        if self._large_buffer is not None:
+            return self._large_buffer[self._large_received:]
+        return self._buffer
+
+    def buffer_updated(self, nbytes):
+        if self._large_buffer is None:
+            num_bytes_needed = self.receiver(self._buffer[:nbytes])
+        else:
+            self._large_received += nbytes
+            if self._large_received < len(self._large_buffer):
+                return
+            large_buffer, self._large_buffer = self._large_buffer, None
+            num_bytes_needed = self.receiver(large_buffer)
+        if num_bytes_needed and num_bytes_needed > len(self._buffer):
+            self._large_buffer = memoryview(
+                bytearray(min(num_bytes_needed, self.max_buffer_size)))
+            self._large_received = 0
+
+    def eof_received(self):
+        # Close the transport, and so call connection_lost.
+        return False
+
+    def connection_lost(self, exc):
+        if not self._closed.done():
+            self._closed.set_result(exc)
+        self._wake_drain_waiters()
+
+    def pause_writing(self):
+        self._paused = True
+
+    def resume_writing(self):
+        self._paused = False
+        self._wake_drain_waiters()
+
+    def _wake_drain_waiters(self):
+        waiters, self._drain_waiters = self._drain_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def getsockname(self):
+        return self.transport.get_extra_info('sockname')
+
+    def getpeername(self):
+        return self.transport.get_extra_info('peername')
+
+    def _send_error(self, message):
+        try:
+            host, port = self.getpeername()
+        except Exception:
+            destination = ''
+        else:
+            destination = f' to {host}:{port}'
+        return ca.CaprotoNetworkError(f"Failed to send{destination}: {message}")
+
+    async def send(self, *buffers):
+        """Sends buffers over the connected socket."""
+        if self.transport.is_closing():
+            raise self._send_error('connection closed')
+        try:
+            # Byte-format views, as the transport may slice what it cannot
+            # send immediately.
+            self.transport.writelines(
+                [memoryview(buffer).cast('B') for buffer in buffers]
+            )
+        except OSError as exc:
+            raise self._send_error(exc) from exc
+        if self._paused:
+            waiter = get_running_loop().create_future()
+            self._drain_waiters.append(waiter)
+            await waiter
+            if self.transport.is_closing():
+                raise self._send_error('connection closed')
+
+    async def wait_closed(self):
+        """Wait for the connection to be lost or closed."""
+        await asyncio.shield(self._closed)
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+
+    def __repr__(self):
+        try:
+            host, port = self.getpeername()
+        except Exception:
+            return f'<{self.__class__.__name__}>'
+
+        return f'<{self.__class__.__name__} address="{host}:{port}">'
+
+
 class _UdpTransportWrapper:
     """Make an asyncio transport something you can call send on."""
     def __init__(self, transport, address=None, loop=None):
@@ -258,6 +432,97 @@ def _create_udp_socket():
     return sock
 
 
+def get_event_loop_policy(event_loop=None):
+    """
+    Get an event loop policy by name, falling back to the standard library.
+
+    Parameters
+    ----------
+    event_loop : str, optional
+        One of the keys of ``EVENT_LOOPS``, such as 'asyncio' or 'uvloop'.
+        Defaults to the value of the environment variable
+        ``CAPROTO_ASYNCIO_EVENT_LOOP``, or 'asyncio' if unset.
+
+    Returns
+    -------
+    name : str
+        The name of the event loop that will actually be used.
+
+    policy : asyncio.AbstractEventLoopPolicy
+        The event loop policy instance.
+    """
+    if event_loop is None:
+        event_loop = DEFAULT_EVENT_LOOP
+
+    event_loop = event_loop.lower()
+    try:
+        module_name = EVENT_LOOPS[event_loop]
+    except KeyError:
+        raise ca.CaprotoValueError(
+            f"Unknown event loop {event_loop!r}; choose from "
+            f"{', '.join(EVENT_LOOPS)}"
+        ) from None
+
+    if module_name is not None:
+        try:
+            module = __import__(module_name)
+        except ImportError:
+            logger.warning(
+                "Event loop %r requested but %r is not installed; falling "
+                "back to the standard asyncio event loop.",
+                event_loop, module_name
+            )
+        else:
+            return event_loop, module.EventLoopPolicy()
+
+    return 'asyncio', asyncio.DefaultEventLoopPolicy()
+
+
+def install_event_loop_policy(event_loop=None):
+    """
+    Install the named event loop policy for subsequently-created loops.
+
+    This must be called prior to the creation of the event loop, i.e., before
+    ``asyncio.run``.  If the requested implementation is unavailable, the
+    standard library event loop is used instead.
+
+    Parameters
+    ----------
+    event_loop : str, optional
+        See :func:`get_event_loop_policy`.
+
+    Returns
+    -------
+    name : str
+        The name of the event loop implementation installed.
+    """
+    name, policy = get_event_loop_policy(event_loop)
+    asyncio.set_event_loop_policy(policy)
+    return name
+
+
+def run(main, *, debug=None, event_loop=None):
+    """
+    Run the coroutine ``main``, optionally using an alternative event loop.
+
+    Parameters
+    ----------
+    main : coroutine
+        The coroutine to run.
+
+    debug : bool, optional
+        Run the event loop in debug mode.
+
+    event_loop : str, optional
+        The event loop implementation name.  See
+        :func:`get_event_loop_policy`.
+    """
+    name = install_event_loop_policy(event_loop)
+    logger.debug('Running with the %r event loop', name)
+    if debug is None:
+        return asyncio.run(main)
+    return asyncio.run(main, debug=debug)
+
+
 get_running_loop = asyncio.get_running_loop
-run = asyncio.run
 create_task = asyncio.create_task
@@ -0,0 +1,183 @@
+"""
+Compare asyncio event loop implementations for a caproto IOC and client.
+
+The same IOC (``caproto.ioc_examples.simple``) and the same asyncio client
+workload are run under each requested event loop.  For each loop, the
+following are reported:
+
+* read round-trip latency percentiles (sequential ReadNotify requests)
+* read throughput in messages/sec (pipelined ReadNotify requests)
+* write throughput in messages/sec (pipelined WriteNotify requests)
+
+Example::
+
+    $ python -m caproto.benchmarking.event_loop --loops asyncio uvloop
+
+Loops which are not installed fall back to the standard asyncio loop, and are
+reported as such.
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import uuid
+
+from ..asyncio.utils import EVENT_LOOPS, get_event_loop_policy
+from ..asyncio.utils import run as run_asyncio
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of ``values`` (need not be sorted)."""
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    idx = max(0, min(len(values) - 1, round(pct / 100. * len(values)) - 1))
+    return values[idx]
+
+
+def start_ioc(prefix, event_loop, *, env=None):
+    """Start the simple IOC in a subprocess using the given event loop."""
+    return subprocess.Popen(
+        [sys.executable, '-m', 'caproto.ioc_examples.simple',
+         '--prefix', prefix, '--event-loop', event_loop, '--quiet'],
+        env=env if env is not None else os.environ,
+    )
+
+
+def stop_ioc(proc):
+    """Stop an IOC subprocess started with :func:`start_ioc`."""
+    if proc.poll() is not None:
+        return
+    if sys.platform != 'win32':
+        proc.send_signal(signal.SIGINT)
+    try:
+        proc.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        proc.terminate()
+        proc.wait()
+
+
+async def client_workload(pv_name, *, num_reads, num_pipelined, timeout):
+    """
+    Run the benchmark workload against ``pv_name`` with the asyncio client.
+
+    Returns
+    -------
+    results : dict
+        Keys: latencies (list of seconds), read_rate, write_rate
+        (messages/sec).
+    """
+    from ..asyncio.client import Context
+
+    ctx = Context(timeout=timeout)
+    try:
+        pv, = await ctx.get_pvs(pv_name, timeout=timeout)
+        await pv.wait_for_connection(timeout=timeout)
+
+        latencies = []
+        for _ in range(num_reads):
+            t0 = time.perf_counter()
+            await pv.read()
+            latencies.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(pv.read() for _ in range(num_pipelined)))
+        read_rate = num_pipelined / (time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(pv.write([idx], wait=True)
+                               for idx in range(num_pipelined)))
+        write_rate = num_pipelined / (time.perf_counter() - t0)
+    finally:
+        await ctx.disconnect()
+
+    return dict(latencies=latencies, read_rate=read_rate,
+                write_rate=write_rate)
+
+
+def benchmark_event_loop(event_loop, *, num_reads=1000, num_pipelined=10000,
+                         timeout=5.0, startup_timeout=10.0):
+    """
+    Benchmark a single event loop implementation for IOC and client.
+
+    Parameters
+    ----------
+    event_loop : str
+        The event loop name, a key of ``caproto.asyncio.utils.EVENT_LOOPS``.
+    num_reads : int, optional
+        Number of sequential reads used to measure latency.
+    num_pipelined : int, optional
+        Number of concurrent reads and writes used to measure throughput.
+    timeout : float, optional
+        Client timeout.
+    startup_timeout : float, optional
+        Time to wait for the IOC to become available.
+
+    Returns
+    -------
+    results : dict
+    """
+    actual_loop, _ = get_event_loop_policy(event_loop)
+    prefix = f'{uuid.uuid4().hex[:8]}:'
+    proc = start_ioc(prefix, event_loop)
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            try:
+                results = run_asyncio(
+                    client_workload(
+                        prefix + 'A', num_reads=num_reads,
+                        num_pipelined=num_pipelined, timeout=timeout,
+                    ),
+                    event_loop=event_loop,
+                )
+            except TimeoutError:
+                if time.monotonic() > deadline or proc.poll() is not None:
+                    raise
+            else:
+                break
+    finally:
+        stop_ioc(proc)
+
+    latencies = results.pop('latencies')
+    results.update(
+        event_loop=event_loop,
+        actual_event_loop=actual_loop,
+        p50_latency=percentile(latencies, 50),
+        p99_latency=percentile(latencies, 99),
+    )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--loops', nargs='+', default=list(EVENT_LOOPS),
+                        choices=list(EVENT_LOOPS),
+                        help='Event loop implementations to compare.')
+    parser.add_argument('--reads', type=int, default=1000,
+                        help='Sequential reads for latency measurement.')
+    parser.add_argument('--pipelined', type=int, default=10000,
+                        help='Concurrent requests for throughput measurement.')
+    parser.add_argument('--timeout', type=float, default=5.0,
+                        help='Client timeout in seconds.')
+    args = parser.parse_args(argv)
+
+    header = (f"{'loop':<10} {'(actual)':<10} {'read msg/s':>12} "
+              f"{'write msg/s':>12} {'p50 ms':>8} {'p99 ms':>8}")
+    print(header)
+    print('-' * len(header))
+    for name in args.loops:
+        res = benchmark_event_loop(name, num_reads=args.reads,
+                                   num_pipelined=args.pipelined,
+                                   timeout=args.timeout)
+        print(f"{res['event_loop']:<10} {res['actual_event_loop']:<10} "
+              f"{res['read_rate']:>12.0f} {res['write_rate']:>12.0f} "
+              f"{res['p50_latency'] * 1e3:>8.3f} "
+              f"{res['p99_latency'] * 1e3:>8.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,759 @@
+"""
+Load-test a synthetic IOC with many simulated clients on the local host.
+
+A synthetic IOC is started in a subprocess. It serves ``scalars`` scalar PVs
+and ``waveforms`` waveform PVs, all updated ``rate`` times per second, plus
+one setpoint PV per scalar, to be written. Simulated clients connect to it all
+at once and then run one of these workloads for ``duration`` seconds:
+
+* ``connect``: nothing more; measure the connection storm alone
+* ``monitor``: subscribe to every scalar and waveform
+* ``rpc``: read scalars and write setpoints in turn, each request waiting for
+  the response to the one before
+* ``mixed``: half the clients monitor, the other half do ``rpc``
+
+The clients are one of these kinds:
+
+* ``threading``: a :class:`caproto.threading.client.Context` each
+* ``asyncio``: a :class:`caproto.asyncio.client.Context` each, all in one
+  event loop
+* ``raw``: a bare TCP connection each, driven through the sans-I/O layer by
+  one selector loop. These are cheap, so use them to simulate many clients.
+
+Each update carries a sequence number (the value of a scalar, the first
+element of a waveform), so updates which the IOC never sent to a client,
+because it fell behind, are counted as dropped. Reported are the
+connections/sec, updates/sec, dropped updates, requests/sec, p50/p99 latency
+of each, and the resident memory of the IOC and of the clients.
+
+Example::
+
+    $ caproto-bench --workload monitor --clients raw --num-clients 10 100 \\
+        --scalars 100 --rate 10
+"""
+import asyncio
+import contextlib
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import caproto as ca
+
+from .event_loop import percentile
+
+__all__ = ('LoadReport', 'run_load', 'serve', 'resident_memory')
+
+WORKLOADS = ('connect', 'monitor', 'rpc', 'mixed')
+CLIENT_KINDS = ('threading', 'asyncio', 'raw')
+
+
+def pv_names(prefix, scalars, waveforms):
+    """
+    Names of the PVs of the synthetic IOC.
+
+    Returns
+    -------
+    names : dict
+        Maps 'scalars', 'waveforms' and 'setpoints' to lists of names.
+    """
+    return dict(
+        scalars=[f'{prefix}scalar{i}' for i in range(scalars)],
+        waveforms=[f'{prefix}waveform{i}' for i in range(waveforms)],
+        setpoints=[f'{prefix}setpoint{i}' for i in range(scalars)],
+    )
+
+
+def serve(prefix, *, scalars=100, waveforms=0, length=1000, rate=10.0):
+    """
+    Run the synthetic IOC, on the local host only.
+
+    Every scalar and waveform is written ``rate`` times per second (or not
+    at all, if ``rate`` is 0) with the next sequence number.
+    """
+    from ..asyncio.server import run
+
+    names = pv_names(prefix, scalars, waveforms)
+    scalar_channels = [ca.ChannelDouble(value=0.0) for _ in names['scalars']]
+    waveform_channels = [ca.ChannelDouble(value=[0.0] * length,
+                                          max_length=length)
+                         for _ in names['waveforms']]
+    pvdb = dict(zip(names['scalars'], scalar_channels))
+    pvdb.update(zip(names['waveforms'], waveform_channels))
+    pvdb.update((name, ca.ChannelDouble(value=0.0))
+                for name in names['setpoints'])
+
+    async def update_forever():
+        loop = asyncio.get_running_loop()
+        period = 1 / rate
+        value = [0.0] * length
+        sequence = 0
+        next_update = loop.time()
+        while True:
+            sequence += 1
+            timestamp = time.time()
+            for channel in scalar_channels:
+                await channel.write(float(sequence), timestamp=timestamp)
+            value[0] = sequence
+            for channel in waveform_channels:
+                await channel.write(value, timestamp=timestamp)
+            # Keep to the schedule, unless the updates take longer.
+            next_update = max(next_update + period, loop.time())
+            await asyncio.sleep(next_update - loop.time())
+
+    async def startup_hook(async_lib):
+        if rate > 0:
+            asyncio.get_running_loop().create_task(update_forever())
+
+    run(pvdb, interfaces=['127.0.0.1'], startup_hook=startup_hook)
+
+
+def free_port():
+    """Return a port on localhost that is free for both TCP and UDP, for now."""
+    while True:
+        tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        try:
+            tcp.bind(('127.0.0.1', 0))
+            port = tcp.getsockname()[1]
+            try:
+                udp.bind(('127.0.0.1', port))
+            except OSError:
+                continue
+            return port
+        finally:
+            tcp.close()
+            udp.close()
+
+
+def start_ioc(prefix, port, *, scalars, waveforms, length, rate):
+    """Start the synthetic IOC in a subprocess, on the given port."""
+    env = dict(os.environ, EPICS_CA_SERVER_PORT=str(port))
+    return subprocess.Popen(
+        [sys.executable, '-m', 'caproto.commandline.bench', '--serve', prefix,
+         '--scalars', str(scalars), '--waveforms', str(waveforms),
+         '--length', str(length), '--rate', str(rate)],
+        env=env)
+
+
+def stop_ioc(proc):
+    """Stop an IOC subprocess started with :func:`start_ioc`."""
+    if proc.poll() is not None:
+        return
+    if sys.platform != 'win32':
+        proc.send_signal(signal.SIGINT)
+    else:
+        proc.terminate()
+    try:
+        proc.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def resident_memory(pid=None):
+    """
+    The resident set size of a process, in bytes.
+
+    Parameters
+    ----------
+    pid : int, optional
+        Default is this process.
+
+    Returns
+    -------
+    rss : int or None
+        None if it cannot be found: on platforms without ``/proc``, unless
+        psutil is installed.
+    """
+    try:
+        with open(f'/proc/{pid or "self"}/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    try:
+        return psutil.Process(pid).memory_info().rss
+    except psutil.Error:
+        return None
+
+
+@contextlib.contextmanager
+def _client_environment(port):
+    'Point clients at the local host only, and the given server port.'
+    settings = dict(EPICS_CA_SERVER_PORT=str(port),
+                    EPICS_CA_ADDR_LIST='127.0.0.1',
+                    EPICS_CA_AUTO_ADDR_LIST='NO')
+    saved = {key: os.environ.get(key) for key in settings}
+    os.environ.update(settings)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _find_ioc(name, timeout):
+    'Search for ``name`` until the IOC answers, returning its address.'
+    from ..sync.client import search
+
+    sock = ca.bcast_socket()
+    try:
+        # Retry often: the IOC is probably still starting.
+        return search(name, sock, timeout,
+                      max_retries=max(1, round(timeout * 4)))
+    finally:
+        sock.close()
+
+
+class LoadReport:
+    """
+    The outcome of :func:`run_load`.
+
+    Attributes
+    ----------
+    workload, client_kind : str
+    num_clients : int
+    connect_latencies : list of float
+        Seconds from the start of the connection storm until each channel
+        connected.
+    failed : int
+        Channels which did not connect within the timeout.
+    duration : float
+        Seconds the workload ran, once connected.
+    updates, dropped : int
+        Monitor updates received, and missed, during the workload.
+    update_latencies : list of float
+        Seconds from the timestamp of each update until it was received.
+    requests : int
+        Reads and writes completed during the workload.
+    request_latencies : list of float
+        Seconds from each request until its response.
+    errors : int
+        Requests which timed out or failed.
+    ioc_rss, client_rss : int or None
+        Resident memory in bytes of the IOC, and of the process running the
+        clients, at the end of the workload.
+    """
+    def __init__(self, workload, client_kind, num_clients):
+        self.workload = workload
+        self.client_kind = client_kind
+        self.num_clients = num_clients
+        self.connect_latencies = []
+        self.failed = 0
+        self.duration = 0.0
+        self.updates = 0
+        self.dropped = 0
+        self.update_latencies = []
+        self.requests = 0
+        self.request_latencies = []
+        self.errors = 0
+        self.ioc_rss = None
+        self.client_rss = None
+        self._lock = threading.Lock()
+        self._sequences = {}
+        self._active = False
+        self._started = None
+
+    def __repr__(self):
+        return (f"<LoadReport workload={self.workload!r} "
+                f"client_kind={self.client_kind!r} "
+                f"num_clients={self.num_clients}>")
+
+    @property
+    def connections_per_second(self):
+        'Channels connected per second during the connection storm.'
+        if not self.connect_latencies:
+            return 0.0
+        return len(self.connect_latencies) / max(self.connect_latencies)
+
+    @property
+    def updates_per_second(self):
+        'Monitor updates received per second, summed over clients.'
+        if not self.duration:
+            return 0.0
+        return self.updates / self.duration
+
+    @property
+    def requests_per_second(self):
+        'Reads and writes completed per second, summed over clients.'
+        if not self.duration:
+            return 0.0
+        return self.requests / self.duration
+
+    def format(self):
+        'A human-readable summary.'
+        def latency(latencies):
+            if not latencies:
+                return 'n/a'
+            return (f'p50 {percentile(latencies, 50) * 1e3:.3f} ms, '
+                    f'p99 {percentile(latencies, 99) * 1e3:.3f} ms')
+
+        def memory(rss):
+            return 'n/a' if rss is None else f'{rss / 2 ** 20:.1f} MiB'
+
+        return '\n'.join([
+            f'{self.workload} workload, {self.num_clients} '
+            f'{self.client_kind} clients, {self.duration:.3f} s',
+            f'connections: {len(self.connect_latencies)} '
+            f'({self.connections_per_second:.1f}/s), failed: {self.failed}, '
+            f'latency: {latency(self.connect_latencies)}',
+            f'updates: {self.updates} ({self.updates_per_second:.1f}/s), '
+            f'dropped: {self.dropped}, '
+            f'latency: {latency(self.update_latencies)}',
+            f'requests: {self.requests} ({self.requests_per_second:.1f}/s), '
+            f'errors: {self.errors}, '
+            f'latency: {latency(self.request_latencies)}',
+            f'memory: IOC {memory(self.ioc_rss)}, '
+            f'clients {memory(self.client_rss)}',
+        ])
+
+    # These are called by the clients, from any thread.
+
+    def _connected(self, latency):
+        with self._lock:
+            self.connect_latencies.append(latency)
+
+    def _update(self, key, sequence, timestamp):
+        now = time.time()
+        with self._lock:
+            last = self._sequences.get(key)
+            self._sequences[key] = sequence
+            if not self._active or last is None:
+                # The first update is the current value, not a new one.
+                return
+            self.updates += 1
+            self.update_latencies.append(now - timestamp)
+            if sequence > last + 1:
+                self.dropped += int(sequence - last - 1)
+
+    def _request(self, latency):
+        with self._lock:
+            if self._active:
+                self.requests += 1
+                self.request_latencies.append(latency)
+
+    def _error(self):
+        with self._lock:
+            self.errors += 1
+
+    def _start(self):
+        with self._lock:
+            self._active = True
+            self._started = time.monotonic()
+
+    def _stop(self):
+        with self._lock:
+            self._active = False
+            self.duration = time.monotonic() - self._started
+
+
+def _roles(workload, num_clients):
+    'The workload of each client.'
+    if workload == 'mixed':
+        return ['monitor' if i % 2 == 0 else 'rpc'
+                for i in range(num_clients)]
+    return [workload] * num_clients
+
+
+def _role_names(names):
+    'The PVs each kind of client connects to.'
+    return dict(
+        connect=names['scalars'] + names['waveforms'] + names['setpoints'],
+        monitor=names['scalars'] + names['waveforms'],
+        # Read from the first half, write to the second.
+        rpc=names['scalars'] + names['setpoints'],
+    )
+
+
+def _split(pvs):
+    half = len(pvs) // 2
+    return pvs[:half], pvs[half:]
+
+
+def _run_threading(roles, names, duration, timeout, report):
+    from ..threading.client import Context
+
+    contexts = [Context() for _ in roles]
+    # Clients hold callbacks by weak reference.
+    callbacks = []
+    stop = threading.Event()
+    threads = []
+
+    def rpc(read_pvs, write_pvs):
+        i = 0
+        while not stop.is_set():
+            for pv, request in ((read_pvs[i % len(read_pvs)], 'read'),
+                                (write_pvs[i % len(write_pvs)], 'write')):
+                t0 = time.monotonic()
+                try:
+                    if request == 'read':
+                        pv.read(timeout=timeout)
+                    else:
+                        pv.write([i], wait=True, timeout=timeout)
+                except (TimeoutError, ca.CaprotoError):
+                    report._error()
+                else:
+                    report._request(time.monotonic() - t0)
+            i += 1
+
+    def subscribe(index, pvs):
+        def callback(sub, response):
+            report._update((index, sub.pv.name), response.data[0],
+                           response.metadata.timestamp)
+
+        callbacks.append(callback)
+        for pv in pvs:
+            pv.subscribe(data_type='time').add_callback(callback)
+
+    try:
+        start = time.monotonic()
+
+        def connection_state_callback(pv, state):
+            if state == 'connected':
+                report._connected(time.monotonic() - start)
+
+        all_pvs = [
+            ctx.get_pvs(*names[role], timeout=timeout,
+                        connection_state_callback=connection_state_callback)
+            for ctx, role in zip(contexts, roles)]
+        for pvs in all_pvs:
+            for pv in pvs:
+                remaining = start + timeout - time.monotonic()
+                try:
+                    pv.wait_for_connection(timeout=max(remaining, 0.001))
+                except TimeoutError:
+                    report.failed += 1
+
+        report._start()
+        for index, (role, pvs) in enumerate(zip(roles, all_pvs)):
+            if role == 'monitor':
+                subscribe(index, pvs)
+            elif role == 'rpc':
+                threads.append(threading.Thread(target=rpc, args=_split(pvs),
+                                                daemon=True))
+                threads[-1].start()
+        time.sleep(duration)
+        report._stop()
+        report.client_rss = resident_memory()
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        for ctx in contexts:
+            ctx.disconnect()
+
+
+async def _asyncio_load(roles, names, duration, timeout, report):
+    from ..asyncio.client import Context
+
+    contexts = [Context() for _ in roles]
+    callbacks = []
+    subscriptions = []
+    tasks = []
+    stop = asyncio.Event()
+
+    async def rpc(read_pvs, write_pvs):
+        i = 0
+        while not stop.is_set():
+            for pv, request in ((read_pvs[i % len(read_pvs)], 'read'),
+                                (write_pvs[i % len(write_pvs)], 'write')):
+                t0 = time.monotonic()
+                try:
+                    if request == 'read':
+                        await pv.read(timeout=timeout)
+                    else:
+                        await pv.write([i], wait=True, timeout=timeout)
+                except (TimeoutError, ca.CaprotoError):
+                    report._error()
+                else:
+                    report._request(time.monotonic() - t0)
+            i += 1
+
+    def subscribe(index, pvs):
+        def callback(sub, response):
+            report._update((index, sub.pv.name), response.data[0],
+                           response.metadata.timestamp)
+
+        callbacks.append(callback)
+        for pv in pvs:
+            sub = pv.subscribe(data_type='time')
+            subscriptions.append((sub, sub.add_callback(callback)))
+
+    try:
+        start = time.monotonic()
+
+        async def wait(pv):
+            try:
+                await pv.wait_for_connection(timeout=timeout)
+            except TimeoutError:
+                report.failed += 1
+            else:
+                report._connected(time.monotonic() - start)
+
+        async def connect(ctx, role):
+            pvs = await ctx.get_pvs(*names[role], timeout=timeout)
+            await asyncio.gather(*(wait(pv) for pv in pvs))
+            return pvs
+
+        all_pvs = await asyncio.gather(
+            *(connect(ctx, role) for ctx, role in zip(contexts, roles)))
+
+        report._start()
+        loop = asyncio.get_running_loop()
+        for index, (role, pvs) in enumerate(zip(roles, all_pvs)):
+            if role == 'monitor':
+                subscribe(index, pvs)
+            elif role == 'rpc':
+                tasks.append(loop.create_task(rpc(*_split(pvs))))
+        await asyncio.sleep(duration)
+        report._stop()
+        report.client_rss = resident_memory()
+    finally:
+        # Stop the loops rather than cancel them, letting requests in flight
+        # finish.
+        stop.set()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for sub, token in subscriptions:
+            await sub.remove_callback(token)
+        for ctx in contexts:
+            await ctx.disconnect()
+
+
+def _run_asyncio(roles, names, duration, timeout, report):
+    asyncio.run(_asyncio_load(roles, names, duration, timeout, report))
+
+
+class _RawClient:
+    'One TCP connection to the IOC, with no client library on top.'
+    def __init__(self, index, role, names, address, report):
+        self.index = index
+        self.role = role
+        self.report = report
+        self.circuit = ca.VirtualCircuit(ca.CLIENT, address, 0)
+        self.channels = [ca.ClientChannel(name, self.circuit)
+                         for name in names]
+        self.pending = len(self.channels)
+        self.outgoing = bytearray()
+        self.closed = False
+        self.sent_at = None
+        self.count = 0
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.sock.setblocking(False)
+        self.sock.connect_ex(address)
+        channel = self.channels[0]
+        self.send(ca.VersionRequest(priority=0,
+                                    version=ca.DEFAULT_PROTOCOL_VERSION),
+                  channel.host_name(socket.gethostname()),
+                  channel.client_name('caproto-bench'),
+                  *(channel.create() for channel in self.channels))
+
+    def send(self, *commands):
+        for buffer in self.circuit.send(*commands):
+            # Some buffers are numpy arrays, which would take over +=.
+            self.outgoing += memoryview(buffer).cast('B')
+
+    def start(self):
+        'Start the workload, once connected.'
+        if self.closed:
+            return
+        if self.role == 'monitor':
+            self.send(*(channel.subscribe(data_type=ca.ChannelType.TIME_DOUBLE)
+                        for channel in self.channels
+                        if channel.states[ca.CLIENT] is ca.CONNECTED))
+        elif self.role == 'rpc':
+            self.read_channels, self.write_channels = _split(self.channels)
+            self.next_request()
+
+    def next_request(self):
+        if self.count % 2 == 0:
+            channels = self.read_channels
+        else:
+            channels = self.write_channels
+        channel = channels[(self.count // 2) % len(channels)]
+        if channel.states[ca.CLIENT] is not ca.CONNECTED:
+            return
+        ioid = self.circuit.new_ioid()
+        if self.count % 2 == 0:
+            request = channel.read(data_type=ca.ChannelType.DOUBLE, ioid=ioid)
+        else:
+            request = channel.write([self.count // 2],
+                                    data_type=ca.ChannelType.DOUBLE,
+                                    ioid=ioid, notify=True)
+        self.count += 1
+        self.sent_at = time.monotonic()
+        self.send(request)
+
+    def readable(self, start):
+        try:
+            data = self.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        commands, _ = self.circuit.recv(data)
+        for command in commands:
+            if command is ca.DISCONNECTED:
+                self.close()
+                return
+            self.circuit.process_command(command)
+            self.received(command, start)
+
+    def received(self, command, start):
+        report = self.report
+        if isinstance(command, ca.CreateChanResponse):
+            self.pending -= 1
+            report._connected(time.monotonic() - start)
+        elif isinstance(command, ca.EventAddResponse):
+            report._update((self.index, command.subscriptionid),
+                           command.data[0], command.metadata.timestamp)
+        elif isinstance(command, (ca.ReadNotifyResponse,
+                                  ca.WriteNotifyResponse)):
+            if command.status.success:
+                report._request(time.monotonic() - self.sent_at)
+            else:
+                report._error()
+            self.next_request()
+        elif isinstance(command, (ca.ErrorResponse, ca.CreateChFailResponse)):
+            report._error()
+
+    def writable(self):
+        try:
+            sent = self.sock.send(self.outgoing)
+        except BlockingIOError:
+            return
+        except OSError:
+            self.close()
+            return
+        del self.outgoing[:sent]
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.sock.close()
+
+
+def _run_raw(roles, names, address, duration, timeout, report):
+    selector = selectors.DefaultSelector()
+    start = time.monotonic()
+    clients = [_RawClient(index, role, names[role], address, report)
+               for index, role in enumerate(roles)]
+    registered = {}
+
+    def poll(until, done=lambda: False):
+        while not done():
+            remaining = until - time.monotonic()
+            if remaining <= 0:
+                return
+            for client in clients:
+                if client.closed:
+                    if registered.pop(client, None) is not None:
+                        selector.unregister(client.sock)
+                    continue
+                events = selectors.EVENT_READ
+                if client.outgoing:
+                    events |= selectors.EVENT_WRITE
+                if registered.get(client) != events:
+                    if client in registered:
+                        selector.modify(client.sock, events, client)
+                    else:
+                        selector.register(client.sock, events, client)
+                    registered[client] = events
+            if not registered:
+                return
+            for key, events in selector.select(min(remaining, 0.1)):
+                client = key.data
+                if events & selectors.EVENT_WRITE:
+                    client.writable()
+                if events & selectors.EVENT_READ and not client.closed:
+                    client.readable(start)
+
+    try:
+        poll(start + timeout,
+             lambda: not any(client.pending for client in clients))
+        report.failed = sum(client.pending for client in clients)
+        report._start()
+        for client in clients:
+            client.start()
+        poll(time.monotonic() + duration)
+        report._stop()
+        report.client_rss = resident_memory()
+    finally:
+        for client in clients:
+            client.close()
+        selector.close()
+
+
+def run_load(workload='monitor', client_kind='raw', num_clients=10, *,
+             scalars=100, waveforms=0, length=1000, rate=10.0, duration=10.0,
+             timeout=10.0):
+    """
+    Run a workload against a synthetic IOC, started for the purpose.
+
+    Parameters
+    ----------
+    workload : {'connect', 'monitor', 'rpc', 'mixed'}
+    client_kind : {'threading', 'asyncio', 'raw'}
+    num_clients : int
+    scalars, waveforms : int, optional
+        Number of each kind of PV served.
+    length : int, optional
+        Elements per waveform.
+    rate : float, optional
+        Updates per second of each scalar and waveform.
+    duration : float, optional
+        Seconds to run the workload for, once connected.
+    timeout : float, optional
+        Seconds to wait for the IOC to start, for the clients to connect, and
+        for each request.
+
+    Returns
+    -------
+    report : LoadReport
+    """
+    if workload not in WORKLOADS:
+        raise ca.CaprotoValueError(f'Unknown workload {workload!r}')
+    if client_kind not in CLIENT_KINDS:
+        raise ca.CaprotoValueError(f'Unknown client kind {client_kind!r}')
+    if workload in ('rpc', 'mixed') and not scalars:
+        raise ca.CaprotoValueError(f'The {workload} workload needs scalars')
+    if not scalars + waveforms:
+        raise ca.CaprotoValueError('The IOC must serve some PVs')
+    prefix = f'bench:{uuid.uuid4().hex[:8]}:'
+    names = pv_names(prefix, scalars, waveforms)
+    first_name = (names['scalars'] + names['waveforms'])[0]
+    roles = _roles(workload, num_clients)
+    report = LoadReport(workload, client_kind, num_clients)
+    port = free_port()
+    proc = start_ioc(prefix, port, scalars=scalars, waveforms=waveforms,
+                     length=length, rate=rate)
+    try:
+        with _client_environment(port):
+            address = _find_ioc(first_name, timeout)
+            if client_kind == 'threading':
+                _run_threading(roles, _role_names(names), duration, timeout,
+                               report)
+            elif client_kind == 'asyncio':
+                _run_asyncio(roles, _role_names(names), duration, timeout,
+                             report)
+            else:
+                _run_raw(roles, _role_names(names), address, duration,
+                         timeout, report)
+        report.ioc_rss = resident_memory(proc.pid)
+    finally:
+        stop_ioc(proc)
+    return report
@@ -0,0 +1,213 @@
+"""
+Compare the datagram rate of the repeater implementations versus client count.
+
+For each implementation (``sync`` and ``asyncio``) and each number of clients,
+a repeater is started in a subprocess on a free port, that many client sockets
+register with it, and a "server" socket sends beacons to it in bursts while
+the clients read what is forwarded. For each run, the following are reported:
+
+* the time taken to register all clients
+* the fraction of beacons delivered to the clients
+* the rate of beacons delivered, summed over clients
+* the rate of beacons forwarded by the repeater
+
+Example::
+
+    $ python -m caproto.benchmarking.repeater --clients 1 10 100 200
+"""
+import argparse
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import caproto as ca
+
+IMPLEMENTATIONS = ('sync', 'asyncio')
+
+
+def free_udp_port():
+    """Return a UDP port on localhost that is free, for now."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+    finally:
+        sock.close()
+
+
+def start_repeater(implementation, port):
+    """Start a repeater subprocess on the given port."""
+    args = [sys.executable, '-m', 'caproto.commandline.repeater', '--quiet']
+    if implementation == 'asyncio':
+        args.append('--asyncio')
+    env = dict(os.environ, EPICS_CA_REPEATER_PORT=str(port))
+    return subprocess.Popen(args, env=env)
+
+
+def stop_repeater(proc):
+    """Stop a repeater subprocess started with :func:`start_repeater`."""
+    if proc.poll() is not None:
+        return
+    if sys.platform != 'win32':
+        proc.send_signal(signal.SIGINT)
+    else:
+        proc.terminate()
+    try:
+        proc.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+
+def register_clients(address, num_clients, *, timeout=10.0):
+    """
+    Register client sockets with the repeater at ``address``.
+
+    Returns the sockets, once every registration has been confirmed.
+    """
+    clients = []
+    confirmation = bytes(ca.RepeaterConfirmResponse('127.0.0.1'))
+    deadline = time.monotonic() + timeout
+    for _ in range(num_clients):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        sock.bind(('127.0.0.1', 0))
+        sock.settimeout(0.2)
+        clients.append(sock)
+        while True:
+            # The repeater may not be listening yet, so retry.
+            sock.sendto(bytes(ca.RepeaterRegisterRequest('127.0.0.1')),
+                        address)
+            try:
+                data = sock.recv(ca.MAX_UDP_RECV)
+            except socket.timeout:
+                if time.monotonic() > deadline:
+                    raise TimeoutError('The repeater did not confirm '
+                                       'registration')
+                continue
+            if data[:16] == confirmation[:16]:
+                break
+    for sock in clients:
+        sock.setblocking(False)
+    return clients
+
+
+def benchmark_repeater(implementation, num_clients, *, beacons=20000,
+                       burst=100, idle_timeout=1.0):
+    """
+    Measure the beacon rate through a repeater with ``num_clients`` clients.
+
+    Parameters
+    ----------
+    implementation : {'sync', 'asyncio'}
+    num_clients : int
+    beacons : int, optional
+        Number of beacons to send.
+    burst : int, optional
+        Number of beacons sent back to back, before reading from the clients.
+    idle_timeout : float, optional
+        Stop once no beacon has arrived for this long.
+
+    Returns
+    -------
+    results : dict
+        Keys: implementation, clients, register_time (sec), delivered
+        (fraction), delivery_rate (beacons/sec summed over clients),
+        forward_rate (beacons/sec forwarded)
+    """
+    port = free_udp_port()
+    address = ('127.0.0.1', port)
+    proc = start_repeater(implementation, port)
+    clients = []
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    selector = selectors.DefaultSelector()
+    try:
+        t0 = time.perf_counter()
+        clients = register_clients(address, num_clients)
+        register_time = time.perf_counter() - t0
+        for sock in clients:
+            selector.register(sock, selectors.EVENT_READ)
+
+        received = 0
+
+        def drain(timeout):
+            nonlocal received
+            for key, _ in selector.select(timeout):
+                while True:
+                    try:
+                        data = key.fileobj.recv(ca.MAX_UDP_RECV)
+                    except BlockingIOError:
+                        break
+                    # Every forwarded beacon is 16 bytes.
+                    received += len(data) // 16
+
+        payload = [bytes(ca.Beacon(13, 5064, i, '0.0.0.0'))
+                   for i in range(beacons)]
+        t0 = time.perf_counter()
+        for start in range(0, beacons, burst):
+            for datagram in payload[start:start + burst]:
+                server.sendto(datagram, address)
+            drain(0)
+        expected = beacons * num_clients
+        last = time.perf_counter()
+        while received < expected:
+            before = received
+            drain(0.05)
+            if received > before:
+                last = time.perf_counter()
+            elif time.perf_counter() - last > idle_timeout:
+                break
+        elapsed = last - t0
+    finally:
+        selector.close()
+        for sock in clients:
+            sock.close()
+        server.close()
+        stop_repeater(proc)
+
+    return dict(
+        implementation=implementation,
+        clients=num_clients,
+        register_time=register_time,
+        delivered=received / expected,
+        delivery_rate=received / elapsed,
+        forward_rate=received / num_clients / elapsed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--implementations', nargs='+',
+                        choices=IMPLEMENTATIONS, default=list(IMPLEMENTATIONS),
+                        help='Repeater implementations to compare.')
+    parser.add_argument('--clients', type=int, nargs='+',
+                        default=[1, 10, 100],
+                        help='Client counts to compare.')
+    parser.add_argument('--beacons', type=int, default=20000,
+                        help='Number of beacons to send per run.')
+    parser.add_argument('--burst', type=int, default=100,
+                        help='Beacons sent back to back.')
+    args = parser.parse_args(argv)
+
+    header = (f"{'repeater':>9} {'clients':>8} {'register s':>11} "
+              f"{'delivered':>10} {'delivered/s':>12} {'forwarded/s':>12}")
+    print(f'{args.beacons} beacons in bursts of {args.burst}')
+    print(header)
+    print('-' * len(header))
+    for num_clients in args.clients:
+        for implementation in args.implementations:
+            res = benchmark_repeater(implementation, num_clients,
+                                     beacons=args.beacons, burst=args.burst)
+            print(f"{res['implementation']:>9} {res['clients']:>8} "
+                  f"{res['register_time']:>11.3f} "
+                  f"{res['delivered']:>10.1%} "
+                  f"{res['delivery_rate']:>12.0f} "
+                  f"{res['forward_rate']:>12.0f}", flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+Measure threading client monitor throughput versus selector thread count.
+
+A number of IOCs are started in subprocesses, each streaming a waveform at a
+fixed period.  A single threading client Context subscribes to all of them,
+and the aggregate rate of monitor updates received is measured for each
+requested number of selector threads (``Context(selector_threads=N)``).
+
+Updates from each IOC carry a sequence number, which is used to verify that
+updates from any given circuit are processed in order.
+
+Example::
+
+    $ python -m caproto.benchmarking.selector_threads --iocs 30 \\
+        --threads 1 2 4 8 --length 4096
+"""
+import argparse
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+
+import caproto as ca
+
+
+def serve(prefix, length, period):
+    """Run an IOC with a single waveform PV, updated every ``period`` sec."""
+    from ..asyncio.server import run
+
+    waveform = ca.ChannelDouble(value=[0.0] * length, max_length=length)
+    pvdb = {f'{prefix}waveform': waveform}
+
+    async def update_forever(async_lib):
+        value = [0.0] * length
+        sequence = 0
+        while True:
+            sequence += 1
+            value[0] = sequence
+            await waveform.write(value)
+            await asyncio.sleep(period)
+
+    async def startup_hook(async_lib):
+        asyncio.get_running_loop().create_task(update_forever(async_lib))
+
+    run(pvdb, startup_hook=startup_hook)
+
+
+def start_iocs(num_iocs, length, period, *, env=None):
+    """Start ``num_iocs`` streaming IOCs, returning (prefixes, processes)."""
+    prefixes = [f'{uuid.uuid4().hex[:8]}:' for _ in range(num_iocs)]
+    procs = [
+        subprocess.Popen(
+            [sys.executable, '-m', 'caproto.benchmarking.selector_threads',
+             '--serve', prefix, '--length', str(length),
+             '--period', str(period)],
+            env=env if env is not None else os.environ,
+        )
+        for prefix in prefixes
+    ]
+    return prefixes, procs
+
+
+def stop_iocs(procs):
+    """Stop IOC subprocesses started with :func:`start_iocs`."""
+    for proc in procs:
+        if proc.poll() is None:
+            if sys.platform != 'win32':
+                proc.send_signal(signal.SIGINT)
+            else:
+                proc.terminate()
+    for proc in procs:
+        try:
+            proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def benchmark_selector_threads(pv_names, selector_threads, *, duration=5.0,
+                               warmup=1.0, timeout=10.0):
+    """
+    Measure aggregate monitor throughput for the given selector thread count.
+
+    Parameters
+    ----------
+    pv_names : list of str
+        Waveform PV names, one per IOC.
+    selector_threads : int
+        Passed to the threading client Context.
+    duration : float, optional
+        Measurement duration in seconds.
+    warmup : float, optional
+        Time to wait after subscribing, prior to measuring.
+    timeout : float, optional
+        Connection timeout.
+
+    Returns
+    -------
+    results : dict
+        Keys: selector_threads, updates, update_rate (updates/sec),
+        byte_rate (bytes/sec), out_of_order
+    """
+    from ..threading.client import Context
+
+    counts = {name: 0 for name in pv_names}
+    nbytes = {name: 0 for name in pv_names}
+    last_sequence = {name: 0 for name in pv_names}
+    out_of_order = {name: 0 for name in pv_names}
+    measuring = threading.Event()
+
+    def callback(sub, response):
+        # Each PV is on its own circuit, and callbacks for any one circuit
+        # are called in order from a single thread.
+        name = sub.pv.name
+        sequence = response.data[0]
+        if sequence < last_sequence[name]:
+            out_of_order[name] += 1
+        last_sequence[name] = sequence
+        if measuring.is_set():
+            counts[name] += 1
+            nbytes[name] += response.data.nbytes
+
+    ctx = Context(timeout=timeout, selector_threads=selector_threads)
+    try:
+        pvs = ctx.get_pvs(*pv_names, timeout=timeout)
+        for pv in pvs:
+            pv.wait_for_connection(timeout=timeout)
+
+        subs = [pv.subscribe(data_type=ca.ChannelType.DOUBLE) for pv in pvs]
+        for sub in subs:
+            sub.add_callback(callback)
+
+        time.sleep(warmup)
+        measuring.set()
+        t0 = time.perf_counter()
+        time.sleep(duration)
+        measuring.clear()
+        elapsed = time.perf_counter() - t0
+
+        for sub in subs:
+            sub.clear()
+    finally:
+        ctx.disconnect()
+
+    updates = sum(counts.values())
+    return dict(
+        selector_threads=selector_threads,
+        updates=updates,
+        update_rate=updates / elapsed,
+        byte_rate=sum(nbytes.values()) / elapsed,
+        out_of_order=sum(out_of_order.values()),
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--iocs', type=int, default=8,
+                        help='Number of streaming IOCs.')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4],
+                        help='Selector thread counts to compare.')
+    parser.add_argument('--length', type=int, default=1024,
+                        help='Waveform length (elements).')
+    parser.add_argument('--period', type=float, default=0.001,
+                        help='Update period of each IOC (sec).')
+    parser.add_argument('--duration', type=float, default=5.0,
+                        help='Measurement duration per thread count (sec).')
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help='Client connection timeout in seconds.')
+    parser.add_argument('--serve', metavar='PREFIX',
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        return serve(args.serve, args.length, args.period)
+
+    prefixes, procs = start_iocs(args.iocs, args.length, args.period)
+    try:
+        pv_names = [f'{prefix}waveform' for prefix in prefixes]
+        header = (f"{'threads':>8} {'updates/s':>12} {'MB/s':>10} "
+                  f"{'out of order':>13}")
+        print(f'{args.iocs} IOCs, waveform length {args.length}, '
+              f'update period {args.period} s')
+        print(header)
+        print('-' * len(header))
+        for num_threads in args.threads:
+            res = benchmark_selector_threads(
+                pv_names, num_threads, duration=args.duration,
+                timeout=args.timeout,
+            )
+            print(f"{res['selector_threads']:>8} "
+                  f"{res['update_rate']:>12.0f} "
+                  f"{res['byte_rate'] / 1e6:>10.2f} "
+                  f"{res['out_of_order']:>13}", flush=True)
+    finally:
+        stop_iocs(procs)
+
+
+if __name__ == '__main__':
+    main()
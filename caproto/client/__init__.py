@@ -1,4 +1,5 @@
 from . import common
+from . import recorder
 from . import search_results
 
-__all__ = ['common', 'search_results']
+__all__ = ['common', 'recorder', 'search_results']
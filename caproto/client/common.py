@@ -8,8 +8,17 @@
 # Context: has a caproto.Broadcaster, a UDP socket, a cache of
 #          search results and a cache of VirtualCircuits.
 #
+import collections
+import errno
 import inspect
 import os
+import socket
+import threading
+import time
+
+from .._dbr import (ChannelType, SubscriptionType, control_types,
+                    graphical_types)
+from .._utils import CaprotoValueError
 
 
 def _sentinel(name):
@@ -35,21 +44,40 @@ BEACON_MARGIN = float(os.environ.get("CAPROTO_CLIENT_BEACON_MARGIN_SEC", 1))
 EVENT_ADD_BATCH_MAX_BYTES = int(
     os.environ.get("CAPROTO_CLIENT_EVENT_ADD_BATCH_MAX_BYTES", 2 ** 16)
 )
+METADATA_CACHE = bool(
+    os.environ.get("CAPROTO_CLIENT_METADATA_CACHE", "").lower()
+    in ("y", "yes", "true", "1")
+)
 MAX_RETRY_SEARCHES_INTERVAL = float(
     os.environ.get("CAPROTO_CLIENT_MAX_RETRY_SEARCHES_INTERVAL_SEC", 5)
 )
 MIN_RETRY_SEARCHES_INTERVAL = float(
     os.environ.get("CAPROTO_CLIENT_MIN_RETRY_SEARCHES_INTERVAL_SEC", 0.03)
 )
+RECONNECT_JITTER = float(
+    os.environ.get("CAPROTO_CLIENT_RECONNECT_JITTER_SEC", 0)
+)
+REQUEST_RATE = float(os.environ.get("CAPROTO_CLIENT_REQUEST_RATE", 0))
+REQUEST_BURST = int(os.environ.get("CAPROTO_CLIENT_REQUEST_BURST", 1000))
 RESTART_SUBS_PERIOD = float(
     os.environ.get("CAPROTO_CLIENT_RESTART_SUBS_PERIOD_SEC", 0.1)
 )
 RETRY_RETIRED_SEARCHES_INTERVAL = float(
     os.environ.get("CAPROTO_CLIENT_RETRY_RETIRED_SEARCHES_INTERVAL_SEC", 60.)
 )
+SEARCH_CACHE = os.environ.get("CAPROTO_CLIENT_SEARCH_CACHE") or None
+SEARCH_CACHE_MAX_AGE = float(
+    os.environ.get("CAPROTO_CLIENT_SEARCH_CACHE_MAX_AGE_SEC", 24 * 60 * 60)
+)
+SEARCH_CACHE_TIMEOUT = float(
+    os.environ.get("CAPROTO_CLIENT_SEARCH_CACHE_TIMEOUT_SEC", 1.)
+)
 SEARCH_RETIREMENT_AGE = int(
     os.environ.get("CAPROTO_CLIENT_SEARCH_RETIREMENT_AGE_SEC", 8 * 60)
 )
+SELECTOR_THREADS = int(
+    os.environ.get("CAPROTO_CLIENT_SELECTOR_THREADS", 1)
+)
 STR_ENC = os.environ.get('CAPROTO_STRING_ENCODING', 'latin-1')
 
 
@@ -111,3 +139,198 @@ SUBSCRIBE_SIG = inspect.Signature([
     Parameter('to', Parameter.POSITIONAL_OR_KEYWORD, default=0),
     Parameter('mask', Parameter.POSITIONAL_OR_KEYWORD, default=None)
 ])
+
+
+def get_dispatch_queue_size(dispatch):
+    """
+    Get the maximum number of pending updates for a dispatch policy.
+
+    Parameters
+    ----------
+    dispatch : {'all', 'latest'} or int
+        How subscription updates are dispatched to user callbacks.  With
+        'all', every update is queued for every callback, without limit.  With
+        'latest', only the most recent update not yet dispatched is kept.  With
+        an integer N, at most N updates not yet dispatched are kept, and the
+        oldest is dropped to make room for new ones.
+
+    Returns
+    -------
+    size : int or None
+        None indicates no limit.
+    """
+    if dispatch == 'all':
+        return None
+    if dispatch == 'latest':
+        return 1
+    if isinstance(dispatch, int) and not isinstance(dispatch, bool):
+        if dispatch > 0:
+            return dispatch
+    raise CaprotoValueError(
+        f"Invalid dispatch policy {dispatch!r}: expected 'all', 'latest' or "
+        f"a positive integer queue size"
+    )
+
+
+# connect_ex() results indicating a non-blocking connection is in progress
+CONNECT_IN_PROGRESS = {0, errno.EINPROGRESS, errno.EWOULDBLOCK,
+                       errno.EALREADY,
+                       getattr(errno, 'WSAEWOULDBLOCK', errno.EWOULDBLOCK)}
+
+
+def get_connect_error(sock):
+    '''Get the result of a non-blocking connect: 0 or an errno value'''
+    error = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+    if not error:
+        try:
+            sock.getpeername()
+        except OSError as ex:
+            error = ex.errno or errno.ENOTCONN
+    return error
+
+
+# Metadata is refreshed by monitoring for property changes and, as alarm
+# status is also included in CTRL and GR types, for alarm changes.
+METADATA_CACHE_MASK = SubscriptionType.DBE_PROPERTY | SubscriptionType.DBE_ALARM
+
+MetadataCacheInfo = collections.namedtuple(
+    'MetadataCacheInfo', 'hits misses refreshes size')
+
+
+class MetadataCache:
+    """
+    Per-PV cache of metadata which rarely changes, such as units, limits and
+    enum strings.
+
+    Entries are keyed on the requested data type, which must be 'control',
+    'graphic' or a specific CTRL or GR ChannelType. They are filled by reads
+    and then kept fresh by a subscription with :data:`METADATA_CACHE_MASK`
+    feeding the object returned by :meth:`recorder`.
+    """
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._recorders = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def __repr__(self):
+        return f"<MetadataCache {self.info()}>"
+
+    @staticmethod
+    def check_data_type(data_type):
+        "Raise CaprotoValueError if data_type is not cacheable."
+        if data_type in ('control', 'graphic'):
+            return
+        try:
+            data_type = ChannelType(data_type)
+        except ValueError:
+            pass
+        else:
+            if data_type in control_types or data_type in graphical_types:
+                return
+        raise CaprotoValueError(
+            f"Only 'control', 'graphic', or CTRL and GR types carry cacheable "
+            f"metadata, not {data_type!r}")
+
+    def get(self, data_type):
+        "Return the cached metadata, or None, counting hits and misses."
+        with self._lock:
+            metadata = self._entries.get(data_type)
+            if metadata is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return metadata
+
+    def store(self, data_type, metadata):
+        with self._lock:
+            self._entries[data_type] = metadata
+
+    def clear(self):
+        "Drop all entries, keeping the statistics."
+        with self._lock:
+            self._entries.clear()
+
+    def info(self):
+        with self._lock:
+            return MetadataCacheInfo(self.hits, self.misses, self.refreshes,
+                                     len(self._entries))
+
+    def recorder(self, data_type):
+        """
+        Get a recorder which refreshes the entry for ``data_type``.
+
+        Returns
+        -------
+        recorder : object
+            With an ``append(response)`` method, suitable for
+            ``Subscription.add_recorder``.
+        created : bool
+            False if the recorder was returned by a previous call.
+        """
+        with self._lock:
+            try:
+                return self._recorders[data_type], False
+            except KeyError:
+                recorder = _MetadataCacheRecorder(self, data_type)
+                self._recorders[data_type] = recorder
+                return recorder, True
+
+
+class _MetadataCacheRecorder:
+    def __init__(self, cache, data_type):
+        self.cache = cache
+        self.data_type = data_type
+
+    def __repr__(self):
+        return f"<_MetadataCacheRecorder data_type={self.data_type!r}>"
+
+    def append(self, response):
+        cache = self.cache
+        with cache._lock:
+            cache._entries[self.data_type] = response.metadata
+            cache.refreshes += 1
+
+
+class TokenBucket:
+    """
+    Limit the rate of requests, allowing bursts.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second.
+    burst : int
+        Maximum number of tokens held, and initially held.
+    """
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<TokenBucket rate={self.rate} burst={self.burst}>"
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst,
+                           self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def take(self, count):
+        "Take up to ``count`` tokens, returning the number taken."
+        with self._lock:
+            self._refill()
+            taken = min(count, int(self._tokens))
+            self._tokens -= taken
+            return taken
+
+    def delay(self):
+        "Seconds until the next token is available."
+        with self._lock:
+            self._refill()
+            return max(0., (1 - self._tokens) / self.rate)
@@ -0,0 +1,333 @@
+"""
+Record subscription updates into preallocated NumPy ring buffers.
+
+This is shared by the threading and asyncio clients. Updates are written
+straight from the decoded response, on the thread (or event loop) that
+received it, without going through user callbacks. Spill files are written
+by a separate thread, so as not to hold up the receipt of other traffic.
+"""
+import concurrent.futures
+import logging
+import os
+import re
+import threading
+import time
+
+from .._constants import MAX_STRING_SIZE
+from .._utils import CaprotoKeyError, CaprotoValueError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+__all__ = ('RingBuffer', 'MonitorRecorder')
+
+logger = logging.getLogger('caproto.ctx')
+
+_spill_executor = None
+_spill_executor_lock = threading.Lock()
+
+
+def _submit_spill(path, records, name):
+    'Write ``records`` to ``path`` on the spill writer thread.'
+    global _spill_executor
+    with _spill_executor_lock:
+        if _spill_executor is None:
+            _spill_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='recorder-spill')
+    return _spill_executor.submit(_write_spill, path, records, name)
+
+
+def _write_spill(path, records, name):
+    '[spill writer thread] Write out a copy of a full ring.'
+    try:
+        np.save(path, records)
+    except Exception:
+        logger.exception('Failed to spill %d records of %r to %s',
+                         len(records), name, path)
+        raise
+    logger.debug('Spilled %d records of %r to %s', len(records), name, path)
+
+
+def _record_dtype(data):
+    'The structured dtype of a record holding ``data``.'
+    if isinstance(data, np.ndarray):
+        value_dtype = data.dtype.newbyteorder('=')
+    else:
+        # Strings (and enums read as strings) arrive as lists of bytes.
+        value_dtype = np.dtype(f'S{MAX_STRING_SIZE}')
+    shape = (len(data), ) if len(data) != 1 else ()
+    return np.dtype([('timestamp', 'f8'),
+                     ('value', value_dtype, shape),
+                     ('severity', 'i2')])
+
+
+class RingBuffer:
+    """
+    A fixed-size history of updates to one PV.
+
+    The buffer is allocated when the first update arrives, as a NumPy
+    structured array with the fields ``timestamp`` (UNIX seconds),
+    ``value`` and ``severity``. Scalars are stored as such; arrays are
+    truncated or zero-padded to the length of the first update.
+
+    Parameters
+    ----------
+    name : str
+        The PV name, used for naming spill files.
+    capacity : int
+        Number of updates to keep in memory.
+    spill_dir : str, optional
+        If given, each time the ring wraps, a copy of its contents is written
+        to a new ``.npy`` file in this directory, by a background thread. See
+        :attr:`spilled` and :meth:`flush`.
+
+    Attributes
+    ----------
+    count : int
+        Total number of updates recorded.
+    spilled : list
+        Paths of the spill files written so far (or being written), oldest
+        first.
+    """
+    def __init__(self, name, capacity, *, spill_dir=None):
+        if np is None:
+            raise RuntimeError('RingBuffer requires numpy')
+        if capacity < 1:
+            raise CaprotoValueError('capacity must be positive')
+        self.name = name
+        self.capacity = capacity
+        self.spill_dir = spill_dir
+        self.spilled = []
+        self.count = 0
+        self._records = None
+        self._pending_spills = []
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return (f"<RingBuffer {self.name!r} count={self.count} "
+                f"capacity={self.capacity}>")
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    @property
+    def dtype(self):
+        'The dtype of the records, or None before the first update.'
+        if self._records is None:
+            return None
+        return self._records.dtype
+
+    def append(self, response):
+        """
+        Record a response to a subscription.
+
+        Parameters
+        ----------
+        response : EventAddResponse
+        """
+        metadata = response.metadata
+        timestamp = getattr(metadata, 'timestamp', None)
+        if timestamp is None:
+            timestamp = time.time()
+        severity = getattr(metadata, 'severity', 0)
+        data = response.data
+
+        with self._lock:
+            if self._records is None:
+                self._records = np.zeros(self.capacity,
+                                         dtype=_record_dtype(data))
+            index = self.count % self.capacity
+            if index == 0 and self.count and self.spill_dir is not None:
+                self._spill()
+            record = self._records[index]
+            record['timestamp'] = timestamp
+            record['severity'] = severity
+            value = record['value']
+            if value.ndim == 0:
+                record['value'] = data[0]
+            else:
+                length = min(len(data), len(value))
+                value[:length] = data[:length]
+                value[length:] = 0
+            self.count += 1
+
+    def _spill(self):
+        'Hand a copy of the full ring, in chronological order, to the writer.'
+        safe_name = re.sub(r'[^\w.-]', '_', self.name)
+        path = os.path.join(
+            self.spill_dir, f'{safe_name}.{len(self.spilled):06d}.npy')
+        self._pending_spills = [future for future in self._pending_spills
+                                if not future.done()]
+        self._pending_spills.append(
+            _submit_spill(path, self._records.copy(), self.name))
+        self.spilled.append(path)
+
+    def flush(self, timeout=None):
+        """
+        Wait for spill files in progress to be written.
+
+        Returns
+        -------
+        done : bool
+            False if the timeout elapsed first.
+        """
+        with self._lock:
+            pending = list(self._pending_spills)
+        _, not_done = concurrent.futures.wait(pending, timeout=timeout)
+        return not not_done
+
+    def snapshot(self, start=None, stop=None, *, include_spilled=False):
+        """
+        Copy the recorded updates, oldest first.
+
+        Parameters
+        ----------
+        start, stop : float, optional
+            Only include updates with ``start <= timestamp < stop``.
+        include_spilled : bool, optional
+            Also include updates from spill files. False by default.
+
+        Returns
+        -------
+        records : numpy.ndarray
+            A structured array with fields ``timestamp``, ``value`` and
+            ``severity``.
+        """
+        with self._lock:
+            if self._records is None:
+                return np.zeros(0, dtype=[('timestamp', 'f8'),
+                                          ('value', 'f8'),
+                                          ('severity', 'i2')])
+            count = self.count
+            index = count % self.capacity
+            if count <= self.capacity:
+                records = self._records[:count].copy()
+            else:
+                records = np.concatenate((self._records[index:],
+                                          self._records[:index]))
+            spilled = list(self.spilled) if include_spilled else []
+
+        if spilled:
+            self.flush()
+            # The last spill file overlaps with the oldest records still in
+            # memory; keep only those which have since been overwritten.
+            spilled = [np.load(path, mmap_mode='r') for path in spilled]
+            overwritten = count - len(records) - (
+                (len(spilled) - 1) * self.capacity)
+            spilled[-1] = spilled[-1][:overwritten]
+            records = np.concatenate(spilled + [records])
+        if start is not None or stop is not None:
+            timestamps = records['timestamp']
+            mask = np.ones(len(records), dtype=bool)
+            if start is not None:
+                mask &= timestamps >= start
+            if stop is not None:
+                mask &= timestamps < stop
+            records = records[mask]
+        return records
+
+    def export(self, path, start=None, stop=None, *, include_spilled=False):
+        """
+        Save a snapshot to a ``.npy`` file. See :meth:`snapshot`.
+        """
+        np.save(path, self.snapshot(start, stop,
+                                    include_spilled=include_spilled))
+
+
+class MonitorRecorder:
+    """
+    Record updates from many subscriptions into per-PV ring buffers.
+
+    Works with the Subscriptions of both the threading and the asyncio
+    clients. Subscribe with ``data_type='time'`` to record the server's
+    timestamps and alarm severities; otherwise, the time of arrival is
+    recorded and severity is 0.
+
+    Parameters
+    ----------
+    capacity : int, optional
+        Number of updates to keep in memory per PV.
+    spill_dir : str, optional
+        If given, full rings are written to ``.npy`` files in this directory
+        before being overwritten. See :class:`RingBuffer`.
+
+    Examples
+    --------
+
+    >>> recorder = MonitorRecorder(capacity=100000)
+    >>> for pv in pvs:
+    ...     recorder.add(pv.subscribe(data_type='time'))
+    >>> time.sleep(10)
+    >>> records = recorder.snapshot()
+    >>> records[pvs[0].name]['value']
+    """
+    def __init__(self, capacity=10000, *, spill_dir=None):
+        if np is None:
+            raise RuntimeError('MonitorRecorder requires numpy')
+        self.capacity = capacity
+        self.spill_dir = spill_dir
+        self.buffers = {}
+        self._subscriptions = {}
+
+    def __repr__(self):
+        return f"<MonitorRecorder buffers={list(self.buffers)!r}>"
+
+    def add(self, sub):
+        """
+        Start recording updates from a Subscription.
+
+        The subscription is activated if it has no callbacks yet. If the PV
+        was recorded before and then removed, recording resumes into the same
+        buffer.
+
+        Returns
+        -------
+        buffer : RingBuffer
+        """
+        name = sub.pv.name
+        if name in self._subscriptions:
+            raise CaprotoValueError(f'Already recording {name!r}')
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            buffer = RingBuffer(name, self.capacity, spill_dir=self.spill_dir)
+            self.buffers[name] = buffer
+        self._subscriptions[name] = sub
+        sub.add_recorder(buffer)
+        return buffer
+
+    def remove(self, name):
+        """
+        Stop recording updates to a PV, keeping the recorded ones. Recording
+        may be resumed with :meth:`add`.
+
+        Returns the result of ``Subscription.remove_recorder``, which must be
+        awaited for Subscriptions of the asyncio client.
+        """
+        try:
+            sub = self._subscriptions.pop(name)
+        except KeyError:
+            raise CaprotoKeyError(f'Not recording {name!r}') from None
+        return sub.remove_recorder(self.buffers[name])
+
+    def snapshot(self, start=None, stop=None, *, include_spilled=False):
+        """
+        Copy the recorded updates of every PV. See :meth:`RingBuffer.snapshot`.
+
+        Returns
+        -------
+        records : dict
+            Maps PV name to structured array.
+        """
+        return {name: buffer.snapshot(start, stop,
+                                      include_spilled=include_spilled)
+                for name, buffer in self.buffers.items()}
+
+    def export(self, path, start=None, stop=None, *, include_spilled=False):
+        """
+        Save a snapshot of every PV to a ``.npz`` file, keyed by PV name.
+        """
+        np.savez(path, **self.snapshot(start, stop,
+                                       include_spilled=include_spilled))
@@ -1,8 +1,12 @@
 import collections
 import functools
+import json
 import logging
+import math
+import os
 import random
 import sys
+import tempfile
 import threading
 import time
 
@@ -381,3 +385,172 @@ class SearchResults:
         print('\t'.join(('Host', 'Name')), file=file)
         for line in self._debug_channel_information():
             print('\t'.join(str(item) for item in line), file=file)
+
+
+class SearchResultCache:
+    '''
+    Thread-safe, persistent cache of verified search results
+
+    PV name to server mappings rarely change, so a client which persists them
+    between runs may try the cached server directly, skipping the search
+    broadcast. Entries are only added for channels which were successfully
+    created, and are not trusted beyond ``max_age``.
+
+    The cache is stored as JSON, and may be shared by multiple processes:
+    :meth:`save` merges with the current contents of the file, keeping the
+    most recent entry for each name, and dropping those discarded since they
+    were written.
+
+    Parameters
+    ----------
+    path : str
+        The cache file. It need not exist yet.
+    max_age : float, optional
+        Entries older than this, in seconds, are ignored. Defaults to
+        ``CAPROTO_CLIENT_SEARCH_CACHE_MAX_AGE_SEC``.
+
+    Attributes
+    ----------
+    entries : dict
+        Maps name -> (address, protocol_version, timestamp), where timestamp
+        is according to `time.time`.
+    '''
+    file_version = 1
+
+    def __init__(self, path, *, max_age=None):
+        self._lock = threading.RLock()
+        self.path = os.path.expanduser(path)
+        if max_age is None:
+            max_age = common.SEARCH_CACHE_MAX_AGE
+        self.max_age = max_age
+        self.log = logging.getLogger('caproto.bcast.search')
+        self.entries = {}
+        # name -> time discarded, such that merging does not bring back
+        # entries from the file which were found to be wrong.
+        self._discarded = {}
+        self.load()
+
+    def __repr__(self):
+        return f'<SearchResultCache path={self.path!r} entries={len(self)}>'
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        try:
+            self.get(name)
+        except KeyError:
+            return False
+        return True
+
+    def _read(self):
+        'Read entries from the cache file, ignoring invalid ones.'
+        try:
+            with open(self.path, 'r') as f:
+                contents = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as ex:
+            self.log.warning('Unable to read search cache %s: %s', self.path,
+                             ex)
+            return {}
+
+        if (not isinstance(contents, dict) or
+                contents.get('version') != self.file_version):
+            self.log.warning('Ignoring search cache %s with unsupported '
+                             'format', self.path)
+            return {}
+
+        entries = {}
+        for name, entry in contents.get('entries', {}).items():
+            try:
+                host, port, protocol_version, timestamp = entry
+                entries[name] = ((str(host), int(port)), int(protocol_version),
+                                 float(timestamp))
+            except (TypeError, ValueError):
+                continue
+        return entries
+
+    @_locked
+    def load(self):
+        'Load (and merge) entries from the cache file.'
+        self._merge(self._read())
+
+    def _merge(self, entries):
+        for name, entry in entries.items():
+            if entry[2] <= self._discarded.get(name, -math.inf):
+                continue
+            current = self.entries.get(name)
+            if current is None or current[2] < entry[2]:
+                self.entries[name] = entry
+
+    @_locked
+    def save(self):
+        'Merge with the cache file, and write it atomically.'
+        self._merge(self._read())
+        oldest = time.time() - self.max_age
+        contents = {
+            'version': self.file_version,
+            'entries': {
+                name: [host, port, protocol_version, timestamp]
+                for name, ((host, port), protocol_version, timestamp)
+                in self.entries.items()
+                if timestamp >= oldest
+            },
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(contents, f)
+                os.replace(temp_path, self.path)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except OSError as ex:
+            self.log.warning('Unable to write search cache %s: %s', self.path,
+                             ex)
+
+    @_locked
+    def get(self, name):
+        '''
+        Get the cached server for a name.
+
+        Returns
+        -------
+        address : (host, port)
+        protocol_version : int
+
+        Raises
+        ------
+        CaprotoKeyError
+            If missing or older than ``max_age``.
+        '''
+        try:
+            address, protocol_version, timestamp = self.entries[name]
+        except KeyError:
+            raise utils.CaprotoKeyError(f'{name!r}: not in search cache') from None
+
+        if time.time() - timestamp > self.max_age:
+            raise utils.CaprotoKeyError(f'{name!r}: stale search cache entry')
+        return address, protocol_version
+
+    @_locked
+    def update(self, name, address, protocol_version):
+        '{name} was verified to be at {address}; update state'
+        self.entries[name] = (tuple(address), protocol_version, time.time())
+
+    @_locked
+    def discard(self, *names):
+        'Remove entries for names, if present, also from the file on `save`'
+        now = time.time()
+        for name in names:
+            self.entries.pop(name, None)
+            self._discarded[name] = now
+
+    @_locked
+    def clear(self):
+        'Clear all entries (the cache file is untouched until `save`)'
+        self.entries.clear()
@@ -0,0 +1,136 @@
+"""
+This module is installed as an entry-point, available from the shell as:
+
+caproto-bench ...
+
+It can equivalently be invoked as:
+
+python3 -m caproto.commandline.bench ...
+
+For access to the underlying functionality from a Python script or interactive
+Python session, do not import this module; instead import
+caproto.benchmarking.load.
+"""
+import argparse
+
+from .. import __version__, set_handler
+from .._utils import ShowVersionAction
+from ..benchmarking.event_loop import percentile
+from ..benchmarking.load import CLIENT_KINDS, WORKLOADS, run_load, serve
+
+
+def _format_row(report):
+    def latency(latencies):
+        if not latencies:
+            return f"{'-':>8} {'-':>8}"
+        return (f'{percentile(latencies, 50) * 1e3:>8.2f} '
+                f'{percentile(latencies, 99) * 1e3:>8.2f}')
+
+    def memory(rss):
+        return f"{'-':>7}" if rss is None else f'{rss / 2 ** 20:>7.1f}'
+
+    if report.workload == 'rpc':
+        latencies = report.request_latencies
+    elif report.workload == 'connect':
+        latencies = report.connect_latencies
+    else:
+        latencies = report.update_latencies
+    return (f'{report.client_kind:>9} {report.num_clients:>8} '
+            f'{report.connections_per_second:>9.0f} {report.failed:>6} '
+            f'{report.updates_per_second:>10.0f} {report.dropped:>8} '
+            f'{report.requests_per_second:>8.0f} {latency(latencies)} '
+            f'{memory(report.ioc_rss)} {memory(report.client_rss)}')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""
+Start a synthetic IOC and load it with simulated clients, all on this host,
+reporting connections/sec, updates/sec, dropped updates, requests/sec,
+latency and resident memory.
+
+The latency shown is that of connections for the connect workload, of
+requests for rpc, and of monitor updates otherwise. Use -v for all of them.""",
+        epilog=f'caproto version {__version__}')
+    parser.register('action', 'show_version', ShowVersionAction)
+    parser.add_argument('--workload', choices=WORKLOADS, default='monitor',
+                        help="'connect': connect to every PV and nothing "
+                             "more; 'monitor': subscribe to every scalar and "
+                             "waveform; 'rpc': read and write in turn, one "
+                             "request at a time; 'mixed': half the clients "
+                             "monitor, half do 'rpc'. Default is monitor.")
+    parser.add_argument('--clients', nargs='+', choices=CLIENT_KINDS,
+                        default=['raw'],
+                        help="Kinds of client to compare. 'raw' clients are "
+                             "bare TCP connections without a client "
+                             "library. Default is raw.")
+    parser.add_argument('--num-clients', type=int, nargs='+', default=[10],
+                        help="Numbers of clients to compare. Default is 10.")
+    parser.add_argument('--scalars', type=int, default=100,
+                        help="Scalar PVs to serve. Default is 100.")
+    parser.add_argument('--waveforms', type=int, default=0,
+                        help="Waveform PVs to serve. Default is 0.")
+    parser.add_argument('--length', type=int, default=1000,
+                        help="Elements per waveform. Default is 1000.")
+    parser.add_argument('--rate', type=float, default=10.0,
+                        help="Updates per second of each scalar and "
+                             "waveform. Default is 10.")
+    parser.add_argument('--duration', type=float, default=10.0,
+                        help="Seconds to run the workload for, once "
+                             "connected. Default is 10.")
+    parser.add_argument('--timeout', type=float, default=10.0,
+                        help="Seconds to wait for the IOC to start, for the "
+                             "clients to connect, and for each request. "
+                             "Default is 10.")
+    parser.add_argument('--serve', metavar='PREFIX',
+                        help=argparse.SUPPRESS)
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Show DEBUG log messages.")
+    parser.add_argument('--no-color', action='store_true',
+                        help="Suppress ANSI color codes in log messages.")
+    parser.add_argument('--version', '-V', action='show_version',
+                        default=argparse.SUPPRESS,
+                        help="Show caproto version and exit.")
+    args = parser.parse_args()
+    if args.verbose:
+        set_handler(color=not args.no_color, level='DEBUG')
+    elif args.serve:
+        # Warnings of high load are to be expected.
+        set_handler(color=not args.no_color, level='ERROR')
+    if args.serve:
+        # Run the synthetic IOC; this is how run_load starts it.
+        try:
+            serve(args.serve, scalars=args.scalars, waveforms=args.waveforms,
+                  length=args.length, rate=args.rate)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    print(f'{args.workload} workload: {args.scalars} scalars, '
+          f'{args.waveforms} waveforms of {args.length}, '
+          f'{args.rate:g} Hz, {args.duration:g} s')
+    header = (f"{'clients':>9} {'number':>8} {'conn/s':>9} {'failed':>6} "
+              f"{'updates/s':>10} {'dropped':>8} {'req/s':>8} "
+              f"{'p50 ms':>8} {'p99 ms':>8} {'IOC MiB':>7} {'cli MiB':>7}")
+    print(header)
+    print('-' * len(header))
+    for num_clients in args.num_clients:
+        for client_kind in args.clients:
+            try:
+                report = run_load(
+                    args.workload, client_kind, num_clients,
+                    scalars=args.scalars, waveforms=args.waveforms,
+                    length=args.length, rate=args.rate,
+                    duration=args.duration, timeout=args.timeout)
+            except BaseException as exc:
+                if args.verbose or isinstance(exc, KeyboardInterrupt):
+                    raise
+                print(exc)
+                return
+            if args.verbose:
+                print(report.format())
+            print(_format_row(report), flush=True)
+
+
+if __name__ == '__main__':
+    main()
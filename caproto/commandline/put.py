@@ -20,7 +20,7 @@ from .. import __version__, set_handler
 from .._log import _set_handler_with_logger
 from .._utils import ShowVersionAction
 from ..client.common import GLOBAL_DEFAULT_TIMEOUT
-from ..sync.client import read_write_read
+from ..sync.client import read_write_read_many
 
 
 def main():
@@ -32,6 +32,10 @@ def main():
                         help="PV (channel) name")
     parser.add_argument('data', type=str,
                         help="Value or values to write.")
+    parser.add_argument('more_pairs', type=str, nargs='*',
+                        metavar='pv_name data',
+                        help="Additional PV names and values to write, which "
+                             "are all written concurrently.")
     parser.add_argument('--verbose', '-v', action='count',
                         help="Show more log messages. (Use -vvv for even more.)")
     fmt_group.add_argument('--format', type=str,
@@ -84,74 +88,91 @@ def main():
                         default=argparse.SUPPRESS,
                         help="Show caproto version and exit.")
     args = parser.parse_args()
+    if len(args.more_pairs) % 2:
+        parser.error('Additional arguments must be pairs of pv_name and data.')
     if args.verbose:
         if args.verbose <= 2:
             _set_handler_with_logger(color=not args.no_color, level='DEBUG', logger_name='caproto.ch')
             _set_handler_with_logger(color=not args.no_color, level='DEBUG', logger_name='caproto.ctx')
         else:
             set_handler(color=not args.no_color, level='DEBUG')
-    logger = logging.LoggerAdapter(logging.getLogger('caproto.ch'), {'pv': args.pv_name})
+    pv_names = [args.pv_name] + args.more_pairs[::2]
+    raw_args = [args.data] + args.more_pairs[1::2]
+    values = []
+    for pv_name, raw_arg in zip(pv_names, raw_args):
+        logger = logging.LoggerAdapter(logging.getLogger('caproto.ch'), {'pv': pv_name})
 
-    if args.file:
-        with open(str(args.data), mode='r') as file:
-            raw_data = file.read()
-    else:
-        raw_data = args.data
+        if args.file:
+            with open(str(raw_arg), mode='r') as file:
+                raw_data = file.read()
+        else:
+            raw_data = raw_arg
 
-    if args.as_string:
-        # interpret as string
-        data = raw_data
-    elif args.array:
-        data = [ast.literal_eval(val) for val in raw_data.split(' ')]
-        if args.array_pad > 0:
-            if len(data) < args.array:
-                data.extend([0] * (args.array - len(data)))
-            elif len(data) > args.array:
-                logger.error('Pad value smaller than array size')
-                sys.exit(1)
-    else:
-        try:
-            data = ast.literal_eval(raw_data)
-        except ValueError:
+        if args.as_string:
             # interpret as string
             data = raw_data
+        elif args.array:
+            data = [ast.literal_eval(val) for val in raw_data.split(' ')]
+            if args.array_pad > 0:
+                if len(data) < args.array:
+                    data.extend([0] * (args.array - len(data)))
+                elif len(data) > args.array:
+                    logger.error('Pad value smaller than array size')
+                    sys.exit(1)
+        else:
+            try:
+                data = ast.literal_eval(raw_data)
+            except ValueError:
+                # interpret as string
+                data = raw_data
+
+        logger.debug('Data argument %s parsed as %r (Python type %s).',
+                     raw_arg, data, type(data).__name__)
+        values.append(data)
 
     if args.wide:
         read_data_type = 'time'
     else:
         read_data_type = None
-    logger.debug('Data argument %s parsed as %r (Python type %s).',
-                 args.data, data, type(data).__name__)
     try:
-        initial, _, final = read_write_read(pv_name=args.pv_name, data=data,
-                                            read_data_type=read_data_type,
-                                            notify=args.notify,
-                                            timeout=args.timeout,
-                                            priority=args.priority,
-                                            force_int_enums=args.n,
-                                            repeater=not args.no_repeater)
-        if args.format is None:
-            format_str = '{which} : {pv_name: <40}  {response.data}'
-        else:
-            format_str = args.format
-        if args.terse:
-            if len(initial.data) == 1:
-                format_str = '{response.data[0]}'
+        # All PVs are searched for and written concurrently, within a single
+        # timeout per step, and the results are reported in the order given.
+        results = read_write_read_many(pv_names, values,
+                                       read_data_type=read_data_type,
+                                       notify=args.notify,
+                                       timeout=args.timeout,
+                                       priority=args.priority,
+                                       force_int_enums=args.n,
+                                       repeater=not args.no_repeater)
+        for pv_name, result in zip(pv_names, results):
+            if isinstance(result, Exception):
+                if args.verbose:
+                    raise result
+                print(result)
+                continue
+            initial, _, final = result
+            if args.format is None:
+                format_str = '{which} : {pv_name: <40}  {response.data}'
             else:
-                format_str = '{response.data}'
-        elif args.wide:
-            # TODO Make this look more like caput -l
-            format_str = '{pv_name} {timestamp} {response.data} {response.status.name}'
-        tokens = dict(pv_name=args.pv_name, response=initial)
-        if hasattr(initial.metadata, 'timestamp'):
-            dt = datetime.fromtimestamp(initial.metadata.timestamp)
-            tokens['timestamp'] = dt
-        print(format_str.format(which='Old', **tokens))
-        tokens = dict(pv_name=args.pv_name, response=final)
-        if hasattr(final.metadata, 'timestamp'):
-            dt = datetime.fromtimestamp(final.metadata.timestamp)
-            tokens['timestamp'] = dt
-        print(format_str.format(which='New', **tokens))
+                format_str = args.format
+            if args.terse:
+                if len(initial.data) == 1:
+                    format_str = '{response.data[0]}'
+                else:
+                    format_str = '{response.data}'
+            elif args.wide:
+                # TODO Make this look more like caput -l
+                format_str = '{pv_name} {timestamp} {response.data} {response.status.name}'
+            tokens = dict(pv_name=pv_name, response=initial)
+            if hasattr(initial.metadata, 'timestamp'):
+                dt = datetime.fromtimestamp(initial.metadata.timestamp)
+                tokens['timestamp'] = dt
+            print(format_str.format(which='Old', **tokens))
+            tokens = dict(pv_name=pv_name, response=final)
+            if hasattr(final.metadata, 'timestamp'):
+                dt = datetime.fromtimestamp(final.metadata.timestamp)
+                tokens['timestamp'] = dt
+            print(format_str.format(which='New', **tokens))
     except BaseException as exc:
         if args.verbose:
             # Show the full traceback.
@@ -14,6 +14,7 @@ caproto.sync.repeater.
 import argparse
 import os
 from ..sync.repeater import run
+from ..asyncio.repeater import run as run_asyncio
 from .. import set_handler, __version__
 from .._log import _set_handler_with_logger
 from .._utils import ShowVersionAction
@@ -38,6 +39,10 @@ EPICS_CA_REPEATER_PORT. It defaults to the standard 5065. The current value is
                        help="Verbose mode. (Use -vvv for more.)")
     parser.add_argument('--no-color', action='store_true',
                         help="Suppress ANSI color codes in log messages.")
+    parser.add_argument('--asyncio', action='store_true',
+                        help=("Run the asyncio repeater, which forwards "
+                              "bursts of beacons to many clients faster. "
+                              "(Not on Windows.)"))
     parser.add_argument('--version', '-V', action='show_version',
                         default=argparse.SUPPRESS,
                         help="Show caproto version and exit.")
@@ -53,7 +58,10 @@ EPICS_CA_REPEATER_PORT. It defaults to the standard 5065. The current value is
             level = 'INFO'
         _set_handler_with_logger(logger_name='caproto.repeater', color=not args.no_color, level=level)
     try:
-        run()
+        if args.asyncio:
+            run_asyncio()
+        else:
+            run()
     except BaseException as exc:
         if args.verbose:
             # Show the full traceback.
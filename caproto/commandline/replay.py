@@ -0,0 +1,85 @@
+"""
+This module is installed as an entry-point, available from the shell as:
+
+caproto-replay ...
+
+It can equivalently be invoked as:
+
+python3 -m caproto.commandline.replay ...
+
+For access to the underlying functionality from a Python script or interactive
+Python session, do not import this module; instead import
+caproto.sync.replay.
+"""
+import argparse
+
+from .. import __version__, set_handler
+from .._utils import ShowVersionAction
+from ..sync.replay import replay_to_client, replay_to_server
+
+
+def _speed(value):
+    if value == 'max':
+        return None
+    speed = float(value)
+    if speed <= 0:
+        raise argparse.ArgumentTypeError('speed must be positive')
+    return speed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="""
+Replay Channel Access traffic captured with caproto.start_traffic_capture()
+and report throughput and latency.
+
+By default, the requests of the captured clients are sent to a server. With
+--client, the captured traffic of the clients is instead fed back through
+caproto's client protocol layer, without any network I/O.""",
+        epilog=f'caproto version {__version__}')
+    parser.register('action', 'show_version', ShowVersionAction)
+    parser.add_argument('capture', type=str, help='Path to a capture file.')
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help="Address of the server. Default is 127.0.0.1.")
+    parser.add_argument('--port', type=int, default=None,
+                        help="Port of the server. Default is "
+                             "EPICS_CA_SERVER_PORT.")
+    parser.add_argument('--speed', type=_speed, default=1.0,
+                        help="Multiple of the captured pace, such as 10, or "
+                             "'max' to replay as fast as possible. Default "
+                             "is 1.")
+    parser.add_argument('--client', action='store_true',
+                        help="Replay through the client protocol layer "
+                             "instead of to a server.")
+    parser.add_argument('--timeout', type=float, default=2.0,
+                        help="Seconds to wait for outstanding responses at "
+                             "the end. Default is 2.")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="Show DEBUG log messages.")
+    parser.add_argument('--no-color', action='store_true',
+                        help="Suppress ANSI color codes in log messages.")
+    parser.add_argument('--version', '-V', action='show_version',
+                        default=argparse.SUPPRESS,
+                        help="Show caproto version and exit.")
+    args = parser.parse_args()
+    if args.verbose:
+        set_handler(color=not args.no_color, level='DEBUG')
+    try:
+        if args.client:
+            report = replay_to_client(args.capture, speed=args.speed)
+        else:
+            report = replay_to_server(args.capture, args.host, args.port,
+                                      speed=args.speed, timeout=args.timeout)
+    except BaseException as exc:
+        if args.verbose:
+            # Show the full traceback.
+            raise
+        else:
+            # Print a one-line error message.
+            print(exc)
+    else:
+        print(report.format())
+
+
+if __name__ == '__main__':
+    main()
@@ -11,8 +11,9 @@ For access to the underlying functionality from a Python script or interactive
 Python session, do not import this module; instead import caproto.sync.shark.
 """
 import argparse
+import os
 import sys
-from ..sync.shark import shark
+from ..sync.shark import INDEX_SUFFIX, build_index, shark, summarize
 from .. import __version__
 from .._utils import ShowVersionAction
 
@@ -31,19 +32,66 @@ def main():
                         default=('{timestamp} '
                                  '{src}:{transport.sport}->{dst}:{transport.dport} '
                                  '{command}'))
+    parser.add_argument('file', nargs='?', default=None,
+                        help=("A pcap file. If omitted, read from the "
+                              "standard input."))
+    parser.add_argument('--summary', action='store_true',
+                        help=("Instead of each command, print counts, bytes, "
+                              "search rates and top PVs per host."))
+    parser.add_argument('--top', type=int, default=10,
+                        help="Number of top PVs to list in the summary.")
+    parser.add_argument('--pv', action='append', default=None,
+                        help=("Only show commands concerning this PV. May "
+                              "be given more than once."))
+    parser.add_argument('--start', type=float, default=None,
+                        help="Skip commands before this UNIX timestamp.")
+    parser.add_argument('--stop', type=float, default=None,
+                        help="Stop at commands after this UNIX timestamp.")
+    parser.add_argument('--index', type=str, default=None,
+                        help=(f"An index of the file, as written by "
+                              f"--build-index. By default, the file path "
+                              f"with {INDEX_SUFFIX} appended is used if it "
+                              f"exists."))
+    parser.add_argument('--build-index', action='store_true',
+                        help=("Index the file by PV name and time, to speed "
+                              "up later queries with --pv, --start and "
+                              "--stop, and exit."))
     parser.add_argument('--version', '-V', action='show_version',
                         default=argparse.SUPPRESS,
                         help="Show caproto version and exit.")
     args = parser.parse_args()
+    if args.file is None:
+        if args.build_index:
+            parser.error("--build-index requires a file")
+        if args.index is not None:
+            parser.error("--index requires a file")
+        file = sys.stdin.buffer
+    else:
+        file = open(args.file, 'rb')
+    index = args.index
+    if args.build_index:
+        with file:
+            build_index(file, index)
+        return
+    if (index is None and args.file is not None and
+            os.path.exists(args.file + INDEX_SUFFIX)):
+        index = args.file + INDEX_SUFFIX
     try:
-        for namespace in shark(sys.stdin.buffer):
-            print(args.format.format(timestamp=namespace.timestamp,
-                                     ethernet=namespace.ethernet,
-                                     ip=namespace.ip,
-                                     transport=namespace.transport,
-                                     src=namespace.src,
-                                     dst=namespace.dst,
-                                     command=namespace.command))
+        with file:
+            if args.summary:
+                summary = summarize(file, start=args.start, stop=args.stop,
+                                    index=index)
+                print(summary.format(top=args.top))
+                return
+            for namespace in shark(file, pv=args.pv, start=args.start,
+                                   stop=args.stop, index=index):
+                print(args.format.format(timestamp=namespace.timestamp,
+                                         ethernet=namespace.ethernet,
+                                         ip=namespace.ip,
+                                         transport=namespace.transport,
+                                         src=namespace.src,
+                                         dst=namespace.dst,
+                                         command=namespace.command))
 
     except KeyboardInterrupt:
         return
@@ -8,6 +8,7 @@ import caproto as ca
 
 from .._utils import safe_getsockname
 from ..server import AsyncLibraryLayer
+from ..server.access_security import load_access_security
 from ..server.common import Context as _Context
 from ..server.common import VirtualCircuit as _VirtualCircuit
 from .utils import curio_run
@@ -236,9 +237,10 @@ class Context(_Context):
 
 
 async def start_server(pvdb, *, interfaces=None, log_pv_names=False,
-                       startup_hook=None):
+                       startup_hook=None, access_security=None):
     '''Start a curio server with a given PV database'''
     ctx = Context(pvdb, interfaces)
+    ctx.access_security = load_access_security(access_security)
     try:
         return await ctx.run(log_pv_names=log_pv_names,
                              startup_hook=startup_hook)
@@ -246,7 +248,8 @@ async def start_server(pvdb, *, interfaces=None, log_pv_names=False,
         pass
 
 
-def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None):
+def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None,
+        access_security=None):
     """
     Run an IOC, given its PV database dictionary.
 
@@ -265,6 +268,9 @@ def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None):
 
     startup_hook : coroutine, optional
         Hook to call at startup with the ``async_lib`` shim.
+
+    access_security : str, pathlib.Path, or AccessSecurityConfig, optional
+        Access security configuration (or ACF filename) to apply to all PVs.
     """
     try:
         return curio_run(
@@ -274,6 +280,7 @@ def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None):
                 interfaces=interfaces,
                 log_pv_names=log_pv_names,
                 startup_hook=startup_hook,
+                access_security=access_security,
             )
         )
     except KeyboardInterrupt:
@@ -0,0 +1,395 @@
+"""
+EPICS-style access security (ACF) rules for caproto servers.
+
+Access security configuration files use the syntax of EPICS base access
+security files.  For example::
+
+    UAG(operators) {alice, bob}
+    HAG(control_room) {opi1, opi2}
+
+    ASG(DEFAULT) {
+        RULE(1, READ)
+        RULE(1, WRITE) {
+            UAG(operators)
+            HAG(control_room)
+        }
+    }
+
+    ASG(READONLY) {
+        RULE(1, READ)
+    }
+
+Each channel belongs to an access security group (ASG), by way of
+:attr:`caproto.ChannelData.access_security_group`, which defaults to
+``DEFAULT``.  Channels referencing a group that is not defined use the
+``DEFAULT`` group.  If ``DEFAULT`` is not defined, such channels are not
+accessible at all.
+
+Rules are compiled once into lookup tables, and the result for each
+(group, hostname, username) combination is cached.  The server additionally
+caches the result per circuit, so that checking access on the read and write
+paths is a single dictionary lookup.
+
+The following are not supported, and rules using them never grant access:
+``INP`` links and ``CALC`` expressions.  ``METHOD`` and ``AUTHORITY`` (EPICS 7
+authentication extensions) are similarly unsupported.  Rule access security
+levels and ``TRAPWRITE`` options are parsed but otherwise ignored.
+"""
+import logging
+import os
+import pathlib
+import re
+from collections import namedtuple
+from typing import Dict, FrozenSet, Optional, Tuple, Union
+
+from .. import AccessRights
+from .._utils import CaprotoValueError
+
+logger = logging.getLogger(__name__)
+
+#: The default access security group name.
+DEFAULT_GROUP = 'DEFAULT'
+
+_ACCESS_LEVELS = {
+    'NONE': AccessRights.NO_ACCESS,
+    'READ': AccessRights.READ,
+    'WRITE': AccessRights.READ | AccessRights.WRITE,
+    # EPICS 7 "read/write/execute": execute is not applicable to caproto
+    'RWX': AccessRights.READ | AccessRights.WRITE,
+}
+
+_TOKEN_RE = re.compile(r'''
+    (?P<comment>\#[^\n]*)
+    | (?P<string>"(?:[^"\\]|\\.)*")
+    | (?P<punct>[(){},])
+    | (?P<word>[^\s(){},"\#]+)
+    | (?P<space>\s+)
+''', re.VERBOSE)
+
+
+class AccessSecurityRule(namedtuple('AccessSecurityRule',
+                                    'level access trap_write uags hags '
+                                    'unsupported')):
+    """
+    A single rule of an access security group.
+
+    Parameters
+    ----------
+    level : int
+        The access security level of the rule.
+    access : AccessRights
+        Access granted if the rule applies.
+    trap_write : bool
+        TRAPWRITE setting, for informational purposes only.
+    uags : frozenset or None
+        User access groups.  ``None`` indicates any user.
+    hags : frozenset or None
+        Host access groups.  ``None`` indicates any host.
+    unsupported : tuple
+        Unsupported clauses (e.g., ``CALC``).  If present, the rule never
+        applies.
+    """
+
+
+class _Parser:
+    """Recursive descent parser for access security configuration files."""
+
+    def __init__(self, text, filename=None):
+        self.filename = filename or '<string>'
+        self.tokens = list(self._tokenize(text))
+        self.pos = 0
+
+    def _tokenize(self, text):
+        line = 1
+        for match in _TOKEN_RE.finditer(text):
+            kind = match.lastgroup
+            value = match.group()
+            if kind == 'string':
+                yield ('word', value[1:-1].replace('\\"', '"'), line)
+            elif kind in ('punct', 'word'):
+                yield (kind, value, line)
+            line += value.count('\n')
+
+    def error(self, message, token=None):
+        if token is None and self.pos < len(self.tokens):
+            token = self.tokens[self.pos]
+        line = token[2] if token is not None else 'EOF'
+        return CaprotoValueError(
+            f'{self.filename} line {line}: {message}'
+        )
+
+    def peek(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][1]
+        return None
+
+    def next_token(self):
+        if self.pos >= len(self.tokens):
+            raise self.error('Unexpected end of file')
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, value):
+        token = self.next_token()
+        if token[1] != value:
+            raise self.error(f'Expected {value!r}, got {token[1]!r}', token)
+        return token
+
+    def word(self):
+        token = self.next_token()
+        if token[0] != 'word':
+            raise self.error(f'Expected a name, got {token[1]!r}', token)
+        return token[1]
+
+    def word_list(self, close):
+        """Comma-separated words, up to and including ``close``."""
+        words = []
+        while self.peek() != close:
+            words.append(self.word())
+            if self.peek() == ',':
+                self.next_token()
+        self.expect(close)
+        return words
+
+    def parse(self):
+        uags = {}
+        hags = {}
+        asgs = {}
+        while self.peek() is not None:
+            keyword = self.word()
+            self.expect('(')
+            name = self.word()
+            self.expect(')')
+            if keyword in ('UAG', 'HAG'):
+                self.expect('{')
+                members = self.word_list('}')
+                target = uags if keyword == 'UAG' else hags
+                target.setdefault(name, set()).update(members)
+            elif keyword == 'ASG':
+                asgs[name] = self.parse_asg()
+            else:
+                raise self.error(f'Unexpected keyword {keyword!r}')
+        return uags, hags, asgs
+
+    def parse_asg(self):
+        rules = []
+        if self.peek() != '{':
+            return rules
+
+        self.expect('{')
+        while self.peek() != '}':
+            keyword = self.word()
+            self.expect('(')
+            if keyword == 'RULE':
+                rules.append(self.parse_rule())
+            elif re.match(r'^INP[A-U]$', keyword):
+                pvname = self.word()
+                self.expect(')')
+                logger.warning('%s: INP links are not supported (%s = %s)',
+                               self.filename, keyword, pvname)
+            else:
+                raise self.error(f'Unexpected keyword {keyword!r} in ASG')
+        self.expect('}')
+        return rules
+
+    def parse_rule(self):
+        args = self.word_list(')')
+        if len(args) not in (2, 3):
+            raise self.error(f'Invalid RULE arguments: {args}')
+
+        try:
+            level = int(args[0])
+        except ValueError:
+            raise self.error(f'Invalid RULE level: {args[0]!r}') from None
+
+        try:
+            access = _ACCESS_LEVELS[args[1]]
+        except KeyError:
+            raise self.error(f'Invalid RULE access: {args[1]!r}') from None
+
+        trap_write = False
+        if len(args) == 3:
+            if args[2] not in ('TRAPWRITE', 'NOTRAPWRITE'):
+                raise self.error(f'Invalid RULE option: {args[2]!r}')
+            trap_write = (args[2] == 'TRAPWRITE')
+
+        uags = hags = None
+        unsupported = []
+        if self.peek() == '{':
+            self.expect('{')
+            while self.peek() != '}':
+                keyword = self.word()
+                self.expect('(')
+                items = self.word_list(')')
+                if keyword == 'UAG':
+                    uags = (uags or frozenset()) | frozenset(items)
+                elif keyword == 'HAG':
+                    hags = (hags or frozenset()) | frozenset(items)
+                elif keyword in ('CALC', 'METHOD', 'AUTHORITY'):
+                    logger.warning(
+                        '%s: RULE %s clauses are not supported; the rule '
+                        'will never apply', self.filename, keyword
+                    )
+                    unsupported.append((keyword, tuple(items)))
+                else:
+                    raise self.error(
+                        f'Unexpected keyword {keyword!r} in RULE'
+                    )
+            self.expect('}')
+
+        return AccessSecurityRule(
+            level=level, access=access, trap_write=trap_write, uags=uags,
+            hags=hags, unsupported=tuple(unsupported),
+        )
+
+
+class AccessSecurityConfig:
+    """
+    Compiled access security configuration.
+
+    Parameters
+    ----------
+    uags : dict
+        User access groups: {group_name: [username, ...]}
+    hags : dict
+        Host access groups: {group_name: [hostname, ...]}
+    asgs : dict
+        Access security groups: {group_name: [AccessSecurityRule, ...]}
+    filename : str or pathlib.Path, optional
+        The source filename, if available.  Used by :meth:`reload`.
+    """
+
+    filename: Optional[pathlib.Path]
+    _cache: Dict[Tuple[str, Optional[str], Optional[str]], AccessRights]
+
+    def __init__(self, uags=None, hags=None, asgs=None, *, filename=None):
+        self.uags = {name: frozenset(users)
+                     for name, users in (uags or {}).items()}
+        # EPICS compares host names case-insensitively
+        self.hags = {name: frozenset(host.lower() for host in hosts)
+                     for name, hosts in (hags or {}).items()}
+        self.asgs = {name: tuple(rules)
+                     for name, rules in (asgs or {}).items()}
+        self.filename = pathlib.Path(filename) if filename else None
+
+        for asg, rules in self.asgs.items():
+            for rule in rules:
+                for uag in rule.uags or ():
+                    if uag not in self.uags:
+                        raise CaprotoValueError(
+                            f'ASG {asg} references undefined UAG {uag!r}'
+                        )
+                for hag in rule.hags or ():
+                    if hag not in self.hags:
+                        raise CaprotoValueError(
+                            f'ASG {asg} references undefined HAG {hag!r}'
+                        )
+
+        # Compile the membership lookup tables
+        self._user_to_uags = {}
+        for name, users in self.uags.items():
+            for user in users:
+                self._user_to_uags.setdefault(user, set()).add(name)
+
+        self._host_to_hags = {}
+        for name, hosts in self.hags.items():
+            for host in hosts:
+                self._host_to_hags.setdefault(host, set()).add(name)
+
+        self._cache = {}
+
+    @classmethod
+    def from_string(cls, text: str, *, filename=None) -> 'AccessSecurityConfig':
+        """Parse an access security configuration from a string."""
+        uags, hags, asgs = _Parser(text, filename=filename).parse()
+        return cls(uags, hags, asgs, filename=filename)
+
+    @classmethod
+    def from_file(cls, filename) -> 'AccessSecurityConfig':
+        """Load an access security configuration file."""
+        with open(filename, 'rt') as f:
+            return cls.from_string(f.read(), filename=filename)
+
+    def reload(self) -> 'AccessSecurityConfig':
+        """Return a new configuration, re-reading the source file."""
+        if self.filename is None:
+            raise CaprotoValueError('Configuration was not loaded from a file')
+        return type(self).from_file(self.filename)
+
+    def _get_uags(self, username) -> FrozenSet[str]:
+        return frozenset(self._user_to_uags.get(username, ()))
+
+    def _get_hags(self, hostname) -> FrozenSet[str]:
+        if hostname is None:
+            return frozenset()
+        return frozenset(self._host_to_hags.get(hostname.lower(), ()))
+
+    def _evaluate(self, group, hostname, username) -> AccessRights:
+        rules = self.asgs.get(group)
+        if rules is None:
+            rules = self.asgs.get(DEFAULT_GROUP, ())
+
+        user_groups = self._get_uags(username)
+        host_groups = self._get_hags(hostname)
+        access = AccessRights.NO_ACCESS
+        for rule in rules:
+            if rule.unsupported:
+                continue
+            if rule.uags is not None and not (rule.uags & user_groups):
+                continue
+            if rule.hags is not None and not (rule.hags & host_groups):
+                continue
+            access |= rule.access
+        return access
+
+    def get_access(self, group, hostname, username) -> AccessRights:
+        """
+        Get the access rights for a client.
+
+        Parameters
+        ----------
+        group : str
+            The access security group name.
+        hostname : str or None
+            The client host name.
+        username : str or None
+            The client user name.
+
+        Returns
+        -------
+        access : AccessRights
+        """
+        key = (group, hostname, username)
+        try:
+            return self._cache[key]
+        except KeyError:
+            access = self._cache[key] = self._evaluate(group, hostname,
+                                                       username)
+            return access
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} filename={self.filename} '
+                f'groups={list(self.asgs)}>')
+
+
+def parse_acf(text: str) -> AccessSecurityConfig:
+    """Parse an access security configuration from a string."""
+    return AccessSecurityConfig.from_string(text)
+
+
+def load_access_security(
+    config: Union[None, str, os.PathLike, AccessSecurityConfig]
+) -> Optional[AccessSecurityConfig]:
+    """
+    Get an access security configuration from a filename or configuration.
+
+    Parameters
+    ----------
+    config : str, pathlib.Path, AccessSecurityConfig, or None
+        The configuration or configuration filename.  ``None`` disables
+        access security.
+    """
+    if config is None or isinstance(config, AccessSecurityConfig):
+        return config
+    return AccessSecurityConfig.from_file(config)
@@ -1,7 +1,10 @@
+import concurrent.futures
 import datetime
+import functools
 import json
 import logging
 import operator
+import os
 import pathlib
 import tempfile
 import typing
@@ -190,17 +193,51 @@ def _to_json_data(value):
     return value
 
 
-def get_autosave_fields(pvprop, channeldata):
-    """Get all autosaved fields from a pvproperty."""
+def get_autosave_field_instances(pvprop, channeldata):
+    """Get all autosaved field ChannelData instances from a pvproperty."""
     for name in (pvprop.autosave.get('fields', None) or []):
         field = getattr(channeldata.field_inst, name, None)
         if field is not None:
-            yield name, _to_json_data(field.value)
+            yield name, field
+
+
+def get_autosave_fields(pvprop, channeldata):
+    """Get all autosaved fields from a pvproperty."""
+    for name, field in get_autosave_field_instances(pvprop, channeldata):
+        yield name, _to_json_data(field.value)
+
+
+def get_journal_filename(filename) -> pathlib.Path:
+    """Get the change journal filename associated with an autosave file."""
+    filename = pathlib.Path(filename)
+    return filename.with_name(filename.name + '.journal')
+
+
+def _fsync_and_close(stream):
+    """Flush ``stream`` to disk and close it."""
+    stream.flush()
+    os.fsync(stream.fileno())
+    stream.close()
 
 
 class AutosaveHelper(PVGroup):
+    """
+    Periodically save and restore values of ``autosaved`` pvproperties.
+
+    Writes to autosaved properties and their fields are tracked, and a period
+    without any changes does not touch the disk.  Files are written from a
+    worker thread so as to not block the event loop: full snapshots are
+    written to a temporary file and atomically renamed into place.
+
+    If ``journal_compact_count`` is non-zero, only the changed properties are
+    appended to a change journal (``{filename}.journal``) each period, and a
+    full snapshot is written - compacting the journal - after that many
+    journal entries.  The journal is replayed on top of the snapshot at
+    restore time.
+    """
     filename = 'autosave.json'
     period = 30
+    journal_compact_count = 0
 
     autosave_hook = pvproperty(
         read_only=True,
@@ -215,6 +252,17 @@ class AutosaveHelper(PVGroup):
             file_manager = RotatingFileManager(self.filename)
         self.file_manager = file_manager
         self.filename = self.file_manager.filename
+        self.journal_filename = get_journal_filename(self.filename)
+
+        # pvname -> (pvprop, channeldata) for tracked properties
+        self._tracked = {}
+        # pvname -> last saved autosave entry
+        self._cache = {}
+        # pvnames with changes that have yet to be saved
+        self._dirty = set()
+        self._journal_entries = 0
+        self._executor = None
+        self._pending_write = None
 
     @autosave_hook.startup
     async def autosave_hook(self, instance, async_lib):
@@ -223,12 +271,23 @@ class AutosaveHelper(PVGroup):
 
         Initially restores values from the autosave file `self.filename`, then
         periodically - at `self.period` seconds - saves autosave data to
-        `self.filename`.
+        `self.filename`.  Once cancelled, pending writes are finished and the
+        writer thread is shut down.
         """
-        await self.restore_from_file(self.filename)
-        while True:
-            await async_lib.library.sleep(self.period)
-            await self.save()
+        try:
+            await self.restore_from_file(self.filename)
+            self.track_changes()
+            while True:
+                await async_lib.library.sleep(self.period)
+                await self.save()
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        """Wait for pending writes, then stop the writer thread."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
 
     def find_autosave_properties(self):
         """Yield (pvprop, channeldata) for all tagged with `autosaved`."""
@@ -238,16 +297,72 @@ class AutosaveHelper(PVGroup):
                 channeldata = operator.attrgetter(dotted_attr)(ioc)
                 yield pvprop, channeldata
 
+    def track_changes(self):
+        """
+        Mark autosaved properties as dirty when they, or their autosaved
+        fields, are written to.
+
+        All properties start out as dirty, such that the first save is a full
+        snapshot.
+        """
+        for pvprop, channeldata in self.find_autosave_properties():
+            pvname = channeldata.pvname
+            if pvname in self._tracked:
+                continue
+
+            self._tracked[pvname] = (pvprop, channeldata)
+
+            def mark_dirty(_, pvname=pvname):
+                self._dirty.add(pvname)
+
+            channeldata.add_write_observer(mark_dirty)
+            for _, field in get_autosave_field_instances(pvprop, channeldata):
+                field.add_write_observer(mark_dirty)
+
+        self._dirty.update(self._tracked)
+        # Ensure the next save is a full snapshot:
+        self._journal_entries = self.journal_compact_count
+
+    @staticmethod
+    def _prepare_entry(pvprop, channeldata):
+        """Generate the autosave entry for a single property."""
+        return {
+            'value': _to_json_data(channeldata.value),
+            'fields': dict(get_autosave_fields(pvprop, channeldata))
+        }
+
     def prepare_data(self):
         """Generate the autosave dictionary."""
         return {
-            channeldata.pvname: {
-                'value': _to_json_data(channeldata.value),
-                'fields': dict(get_autosave_fields(pvprop, channeldata))
-            }
+            channeldata.pvname: self._prepare_entry(pvprop, channeldata)
             for pvprop, channeldata in self.find_autosave_properties()
         }
 
+    def _load_journal(self, filename):
+        """Load the journal for ``filename``, if it is newer than it."""
+        journal_filename = get_journal_filename(filename)
+        try:
+            if journal_filename.stat().st_mtime < filename.stat().st_mtime:
+                # Left over from a compaction that was interrupted after the
+                # snapshot was written; the snapshot supersedes it.
+                self.log.warning('Ignoring stale autosave journal: %s',
+                                 journal_filename)
+                return {}
+        except FileNotFoundError:
+            return {}
+
+        changes = {}
+        with open(journal_filename, 'rt') as f:
+            for line in f:
+                try:
+                    changes.update(json.loads(line))
+                except ValueError:
+                    # A partially-written final entry is to be expected if the
+                    # IOC exited during a write.
+                    self.log.warning('Skipping corrupt autosave journal '
+                                     'entry in %s', journal_filename)
+        return changes
+
     async def restore_from_file(self, filename):
         """Restore from the autosave file."""
         filename = pathlib.Path(filename)
@@ -262,6 +377,11 @@ class AutosaveHelper(PVGroup):
             self.log.exception('Failed to load JSON from %s', filename)
             return
 
+        try:
+            data.update(self._load_journal(filename))
+        except Exception:
+            self.log.exception('Failed to load the journal for %s', filename)
+
         try:
             await self.restore_values(data)
         except Exception:
@@ -298,25 +418,124 @@ class AutosaveHelper(PVGroup):
                     self.log.info('Restored %s field %s => %s', pvname,
                                   field_name, field.value)
 
-    async def save(self, data=None):
-        """Save autosave ``data`` dictionary with the file manager."""
+    def _write_snapshot(self, data):
+        """[worker thread] Atomically write a full snapshot and rotate it in."""
+        stream = tempfile.NamedTemporaryFile(
+            mode='wt', delete=False, dir=self.file_manager.directory,
+        )
+        path = pathlib.Path(stream.name)
         try:
-            if data is None:
-                data = self.prepare_data()
-
-            with tempfile.NamedTemporaryFile(mode='wt', delete=False,
-                                             dir=self.file_manager.directory,
-                                             ) as stream:
+            try:
                 json.dump(data, stream)
-                filename = stream.name
+            finally:
+                _fsync_and_close(stream)
+            self.file_manager.rotate_in_file(path)
+        except BaseException:
+            # Do not leave a partial snapshot behind.
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                ...
+            raise
+
+        # The snapshot supersedes the journal:
+        try:
+            self.journal_filename.unlink()
+        except FileNotFoundError:
+            ...
+
+    def _append_journal(self, changes):
+        """[worker thread] Append ``changes`` to the journal."""
+        with open(self.journal_filename, 'at') as stream:
+            stream.write(json.dumps(changes) + '\n')
+            stream.flush()
+            os.fsync(stream.fileno())
+
+    def _run_write(self, func, *args, on_failure=None):
+        """[worker thread] Run ``func``, logging any failures."""
+        try:
+            func(*args)
         except Exception:
             self.log.exception('Failed to save the current state')
+            if on_failure is not None:
+                # This runs before the future is done, and so before the next
+                # save can look at the bookkeeping it restores.
+                on_failure()
+
+    def _submit_write(self, func, *args, on_failure=None):
+        """Schedule ``func(*args)`` on the autosave writer thread."""
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix='autosave',
+            )
+        self._pending_write = self._executor.submit(
+            self._run_write, func, *args, on_failure=on_failure
+        )
+        return self._pending_write
+
+    def _journal_failed(self, changes):
+        """[worker thread] Mark changes as unsaved after a failed append."""
+        self._dirty.update(changes)
+        self._journal_entries -= 1
+
+    def _snapshot_failed(self, changes):
+        """[worker thread] Mark changes as unsaved after a failed snapshot."""
+        self._dirty.update(changes)
+        # Retry the full snapshot, as the journal was not compacted.
+        self._journal_entries = self.journal_compact_count
+
+    async def save(self, data=None):
+        """
+        Save autosave ``data`` dictionary with the file manager.
+
+        If ``data`` is not specified, save the current state of all
+        autosaved properties that have changed since the last save.  The
+        write happens in a background thread; if the previous write has not
+        yet finished, this save is skipped and the changes are saved in the
+        next period.  Should a write fail, its changes are saved in the next
+        period.  An explicit ``data`` dictionary is always written, after any
+        write in progress.
+        """
+        if data is not None:
+            self._submit_write(self._write_snapshot, data)
+            return
+
+        if self._pending_write is not None and not self._pending_write.done():
+            self.log.debug('Previous autosave still in progress; skipping')
             return
 
         try:
-            self.file_manager.rotate_in_file(pathlib.Path(filename))
+            if not self._tracked:
+                self._submit_write(self._write_snapshot, self.prepare_data())
+                return
+
+            if not self._dirty:
+                return
+
+            changes = {
+                pvname: self._prepare_entry(*self._tracked[pvname])
+                for pvname in self._dirty
+            }
+            self._dirty.clear()
+            self._cache.update(changes)
         except Exception:
-            self.log.exception('Rotating in save file failed')
+            self.log.exception('Failed to save the current state')
+            return
+
+        if self._journal_entries >= self.journal_compact_count:
+            self._journal_entries = 0
+            # Entries in the cache are replaced rather than modified, so a
+            # shallow copy is safe to serialize from the writer thread.
+            self._submit_write(
+                self._write_snapshot, dict(self._cache),
+                on_failure=functools.partial(self._snapshot_failed, changes),
+            )
+        else:
+            self._journal_entries += 1
+            self._submit_write(
+                self._append_journal, changes,
+                on_failure=functools.partial(self._journal_failed, changes),
+            )
 
 
 def autosaved(pvprop, fields=None):
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import array
 import logging
 import os
 import sys
@@ -10,13 +11,15 @@ from collections import ChainMap, defaultdict, deque, namedtuple
 from typing import DefaultDict, Deque, Tuple
 
 import caproto as ca
-from caproto import (CaprotoKeyError, CaprotoNetworkError, CaprotoRuntimeError,
-                     ChannelType, RemoteProtocolError, apply_arr_filter,
-                     get_environment_variables)
+from caproto import (AccessRights, CaprotoKeyError, CaprotoNetworkError,
+                     CaprotoRuntimeError, ChannelType, RemoteProtocolError,
+                     apply_arr_filter, get_environment_variables)
 
 from .._constants import MAX_UDP_RECV
 from .._dbr import DbrTypeBase, _LongStringChannelType
-from .._utils import apply_deadband_filter
+from .._utils import apply_deadband_filter, socket_bytes_available
+from . import instrumentation
+from .access_security import AccessSecurityConfig, load_access_security
 
 if typing.TYPE_CHECKING:
     from .._circuit import ServerChannel, SubscriptionType
@@ -42,6 +45,14 @@ HIGH_LOAD_WARN_LATENCY_SEC = float(
 )
 # When a batch of subscription updates has this many bytes or more, send it.
 SUB_BATCH_THRESH = int(os.environ.get("CAPROTO_SERVER_SUB_BATCH_THRESH", 2 ** 16))
+# Responses to requests received together are sent together, in writes of up
+# to about this many bytes.
+RESPONSE_BATCH_THRESH = int(
+    os.environ.get("CAPROTO_SERVER_RESPONSE_BATCH_THRESH", 2 ** 16)
+)
+# Receive at most this many bytes at once, even if more are waiting or needed
+# to complete a large request.
+MAX_RECV_BYTES = int(os.environ.get("CAPROTO_SERVER_MAX_RECV_BYTES", 2 ** 20))
 # Tune this to change the max time between packets. If it's too high, the
 # client will experience long gaps when the server is under load. If it's too
 # low, the *overall* latency will be higher because the server will have to
@@ -143,12 +154,19 @@ class VirtualCircuit:
         self.context = context
         self.client_hostname = None
         self.client_username = None
+        # Access rights from the access security configuration, keyed on
+        # access security group.  Cleared when the configuration or client
+        # host/user name changes.
+        self._access_rights = {}
         # The structure of self.subscriptions is:
         # {SubscriptionSpec: deque([Subscription, Subscription, ...]), ...}
         self.subscriptions = defaultdict(deque)
         self.unexpired_updates = {}
         self.subscriptions_to_resend = {}
         self.time_events_toggled = time.monotonic()
+        # For sizing receives: see _recv_size.
+        self._num_bytes_needed = 0
+        self._fionread_buffer = array.array('i', [0])
         # This dict is passed to the loggers.
         self._tags = {'their_address': self.circuit.address,
                       'our_address': self.circuit.our_address,
@@ -163,6 +181,79 @@ class VirtualCircuit:
         # self.events_on = ...
         # self.write_event = ...
 
+    def _get_access_rights(self, db_entry) -> AccessRights:
+        """
+        Access rights for ``db_entry`` from the access security configuration.
+
+        This requires that the context has an access security configuration.
+        """
+        try:
+            return self._access_rights[db_entry.access_security_group]
+        except KeyError:
+            access = self.context.access_security.get_access(
+                db_entry.access_security_group, self.client_hostname,
+                self.client_username
+            )
+            self._access_rights[db_entry.access_security_group] = access
+            return access
+
+    def _get_channel_access_rights(self, db_entry) -> AccessRights:
+        """Access rights for ``db_entry``, as reported to the client."""
+        access = db_entry.check_access(self.client_hostname,
+                                       self.client_username)
+        if self.context.access_security is not None:
+            access &= self._get_access_rights(db_entry)
+        return access
+
+    def _check_access_rights(self, command, chan, db_entry, required):
+        """
+        Check access security for a read, write, or subscription request.
+
+        Returns
+        -------
+        error_response : list or None
+            An error response to send, if access is denied.
+        """
+        if self.context.access_security is None:
+            return None
+        if required in self._get_access_rights(db_entry):
+            return None
+
+        self.log.debug('Access denied to %s (%s) for %r', self.client_username,
+                       self.client_hostname, command)
+        if isinstance(command, ca.WriteNotifyRequest):
+            # As with EPICS rsrv, the put callback reports the failure
+            return [chan.write(ioid=command.ioid,
+                               status=ca.CAStatus.ECA_NOWTACCESS,
+                               data_count=db_entry.length)]
+
+        if required == AccessRights.WRITE:
+            status = ca.CAStatus.ECA_NOWTACCESS
+        else:
+            status = ca.CAStatus.ECA_NORDACCESS
+        return [ca.ErrorResponse(command, chan.cid, status=status,
+                                 error_message=status.value.description)]
+
+    async def update_access_rights(self):
+        """
+        Clear cached access rights, and notify the client of any changes.
+
+        Called when the access security configuration is reloaded.
+        """
+        self._access_rights.clear()
+        to_send = []
+        for chan in list(self.circuit.channels_sid.values()):
+            try:
+                db_entry = self.context[chan.name]
+            except KeyError:
+                continue
+            access = self._get_channel_access_rights(db_entry)
+            if access != chan.access_rights:
+                to_send.append(ca.AccessRightsResponse(cid=chan.cid,
+                                                       access_rights=access))
+        if to_send:
+            await self.send(*to_send)
+
     async def _on_disconnect(self):
         """Executed when disconnection detected"""
         if not self.connected:
@@ -183,6 +274,10 @@ class VirtualCircuit:
         """To be implemented in a subclass"""
         raise NotImplementedError()
 
+    def _sub_queue_depth(self) -> int:
+        """The number of subscription updates queued on this circuit."""
+        return self.subscription_queue.qsize()
+
     async def send(self, *commands):
         """
         Process a command and tranport it over the TCP socket for this circuit.
@@ -196,16 +291,31 @@ class VirtualCircuit:
                     f"Circuit disconnected: {ex}"
                 ) from ex
 
+    def _recv_size(self) -> int:
+        """
+        The number of bytes to ask for in the next receive.
+
+        This is what is already waiting in the kernel, or what is still needed
+        to complete a partially-received command, if either is more than 4096
+        bytes, up to MAX_RECV_BYTES.
+        """
+        try:
+            available = socket_bytes_available(
+                self.client, available_buffer=self._fionread_buffer)
+        except (OSError, TypeError, ValueError):
+            available = 4096
+        return min(max(available, self._num_bytes_needed), MAX_RECV_BYTES)
+
     async def recv(self):
         """
         Receive bytes over TCP and cache them in this circuit's buffer.
         """
         try:
-            bytes_received = await self.client.recv(4096)
+            bytes_received = await self.client.recv(self._recv_size())
         except OSError:
             bytes_received = []
 
-        commands, _ = self.circuit.recv(bytes_received)
+        commands, self._num_bytes_needed = self.circuit.recv(bytes_received)
         for c in commands:
             try:
                 await self.command_queue.put(c)
@@ -344,13 +454,16 @@ class VirtualCircuit:
         if maybe_awaitable is not None:
             await maybe_awaitable
         commands = deque()
+        queued_times = []
         latency_limit = HIGH_LOAD_TIMEOUT
         deadline = 0.0
         while True:
             send_now = False
             commands.clear()
+            queued_times.clear()
             commands_bytes = 0
             num_expired = 0
+            stats = instrumentation.active
             try:
                 # We are covering two regimes of operation here. In the "slow
                 # producer" regime, the server is only occasionally sending
@@ -400,6 +513,10 @@ class VirtualCircuit:
                     # Accumulate commands into a batch.
                     commands.append(command)
                     commands_bytes += len(command)
+                    if stats is not None:
+                        queued_at = getattr(ref, 'queued_at', None)
+                        if queued_at is not None:
+                            queued_times.append(queued_at)
                     now = time.monotonic()
                     if len(commands) == 1:
                         # Set a dealine by which will must send this oldest
@@ -419,36 +536,9 @@ class VirtualCircuit:
             except self.TaskCancelled:
                 break
             try:
-                len_commands = len(commands)
-
-                # If events are toggled by the client, subscriptions values get
-                # garbage- collected.  It's not a high load situation.  Let's
-                # warn only if we're relatively sure that it wasn't due to
-                # recent event toggling.
-                time_since_events_toggled = time.monotonic() - self.time_events_toggled
-                if num_expired and time_since_events_toggled > HIGH_LOAD_EVENT_TIME_THRESHOLD:
-                    self.log.warning("High load. Dropped %d responses.", num_expired)
-
-                if len_commands > 1 and HIGH_LOAD_WARN_LATENCY_SEC > 0:
-                    latency = now - deadline + latency_limit
-                    if latency >= HIGH_LOAD_WARN_LATENCY_SEC:
-                        self.log.warning(
-                            "High load. Batched %d commands (%dB) with %.4fs latency.",
-                            len_commands, commands_bytes, latency
-                        )
-
-                # Ensure at the last possible moment that we don't send
-                # responses for Subscriptions that have been canceled at some
-                # time after the response was queued. The important thing is
-                # that no EventAddResponse be sent after the corresponding
-                # EventCancelResponse.
-                all_subscription_ids = set(sub.subscriptionid
-                                           for subs in self.subscriptions.values()
-                                           for sub in subs)
-                culled_commands = (command for command in commands
-                                   if command.subscriptionid in all_subscription_ids)
-                await self.send(*culled_commands)
-
+                await self._send_subscription_batch(
+                    commands, commands_bytes, queued_times, num_expired,
+                    latency=now - deadline + latency_limit)
                 # When we are stuck in the "fast producer" regime,
                 # stuggling to push updates out, send larger and larger
                 # pakcets by increasing the allowed latency between each
@@ -460,6 +550,60 @@ class VirtualCircuit:
                 await self.context.circuit_disconnected(self)
                 break
 
+    async def _send_subscription_batch(self, commands, commands_bytes,
+                                       queued_times, num_expired, latency):
+        """
+        Send a batch of EventAddResponses from the subscription queue.
+
+        Parameters
+        ----------
+        commands : sequence
+            The EventAddResponses, oldest first.
+        commands_bytes : int
+            Their total size.
+        queued_times : list
+            When each was queued, if instrumentation is active.
+        num_expired : int
+            Number of queued responses dropped while collecting the batch.
+        latency : float
+            Seconds since the oldest command was taken off the queue.
+        """
+        len_commands = len(commands)
+
+        # If events are toggled by the client, subscriptions values get
+        # garbage- collected.  It's not a high load situation.  Let's
+        # warn only if we're relatively sure that it wasn't due to
+        # recent event toggling.
+        time_since_events_toggled = time.monotonic() - self.time_events_toggled
+        if num_expired and time_since_events_toggled > HIGH_LOAD_EVENT_TIME_THRESHOLD:
+            self.log.warning("High load. Dropped %d responses.", num_expired)
+
+        if len_commands > 1 and HIGH_LOAD_WARN_LATENCY_SEC > 0:
+            if latency >= HIGH_LOAD_WARN_LATENCY_SEC:
+                self.log.warning(
+                    "High load. Batched %d commands (%dB) with %.4fs latency.",
+                    len_commands, commands_bytes, latency
+                )
+
+        # Ensure at the last possible moment that we don't send
+        # responses for Subscriptions that have been canceled at some
+        # time after the response was queued. The important thing is
+        # that no EventAddResponse be sent after the corresponding
+        # EventCancelResponse.
+        all_subscription_ids = set(sub.subscriptionid
+                                   for subs in self.subscriptions.values()
+                                   for sub in subs)
+        culled_commands = (command for command in commands
+                           if command.subscriptionid in all_subscription_ids)
+        await self.send(*culled_commands)
+
+        stats = instrumentation.active
+        if stats is not None:
+            if num_expired:
+                stats.record_dropped(self, num_expired)
+            stats.record_batch(self, queued_times, commands_bytes,
+                               self._sub_queue_depth())
+
     async def _cull_subscriptions(self, db_entry, func):
         # Iterate through each Subscription, passing each one to func(sub).
         # Collect a list of (SubscriptionSpec, Subscription) for which
@@ -529,8 +673,7 @@ class VirtualCircuit:
                 to_send = [ca.CreateChFailResponse(cid=command.cid)]
             else:
 
-                access = db_entry.check_access(self.client_hostname,
-                                               self.client_username)
+                access = self._get_channel_access_rights(db_entry)
 
                 modifiers = ca.parse_record_field(pvname).modifiers
                 data_type = db_entry.data_type
@@ -549,9 +692,13 @@ class VirtualCircuit:
                            ]
         elif isinstance(command, ca.HostNameRequest):
             self.client_hostname = command.name
+            if self.context.access_security is not None:
+                await self.update_access_rights()
             to_send = []
         elif isinstance(command, ca.ClientNameRequest):
             self.client_username = command.name
+            if self.context.access_security is not None:
+                await self.update_access_rights()
             to_send = []
         elif isinstance(command, (ca.ReadNotifyRequest, ca.ReadRequest)):
             chan, db_entry = self._get_db_entry_from_command(command)
@@ -560,6 +707,11 @@ class VirtualCircuit:
             except ValueError:
                 raise ca.RemoteProtocolError('Invalid data type')
 
+            error_response = self._check_access_rights(
+                command, chan, db_entry, AccessRights.READ)
+            if error_response is not None:
+                return error_response
+
             # If we are in the middle of processing a Write[Notify]Request,
             # allow a bit of time for that to (maybe) finish. Some requests
             # may take a long time, so give up rather quickly to avoid
@@ -603,6 +755,11 @@ class VirtualCircuit:
                        ]
         elif isinstance(command, (ca.WriteRequest, ca.WriteNotifyRequest)):
             chan, db_entry = self._get_db_entry_from_command(command)
+            error_response = self._check_access_rights(
+                command, chan, db_entry, AccessRights.WRITE)
+            if error_response is not None:
+                return error_response
+
             client_waiting = isinstance(command, ca.WriteNotifyRequest)
 
             async def handle_write():
@@ -649,6 +806,11 @@ class VirtualCircuit:
             to_send = []
         elif isinstance(command, ca.EventAddRequest):
             chan, db_entry = self._get_db_entry_from_command(command)
+            error_response = self._check_access_rights(
+                command, chan, db_entry, AccessRights.READ)
+            if error_response is not None:
+                return error_response
+
             # TODO no support for deprecated low/high/to
 
             read_data_type = command.data_type
@@ -740,7 +902,8 @@ class VirtualCircuit:
             to_send = [chan.clear()]
         elif isinstance(command, ca.EchoRequest):
             to_send = [ca.EchoResponse()]
-        if isinstance(command, ca.Message):
+        if (isinstance(command, ca.Message) and
+                self.log.isEnabledFor(logging.DEBUG)):
             tags['bytesize'] = len(command)
             self.log.debug("%r", command, extra=tags)
         return to_send
@@ -783,6 +946,43 @@ class Context:
 
         ignore_addresses = self.environ['EPICS_CAS_IGNORE_ADDR_LIST']
         self.ignore_addresses = ignore_addresses.split(' ')
+        self.access_security = None
+
+    async def set_access_security(self, access_security):
+        """
+        Set (or clear) the access security configuration.
+
+        Clients of all connected circuits are sent updated access rights for
+        any channels where they have changed.
+
+        Parameters
+        ----------
+        access_security : AccessSecurityConfig, str, pathlib.Path, or None
+            The configuration or configuration filename.  ``None`` disables
+            access security.
+        """
+        self.access_security = load_access_security(access_security)
+        for circuit in list(self.circuits):
+            try:
+                await circuit.update_access_rights()
+            except Exception:
+                self.log.exception('Failed to update access rights for %s',
+                                   circuit)
+
+    async def reload_access_security(self) -> AccessSecurityConfig:
+        """
+        Re-read the access security configuration file.
+
+        Raises
+        ------
+        CaprotoValueError
+            If there is no access security configuration loaded from a file,
+            or the file is invalid.  The existing configuration is retained.
+        """
+        if self.access_security is None:
+            raise ca.CaprotoValueError('Access security is not configured')
+        await self.set_access_security(self.access_security.reload())
+        return self.access_security
 
     @property
     def pvdb_with_fields(self):
@@ -967,7 +1167,9 @@ class Context:
             # Broadcast to all Subscriptions for the relevant
             # SubscriptionSpec(s).
             for sub_spec in sub_specs:
-                for sub in self.subscriptions[sub_spec]:
+                # Copy, as subscriptions may be added or removed while
+                # awaiting below.
+                for sub in tuple(self.subscriptions[sub_spec]):
                     await self._subscription_queue_send(
                         sub_spec,
                         sub,
@@ -1101,16 +1303,25 @@ class Context:
             if sub not in to_resend:
                 to_resend.append(sub)
 
+        stats = instrumentation.active
+        if stats is None:
+            ref = weakref.ref(command, destroyed)
+        else:
+            ref = instrumentation.QueuedRef(command, destroyed)
+            ref.queued_at = time.monotonic()
+
         # This is a queue with the commands from _all_ subscriptions on this
         # circuit.
         try:
-            await circuit.subscription_queue.put(weakref.ref(command, destroyed))
+            await circuit.subscription_queue.put(ref)
         except circuit.QueueFull:
             # We have hit the overall max for subscription backlog.
             circuit.log.warning(
                 "Critically high EventAddResponse load. Dropping all "
                 "queued responses on this circuit."
             )
+            if stats is not None:
+                stats.record_dropped(circuit, circuit._sub_queue_depth())
             circuit.subscription_queue.clear()
             circuit.unexpired_updates.clear()
 
@@ -0,0 +1,246 @@
+"""
+Lightweight, optional instrumentation of the caproto server hot paths.
+
+Instrumentation is disabled by default.  When disabled, the server hot paths
+only check whether :data:`active` is ``None``.  Enable it with :func:`enable`
+(or by way of :class:`caproto.server.stats.InstrumentationHelper`).
+
+The following are recorded:
+
+* Per-PV getter and putter execution time.
+* Write-to-publish latency: from the start of a verified write (i.e., the
+  putter being called) to the new value being published to subscribers.
+* Queue-to-send latency: from a subscription update being queued on a
+  circuit to it being sent on the socket (including batching delays).
+* Per-circuit subscription send queue depth, dropped update counts, and
+  the size of each batch of subscription updates sent.
+"""
+import bisect
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Sequence
+
+# Latency histogram bin edges in seconds: 1us to 10s, 4 bins per decade.
+LATENCY_BIN_EDGES = tuple(1e-6 * 10 ** (idx / 4) for idx in range(29))
+# Batch size histogram bin edges in number of commands: 1, 2, 4, ... 65536
+BATCH_SIZE_BIN_EDGES = tuple(2 ** idx for idx in range(17))
+
+#: The active ServerInstrumentation instance, if enabled.
+active: Optional["ServerInstrumentation"] = None
+_lock = threading.Lock()
+
+
+class Histogram:
+    """
+    A fixed-bin histogram.
+
+    Values below the first edge are counted in the first bin, and values
+    above the final edge are counted in the last bin.  That is, there are
+    ``len(edges) + 1`` bins.
+
+    Parameters
+    ----------
+    edges : sequence of float
+        Monotonically increasing bin edges.
+    """
+
+    __slots__ = ('edges', 'counts', 'count', 'total', 'maximum')
+
+    def __init__(self, edges: Sequence[float] = LATENCY_BIN_EDGES):
+        self.edges = tuple(edges)
+        self.reset()
+
+    def reset(self):
+        """Reset all counts."""
+        self.counts = [0] * (len(self.edges) + 1)
+        self.count = 0
+        self.total = 0
+        self.maximum = 0
+
+    def record(self, value):
+        """Record a single value."""
+        self.counts[bisect.bisect_right(self.edges, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self) -> float:
+        """The mean of all recorded values."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """
+        Approximate the given percentile by the upper edge of its bin.
+
+        Values in the overflow bin are approximated by the maximum value.
+        """
+        if not self.count:
+            return 0.0
+
+        threshold = self.count * pct / 100.
+        cumulative = 0
+        for idx, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= threshold:
+                break
+
+        if idx >= len(self.edges):
+            return self.maximum
+        return min(self.edges[idx], self.maximum)
+
+    def __repr__(self):
+        return (f'<{type(self).__name__} count={self.count} '
+                f'mean={self.mean:g} max={self.maximum:g}>')
+
+
+class CircuitStatistics:
+    """Statistics for a single server virtual circuit."""
+
+    __slots__ = ('address', 'queue_depth', 'max_queue_depth',
+                 'dropped_updates', 'batches', 'updates_sent', 'bytes_sent')
+
+    def __init__(self, address):
+        self.address = address
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.dropped_updates = 0
+        self.batches = 0
+        self.updates_sent = 0
+        self.bytes_sent = 0
+
+
+class ServerInstrumentation:
+    """
+    Instrumentation data for a caproto server.
+
+    Methods prefixed with ``record_`` are called from the server hot paths
+    only when this instance is :data:`active`.
+    """
+
+    getter_times: Dict[str, Histogram]
+    putter_times: Dict[str, Histogram]
+
+    def __init__(self):
+        self.write_to_publish = Histogram(LATENCY_BIN_EDGES)
+        self.queue_to_send = Histogram(LATENCY_BIN_EDGES)
+        self.batch_sizes = Histogram(BATCH_SIZE_BIN_EDGES)
+        self.getter_times = {}
+        self.putter_times = {}
+        self.dropped_updates = 0
+        self.circuits = weakref.WeakKeyDictionary()
+
+    def reset(self):
+        """Reset all statistics."""
+        self.write_to_publish.reset()
+        self.queue_to_send.reset()
+        self.batch_sizes.reset()
+        self.getter_times.clear()
+        self.putter_times.clear()
+        self.dropped_updates = 0
+        self.circuits.clear()
+
+    def get_circuit_statistics(self, circuit) -> CircuitStatistics:
+        """Get (or create) the statistics for the given circuit."""
+        try:
+            return self.circuits[circuit]
+        except KeyError:
+            address = '{}:{}'.format(*circuit.circuit.address)
+            stats = self.circuits[circuit] = CircuitStatistics(address)
+            return stats
+
+    def record_getter(self, pvname, elapsed):
+        """Record the execution time of a getter for ``pvname``."""
+        try:
+            hist = self.getter_times[pvname]
+        except KeyError:
+            hist = self.getter_times[pvname] = Histogram()
+        hist.record(elapsed)
+
+    def record_putter(self, pvname, elapsed):
+        """Record the execution time of a putter for ``pvname``."""
+        try:
+            hist = self.putter_times[pvname]
+        except KeyError:
+            hist = self.putter_times[pvname] = Histogram()
+        hist.record(elapsed)
+
+    def record_dropped(self, circuit, count):
+        """Record ``count`` subscription updates dropped on ``circuit``."""
+        self.dropped_updates += count
+        self.get_circuit_statistics(circuit).dropped_updates += count
+
+    def record_batch(self, circuit, queued_times, num_bytes, queue_depth):
+        """
+        Record a batch of subscription updates sent on ``circuit``.
+
+        Parameters
+        ----------
+        circuit : VirtualCircuit
+            The server circuit.
+        queued_times : list of float
+            ``time.monotonic()`` timestamps of when each update was queued.
+        num_bytes : int
+            Total size of the batch.
+        queue_depth : int
+            The number of updates remaining in the circuit queue.
+        """
+        now = time.monotonic()
+        for queued_at in queued_times:
+            self.queue_to_send.record(now - queued_at)
+
+        self.batch_sizes.record(len(queued_times))
+        stats = self.get_circuit_statistics(circuit)
+        stats.batches += 1
+        stats.updates_sent += len(queued_times)
+        stats.bytes_sent += num_bytes
+        stats.queue_depth = queue_depth
+        stats.max_queue_depth = max(stats.max_queue_depth, queue_depth)
+
+    def get_handler_summary(self, limit=None) -> List[dict]:
+        """
+        Summarize getter/putter execution times, sorted by total time.
+
+        Returns
+        -------
+        summary : list of dict
+            Keys: pvname, getter (Histogram or None), putter (Histogram or
+            None).
+        """
+        pvnames = set(self.getter_times) | set(self.putter_times)
+
+        def total_time(pvname):
+            return sum(hist.total for hist in (self.getter_times.get(pvname),
+                                               self.putter_times.get(pvname))
+                       if hist is not None)
+
+        summary = [
+            dict(pvname=pvname,
+                 getter=self.getter_times.get(pvname),
+                 putter=self.putter_times.get(pvname))
+            for pvname in sorted(pvnames, key=total_time, reverse=True)
+        ]
+        return summary[:limit] if limit is not None else summary
+
+
+def enable() -> ServerInstrumentation:
+    """Enable server instrumentation, returning the active instance."""
+    global active
+    with _lock:
+        if active is None:
+            active = ServerInstrumentation()
+        return active
+
+
+def disable():
+    """Disable server instrumentation."""
+    global active
+    with _lock:
+        active = None
+
+
+class QueuedRef(weakref.ref):
+    """A weak reference to a queued command, including when it was queued."""
+    __slots__ = ('queued_at', )
@@ -14,6 +14,7 @@ import enum
 import functools
 import inspect
 import logging
+import os
 import sys
 import time
 import typing
@@ -31,6 +32,8 @@ from .. import (AccessRights, AlarmSeverity, AlarmStatus,
                 ChannelInteger, ChannelShort, ChannelString, ChannelType,
                 __version__, _constants, get_server_address_list)
 from .._backend import backend
+from .._data import SkipWrite
+from . import instrumentation, startup_profile
 from .typing import (AinitHook, AsyncLibraryLayer, BoundGetter, BoundPutter,
                      BoundScan, BoundShutdown, BoundStartup, Getter, Putter,
                      Scan, Shutdown, Startup)
@@ -139,6 +142,8 @@ class PvpropertyData(Generic[T_RecordFields], ChannelData):
         Passed to the superclass, along with reported_record_type.
     """
 
+    _instrumented: bool = True
+    _write_started_at: Optional[float] = None
     field_inst: T_RecordFields
     fields: Dict[str, ChannelData]
     getter: Optional[BoundGetter]
@@ -223,28 +228,20 @@ class PvpropertyData(Generic[T_RecordFields], ChannelData):
         if self.record_type is not None:
             field_class = get_record_class(self.record_type)
             if self.pvspec.fields is not None:
-                clsdict = {}
-                # Update all fields with user-customized putters
-                for (prop_name, field_attr), func in self.pvspec.fields:
-                    try:
-                        prop = clsdict[prop_name]
-                    except KeyError:
-                        prop = copy.copy(getattr(field_class, prop_name))
-
-                    prop.pvspec = prop.pvspec._replace(**{field_attr: func})
-                    clsdict[prop_name] = prop
-
-                # Subclass the original record fields, patching in our new
-                # methods:
-                field_class = type(
-                    field_class.__name__ + self.name.replace('.', '_'),
-                    (field_class, ), clsdict)
+                field_class = _get_customized_field_class(
+                    field_class, self.pvspec.fields,
+                    owner=type(group).__name__ if group is not None else '',
+                    attr=self.pvspec.attr or self.name,
+                )
 
             self.field_inst = field_class(
                 prefix='', parent=self,
                 name=f'{self.name}.fields')
 
             self.fields = self.field_inst.pvdb
+            # Record fields share the access security group of the record
+            for field in self.fields.values():
+                field.access_security_group = self.access_security_group
         else:
             self.field_inst = None
             self.fields = {}
@@ -324,7 +321,13 @@ class PvpropertyData(Generic[T_RecordFields], ChannelData):
             The type of data to return.
         """
         if self.getter is not None:
-            value = await self.getter(self)
+            stats = instrumentation.active
+            if stats is None or not self._instrumented:
+                value = await self.getter(self)
+            else:
+                t0 = time.monotonic()
+                value = await self.getter(self)
+                stats.record_getter(self.pvname, time.monotonic() - t0)
             if value is not None:
                 # Update the internal state
                 await self.write(value)
@@ -345,7 +348,32 @@ class PvpropertyData(Generic[T_RecordFields], ChannelData):
         """
         value = await super().verify_value(value)
         if self.putter is not None:
-            return await self.putter(self, value)
+            stats = instrumentation.active
+            if stats is None or not self._instrumented:
+                return await self.putter(self, value)
+
+            t0 = time.monotonic()
+            try:
+                result = await self.putter(self, value)
+            finally:
+                stats.record_putter(self.pvname, time.monotonic() - t0)
+            if result is not SkipWrite:
+                self._write_started_at = t0
+            return result
+
+    async def publish(self, flags):
+        """
+        Publish data to appropriate queues matching the SubscriptionSpec.
+
+        See `ChannelData.publish`.
+        """
+        stats = instrumentation.active
+        if stats is not None and self._write_started_at is not None:
+            stats.write_to_publish.record(
+                time.monotonic() - self._write_started_at
+            )
+            self._write_started_at = None
+        return await super().publish(flags)
 
     async def update_fields(self, value):
         """This is a hook to update field instance data."""
@@ -744,12 +772,50 @@ class PVSpec(namedtuple('PVSpec',
         else:
             alarm = group.alarms[self.alarm_group]
             full_pvname = group.prefix + expand_macros(self.name, group.macros)
-
-        cls: Type[ChannelData] = self.get_data_class(group)
-
+            cache = getattr(type(group), '_pvspec_cache_', None)
+            if cache is not None:
+                # The data class and static keyword arguments depend only on
+                # the group class, so they are determined once per class.
+                try:
+                    pvspec, cls, static_kwargs = cache[self.attr]
+                except KeyError:
+                    pvspec = None
+
+                if pvspec is not self:
+                    cls, static_kwargs = self._get_static_instantiation_info(
+                        group)
+                    cache[self.attr] = (self, cls, static_kwargs)
+
+                if alarm and not isinstance(alarm, ChannelAlarm):
+                    raise ValueError(
+                        f"Alarm instance required for {full_pvname!r}"
+                    )
+                kwargs = dict(static_kwargs)
+                kwargs.update(group=group, alarm=alarm, pvname=full_pvname)
+                return cls, kwargs
+
+        cls, static_kwargs = self._get_static_instantiation_info(group)
         if alarm and not isinstance(alarm, ChannelAlarm):
             raise ValueError(f"Alarm instance required for {full_pvname!r}")
 
+        return cls, dict(
+            group=group,
+            alarm=alarm,
+            pvname=full_pvname,
+            **static_kwargs
+        )
+
+    def _get_static_instantiation_info(
+        self, group: Optional[PVGroup] = None
+    ) -> Tuple[Type[PvpropertyData], Dict[str, Any]]:
+        """
+        Get class and instantiation arguments that do not depend on the group
+        instance (i.e., only on the group class).
+
+        See :meth:`get_instantiation_info`.
+        """
+        cls: Type[ChannelData] = self.get_data_class(group)
+
         if self.value is not None:
             value = self.value
         elif group is not None:
@@ -758,12 +824,9 @@ class PVSpec(namedtuple('PVSpec',
             value = cls.default_value
 
         return cls, dict(
-            group=group,
             pvspec=self,
             value=value,
             max_length=self.max_length,
-            alarm=alarm,
-            pvname=full_pvname,
             record=self.record,
             **(self.cls_kwargs or {})
         )
@@ -978,6 +1041,44 @@ class FieldSpec(Generic[T_RecordFields]):
                 f'fields={self.fields}>')
 
 
+# Cache of record field classes customized by way of pvproperty.fields
+_customized_field_classes: Dict[tuple, Type["RecordFieldGroup"]] = {}
+
+
+def _get_customized_field_class(field_class, fields, *, owner, attr):
+    """
+    Subclass the record fields class, patching in user-customized methods.
+
+    The generated class is cached, so that it is only created once for each
+    pvproperty of a given PVGroup class.
+    """
+    key = (field_class, fields, owner, attr)
+    try:
+        return _customized_field_classes[key]
+    except KeyError:
+        ...
+    except TypeError:
+        # Unhashable customization; do not cache
+        key = None
+
+    clsdict = {}
+    # Update all fields with user-customized putters
+    for (prop_name, field_attr), func in fields:
+        try:
+            prop = clsdict[prop_name]
+        except KeyError:
+            prop = copy.copy(getattr(field_class, prop_name))
+
+        prop.pvspec = prop.pvspec._replace(**{field_attr: func})
+        clsdict[prop_name] = prop
+
+    name = f"{field_class.__name__}{owner}_{attr.replace('.', '_')}"
+    customized = type(name, (field_class, ), clsdict)
+    if key is not None:
+        _customized_field_classes[key] = customized
+    return customized
+
+
 def get_record_class(
     record: Union[str, Type["RecordFieldGroup"]]
 ) -> Type["RecordFieldGroup"]:
@@ -1809,6 +1910,8 @@ class pvfunction(SubGroup):
 
 def expand_macros(pv, macros):
     'Expand a PV name with Python {format-style} macros'
+    if '{' not in pv and '}' not in pv:
+        return pv
     return pv.format(**macros)
 
 
@@ -1850,8 +1953,11 @@ class PVGroupMeta(type):
     def __new__(
         metacls: PVGroupMeta, name: str, bases: Tuple[type, ...], dct: Dict[str, Any]
     ):
+        t0 = time.perf_counter()
         dct['_subgroups_'] = subgroups = OrderedDict()
         dct['_pvs_'] = pvs = OrderedDict()
+        # Per-class cache of {attr: (pvspec, data class, static kwargs)}
+        dct['_pvspec_cache_'] = {}
 
         cls = super().__new__(metacls, name, bases, dct)
 
@@ -1875,6 +1981,8 @@ class PVGroupMeta(type):
                     subgroups['.'.join((attr, subattr))] = subgroup
 
         pvs.update(metacls.find_pvproperties(dct))
+        startup_profile.record_class_construction(
+            cls, time.perf_counter() - t0)
         return cls
 
 
@@ -1943,6 +2051,7 @@ class PVGroup(metaclass=PVGroupMeta):
     """
 
     _pvs_: ClassVar[Dict[str, PvpropertyData]]
+    _pvspec_cache_: ClassVar[Dict[str, Tuple[PVSpec, type, Dict[str, Any]]]]
     _subgroups_: ClassVar[Dict[str, SubGroup]]
     pvdb: Dict[str, PvpropertyData]
     attr_pvdb: Dict[str, PvpropertyData]
@@ -2003,7 +2112,16 @@ class PVGroup(metaclass=PVGroupMeta):
 
         # Instantiate the logger
         self.log = logging.getLogger(f'{base}.{log_name}')
-        self._create_pvdb()
+
+        profiler = startup_profile.active
+        if profiler is None:
+            self._create_pvdb()
+        else:
+            profiler.group_started()
+            try:
+                self._create_pvdb()
+            finally:
+                profiler.group_finished(self)
 
         # Prime the snapshots to the current state.
         for key, val in self.states.items():
@@ -2013,6 +2131,7 @@ class PVGroup(metaclass=PVGroupMeta):
 
     def _create_pvdb(self):
         'Create the PV database for all subgroups and pvproperties'
+        profiler = startup_profile.active
         for attr, subgroup in self._subgroups_.items():
             if attr in self.groups:
                 # already created as part of a sub-subgroup
@@ -2047,6 +2166,8 @@ class PVGroup(metaclass=PVGroupMeta):
             else:
                 channeldata = pvprop.pvspec.create(self)
                 pvname = channeldata.pvname
+                if profiler is not None:
+                    profiler.channel_created(self, channeldata)
 
             if pvname in self.pvdb:
                 first_seen = self.pvdb[pvname]
@@ -2158,6 +2279,20 @@ def template_arg_parser(
                         choices=choices,
                         help=("Which asynchronous library to use. "
                               "Default is asyncio."))
+    default_event_loop = os.environ.get('CAPROTO_ASYNCIO_EVENT_LOOP', 'asyncio')
+    parser.add_argument('--event-loop', default=default_event_loop,
+                        choices=('asyncio', 'uvloop'),
+                        help=("Event loop implementation to use with the "
+                              "asyncio server. Falls back to the standard "
+                              "asyncio loop if unavailable. Default is "
+                              "CAPROTO_ASYNCIO_EVENT_LOOP or asyncio."))
+    parser.add_argument('--profile-startup', action='store_true',
+                        help=("Log a report of time spent in each startup "
+                              "phase and PVGroup class once the server has "
+                              "started."))
+    parser.add_argument('--acf', default=None, metavar='FILENAME',
+                        help=("EPICS access security configuration file "
+                              "(ACF) to apply to all PVs."))
     default_intf = get_server_address_list()
     if default_intf == ['0.0.0.0']:
         default_msg = '0.0.0.0'
@@ -2203,12 +2338,21 @@ def template_arg_parser(
         else:
             _set_handler_with_logger(logger_name='caproto.ctx', level='INFO')
 
+        run_options = {
+            'module_name': f'caproto.{args.async_lib}.server',
+            'log_pv_names': args.list_pvs,
+            'interfaces': args.interfaces,
+        }
+        if args.async_lib == 'asyncio':
+            run_options['event_loop'] = args.event_loop
+        if args.acf is not None:
+            run_options['access_security'] = args.acf
+        if args.profile_startup:
+            startup_profile.enable()
+
         return ({'prefix': args.prefix,
                  'macros': {key: getattr(args, key) for key in macros}},
-
-                {'module_name': f'caproto.{args.async_lib}.server',
-                 'log_pv_names': args.list_pvs,
-                 'interfaces': args.interfaces})
+                run_options)
 
     return parser, split_args
 
@@ -2253,13 +2397,33 @@ def ioc_arg_parser(
     return split_args(parser.parse_args())
 
 
+def _wrap_startup_hook_for_profiling(
+    profiler: startup_profile.StartupProfiler,
+    startup_hook: Optional[AinitHook],
+) -> AinitHook:
+    """Wrap a startup hook to log the startup profile report."""
+    t0 = time.perf_counter()
+
+    async def profiled_startup_hook(async_lib):
+        profiler.add_phase('Server startup', time.perf_counter() - t0)
+        logging.getLogger('caproto.ctx').info(
+            'Startup profile:\n%s', profiler.report()
+        )
+        if startup_hook is not None:
+            await startup_hook(async_lib)
+
+    return profiled_startup_hook
+
+
 def run(
     pvdb: Dict[str, ChannelData],
     *,
     module_name: str = "caproto.asyncio.server",
     interfaces: Optional[List[str]] = None,
     log_pv_names: bool = False,
-    startup_hook: Optional[AinitHook] = None
+    startup_hook: Optional[AinitHook] = None,
+    event_loop: Optional[str] = None,
+    access_security: Optional[Union[str, os.PathLike]] = None,
 ) -> None:
     """
     Run an IOC, given its PV database dictionary and async-library module name.
@@ -2280,13 +2444,32 @@ def run(
 
     startup_hook : coroutine, optional
         Hook to call at startup with the ``async_lib`` shim.
+
+    event_loop : str, optional
+        Event loop implementation name (e.g., 'uvloop').  Only supported by
+        the asyncio server.
+
+    access_security : str, pathlib.Path, or AccessSecurityConfig, optional
+        Access security configuration (or ACF filename) to apply to all PVs.
+        See :mod:`caproto.server.access_security`.
     """
     from importlib import import_module  # to avoid leaking into module ns
     module = import_module(module_name)
     run = module.run
+    kwargs = {}
+    if event_loop is not None:
+        kwargs['event_loop'] = event_loop
+    if access_security is not None:
+        kwargs['access_security'] = access_security
+
+    profiler = startup_profile.active
+    if profiler is not None:
+        startup_hook = _wrap_startup_hook_for_profiling(profiler, startup_hook)
+
     return run(
         pvdb,
         interfaces=interfaces,
         log_pv_names=log_pv_names,
         startup_hook=startup_hook,
+        **kwargs
     )
@@ -0,0 +1,159 @@
+"""
+Startup profiling for caproto servers.
+
+Class construction time of each :class:`~caproto.server.PVGroup` subclass is
+always recorded, as it happens at import time and is inexpensive to measure.
+When enabled (:func:`enable`, or ``--profile-startup`` on the command line of
+IOCs using :func:`~caproto.server.ioc_arg_parser`), the following are
+additionally recorded:
+
+* Named startup phases, such as server startup.
+* Per-PVGroup class instantiation time: count, inclusive time (including
+  subgroups and record fields), and exclusive time.
+* Counts of ChannelData instances created, by class.
+
+The report is logged when the server has started, or may be generated at any
+time with :meth:`StartupProfiler.report`.
+"""
+import collections
+import contextlib
+import time
+from typing import Dict, List, Optional
+
+#: The active StartupProfiler instance, if enabled.
+active: Optional["StartupProfiler"] = None
+
+#: PVGroup class construction times: {qualified class name: seconds}
+class_construction_times: Dict[str, float] = {}
+
+
+def _class_name(cls) -> str:
+    return f'{cls.__module__}.{cls.__qualname__}'
+
+
+def record_class_construction(cls, elapsed: float):
+    """Record the time taken to construct a PVGroup class."""
+    class_construction_times[_class_name(cls)] = elapsed
+
+
+class GroupStatistics:
+    """Instantiation statistics for a single PVGroup class."""
+
+    __slots__ = ('count', 'inclusive', 'exclusive', 'channels')
+
+    def __init__(self):
+        self.count = 0
+        self.inclusive = 0.0
+        self.exclusive = 0.0
+        self.channels = 0
+
+
+class StartupProfiler:
+    """
+    Collects startup timing information.
+
+    Attributes
+    ----------
+    phases : dict
+        Named phases in the order they were first recorded: {name: seconds}
+    groups : dict
+        {qualified PVGroup class name: GroupStatistics}
+    object_counts : collections.Counter
+        ChannelData instances created, by class name.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = {}
+        self.groups = collections.defaultdict(GroupStatistics)
+        self.object_counts = collections.Counter()
+        # Stack of [start time, time spent in child groups]
+        self._stack = []
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Context manager to time a named startup phase."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_phase(name, time.perf_counter() - t0)
+
+    def add_phase(self, name: str, elapsed: float):
+        """Add ``elapsed`` seconds to the phase ``name``."""
+        self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    def group_started(self):
+        """A PVGroup instance is about to be created."""
+        self._stack.append([time.perf_counter(), 0.0])
+
+    def group_finished(self, group):
+        """A PVGroup instance has been created, along with its subgroups."""
+        t0, child_time = self._stack.pop()
+        elapsed = time.perf_counter() - t0
+        if self._stack:
+            self._stack[-1][1] += elapsed
+        else:
+            self.add_phase('PVGroup instantiation', elapsed)
+
+        stats = self.groups[_class_name(type(group))]
+        stats.count += 1
+        stats.inclusive += elapsed
+        stats.exclusive += elapsed - child_time
+
+    def channel_created(self, group, channeldata):
+        """A ChannelData instance was created for ``group``."""
+        self.object_counts[type(channeldata).__name__] += 1
+        self.groups[_class_name(type(group))].channels += 1
+
+    def report(self, limit: int = 20) -> str:
+        """
+        Generate a human-readable startup profile report.
+
+        Parameters
+        ----------
+        limit : int, optional
+            Maximum number of group classes and object types to include.
+        """
+        lines: List[str] = []
+        construction = sum(class_construction_times.values())
+        lines.append(f'Total since profiling enabled: '
+                     f'{time.perf_counter() - self.t0:.3f} s')
+        lines.append('Phases:')
+        lines.append(f'    {"PVGroup class construction":<40} '
+                     f'{construction:10.3f} s '
+                     f'({len(class_construction_times)} classes)')
+        for name, elapsed in self.phases.items():
+            lines.append(f'    {name:<40} {elapsed:10.3f} s')
+
+        lines.append('PVGroup classes by exclusive instantiation time:')
+        lines.append(f'    {"class":<50} {"count":>7} {"incl (s)":>10} '
+                     f'{"excl (s)":>10} {"PVs":>8} {"build (s)":>10}')
+        by_exclusive = sorted(self.groups.items(),
+                              key=lambda item: item[1].exclusive,
+                              reverse=True)
+        for name, stats in by_exclusive[:limit]:
+            built = class_construction_times.get(name, 0.0)
+            lines.append(f'    {name[-50:]:<50} {stats.count:>7} '
+                         f'{stats.inclusive:>10.3f} {stats.exclusive:>10.3f} '
+                         f'{stats.channels:>8} {built:>10.4f}')
+
+        lines.append(f'ChannelData instances: '
+                     f'{sum(self.object_counts.values())}')
+        for name, count in self.object_counts.most_common(limit):
+            lines.append(f'    {name:<50} {count:>8}')
+        return '\n'.join(lines)
+
+
+def enable() -> StartupProfiler:
+    """Enable startup profiling, returning the active profiler."""
+    global active
+    if active is None:
+        active = StartupProfiler()
+    return active
+
+
+def disable():
+    """Disable startup profiling."""
+    global active
+    active = None
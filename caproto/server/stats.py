@@ -12,7 +12,7 @@ import typing
 from typing import List, Optional
 
 from .. import ChannelType, __version__
-from . import PVGroup, SubGroup, pvproperty
+from . import PVGroup, SubGroup, instrumentation, pvproperty
 from .autosave import autosaved
 
 try:
@@ -595,12 +595,302 @@ class MemoryTracingHelper(PVGroup):
         self._old_snapshot = snapshot
 
 
+def _histogram_bin_edges(edges, max_length):
+    """Upper bin edges for a histogram, with the overflow bin last."""
+    return (list(edges) + [float('inf')])[:max_length]
+
+
+class InstrumentationHelper(PVGroup):
+    """
+    Channel Access server instrumentation exposed as PVs.
+
+    Instrumentation is disabled by default, as it adds (small) overhead to the
+    server hot paths.  Enable it with ``CAS_INSTR_ENABLE``.  All times are in
+    seconds.  Histogram waveforms correspond to the bin edges in the
+    ``*_BINS`` waveforms, where each bin counts values less than or equal to
+    its edge.
+
+    See :mod:`caproto.server.instrumentation` for details.
+    """
+
+    max_circuits = 100
+    max_handlers = 50
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Exclude the instrumentation PVs from their own statistics
+        for instance in self.pvdb.values():
+            instance._instrumented = False
+
+    enable = pvproperty(
+        name='CAS_INSTR_ENABLE',
+        value='Disable',
+        doc='Enable/disable server instrumentation',
+        record='bo',
+        enum_strings=['Disable', 'Enable'],
+        dtype=ChannelType.ENUM,
+    )
+
+    reset = pvproperty(
+        name='CAS_INSTR_RESET',
+        value='Done',
+        doc='Reset instrumentation statistics',
+        record='bo',
+        enum_strings=['Done', 'Reset'],
+        dtype=ChannelType.ENUM,
+    )
+
+    update_period = pvproperty(
+        value=5.0,
+        name='CAS_INSTR_UPD_TIME',
+        record='ao',
+        lower_ctrl_limit=1,
+        upper_ctrl_limit=60,
+        doc='Instrumentation PV update rate',
+    )
+
+    latency_bins = pvproperty(
+        value=_histogram_bin_edges(instrumentation.LATENCY_BIN_EDGES, 30),
+        name='CAS_LATENCY_BINS',
+        record='waveform',
+        read_only=True,
+        doc='Latency histogram bin upper edges',
+    )
+
+    write_to_publish_hist = pvproperty(
+        value=[0] * (len(instrumentation.LATENCY_BIN_EDGES) + 1),
+        name='CAS_WRITE_PUB_HIST',
+        record='waveform',
+        read_only=True,
+        doc='Histogram of latency from putter start to publish',
+    )
+
+    write_to_publish_p50 = pvproperty(
+        value=0.0,
+        name='CAS_WRITE_PUB_P50',
+        record='ai',
+        units='s',
+        precision=6,
+        read_only=True,
+    )
+
+    write_to_publish_p99 = pvproperty(
+        value=0.0,
+        name='CAS_WRITE_PUB_P99',
+        record='ai',
+        units='s',
+        precision=6,
+        read_only=True,
+    )
+
+    queue_to_send_hist = pvproperty(
+        value=[0] * (len(instrumentation.LATENCY_BIN_EDGES) + 1),
+        name='CAS_QUEUE_SEND_HIST',
+        record='waveform',
+        read_only=True,
+        doc='Histogram of latency from circuit queue to socket send',
+    )
+
+    queue_to_send_p50 = pvproperty(
+        value=0.0,
+        name='CAS_QUEUE_SEND_P50',
+        record='ai',
+        units='s',
+        precision=6,
+        read_only=True,
+    )
+
+    queue_to_send_p99 = pvproperty(
+        value=0.0,
+        name='CAS_QUEUE_SEND_P99',
+        record='ai',
+        units='s',
+        precision=6,
+        read_only=True,
+    )
+
+    batch_size_bins = pvproperty(
+        value=_histogram_bin_edges(instrumentation.BATCH_SIZE_BIN_EDGES, 18),
+        name='CAS_BATCH_SIZE_BINS',
+        record='waveform',
+        read_only=True,
+        doc='Subscription batch size histogram bin upper edges',
+    )
+
+    batch_size_hist = pvproperty(
+        value=[0] * (len(instrumentation.BATCH_SIZE_BIN_EDGES) + 1),
+        name='CAS_BATCH_SIZE_HIST',
+        record='waveform',
+        read_only=True,
+        doc='Histogram of subscription updates sent per batch',
+    )
+
+    dropped_count = pvproperty(
+        value=0,
+        name='CAS_DROPPED_CNT',
+        record='longin',
+        read_only=True,
+        doc='Total subscription updates dropped due to high load',
+    )
+
+    circuits = pvproperty(
+        value='',
+        name='CAS_CIRCUITS',
+        record='waveform',
+        max_length=max_circuits * 22,
+        read_only=True,
+        doc='Newline-separated client addresses, in the order of CAS_CIRCUIT_*',
+    )
+
+    circuit_queue_depth = pvproperty(
+        value=[0],
+        max_length=max_circuits,
+        name='CAS_CIRCUIT_QUEUE_DEPTH',
+        record='waveform',
+        read_only=True,
+        doc='Per-circuit subscription send queue depth',
+    )
+
+    circuit_max_queue_depth = pvproperty(
+        value=[0],
+        max_length=max_circuits,
+        name='CAS_CIRCUIT_MAX_QUEUE_DEPTH',
+        record='waveform',
+        read_only=True,
+        doc='Per-circuit maximum subscription send queue depth',
+    )
+
+    circuit_dropped = pvproperty(
+        value=[0],
+        max_length=max_circuits,
+        name='CAS_CIRCUIT_DROPPED',
+        record='waveform',
+        read_only=True,
+        doc='Per-circuit dropped subscription updates',
+    )
+
+    handler_pvs = pvproperty(
+        value='',
+        name='CAS_HANDLER_PVS',
+        record='waveform',
+        max_length=max_handlers * 40,
+        read_only=True,
+        doc='Newline-separated PV names, in the order of CAS_GETTER/PUTTER_*',
+    )
+
+    getter_mean = pvproperty(
+        value=[0.0],
+        max_length=max_handlers,
+        name='CAS_GETTER_MEAN',
+        record='waveform',
+        read_only=True,
+        doc='Per-PV mean getter execution time',
+    )
+
+    getter_max = pvproperty(
+        value=[0.0],
+        max_length=max_handlers,
+        name='CAS_GETTER_MAX',
+        record='waveform',
+        read_only=True,
+        doc='Per-PV maximum getter execution time',
+    )
+
+    putter_mean = pvproperty(
+        value=[0.0],
+        max_length=max_handlers,
+        name='CAS_PUTTER_MEAN',
+        record='waveform',
+        read_only=True,
+        doc='Per-PV mean putter execution time',
+    )
+
+    putter_max = pvproperty(
+        value=[0.0],
+        max_length=max_handlers,
+        name='CAS_PUTTER_MAX',
+        record='waveform',
+        read_only=True,
+        doc='Per-PV maximum putter execution time',
+    )
+
+    @enable.putter
+    async def enable(self, instance, value):
+        if value == 'Enable':
+            instrumentation.enable()
+        else:
+            instrumentation.disable()
+
+    @reset.putter
+    async def reset(self, instance, value):
+        stats = instrumentation.active
+        if value == 'Reset' and stats is not None:
+            stats.reset()
+        return 'Done'
+
+    async def _update(self, stats: instrumentation.ServerInstrumentation):
+        """Update all PVs from the instrumentation statistics."""
+        for hist, hist_pv, p50_pv, p99_pv in [
+            (stats.write_to_publish, self.write_to_publish_hist,
+             self.write_to_publish_p50, self.write_to_publish_p99),
+            (stats.queue_to_send, self.queue_to_send_hist,
+             self.queue_to_send_p50, self.queue_to_send_p99),
+        ]:
+            await hist_pv.write(hist.counts)
+            await p50_pv.write(hist.percentile(50))
+            await p99_pv.write(hist.percentile(99))
+
+        await self.batch_size_hist.write(stats.batch_sizes.counts)
+        await self.dropped_count.write(stats.dropped_updates)
+
+        circuits = list(stats.circuits.values())[:self.max_circuits]
+        if circuits:
+            await self.circuits.write(
+                '\n'.join(circ.address for circ in circuits)
+            )
+            await self.circuit_queue_depth.write(
+                [circ.queue_depth for circ in circuits])
+            await self.circuit_max_queue_depth.write(
+                [circ.max_queue_depth for circ in circuits])
+            await self.circuit_dropped.write(
+                [circ.dropped_updates for circ in circuits])
+
+        handlers = stats.get_handler_summary(limit=self.max_handlers)
+        if handlers:
+            def get_stat(handler, key, attr):
+                hist = handler[key]
+                return getattr(hist, attr) if hist is not None else 0.0
+
+            names = '\n'.join(handler['pvname'] for handler in handlers)
+            await self.handler_pvs.write(
+                names[:self.handler_pvs.max_length]
+            )
+            for pv, key, attr in [(self.getter_mean, 'getter', 'mean'),
+                                  (self.getter_max, 'getter', 'maximum'),
+                                  (self.putter_mean, 'putter', 'mean'),
+                                  (self.putter_max, 'putter', 'maximum')]:
+                await pv.write([get_stat(handler, key, attr)
+                                for handler in handlers])
+
+    @update_period.startup
+    async def update_period(self, instance, async_lib):
+        while True:
+            stats = instrumentation.active
+            if stats is not None:
+                try:
+                    await self._update(stats)
+                except Exception as ex:
+                    self.log.warning('Instrumentation update failure: %s', ex)
+            await async_lib.library.sleep(self.update_period.value)
+
+
 class StatusHelper(PVGroup):
     """
     An IocStats-like tool for caproto IOCs.
 
-    Includes all PVs from :class:`BasicStatusHelper` and
-    :class:`PeriodicStatusHelper`.
+    Includes all PVs from :class:`BasicStatusHelper`,
+    :class:`PeriodicStatusHelper`, and :class:`InstrumentationHelper`.
     """
     basic = SubGroup(BasicStatusHelper, prefix='')
     periodic = SubGroup(PeriodicStatusHelper, prefix='')
+    instrumentation = SubGroup(InstrumentationHelper, prefix='')
@@ -1,10 +1,13 @@
 # This module contains a synchronous implementation of a Channel Access client
 # as three top-level functions: read, write, subscribe. They are comparatively
 # simple and naive, with no caching or concurrency, and therefore less
-# performant but more robust.
+# performant but more robust. Caching of search results and channels across
+# calls is available as an opt-in, by passing a ChannelPool.
+import collections
 import getpass
 import inspect
 import logging
+import os
 import random
 import selectors
 import socket
@@ -14,21 +17,29 @@ import weakref
 
 import caproto as ca
 
+from .._constants import SEARCH_MAX_DATAGRAM_BYTES, STALE_SEARCH_EXPIRATION
 from .._dbr import ChannelType, SubscriptionType, field_types, native_type
-from .._utils import (CaprotoError, CaprotoTimeoutError, ErrorResponseReceived,
-                      adapt_old_callback_signature, get_environment_variables,
+from .._utils import (CaprotoError, CaprotoTimeoutError, CaprotoValueError,
+                      ErrorResponseReceived, adapt_old_callback_signature,
+                      batch_requests, get_environment_variables,
                       safe_getsockname)
 from ..client import common
 from .repeater import spawn_repeater
 
 __all__ = ('read', 'write', 'subscribe', 'block', 'interrupt',
-           'read_write_read')
+           'read_write_read', 'read_many', 'read_write_read_many',
+           'ChannelPool')
 logger = logging.getLogger('caproto.ctx')
 
 # Make a dict to hold our tcp sockets.
 sockets = {}
 global_circuits = {}
 
+# Receive buffer size per circuit, adapted to the amount of data received.
+MIN_RECV_SIZE = 4096
+MAX_RECV_SIZE = 2 ** 20
+_recv_sizes = weakref.WeakKeyDictionary()
+
 _permission_to_block = []  # mutable state shared by block and interrupt
 
 
@@ -43,7 +54,14 @@ def send(circuit, command, pv_name=None):
 
 
 def recv(circuit):
-    bytes_received = sockets[circuit].recv(4096)
+    recv_size = _recv_sizes.get(circuit, MIN_RECV_SIZE)
+    bytes_received = sockets[circuit].recv(recv_size)
+    # Grow the buffer when it was filled, as more data is likely waiting, and
+    # shrink it back after small reads.
+    if len(bytes_received) == recv_size:
+        _recv_sizes[circuit] = min(recv_size * 2, MAX_RECV_SIZE)
+    elif len(bytes_received) < recv_size // 4:
+        _recv_sizes[circuit] = max(recv_size // 2, MIN_RECV_SIZE)
     commands, _ = circuit.recv(bytes_received)
     for c in commands:
         circuit.process_command(c)
@@ -152,13 +170,24 @@ def search(pv_name, udp_sock, timeout, *, max_retries=2):
 
 
 def make_channel(pv_name, udp_sock, priority, timeout):
-    log = logging.LoggerAdapter(logging.getLogger('caproto.ch'), {'pv': pv_name})
     address = search(pv_name, udp_sock, timeout)
+    return _create_channel(pv_name, address, priority, timeout,
+                           global_circuits)
+
+
+def _create_channel(pv_name, address, priority, timeout, circuits):
+    """
+    Create a channel on the circuit (from ``circuits``) to ``address``.
+
+    The circuit is created and connected if necessary. On failure, its socket
+    is closed and it is removed from ``circuits``.
+    """
+    log = logging.LoggerAdapter(logging.getLogger('caproto.ch'), {'pv': pv_name})
     try:
-        circuit = global_circuits[(address, priority)]
+        circuit = circuits[(address, priority)]
     except KeyError:
 
-        circuit = global_circuits[(address, priority)] = ca.VirtualCircuit(
+        circuit = circuits[(address, priority)] = ca.VirtualCircuit(
             our_role=ca.CLIENT,
             address=address,
             priority=priority)
@@ -205,12 +234,682 @@ def make_channel(pv_name, udp_sock, priority, timeout):
     except BaseException:
         sockets[chan.circuit].close()
         del sockets[chan.circuit]
-        del global_circuits[(chan.circuit.address, chan.circuit.priority)]
+        del circuits[(chan.circuit.address, chan.circuit.priority)]
         raise
     return chan
 
 
-def _read(chan, timeout, data_type, data_count, notify, force_int_enums):
+def search_many(pv_names, udp_sock, timeout, *, max_retries=2):
+    """
+    Search for many PVs at once.
+
+    Search requests are packed into as few datagrams as possible, and
+    unanswered ones are resent up to ``max_retries`` times within ``timeout``.
+
+    Returns
+    -------
+    addresses : dict
+        Maps name to server address, for the names which were found.
+    """
+    b = ca.Broadcaster(our_role=ca.CLIENT)
+    b.client_address = safe_getsockname(udp_sock)
+
+    # Send registration request to the repeater
+    logger.debug('Registering with the Channel Access repeater.')
+    bytes_to_send = b.send(ca.RepeaterRegisterRequest())
+
+    env = get_environment_variables()
+    repeater_port = env['EPICS_CA_REPEATER_PORT']
+
+    client_address_list = ca.get_client_address_list()
+    local_address = ca.get_local_address()
+
+    try:
+        udp_sock.sendto(bytes_to_send, (local_address, repeater_port))
+    except OSError as exc:
+        raise ca.CaprotoNetworkError(
+            f"Failed to send to {local_address}:{repeater_port}") from exc
+
+    logger.debug("Searching for %d PVs....", len(pv_names))
+    first_cid = random.randint(0, 65535)
+    unanswered = {(first_cid + i) % 65536: name
+                  for i, name in enumerate(dict.fromkeys(pv_names))}
+    addresses = {}
+    version_req = ca.VersionRequest(0, ca.DEFAULT_PROTOCOL_VERSION)
+    tags = {'role': 'CLIENT',
+            'our_address': b.client_address,
+            'direction': '--->>>'}
+
+    def send_search():
+        requests = (ca.SearchRequest(name, cid, ca.DEFAULT_PROTOCOL_VERSION)
+                    for cid, name in unanswered.items())
+        for batch in batch_requests(requests,
+                                    SEARCH_MAX_DATAGRAM_BYTES - len(version_req)):
+            commands = (version_req, *batch)
+            bytes_to_send = b.send(*commands)
+            for dest in client_address_list:
+                tags['their_address'] = dest
+                b.log.debug(
+                    '%d commands %dB',
+                    len(commands), len(bytes_to_send), extra=tags)
+                try:
+                    udp_sock.sendto(bytes_to_send, dest)
+                except OSError as exc:
+                    host, port = dest
+                    raise ca.CaprotoNetworkError(
+                        f"Failed to send to {host}:{port}") from exc
+
+    retry_timeout = timeout / max((max_retries, 1))
+    deadline = time.monotonic() + timeout
+    send_search()
+    retry_at = time.monotonic() + retry_timeout
+
+    try:
+        orig_timeout = udp_sock.gettimeout()
+        while unanswered:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            if now >= retry_at:
+                send_search()
+                retry_at = now + retry_timeout
+            udp_sock.settimeout(max(min(retry_at, deadline) - now, 1e-3))
+            try:
+                bytes_received, address = udp_sock.recvfrom(ca.MAX_UDP_RECV)
+            except ConnectionResetError as ex:
+                # Win32: see search()
+                logger.debug('Connection reset, retrying: %s', ex)
+                continue
+            except socket.timeout:
+                continue
+
+            commands = b.recv(bytes_received, address)
+            b.process_commands(commands)
+            for command in commands:
+                if isinstance(command, ca.SearchResponse):
+                    name = unanswered.pop(command.cid, None)
+                    if name is not None:
+                        addresses[name] = ca.extract_address(command)
+                        logger.debug('Found %r at %s:%d', name,
+                                     *addresses[name])
+    finally:
+        udp_sock.settimeout(orig_timeout)
+    return addresses
+
+
+def _recv_many(circuits, deadline, *, connecting=None):
+    """
+    Receive on many circuits until the deadline.
+
+    Yields ``(circuit, commands)``, and stops early if all circuits are
+    disconnected.
+
+    ``connecting`` optionally maps circuits whose non-blocking connect is in
+    progress to the commands to send once connected. Entries are removed as
+    connections complete; if one fails, its entry is replaced with the
+    OSError and ``(circuit, [ca.DISCONNECTED])`` is yielded.
+    """
+    if connecting is None:
+        connecting = {}
+    selector = selectors.DefaultSelector()
+    for circuit in circuits:
+        # Connecting sockets become writable once connected
+        events = (selectors.EVENT_WRITE if circuit in connecting
+                  else selectors.EVENT_READ)
+        selector.register(sockets[circuit], events, circuit)
+    try:
+        while selector.get_map():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            for key, events in selector.select(remaining):
+                circuit = key.data
+                if key.events & selectors.EVENT_WRITE:
+                    error = common.get_connect_error(key.fileobj)
+                    if error:
+                        connecting[circuit] = OSError(error,
+                                                      os.strerror(error))
+                        selector.unregister(key.fileobj)
+                        yield circuit, [ca.DISCONNECTED]
+                        continue
+                    commands = connecting.pop(circuit)
+                    selector.modify(key.fileobj, selectors.EVENT_READ, circuit)
+                    try:
+                        key.fileobj.sendall(b"".join(circuit.send(*commands)))
+                    except OSError:
+                        selector.unregister(key.fileobj)
+                        yield circuit, [ca.DISCONNECTED]
+                    continue
+                try:
+                    commands = recv(circuit)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    commands = [ca.DISCONNECTED]
+                if any(command is ca.DISCONNECTED for command in commands):
+                    selector.unregister(key.fileobj)
+                yield circuit, commands
+    finally:
+        selector.close()
+
+
+def make_channels(pv_names, udp_sock, priority, timeout):
+    """
+    Create channels for many PVs at once.
+
+    All PVs are searched for at once, and channels are created concurrently
+    on one new circuit per server, connecting to all of them at once. As with :func:`make_channel`, ``timeout``
+    applies separately to searching and to channel creation.
+
+    Returns
+    -------
+    channels : dict
+        Maps name to connected ClientChannel.
+    errors : dict
+        Maps name to the exception which prevented its connection.
+    """
+    addresses = search_many(pv_names, udp_sock, timeout)
+    errors = {
+        name: CaprotoTimeoutError(
+            f"Timed out while awaiting a response from the search for "
+            f"{name!r}. Search requests were sent to this address list: "
+            f"{ca.get_address_list()}.")
+        for name in pv_names if name not in addresses
+    }
+    names_by_address = collections.defaultdict(list)
+    for name, address in addresses.items():
+        names_by_address[address].append(name)
+
+    deadline = time.monotonic() + timeout
+    pending = {}  # map (circuit, cid) to channel
+    connecting = {}  # map circuit to commands to send once connected
+    for address, names in names_by_address.items():
+        circuit = ca.VirtualCircuit(our_role=ca.CLIENT, address=address,
+                                    priority=priority)
+        # Connect to all of the servers at once.
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        error = sock.connect_ex(address)
+        if error not in common.CONNECT_IN_PROGRESS:
+            sock.close()
+            errors.update((name, OSError(error, os.strerror(error)))
+                          for name in names)
+            continue
+        sock.settimeout(timeout)
+        sockets[circuit] = sock
+        circuit.our_address = sock.getsockname()
+        channels = [ca.ClientChannel(name, circuit) for name in names]
+        commands = [ca.VersionRequest(priority=priority,
+                                      version=ca.DEFAULT_PROTOCOL_VERSION),
+                    channels[0].host_name(socket.gethostname()),
+                    channels[0].client_name(getpass.getuser())]
+        commands.extend(chan.create() for chan in channels)
+        connecting[circuit] = commands
+        pending.update(((circuit, chan.cid), chan) for chan in channels)
+
+    channels = {}
+    circuits = set(circuit for circuit, _ in pending)
+    for circuit, commands in _recv_many(circuits, deadline,
+                                        connecting=connecting):
+        for command in commands:
+            if isinstance(command, ca.CreateChanResponse):
+                chan = pending.pop((circuit, command.cid), None)
+                if chan is not None:
+                    chan.log.info("Channel connected.")
+                    channels[chan.name] = chan
+            elif isinstance(command, ca.CreateChFailResponse):
+                chan = pending.pop((circuit, command.cid), None)
+                if chan is not None:
+                    errors[chan.name] = CaprotoError(
+                        f'Server at {circuit.host}:{circuit.port} failed to '
+                        f'create channel {chan.name!r}')
+            elif command is ca.DISCONNECTED:
+                error = connecting.get(circuit)
+                if not isinstance(error, OSError):
+                    error = CaprotoError('Disconnected during initialization')
+                for key in [key for key in pending if key[0] is circuit]:
+                    errors[pending.pop(key).name] = error
+        if not pending:
+            break
+
+    # Close the circuits which failed to connect, or on which no channel
+    # was created.
+    for circuit in circuits - set(chan.circuit for chan in channels.values()):
+        sockets.pop(circuit).close()
+    for (_, _), chan in pending.items():
+        errors[chan.name] = CaprotoTimeoutError(
+            "Timeout while awaiting channel creation.")
+    return channels, errors
+
+
+def _close_channels(channels):
+    'Clear channels, and close the circuits created by make_channels.'
+    circuits = set()
+    for chan in channels:
+        circuits.add(chan.circuit)
+        try:
+            if (chan.states[ca.CLIENT] is ca.CONNECTED and
+                    chan.circuit.states[ca.CLIENT] is ca.CONNECTED):
+                send(chan.circuit, chan.clear(), chan.name)
+        except (CaprotoError, OSError):
+            ...
+    for circuit in circuits:
+        sock = sockets.pop(circuit, None)
+        if sock is not None:
+            sock.close()
+
+
+def _request_many(requests, timeout):
+    """
+    Send requests, batched per circuit, and wait for all of the responses.
+
+    Parameters
+    ----------
+    requests : list
+        Of ``(channel, request)``, where a request of None is skipped.
+    timeout : float
+
+    Returns
+    -------
+    results : list
+        The response to each request (None if no response is expected, as for
+        a WriteRequest), or the exception describing its failure.
+    """
+    results = [None] * len(requests)
+    pending = {}  # map (circuit, ioid) to index
+    by_circuit = collections.defaultdict(list)
+    for index, (chan, request) in enumerate(requests):
+        if request is None:
+            continue
+        by_circuit[chan.circuit].append(request)
+        if isinstance(request, (ca.ReadRequest, ca.ReadNotifyRequest,
+                                ca.WriteNotifyRequest)):
+            pending[(chan.circuit, request.ioid)] = index
+
+    for circuit, circuit_requests in by_circuit.items():
+        sockets[circuit].sendall(b"".join(circuit.send(*circuit_requests)))
+    if not pending:
+        return results
+
+    deadline = time.monotonic() + timeout
+    for circuit, commands in _recv_many(list(by_circuit), deadline):
+        for command in commands:
+            if isinstance(command, (ca.ReadResponse, ca.ReadNotifyResponse,
+                                    ca.WriteNotifyResponse)):
+                index = pending.pop((circuit, command.ioid), None)
+                if index is not None:
+                    results[index] = command
+            elif isinstance(command, ca.ErrorResponse):
+                for key, index in list(pending.items()):
+                    chan, _ = requests[index]
+                    if key[0] is circuit and chan.cid == command.cid:
+                        del pending[key]
+                        results[index] = ErrorResponseReceived(command)
+            elif command is ca.DISCONNECTED:
+                for key in [key for key in pending if key[0] is circuit]:
+                    results[pending.pop(key)] = CaprotoError(
+                        'Disconnected while waiting for response')
+        if not pending:
+            break
+
+    for index in pending.values():
+        results[index] = CaprotoTimeoutError("Timeout while awaiting response.")
+    return results
+
+
+def read_many(pv_names, *, data_type=None, data_count=None,
+              timeout=common.GLOBAL_DEFAULT_TIMEOUT, priority=0, notify=True,
+              force_int_enums=False, repeater=True):
+    """
+    Read many Channels at once.
+
+    All PVs are searched for at once, and requests are pipelined on one
+    circuit per server, so the time taken does not grow with the number of
+    PVs, or of missing ones.
+
+    Parameters
+    ----------
+    pv_names : list of str
+        The PV names to read from
+    data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+        Request specific data type or a class of data types, matched to the
+        channel's native data type. Default is Channel's native data type.
+    data_count : integer, optional
+        Requested number of values. Default is the channel's native data
+        count.
+    timeout : float, optional
+        Timeout for each of: searching, connecting and reading.
+        Default is 1 second.
+    priority : 0, optional
+        Virtual Circuit priority. Default is 0, lowest. Highest is 99.
+    notify : boolean, optional
+        Send a ReadNotifyRequest instead of a ReadRequest. True by default.
+    force_int_enums : boolean, optional
+        Retrieve enums as integers. (Default is strings.)
+    repeater : boolean, optional
+        Spawn a Channel Access Repeater process if the port is available.
+        True default, as the Channel Access spec stipulates that well-behaved
+        clients should do this.
+
+    Returns
+    -------
+    responses : list
+        A ReadResponse or ReadNotifyResponse for each PV, in order, or the
+        exception describing why it could not be read.
+
+    Examples
+    --------
+
+    >>> for response in read_many(['simple:A', 'simple:B']):
+    ...     print(response.data)
+    """
+    if repeater:
+        # As per the EPICS spec, a well-behaved client should start a
+        # caproto-repeater that will continue running after it exits.
+        spawn_repeater()
+    udp_sock = ca.bcast_socket()
+    # Must bind or getsocketname() will raise on Windows.
+    # See https://github.com/caproto/caproto/issues/514.
+    udp_sock.bind(('', 0))
+    try:
+        channels, errors = make_channels(pv_names, udp_sock, priority, timeout)
+    finally:
+        udp_sock.close()
+    try:
+        requests = []
+        for name in pv_names:
+            chan = channels.get(name)
+            request = None
+            if chan is not None:
+                try:
+                    request = _read_request(chan, data_type, data_count,
+                                            notify, force_int_enums)
+                except CaprotoError as ex:
+                    errors[name] = ex
+            requests.append((chan, request))
+        results = _request_many(requests, timeout)
+    finally:
+        _close_channels(channels.values())
+    return [errors.get(name, result)
+            for name, result in zip(pv_names, results)]
+
+
+def read_write_read_many(pv_names, data, *, notify=False,
+                         read_data_type=None, write_data_type=None,
+                         metadata=None, timeout=common.GLOBAL_DEFAULT_TIMEOUT,
+                         priority=0, force_int_enums=False, repeater=True):
+    """
+    Write to many Channels at once, sandwiching the writes between two reads.
+
+    This is the multi-PV version of :func:`read_write_read`. All PVs are
+    searched for at once, and the requests of each step are pipelined on one
+    circuit per server.
+
+    Parameters
+    ----------
+    pv_names : list of str
+        The PV names to write/read/write
+    data : list
+        The value to write to each PV.
+    notify : boolean, optional
+        Request notification of completion and wait for it. False by default.
+    read_data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+        Request specific data type.
+    write_data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+        Write as specific data type. Default is inferred from input.
+    metadata : ``ctypes.BigEndianStructure`` or tuple
+        Status and control metadata for the values
+    timeout : float, optional
+        Timeout for each of: searching, connecting, reading, writing and
+        reading again.
+        Default is 1 second.
+    priority : 0, optional
+        Virtual Circuit priority. Default is 0, lowest. Highest is 99.
+    force_int_enums : boolean, optional
+        Retrieve enums as integers. (Default is strings.)
+    repeater : boolean, optional
+        Spawn a Channel Access Repeater process if the port is available.
+        True default, as the Channel Access spec stipulates that well-behaved
+        clients should do this.
+
+    Returns
+    -------
+    results : list
+        For each PV, in order, a tuple of responses ``(initial,
+        write_response, final)`` as from :func:`read_write_read`, or the
+        exception describing the failure.
+    """
+    if len(pv_names) != len(data):
+        raise CaprotoValueError('pv_names and data must have the same length')
+    if repeater:
+        # As per the EPICS spec, a well-behaved client should start a
+        # caproto-repeater that will continue running after it exits.
+        spawn_repeater()
+    udp_sock = ca.bcast_socket()
+    # Must bind or getsocketname() will raise on Windows.
+    # See https://github.com/caproto/caproto/issues/514.
+    udp_sock.bind(('', 0))
+    try:
+        channels, errors = make_channels(pv_names, udp_sock, priority, timeout)
+    finally:
+        udp_sock.close()
+
+    def request_step(make_request):
+        requests = []
+        for name, value in zip(pv_names, data):
+            chan = channels.get(name)
+            request = None
+            if chan is not None and name not in errors:
+                try:
+                    request = make_request(chan, value)
+                except (CaprotoError, ValueError, TypeError) as ex:
+                    errors[name] = ex
+            requests.append((chan, request))
+        results = _request_many(requests, timeout)
+        for name, result in zip(pv_names, results):
+            if isinstance(result, Exception):
+                errors.setdefault(name, result)
+        return results
+
+    try:
+        initial = request_step(
+            lambda chan, value: _read_request(chan, read_data_type, None,
+                                              True, force_int_enums))
+        written = request_step(
+            lambda chan, value: _write_request(chan, value, metadata,
+                                               write_data_type, notify))
+        final = request_step(
+            lambda chan, value: _read_request(chan, read_data_type, None,
+                                              True, force_int_enums))
+    finally:
+        _close_channels(channels.values())
+    return [errors.get(name, result)
+            for name, result in zip(pv_names, zip(initial, written, final))]
+
+
+class ChannelPool:
+    """
+    Keep channels open across calls to :func:`read` and :func:`write`.
+
+    By default, each call searches for the PV, creates a channel (and TCP
+    connection), and closes it again. Passing the same pool to repeated calls
+    instead caches search results and reuses channels and circuits. Channels
+    unused for ``idle_timeout`` are closed, as are the least recently used
+    ones beyond ``max_channels``.
+
+    A pool should not be shared between threads.
+
+    Parameters
+    ----------
+    idle_timeout : float, optional
+        Close channels unused for this number of seconds. Default is 60.
+    max_channels : int, optional
+        Maximum number of open channels. Default is 1000.
+    search_expiration : float, optional
+        Search results are reused for this number of seconds, unless
+        a channel can no longer be created with them.
+
+    Examples
+    --------
+
+    >>> with ChannelPool() as pool:
+    ...     for _ in range(100):
+    ...         read('simple:A', pool=pool)
+    """
+    def __init__(self, *, idle_timeout=60.0, max_channels=1000,
+                 search_expiration=STALE_SEARCH_EXPIRATION):
+        self.idle_timeout = idle_timeout
+        self.max_channels = max_channels
+        self.search_expiration = search_expiration
+        self.search_results = {}  # map name to (address, time)
+        self.circuits = {}  # map (address, priority) to VirtualCircuit
+        # map (name, priority) to [channel, last_used], least recent first
+        self.channels = collections.OrderedDict()
+        self._udp_sock = None
+
+    def __repr__(self):
+        return (f'<ChannelPool channels={len(self.channels)} '
+                f'circuits={len(self.circuits)}>')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _search(self, pv_name, timeout):
+        try:
+            address, found = self.search_results[pv_name]
+        except KeyError:
+            ...
+        else:
+            if time.monotonic() - found < self.search_expiration:
+                return address, True
+
+        if self._udp_sock is None:
+            udp_sock = ca.bcast_socket()
+            # Must bind or getsocketname() will raise on Windows.
+            # See https://github.com/caproto/caproto/issues/514.
+            udp_sock.bind(('', 0))
+            self._udp_sock = udp_sock
+        self._udp_sock.settimeout(timeout)
+        address = search(pv_name, self._udp_sock, timeout)
+        self.search_results[pv_name] = (address, time.monotonic())
+        return address, False
+
+    def get_channel(self, pv_name, priority=0,
+                    timeout=common.GLOBAL_DEFAULT_TIMEOUT):
+        """
+        Get a connected channel, reusing an open one if possible.
+
+        Parameters
+        ----------
+        pv_name : str
+        priority : int, optional
+        timeout : float, optional
+
+        Returns
+        -------
+        channel : caproto.ClientChannel
+        """
+        self.evict_idle()
+        key = (pv_name, priority)
+        entry = self.channels.get(key)
+        if entry is not None:
+            chan, _ = entry
+            if (chan.states[ca.CLIENT] is ca.CONNECTED and
+                    chan.circuit in sockets):
+                entry[1] = time.monotonic()
+                self.channels.move_to_end(key)
+                self._evict_least_recently_used()
+                sockets[chan.circuit].settimeout(timeout)
+                return chan
+            self.discard(pv_name, priority)
+
+        address, cached = self._search(pv_name, timeout)
+        try:
+            chan = _create_channel(pv_name, address, priority, timeout,
+                                   self.circuits)
+        except (CaprotoError, OSError):
+            if not cached:
+                raise
+            # The server may have moved; search again.
+            logger.debug('Cached search result for %r failed; searching.',
+                         pv_name)
+            self.search_results.pop(pv_name, None)
+            self._forget_dead_circuits()
+            address, _ = self._search(pv_name, timeout)
+            chan = _create_channel(pv_name, address, priority, timeout,
+                                   self.circuits)
+
+        sockets[chan.circuit].settimeout(timeout)
+        self.channels[key] = [chan, time.monotonic()]
+        self._evict_least_recently_used()
+        return chan
+
+    def _evict_least_recently_used(self):
+        'Close the least recently used channels beyond ``max_channels``.'
+        while len(self.channels) > self.max_channels:
+            name, priority = next(iter(self.channels))
+            self.discard(name, priority)
+
+    def _forget_dead_circuits(self):
+        'Drop channels on circuits whose sockets were closed.'
+        for (name, priority), (chan, _) in list(self.channels.items()):
+            if chan.circuit not in sockets:
+                self.discard(name, priority)
+        for key, circuit in list(self.circuits.items()):
+            if circuit not in sockets:
+                del self.circuits[key]
+
+    def discard(self, pv_name, priority=0):
+        """
+        Close the channel for a PV, if open, and its circuit if unused.
+        """
+        entry = self.channels.pop((pv_name, priority), None)
+        if entry is None:
+            return
+        chan, _ = entry
+        circuit = chan.circuit
+        try:
+            if (chan.states[ca.CLIENT] is ca.CONNECTED and
+                    circuit in sockets):
+                send(circuit, chan.clear(), chan.name)
+        except (CaprotoError, OSError):
+            logger.debug('Failed to clear channel %r', pv_name,
+                         exc_info=True)
+
+        if any(other.circuit is circuit for other, _ in self.channels.values()):
+            return
+        sock = sockets.pop(circuit, None)
+        if sock is not None:
+            sock.close()
+        key = (circuit.address, circuit.priority)
+        if self.circuits.get(key) is circuit:
+            del self.circuits[key]
+
+    def evict_idle(self):
+        'Close channels unused for longer than ``idle_timeout``.'
+        if self.idle_timeout is None:
+            return
+        threshold = time.monotonic() - self.idle_timeout
+        for (name, priority), (_, last_used) in list(self.channels.items()):
+            if last_used >= threshold:
+                # Ordered by last use; the remainder are more recent.
+                break
+            self.discard(name, priority)
+
+    def close(self):
+        'Close all channels and sockets.'
+        for name, priority in list(self.channels):
+            self.discard(name, priority)
+        self._forget_dead_circuits()
+        if self._udp_sock is not None:
+            self._udp_sock.close()
+            self._udp_sock = None
+
+
+def _read_request(chan, data_type, data_count, notify, force_int_enums):
     logger = chan.log
     logger.debug("Detected native data_type %r.", chan.native_data_type)
     ntype = native_type(chan.native_data_type)  # abundance of caution
@@ -218,7 +917,12 @@ def _read(chan, timeout, data_type, data_count, notify, force_int_enums):
             (data_type is None) and (not force_int_enums)):
         logger.debug("Changing requested data_type to STRING.")
         data_type = ChannelType.STRING
-    req = chan.read(data_type=data_type, data_count=data_count, notify=notify)
+    return chan.read(data_type=data_type, data_count=data_count, notify=notify)
+
+
+def _read(chan, timeout, data_type, data_count, notify, force_int_enums):
+    logger = chan.log
+    req = _read_request(chan, data_type, data_count, notify, force_int_enums)
     send(chan.circuit, req, chan.name)
     t = time.monotonic()
     while True:
@@ -249,7 +953,7 @@ def _read(chan, timeout, data_type, data_count, notify, force_int_enums):
 
 def read(pv_name, *, data_type=None, data_count=None,
          timeout=common.GLOBAL_DEFAULT_TIMEOUT, priority=0, notify=True,
-         force_int_enums=False, repeater=True):
+         force_int_enums=False, repeater=True, pool=None):
     """
     Read a Channel.
 
@@ -275,6 +979,10 @@ def read(pv_name, *, data_type=None, data_count=None,
         Spawn a Channel Access Repeater process if the port is available.
         True default, as the Channel Access spec stipulates that well-behaved
         clients should do this.
+    pool : ChannelPool, optional
+        Reuse search results and channels from this pool, leaving the channel
+        open afterward. By default, the channel is created and closed within
+        this call.
 
     Returns
     -------
@@ -340,6 +1048,15 @@ def read(pv_name, *, data_type=None, data_count=None,
         # As per the EPICS spec, a well-behaved client should start a
         # caproto-repeater that will continue running after it exits.
         spawn_repeater()
+    if pool is not None:
+        chan = pool.get_channel(pv_name, priority, timeout)
+        try:
+            return _read(chan, timeout, data_type=data_type,
+                         data_count=data_count, notify=notify,
+                         force_int_enums=force_int_enums)
+        except (CaprotoError, OSError):
+            pool.discard(pv_name, priority)
+            raise
     udp_sock = ca.bcast_socket()
     # Must bind or getsocketname() will raise on Windows.
     # See https://github.com/caproto/caproto/issues/514.
@@ -561,7 +1278,7 @@ def block(*subscriptions, duration=None, timeout=common.GLOBAL_DEFAULT_TIMEOUT,
                 del global_circuits[(chan.circuit.address, chan.circuit.priority)]
 
 
-def _write(chan, data, metadata, timeout, data_type, notify):
+def _write_request(chan, data, metadata, data_type, notify):
     logger.debug("Detected native data_type %r.", chan.native_data_type)
     # abundance of caution
     ntype = field_types['native'][chan.native_data_type]
@@ -580,8 +1297,12 @@ def _write(chan, data, metadata, timeout, data_type, notify):
             logger.debug("Will write to ENUM as data_type STRING.")
             data_type = ChannelType.STRING
     logger.debug("Writing.")
-    req = chan.write(data=data, notify=notify,
-                     data_type=data_type, metadata=metadata)
+    return chan.write(data=data, notify=notify,
+                      data_type=data_type, metadata=metadata)
+
+
+def _write(chan, data, metadata, timeout, data_type, notify):
+    req = _write_request(chan, data, metadata, data_type, notify)
     send(chan.circuit, req, chan.name)
     t = time.monotonic()
     if notify:
@@ -619,7 +1340,8 @@ def _write(chan, data, metadata, timeout, data_type, notify):
 
 
 def write(pv_name, data, *, notify=False, data_type=None, metadata=None,
-          timeout=common.GLOBAL_DEFAULT_TIMEOUT, priority=0, repeater=True):
+          timeout=common.GLOBAL_DEFAULT_TIMEOUT, priority=0, repeater=True,
+          pool=None):
     """
     Write to a Channel.
 
@@ -643,6 +1365,10 @@ def write(pv_name, data, *, notify=False, data_type=None, metadata=None,
         Spawn a Channel Access Repeater process if the port is available.
         True default, as the Channel Access spec stipulates that well-behaved
         clients should do this.
+    pool : ChannelPool, optional
+        Reuse search results and channels from this pool, leaving the channel
+        open afterward. By default, the channel is created and closed within
+        this call.
 
     Returns
     -------
@@ -671,6 +1397,13 @@ def write(pv_name, data, *, notify=False, data_type=None, metadata=None,
         # caproto-repeater that will continue running after it exits.
         spawn_repeater()
 
+    if pool is not None:
+        chan = pool.get_channel(pv_name, priority, timeout)
+        try:
+            return _write(chan, data, metadata, timeout, data_type, notify)
+        except (CaprotoError, OSError):
+            pool.discard(pv_name, priority)
+            raise
     udp_sock = ca.bcast_socket()
     # Must bind or getsocketname() will raise on Windows.
     # See https://github.com/caproto/caproto/issues/514.
@@ -695,7 +1428,8 @@ def write(pv_name, data, *, notify=False, data_type=None, metadata=None,
 def read_write_read(pv_name, data, *, notify=False,
                     read_data_type=None, write_data_type=None,
                     metadata=None, timeout=common.GLOBAL_DEFAULT_TIMEOUT,
-                    priority=0, force_int_enums=False, repeater=True):
+                    priority=0, force_int_enums=False, repeater=True,
+                    pool=None):
     """
     Write to a Channel, but sandwich the write between to reads.
 
@@ -733,6 +1467,10 @@ def read_write_read(pv_name, data, *, notify=False,
         Spawn a Channel Access Repeater process if the port is available.
         True default, as the Channel Access spec stipulates that well-behaved
         clients should do this.
+    pool : ChannelPool, optional
+        Reuse search results and channels from this pool, leaving the channel
+        open afterward. By default, the channel is created and closed within
+        this call.
 
     Returns
     -------
@@ -757,6 +1495,20 @@ def read_write_read(pv_name, data, *, notify=False,
         # caproto-repeater that will continue running after it exits.
         spawn_repeater()
 
+    if pool is not None:
+        chan = pool.get_channel(pv_name, priority, timeout)
+        try:
+            initial = _read(chan, timeout, read_data_type, None, notify=True,
+                            force_int_enums=force_int_enums)
+            res = _write(chan, data, metadata, timeout, write_data_type,
+                         notify)
+            final = _read(chan, timeout, read_data_type, None, notify=True,
+                          force_int_enums=force_int_enums)
+        except (CaprotoError, OSError):
+            pool.discard(pv_name, priority)
+            raise
+        return initial, res, final
+
     udp_sock = ca.bcast_socket()
     # Must bind or getsocketname() will raise on Windows.
     # See https://github.com/caproto/caproto/issues/514.
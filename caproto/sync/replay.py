@@ -0,0 +1,616 @@
+"""
+Replay captured Channel Access traffic for realistic load tests.
+
+Traffic is captured with :func:`caproto.start_traffic_capture`, by a client or
+by a server. :func:`replay_to_server` sends the requests of every captured
+client again, over fresh connections, to a (local) server and measures how
+quickly it responds. :func:`replay_to_client` feeds a client's captured
+traffic back through the client side of caproto's protocol layer, to measure
+how quickly it is processed.
+
+Either way, the traffic may be replayed at the captured pace (``speed=1``),
+faster (``speed=10``), or as fast as possible (``speed=None``).
+"""
+import collections
+import selectors
+import socket
+import struct
+import time
+
+from .._capture import CaptureRecord, read_capture
+from .._circuit import ClientChannel, VirtualCircuit
+from .._commands import (ClearChannelRequest, CreateChanRequest,
+                         CreateChanResponse, CreateChFailResponse,
+                         EchoRequest, EchoResponse, EventAddRequest,
+                         EventAddResponse, EventCancelRequest, ReadNotifyRequest,
+                         ReadNotifyResponse, ReadRequest, ReadResponse,
+                         SearchRequest, SearchResponse, VersionRequest,
+                         WriteNotifyRequest, WriteNotifyResponse, WriteRequest,
+                         read_datagram, read_from_bytestream)
+from .._constants import MAX_UDP_RECV
+from .._utils import (CLIENT, NEED_DATA, SERVER, CaprotoError,
+                      get_environment_variables)
+
+__all__ = ('ReplayReport', 'replay_to_server', 'replay_to_client')
+
+
+# Requests which refer to a channel by the id the server gave it. These are
+# rewritten with the id given by the server replayed to.
+_SID_REQUESTS = (ReadNotifyRequest, ReadRequest, WriteNotifyRequest,
+                 WriteRequest, EventAddRequest, EventCancelRequest,
+                 ClearChannelRequest)
+# The sid is parameter1 of the header, at the same offset in the extended
+# header.
+_SID_OFFSET = 8
+
+
+class ReplayReport:
+    """
+    The outcome of a replay.
+
+    Attributes
+    ----------
+    duration : float
+        Seconds from the first message replayed to the last one processed.
+    messages_sent, bytes_sent : int
+        Messages and bytes replayed.
+    messages_received, bytes_received : int
+        Messages and bytes received in response (:func:`replay_to_server`),
+        or processed (:func:`replay_to_client`).
+    skipped : int
+        Messages which could not be replayed, such as requests for channels
+        created before the capture started.
+    unanswered : int
+        Requests still awaiting a response at the end.
+    latencies : list of float
+        For :func:`replay_to_server`, the seconds from each request to its
+        response. For :func:`replay_to_client` at a given speed, the seconds
+        by which processing each received message lagged behind the
+        schedule.
+    """
+    def __init__(self):
+        self.duration = 0.0
+        self.messages_sent = 0
+        self.bytes_sent = 0
+        self.messages_received = 0
+        self.bytes_received = 0
+        self.skipped = 0
+        self.unanswered = 0
+        self.latencies = []
+
+    def __repr__(self):
+        return (f"<ReplayReport messages_sent={self.messages_sent} "
+                f"messages_received={self.messages_received} "
+                f"duration={self.duration:.3f}>")
+
+    @property
+    def messages_per_second(self):
+        'Messages sent and received per second.'
+        if not self.duration:
+            return 0.0
+        return (self.messages_sent + self.messages_received) / self.duration
+
+    @property
+    def bytes_per_second(self):
+        'Bytes sent and received per second.'
+        if not self.duration:
+            return 0.0
+        return (self.bytes_sent + self.bytes_received) / self.duration
+
+    def latency_percentiles(self, percentiles=(50, 90, 99, 100)):
+        """
+        Percentiles of :attr:`latencies`, by the nearest-rank method.
+
+        Returns
+        -------
+        percentiles : dict
+            Maps each percentile to the latency in seconds, or None if there
+            were no latencies measured.
+        """
+        latencies = sorted(self.latencies)
+        result = {}
+        for percentile in percentiles:
+            if not latencies:
+                result[percentile] = None
+                continue
+            rank = max(1, -(-percentile * len(latencies) // 100))
+            result[percentile] = latencies[rank - 1]
+        return result
+
+    def format(self):
+        'A human-readable summary.'
+        lines = [
+            f'duration: {self.duration:.3f} s',
+            f'sent: {self.messages_sent} messages, {self.bytes_sent} bytes',
+            f'received: {self.messages_received} messages, '
+            f'{self.bytes_received} bytes',
+            f'throughput: {self.messages_per_second:.1f} messages/s, '
+            f'{self.bytes_per_second / 1e6:.3f} MB/s',
+            f'skipped: {self.skipped}, unanswered: {self.unanswered}',
+        ]
+        percentiles = self.latency_percentiles()
+        if self.latencies:
+            lines.append('latency: ' + ', '.join(
+                f'p{percentile} {latency * 1e3:.3f} ms'
+                for percentile, latency in percentiles.items()))
+        return '\n'.join(lines)
+
+
+def _parse_stream(data, their_role):
+    'Parse commands from a bytearray, leaving the incomplete remainder.'
+    commands = []
+    # Parse from a copy, which the commands may reference.
+    view = memoryview(bytearray(data))
+    while True:
+        view, command, _ = read_from_bytestream(view, their_role)
+        if command is NEED_DATA:
+            break
+        commands.append(command)
+    del data[:len(data) - len(view)]
+    return commands
+
+
+def _request_key(command):
+    'The key by which the response to a request is matched, if any.'
+    if isinstance(command, (ReadNotifyRequest, ReadRequest,
+                            WriteNotifyRequest)):
+        return ('ioid', command.ioid)
+    elif isinstance(command, CreateChanRequest):
+        return ('cid', command.cid)
+    elif isinstance(command, EventAddRequest):
+        return ('sub', command.subscriptionid)
+    elif isinstance(command, EchoRequest):
+        return ('echo', )
+    return None
+
+
+def _response_key(command):
+    'The key of the request which a response answers, if any.'
+    if isinstance(command, (ReadNotifyResponse, ReadResponse,
+                            WriteNotifyResponse)):
+        return ('ioid', command.ioid)
+    elif isinstance(command, (CreateChanResponse, CreateChFailResponse)):
+        return ('cid', command.cid)
+    elif isinstance(command, EventAddResponse):
+        return ('sub', command.subscriptionid)
+    elif isinstance(command, EchoResponse):
+        return ('echo', )
+    return None
+
+
+class _Requests:
+    'Requests awaiting responses, in order to time them and count answers.'
+    def __init__(self):
+        self.pending = {}
+        self.answered = 0
+
+    def __len__(self):
+        return sum(len(times) for times in self.pending.values())
+
+    def sent(self, command, now):
+        key = _request_key(command)
+        if key is not None:
+            self.pending.setdefault(key, collections.deque()).append(now)
+
+    def received(self, command, now):
+        'Return the latency of a response, or None if it answers nothing.'
+        times = self.pending.get(_response_key(command))
+        if not times:
+            return None
+        self.answered += 1
+        return now - times.popleft()
+
+
+class _Connection:
+    'A captured TCP connection from a client, replayed to a server.'
+    def __init__(self, stream):
+        self.stream = stream
+        self._requests = bytearray()
+        self._responses = bytearray()
+        self._captured = _Requests()
+        # (timestamp, command, answered): each request sent by the client,
+        # with how many of its requests had been answered by then. Replaying
+        # a request waits for as many answers, so that the client's requests
+        # are no more concurrent than they were.
+        self.events = collections.deque()
+        # map the captured server's channel ids to client channel ids
+        self.captured_cids = {}
+        # map client channel ids to the ids of the server replayed to
+        self.sids = {}
+        self.requests = _Requests()
+        self.sock = None
+        self.incoming = bytearray()
+        self.outgoing = bytearray()
+        self.blocked_since = None
+        self.closed = False
+
+    def captured(self, record, to_server):
+        if to_server:
+            self._requests += record.data
+            for command in _parse_stream(self._requests, CLIENT):
+                self.events.append((record.timestamp, command,
+                                    self._captured.answered))
+                self._captured.sent(command, record.timestamp)
+        else:
+            self._responses += record.data
+            for command in _parse_stream(self._responses, SERVER):
+                if isinstance(command, CreateChanResponse):
+                    self.captured_cids[command.sid] = command.cid
+                self._captured.received(command, record.timestamp)
+
+    def prepare(self, command, answered):
+        """
+        Return the bytes to send for a command, or NEED_DATA if it must wait
+        for responses, or None if it cannot be replayed.
+        """
+        if self.requests.answered < answered:
+            return NEED_DATA
+        if not isinstance(command, _SID_REQUESTS):
+            return bytes(command)
+        try:
+            sid = self.sids[self.captured_cids[command.sid]]
+        except KeyError:
+            # The channel was created before the capture started, or could
+            # not be created this time.
+            return None
+        data = bytearray(bytes(command))
+        struct.pack_into('>I', data, _SID_OFFSET, sid)
+        return data
+
+    def received(self, command, now):
+        'Return the latency of a response, or None.'
+        if isinstance(command, CreateChanResponse):
+            self.sids[command.cid] = command.sid
+        return self.requests.received(command, now)
+
+
+def _load_workload(file):
+    'Collect the requests which captured clients sent to servers.'
+    connections = {}
+    searches = []  # (timestamp, datagram)
+    for item in read_capture(file):
+        if not isinstance(item, CaptureRecord):
+            continue
+        stream = item.stream
+        to_server = item.sent == (stream.our_role is CLIENT)
+        if stream.transport == 'udp':
+            if not to_server:
+                continue
+            commands = read_datagram(item.data, stream.their_address, CLIENT)
+            # Leave out registrations with the repeater, for example.
+            commands = [command for command in commands
+                        if isinstance(command, (VersionRequest,
+                                                SearchRequest))]
+            if any(isinstance(command, SearchRequest)
+                   for command in commands):
+                searches.append((item.timestamp, commands))
+            continue
+        try:
+            connection = connections[stream.id]
+        except KeyError:
+            connection = connections[stream.id] = _Connection(stream)
+        connection.captured(item, to_server)
+    # Connections captured after they started are left out.
+    replayable = []
+    skipped = 0
+    for connection in connections.values():
+        if (connection.events and
+                isinstance(connection.events[0][1], VersionRequest)):
+            replayable.append(connection)
+        else:
+            skipped += len(connection.events)
+    return replayable, searches, skipped
+
+
+def replay_to_server(file, host='127.0.0.1', port=None, *, speed=1.0,
+                     timeout=2.0):
+    """
+    Replay the requests of the clients in a capture to a server.
+
+    Each captured TCP connection of a client is replayed over a new
+    connection, and each captured search is sent again by UDP. Requests are
+    sent on the captured schedule, scaled by ``speed``. The ids which the
+    captured server gave to channels are replaced by the ones given by the
+    server replayed to, so the server need not be the one captured---but it
+    should serve the same PVs. Connections captured after they started, and
+    requests regarding channels created before the capture started, are
+    skipped.
+
+    Parameters
+    ----------
+    file : str or binary file-like
+        The capture.
+    host : str, optional
+        The address of the server. Default is the local host.
+    port : int, optional
+        The port of the server. Default is EPICS_CA_SERVER_PORT.
+    speed : float or None, optional
+        Multiple of the captured pace. If None, replay as fast as possible.
+    timeout : float, optional
+        Seconds to wait for outstanding responses at the end, and for a
+        channel to be created before skipping the requests which use it.
+
+    Returns
+    -------
+    report : ReplayReport
+    """
+    if port is None:
+        port = get_environment_variables()['EPICS_CA_SERVER_PORT']
+    connections, searches, skipped = _load_workload(file)
+    report = ReplayReport()
+    report.skipped = skipped
+    timestamps = [connection.events[0][0] for connection in connections]
+    timestamps.extend(timestamp for timestamp, _ in searches[:1])
+    if not timestamps:
+        return report
+    first_timestamp = min(timestamps)
+
+    def due(timestamp):
+        if not speed:
+            return start
+        return start + (timestamp - first_timestamp) / speed
+
+    selector = selectors.DefaultSelector()
+    udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    udp_sock.setblocking(False)
+    selector.register(udp_sock, selectors.EVENT_READ, None)
+    searches = collections.deque(searches)
+    search_times = {}
+
+    def received(connection, commands, now):
+        for command in commands:
+            report.messages_received += 1
+            report.bytes_received += len(command)
+            latency = connection.received(command, now)
+            if latency is not None:
+                report.latencies.append(latency)
+
+    def read_udp(now):
+        while True:
+            try:
+                data, address = udp_sock.recvfrom(MAX_UDP_RECV)
+            except BlockingIOError:
+                return
+            for command in read_datagram(data, address, SERVER):
+                report.messages_received += 1
+                report.bytes_received += len(command)
+                if isinstance(command, SearchResponse):
+                    sent = search_times.pop(command.cid, None)
+                    if sent is not None:
+                        report.latencies.append(now - sent)
+
+    def read_tcp(connection, now):
+        try:
+            data = connection.sock.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            close(connection)
+            return
+        connection.incoming += data
+        received(connection, _parse_stream(connection.incoming, SERVER), now)
+
+    def write_tcp(connection):
+        try:
+            sent = connection.sock.send(connection.outgoing)
+        except BlockingIOError:
+            return
+        except OSError:
+            close(connection)
+            return
+        del connection.outgoing[:sent]
+
+    def close(connection):
+        if connection.sock is not None:
+            selector.unregister(connection.sock)
+            connection.sock.close()
+            connection.sock = None
+        connection.closed = True
+        report.skipped += len(connection.events)
+        connection.events.clear()
+
+    def update_interest(connection):
+        events = selectors.EVENT_READ
+        if connection.outgoing:
+            events |= selectors.EVENT_WRITE
+        selector.modify(connection.sock, events, connection)
+
+    start = time.monotonic()
+    last_activity = start
+    try:
+        while True:
+            now = time.monotonic()
+            next_due = None
+            # Send what is due.
+            while searches and due(searches[0][0]) <= now:
+                _, commands = searches.popleft()
+                for command in commands:
+                    if isinstance(command, SearchRequest):
+                        search_times[command.cid] = now
+                data = b''.join(bytes(command) for command in commands)
+                try:
+                    udp_sock.sendto(data, (host, port))
+                except OSError:
+                    report.skipped += len(commands)
+                else:
+                    report.messages_sent += len(commands)
+                    report.bytes_sent += len(data)
+            if searches:
+                next_due = due(searches[0][0])
+            for connection in connections:
+                if connection.closed:
+                    continue
+                while connection.events:
+                    timestamp, command, answered = connection.events[0]
+                    if due(timestamp) > now:
+                        break
+                    data = connection.prepare(command, answered)
+                    if data is NEED_DATA:
+                        if connection.blocked_since is None:
+                            connection.blocked_since = now
+                        if now - connection.blocked_since < timeout:
+                            break
+                        # Give up waiting.
+                        data = connection.prepare(command, 0)
+                    connection.blocked_since = None
+                    connection.events.popleft()
+                    if data is None:
+                        report.skipped += 1
+                        continue
+                    if connection.sock is None:
+                        try:
+                            connection.sock = socket.create_connection(
+                                (host, port), timeout=timeout)
+                        except OSError:
+                            connection.events.appendleft(
+                                (timestamp, command, answered))
+                            close(connection)
+                            break
+                        connection.sock.setblocking(False)
+                        selector.register(connection.sock,
+                                          selectors.EVENT_READ, connection)
+                    connection.outgoing += data
+                    connection.requests.sent(command, now)
+                    report.messages_sent += 1
+                    report.bytes_sent += len(data)
+                if connection.sock is not None:
+                    if connection.outgoing:
+                        write_tcp(connection)
+                    if connection.sock is not None:
+                        update_interest(connection)
+                if connection.events and not connection.closed:
+                    if connection.blocked_since is not None:
+                        # Until the response arrives, or the timeout.
+                        wake = connection.blocked_since + timeout
+                    else:
+                        wake = due(connection.events[0][0])
+                    next_due = wake if next_due is None else min(next_due,
+                                                                 wake)
+
+            waiting = (search_times or
+                       any(connection.requests or
+                           connection.outgoing
+                           for connection in connections
+                           if not connection.closed))
+            if next_due is None:
+                if not waiting or now - last_activity > timeout:
+                    break
+                select_timeout = timeout - (now - last_activity)
+            else:
+                select_timeout = max(0.0, next_due - now)
+
+            for key, mask in selector.select(select_timeout):
+                now = time.monotonic()
+                last_activity = now
+                connection = key.data
+                if connection is None:
+                    read_udp(now)
+                    continue
+                if mask & selectors.EVENT_READ:
+                    read_tcp(connection, now)
+                if connection.sock is not None and mask & selectors.EVENT_WRITE:
+                    write_tcp(connection)
+                    if connection.sock is not None:
+                        update_interest(connection)
+    finally:
+        report.duration = last_activity - start
+        for connection in connections:
+            report.unanswered += len(connection.requests)
+            if connection.sock is not None:
+                selector.unregister(connection.sock)
+                connection.sock.close()
+        report.unanswered += len(search_times)
+        selector.unregister(udp_sock)
+        udp_sock.close()
+        selector.close()
+    return report
+
+
+def replay_to_client(file, *, speed=None):
+    """
+    Replay the traffic of the clients in a capture through the client side of
+    the protocol layer.
+
+    For each captured TCP connection of a client, a client
+    :class:`~caproto.VirtualCircuit` sends the captured requests and receives
+    and processes the captured responses, in order, on the captured schedule
+    scaled by ``speed``. No sockets are involved, so this measures how quickly
+    caproto itself can keep up with the traffic. Connections captured after
+    they started are skipped.
+
+    Parameters
+    ----------
+    file : str or binary file-like
+        A capture made by a client.
+    speed : float or None, optional
+        Multiple of the captured pace. If None, replay as fast as possible.
+
+    Returns
+    -------
+    report : ReplayReport
+    """
+    report = ReplayReport()
+    records = [item for item in read_capture(file)
+               if isinstance(item, CaptureRecord) and
+               item.stream.transport == 'tcp' and
+               item.stream.our_role is CLIENT]
+    if not records:
+        return report
+    circuits = {}
+    unparsed = collections.defaultdict(bytearray)
+    skipped_streams = set()
+    first_timestamp = records[0].timestamp
+    start = time.monotonic()
+    for record in records:
+        stream = record.stream
+        if stream.id in skipped_streams:
+            continue
+        scheduled = start
+        if speed:
+            scheduled += (record.timestamp - first_timestamp) / speed
+            delay = scheduled - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        circuit = circuits.get(stream.id)
+        if record.sent:
+            data = unparsed[stream.id]
+            data += record.data
+            commands = _parse_stream(data, CLIENT)
+            if circuit is None:
+                if not commands or not isinstance(commands[0],
+                                                  VersionRequest):
+                    skipped_streams.add(stream.id)
+                    report.skipped += len(commands)
+                    continue
+                circuit = circuits[stream.id] = VirtualCircuit(
+                    CLIENT, stream.their_address, commands[0].priority)
+                circuit.our_address = stream.our_address
+            for command in commands:
+                if isinstance(command, CreateChanRequest):
+                    ClientChannel(command.name, circuit, cid=command.cid)
+                try:
+                    circuit.send(command)
+                except CaprotoError:
+                    report.skipped += 1
+                    continue
+                report.messages_sent += 1
+                report.bytes_sent += len(command)
+        else:
+            if circuit is None:
+                continue
+            commands, _ = circuit.recv(record.data)
+            for command in commands:
+                try:
+                    circuit.process_command(command)
+                except CaprotoError:
+                    report.skipped += 1
+                    continue
+                report.messages_received += 1
+                report.bytes_received += len(command)
+            if speed:
+                report.latencies.append(
+                    max(0.0, time.monotonic() - scheduled))
+    report.duration = time.monotonic() - start
+    return report
@@ -1,9 +1,24 @@
+"""
+Parse Channel Access traffic out of pcap (tcpdump) captures.
+
+:func:`shark` yields every command with its networking context.
+:func:`summarize` aggregates traffic per host without building commands, and
+:func:`build_index` writes an index by PV name and time that later calls to
+either function may use to read only the relevant parts of a large capture.
+
+Only :func:`shark` requires dpkt, to decode the Ethernet, IP and transport
+layers it yields.
+"""
+import bisect
+import collections
 import ctypes
-from dpkt.pcap import Reader
-from dpkt.ethernet import Ethernet
-from dpkt.tcp import TCP
-from dpkt.udp import UDP
-from dpkt.ip import IP
+import itertools
+import json
+import os
+import struct
+import sys
+from array import array
+from collections import namedtuple
 from socket import inet_ntoa
 from types import SimpleNamespace
 
@@ -23,8 +38,8 @@ from .._commands import (AccessRightsResponse, CreateChFailResponse,
                          ReadNotifyResponse, ReadResponse,
                          SearchResponse, ServerDisconnResponse,
                          VersionRequest, VersionResponse, WriteNotifyRequest,
-                         WriteNotifyResponse, WriteRequest)
-from .._utils import ValidationError
+                         WriteNotifyResponse, WriteRequest, STR_ENC)
+from .._utils import CLIENT, SERVER, CaprotoValueError, ValidationError
 
 
 # These are similar to read_datagram and read_from_bytestream in _commands.py
@@ -239,7 +254,493 @@ def infer_command_class(header):
             raise ValidationError("Unknown command ID")
 
 
-def shark(file):
+# Streaming parsing
+#
+# The code below reads pcap files directly, rather than with dpkt, and decodes
+# only what is needed to follow Channel Access: IPv4 addresses, ports and, for
+# TCP, sequence numbers. TCP payloads are reassembled per flow, so commands
+# split across segments are found, and each flow is parsed only once enough
+# bytes are buffered for its next command.
+
+_PCAP_HEADER_SIZE = 24
+_PCAP_RECORD_SIZE = 16
+_MICROSECOND_MAGIC = 0xa1b2c3d4
+_NANOSECOND_MAGIC = 0xa1b23c4d
+_LINKTYPE_ETHERNET = 1
+
+_ETHERTYPE = struct.Struct('>H')
+_ETHERTYPE_IPV4 = 0x0800
+_ETHERTYPES_VLAN = (0x8100, 0x88a8)
+# version and header length, total length, flags and fragment offset,
+# protocol, source and destination
+_IPV4 = struct.Struct('>BxHxxHxBxx4s4s')
+_TCP = struct.Struct('>HHIxxxxBB')
+_UDP = struct.Struct('>HH')
+_TCP_FIN = 0x01
+_TCP_SYN = 0x02
+_TCP_RST = 0x04
+_SEQ_MASK = 0xffffffff
+
+# Consecutive parsing failures after which a TCP flow is taken not to be CA.
+_MAX_ERRORS = 3
+
+
+class _PcapFile:
+    """
+    The packets of a pcap file.
+
+    Parameters
+    ----------
+    file : binary file-like
+        This must be seekable only to read from a given offset.
+    """
+    def __init__(self, file):
+        self.file = file
+        header = file.read(_PCAP_HEADER_SIZE)
+        if len(header) < _PCAP_HEADER_SIZE:
+            raise CaprotoValueError("Not enough bytes to be a pcap file")
+        for byte_order in '<>':
+            magic, = struct.unpack_from(byte_order + 'I', header)
+            if magic in (_MICROSECOND_MAGIC, _NANOSECOND_MAGIC):
+                break
+        else:
+            raise CaprotoValueError("Not a pcap file (pcapng is not "
+                                    "supported)")
+        self.divisor = 1e9 if magic == _NANOSECOND_MAGIC else 1e6
+        linktype, = struct.unpack_from(byte_order + 'I', header, 20)
+        if linktype != _LINKTYPE_ETHERNET:
+            raise CaprotoValueError(f"Unsupported pcap link type {linktype}; "
+                                    f"only Ethernet captures are supported")
+        self._record = struct.Struct(byte_order + 'IIII')
+
+    def packets(self, offset=None):
+        """
+        Yield (offset, timestamp, frame) for each packet.
+
+        The offset is that of the packet in the file. Start from the given
+        offset, or else from the first packet, which must be next in the file.
+        """
+        read = self.file.read
+        unpack = self._record.unpack
+        divisor = self.divisor
+        if offset is None:
+            offset = _PCAP_HEADER_SIZE
+        else:
+            self.file.seek(offset)
+        while True:
+            record = read(_PCAP_RECORD_SIZE)
+            if len(record) < _PCAP_RECORD_SIZE:
+                # The end, or a truncated capture that is still being written.
+                return
+            seconds, fraction, length, _ = unpack(record)
+            frame = read(length)
+            if len(frame) < length:
+                return
+            yield offset, seconds + fraction / divisor, frame
+            offset += _PCAP_RECORD_SIZE + length
+
+
+def _decode_frame(frame):
+    """
+    Decode the IPv4 and TCP or UDP headers of an Ethernet frame.
+
+    Returns
+    -------
+    decoded : tuple or None
+        (is_tcp, src, sport, dst, dport, seq, flags, payload), with ``seq``
+        and ``flags`` 0 for UDP, or None for any other kind of frame and for
+        IP fragments.
+    """
+    try:
+        start = 14
+        ethertype, = _ETHERTYPE.unpack_from(frame, 12)
+        while ethertype in _ETHERTYPES_VLAN:
+            ethertype, = _ETHERTYPE.unpack_from(frame, start + 2)
+            start += 4
+        if ethertype != _ETHERTYPE_IPV4:
+            return None
+        (version_and_length, length, fragment, protocol, src,
+         dst) = _IPV4.unpack_from(frame, start)
+        if fragment & 0x3fff:
+            return None
+        # The length is 0 in outgoing packets captured before segmentation
+        # offload. Otherwise, it excludes any Ethernet padding.
+        end = start + length if length else len(frame)
+        start += (version_and_length & 0x0f) * 4
+        if protocol == 6:
+            sport, dport, seq, data_offset, flags = _TCP.unpack_from(frame,
+                                                                     start)
+            payload = memoryview(frame)[start + (data_offset >> 4) * 4:end]
+            return (True, inet_ntoa(src), sport, inet_ntoa(dst), dport, seq,
+                    flags, payload)
+        if protocol == 17:
+            sport, dport = _UDP.unpack_from(frame, start)
+            payload = memoryview(frame)[start + 8:end]
+            return (False, inet_ntoa(src), sport, inet_ntoa(dst), dport, 0, 0,
+                    payload)
+    except struct.error:
+        # Truncated by the capture's snapshot length.
+        pass
+    return None
+
+
+def _split_messages(data):
+    """
+    Split a bytearray into commands, without building them.
+
+    Returns
+    -------
+    (messages, consumed, needed)
+        A list of ``(position, header, class_, payload)`` for each complete
+        command, the number of bytes they span, and the number of bytes the
+        next command needs, counting from its start.
+    """
+    messages = []
+    view = memoryview(data)
+    size = len(data)
+    position = 0
+    while True:
+        remaining = size - position
+        if remaining < _MessageHeaderSize:
+            return messages, position, _MessageHeaderSize
+        header = MessageHeader.from_buffer(data, position)
+        header_size = _MessageHeaderSize
+        # Looks for sentinels that mark this as an "extended header".
+        if header.payload_size == 0xFFFF and header.data_count == 0:
+            header_size = _ExtendedMessageHeaderSize
+            if remaining < header_size:
+                return messages, position, header_size
+            header = ExtendedMessageHeader.from_buffer(data, position)
+        end = position + header_size + header.payload_size
+        if end > size:
+            return messages, position, end - position
+        messages.append((position, header, infer_command_class(header),
+                         view[position + header_size:end]))
+        position = end
+
+
+class _Flow:
+    "Reassemble and parse the bytes sent one way over a TCP connection."
+    __slots__ = ('next_seq', 'buffer', 'start', 'segments', 'needed',
+                 'errors')
+
+    def __init__(self, next_seq=None):
+        self.next_seq = next_seq
+        self.buffer = bytearray()
+        # The position in the stream of buffer[0] and, oldest first, the
+        # positions where buffered segments start, with their packet offsets.
+        self.start = 0
+        self.segments = collections.deque()
+        self.needed = _MessageHeaderSize
+        self.errors = 0
+
+    def reset(self):
+        "Drop any partial command, resuming parsing at the next segment."
+        self.start += len(self.buffer)
+        self.buffer.clear()
+        self.segments.clear()
+        self.needed = _MessageHeaderSize
+
+    def feed(self, seq, payload, offset):
+        "Add a segment. Return True if a command may be complete."
+        behind = 0
+        if self.next_seq is not None:
+            behind = (self.next_seq - seq) & _SEQ_MASK
+            if behind > _SEQ_MASK >> 1:
+                # Bytes are missing: dropped from the capture, or out of
+                # order. The rest of the partial command will not come.
+                self.reset()
+                behind = 0
+            elif behind >= len(payload):
+                # A retransmission
+                return False
+        self.segments.append((self.start + len(self.buffer) - behind,
+                              offset))
+        self.buffer += payload[behind:]
+        self.next_seq = (seq + len(payload)) & _SEQ_MASK
+        return len(self.buffer) >= self.needed
+
+    def parse(self):
+        """
+        Parse the complete commands buffered.
+
+        Returns
+        -------
+        messages : list
+            ``(offset, position, header, class_, payload)`` for each command,
+            which starts at ``position`` in the payload of the packet at
+            ``offset``.
+        """
+        # Parse a copy: the payloads are views that may outlive the buffer.
+        parsed, consumed, self.needed = _split_messages(bytearray(self.buffer))
+        segments = self.segments
+        messages = []
+        for position, header, class_, payload in parsed:
+            position += self.start
+            while len(segments) > 1 and segments[1][0] <= position:
+                segments.popleft()
+            segment_start, offset = segments[0]
+            messages.append((offset, position - segment_start, header,
+                             class_, payload))
+        del self.buffer[:consumed]
+        self.start += consumed
+        while len(segments) > 1 and segments[1][0] <= self.start:
+            segments.popleft()
+        return messages
+
+
+_Message = namedtuple('_Message', 'timestamp offset position frame is_tcp '
+                                  'src sport dst dport header class_ payload')
+
+
+class _Sniffer:
+    """
+    Find the CA commands in a sequence of packets.
+
+    UDP sources and TCP flows that send something other than CA are banned.
+    """
+    def __init__(self):
+        self.flows = {}
+        self.banned = set()
+
+    def sniff(self, packets):
+        "Yield a _Message for each command in ``packets``."
+        flows = self.flows
+        banned = self.banned
+        for offset, timestamp, frame in packets:
+            decoded = _decode_frame(frame)
+            if decoded is None:
+                continue
+            is_tcp, src, sport, dst, dport, seq, flags, payload = decoded
+            if not is_tcp:
+                if (src, sport) in banned:
+                    continue
+                try:
+                    parsed, consumed, _ = _split_messages(bytearray(payload))
+                    if consumed < len(payload):
+                        raise ValidationError("Incomplete command")
+                except ValidationError:
+                    banned.add((src, sport))
+                    continue
+                for position, header, class_, data in parsed:
+                    yield _Message(timestamp, offset, position, frame, False,
+                                   src, sport, dst, dport, header, class_,
+                                   data)
+                continue
+            key = (src, sport, dst, dport)
+            if key in banned:
+                continue
+            if flags & _TCP_SYN:
+                flows[key] = _Flow((seq + 1) & _SEQ_MASK)
+                continue
+            flow = flows.get(key)
+            if flow is None:
+                if not payload:
+                    continue
+                # A connection established before the capture started
+                flow = flows[key] = _Flow()
+            if payload and flow.feed(seq, payload, offset):
+                try:
+                    messages = flow.parse()
+                except ValidationError:
+                    flow.reset()
+                    flow.errors += 1
+                    if flow.errors >= _MAX_ERRORS:
+                        del flows[key]
+                        banned.add(key)
+                    continue
+                if messages:
+                    flow.errors = 0
+                for (message_offset, position, header, class_,
+                     data) in messages:
+                    yield _Message(timestamp, message_offset, position, frame,
+                                   True, src, sport, dst, dport, header,
+                                   class_, data)
+            if flags & (_TCP_FIN | _TCP_RST):
+                flows.pop(key, None)
+
+
+def _payload_name(payload):
+    return bytes(payload).rstrip(b'\x00').decode(STR_ENC)
+
+
+class _Connection:
+    "The channels of one TCP connection, by their IDs."
+    __slots__ = ('client', 'cids', 'sids', 'ioids', 'subscriptions')
+
+    def __init__(self, client):
+        self.client = client
+        self.cids = {}
+        self.sids = {}
+        self.ioids = {}
+        self.subscriptions = {}
+
+
+# Commands on a channel refer to it by its sid, or by an ID assigned in an
+# earlier request (ioid or subscriptionid), or by its cid.
+_IO_REQUESTS = frozenset({ReadRequest, ReadNotifyRequest, WriteRequest,
+                          WriteNotifyRequest})
+_IO_RESPONSES = frozenset({ReadNotifyResponse, WriteNotifyResponse})
+_BY_SID = frozenset({ReadResponse, ClearChannelRequestOrResponse})
+_BY_CID = frozenset({AccessRightsResponse, CreateChFailResponse,
+                     ServerDisconnResponse})
+
+
+class _ChannelNames:
+    """
+    Work out which PV each command concerns.
+
+    Names come from searches and channel creation; the IDs by which later
+    commands refer to a channel are tracked per TCP connection. Commands on
+    channels created before the capture started cannot be named.
+    """
+    def __init__(self):
+        self.connections = {}
+
+    def name(self, message):
+        "The PV name, or None."
+        class_ = message.class_
+        if class_ is SearchRequest:
+            return _payload_name(message.payload)
+        if not message.is_tcp:
+            return None
+        header = message.header
+        sender = (message.src, message.sport)
+        receiver = (message.dst, message.dport)
+        key = (sender, receiver) if sender < receiver else (receiver, sender)
+        connection = self.connections.get(key)
+        if class_ is CreateChanRequest:
+            if connection is None:
+                connection = self.connections[key] = _Connection(sender)
+            name = _payload_name(message.payload)
+            connection.cids[header.parameter1] = name
+            return name
+        if connection is None:
+            return None
+        if class_ is EventAddRequestOrResponse:
+            if sender == connection.client:
+                class_ = EventAddRequest
+            else:
+                class_ = EventAddResponse
+        if class_ in _IO_REQUESTS:
+            name = connection.sids.get(header.parameter1)
+            connection.ioids[header.parameter2] = name
+            return name
+        if class_ in _IO_RESPONSES:
+            return connection.ioids.pop(header.parameter2, None)
+        if class_ is EventAddRequest or class_ is EventCancelRequest:
+            name = connection.sids.get(header.parameter1)
+            connection.subscriptions[header.parameter2] = name
+            return name
+        if class_ is EventAddResponse:
+            return connection.subscriptions.get(header.parameter2)
+        if class_ is EventCancelResponse:
+            return connection.subscriptions.pop(header.parameter2, None)
+        if class_ in _BY_SID:
+            return connection.sids.get(header.parameter1)
+        if class_ is CreateChanResponse:
+            name = connection.cids.get(header.parameter1)
+            if name is not None:
+                connection.sids[header.parameter2] = name
+            return name
+        if class_ in _BY_CID:
+            return connection.cids.get(header.parameter1)
+        return None
+
+
+def _messages(file, sniffer, names, start, stop, index):
+    "Yield the _Message for each command in ``file`` matching the filters."
+    if index is not None:
+        if not isinstance(index, SharkIndex):
+            index = SharkIndex(index)
+        index.check(file)
+    pcap = _PcapFile(file)
+    offset = None
+    if index is not None:
+        if names is not None:
+            yield from _indexed_messages(pcap, index, names, start, stop)
+            return
+        if start is not None:
+            offset = index.seek_time(start)
+    # Without an index, commands on a channel can only be named by following
+    # the connection from the start.
+    channel_names = _ChannelNames() if names is not None else None
+    for message in sniffer.sniff(pcap.packets(offset)):
+        if stop is not None and message.timestamp > stop:
+            return
+        if (channel_names is not None and
+                channel_names.name(message) not in names):
+            continue
+        if start is not None and message.timestamp < start:
+            continue
+        yield message
+
+
+def _indexed_messages(pcap, index, names, start, stop):
+    "Yield the commands on the given PVs, reading only the packets of each."
+    locations = sorted(set(itertools.chain.from_iterable(
+        index.locations(name) for name in names)))
+    for offset, group in itertools.groupby(locations,
+                                           key=lambda location: location[0]):
+        wanted = {position for _, position in group}
+        packets = pcap.packets(offset)
+        first = next(packets, None)
+        if first is None:
+            return
+        _, timestamp, frame = first
+        if start is not None and timestamp < start:
+            continue
+        if stop is not None and timestamp > stop:
+            return
+        decoded = _decode_frame(frame)
+        if decoded is None:
+            continue
+        is_tcp, src, sport, dst, dport, seq, _, payload = decoded
+        if not is_tcp:
+            parsed, _, _ = _split_messages(bytearray(payload))
+            for position, header, class_, data in parsed:
+                if position in wanted:
+                    yield _Message(timestamp, offset, position, frame, False,
+                                   src, sport, dst, dport, header, class_,
+                                   data)
+            continue
+        # Parse from the first wanted command, following the flow over later
+        # packets until the last wanted command is complete.
+        key = (src, sport, dst, dport)
+        flow = _Flow((seq + min(wanted)) & _SEQ_MASK)
+        for packet_offset, timestamp, frame in itertools.chain([first],
+                                                               packets):
+            decoded = _decode_frame(frame)
+            if decoded is None or decoded[1:5] != key:
+                continue
+            if not flow.feed(decoded[5], decoded[7], packet_offset):
+                continue
+            if flow.segments[0][1] != offset:
+                # Bytes are missing.
+                break
+            try:
+                messages = flow.parse()
+            except ValidationError:
+                break
+            for message_offset, position, header, class_, data in messages:
+                if message_offset == offset and position in wanted:
+                    wanted.discard(position)
+                    yield _Message(timestamp, offset, position, frame, True,
+                                   src, sport, dst, dport, header, class_,
+                                   data)
+            if not wanted:
+                break
+
+
+def _pv_names(pv):
+    if pv is None:
+        return None
+    if isinstance(pv, str):
+        return {pv}
+    return set(pv)
+
+
+def shark(file, *, pv=None, start=None, stop=None, index=None):
     """
     Parse pcap (tcpdump) to extract networking info and CA commands.
 
@@ -247,53 +748,469 @@ def shark(file):
 
         sudo tcpdump -w - | caproto-shark
 
+    Commands split over several TCP segments are reassembled.
+
     Parameters
     ----------
     file : buffer
+    pv : str or collection of str, optional
+        Only yield commands concerning these PVs: searches, channel creation,
+        and commands on channels whose creation was captured.
+    start, stop : float, optional
+        Only yield commands captured within this range of UNIX timestamps.
+    index : SharkIndex or str, optional
+        An index of ``file`` written by :func:`build_index`, to read only the
+        packets of the given PVs or time range. This requires ``file`` to be
+        seekable.
 
     Yields
     ------
     command_context : SimpleNamespace
         Contains timestamp, ethernet, src, dst, ip, transport, and command.
     """
-    banned = set()
-    for timestamp, buffer in Reader(file):
-        ethernet = Ethernet(buffer)
-        ip = ethernet.data
-        if not isinstance(ip, IP):
-            continue
-        transport = ip.data
-        if not isinstance(transport, (TCP, UDP)):
-            continue
+    # dpkt is needed only to decode the layers yielded with each command.
+    from dpkt.ethernet import Ethernet
+
+    frame = None
+    for message in _messages(file, _Sniffer(), _pv_names(pv), start, stop,
+                             index):
+        if message.is_tcp:
+            address = None
+        else:
+            address = message.src
         try:
-            src = inet_ntoa(ip.src)
-            dst = inet_ntoa(ip.dst)
-            if isinstance(transport, TCP):
-                if (ip.src, transport.sport) in banned:
-                    continue
-                data = bytearray(transport.data)
-                while True:
-                    data, command, _ = read_from_bytestream(data)
-                    if command is NEED_DATA:
-                        break
-                    yield SimpleNamespace(timestamp=timestamp,
-                                          ethernet=ethernet,
-                                          src=src,
-                                          dst=dst,
-                                          ip=ip,
-                                          transport=transport,
-                                          command=command)
-            elif isinstance(transport, UDP):
-                if (ip.src, transport.sport) in banned:
-                    continue
-                address = inet_ntoa(ip.src)
-                for command in read_datagram(transport.data, address):
-                    yield SimpleNamespace(timestamp=timestamp,
-                                          ethernet=ethernet,
-                                          src=src,
-                                          dst=dst,
-                                          ip=ip,
-                                          transport=transport,
-                                          command=command)
+            command = message.class_.from_wire(message.header,
+                                               message.payload,
+                                               sender_address=address,
+                                               validate=True)
         except ValidationError:
-            banned.add((ip.src, transport.sport))
+            # The framing is sound, so skip just this command.
+            continue
+        if message.frame is not frame:
+            frame = message.frame
+            ethernet = Ethernet(frame)
+            ip = ethernet.data
+            transport = ip.data
+        yield SimpleNamespace(timestamp=message.timestamp,
+                              ethernet=ethernet,
+                              src=message.src,
+                              dst=message.dst,
+                              ip=ip,
+                              transport=transport,
+                              command=command)
+
+
+# Summaries
+
+def _sender_role(class_):
+    "The role of the sender of a command: CLIENT, SERVER or None if unclear."
+    name = class_.__name__
+    if name.endswith('OrResponse'):
+        return None
+    if name.endswith('Response') or class_ is Beacon:
+        return SERVER
+    if name.endswith('Request'):
+        return CLIENT
+    return None
+
+
+_SENDER_ROLES = {class_: _sender_role(class_)
+                 for class_ in itertools.chain(
+                     one_way_commands.values(),
+                     [VersionRequest, VersionResponse, SearchRequest,
+                      SearchResponse, EventAddRequest,
+                      EventAddRequestOrResponse, EventAddResponse,
+                      EventCancelRequest, EventCancelResponse, ReadRequest,
+                      ReadResponse, ReadNotifyRequest, ReadNotifyResponse,
+                      WriteNotifyRequest, WriteNotifyResponse,
+                      CreateChanRequest, CreateChanResponse])}
+
+
+class EndpointSummary:
+    """
+    The CA traffic sent by one host in one role.
+
+    Attributes
+    ----------
+    host : str
+    role : CLIENT, SERVER or None
+        None if the host sent only commands that do not reveal its role.
+    commands : collections.Counter
+        Number of commands sent, by command name.
+    bytes : int
+        Size of the commands sent, including headers.
+    searches : int
+        Searches sent by a client, or answered by a server.
+    pvs : collections.Counter
+        Number of commands sent concerning each PV.
+    """
+    def __init__(self, host, role):
+        self.host = host
+        self.role = role
+        self.commands = collections.Counter()
+        self.bytes = 0
+        self.searches = 0
+        self.pvs = collections.Counter()
+
+    def __repr__(self):
+        return (f"<EndpointSummary {self.role!r} {self.host} "
+                f"commands={self.count} bytes={self.bytes}>")
+
+    @property
+    def count(self):
+        "Total number of commands sent."
+        return sum(self.commands.values())
+
+
+class SharkSummary:
+    """
+    Aggregated CA traffic, as returned by :func:`summarize`.
+
+    Attributes
+    ----------
+    count : int
+        Number of commands.
+    bytes : int
+        Size of the commands, including headers.
+    start, end : float or None
+        Timestamps of the first and last commands.
+    endpoints : dict
+        Maps ``(host, role)`` to :class:`EndpointSummary`.
+    pvs : collections.Counter
+        Number of commands concerning each PV.
+    pv_searches : collections.Counter
+        Number of searches for each PV.
+    searches : int
+        Number of searches.
+    searches_per_second : collections.Counter
+        Number of searches in each second, by integer UNIX timestamp.
+    """
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.start = None
+        self.end = None
+        self.endpoints = {}
+        self.pvs = collections.Counter()
+        self.pv_searches = collections.Counter()
+        self.searches = 0
+        self.searches_per_second = collections.Counter()
+
+    def __repr__(self):
+        return (f"<SharkSummary commands={self.count} bytes={self.bytes} "
+                f"endpoints={len(self.endpoints)}>")
+
+    def endpoint(self, host, role):
+        "The :class:`EndpointSummary` of ``host`` in ``role``, made if new."
+        try:
+            return self.endpoints[(host, role)]
+        except KeyError:
+            endpoint = self.endpoints[(host, role)] = EndpointSummary(host,
+                                                                      role)
+            return endpoint
+
+    @property
+    def duration(self):
+        if self.start is None:
+            return 0.0
+        return self.end - self.start
+
+    @property
+    def servers(self):
+        "Server endpoints, busiest first."
+        return self._busiest(SERVER)
+
+    @property
+    def clients(self):
+        "Client endpoints, busiest first."
+        return self._busiest(CLIENT)
+
+    def _busiest(self, role):
+        return sorted((endpoint for endpoint in self.endpoints.values()
+                       if endpoint.role is role),
+                      key=lambda endpoint: endpoint.bytes, reverse=True)
+
+    @property
+    def search_rate(self):
+        "Mean number of searches per second."
+        if not self.duration:
+            return float(self.searches)
+        return self.searches / self.duration
+
+    @property
+    def peak_search_rate(self):
+        "Largest number of searches within one second."
+        return max(self.searches_per_second.values(), default=0)
+
+    def top_pvs(self, n=10):
+        "The ``n`` PVs with the most commands, as ``(name, count)`` pairs."
+        return self.pvs.most_common(n)
+
+    def format(self, top=10):
+        "A human-readable report, listing ``top`` PVs per endpoint."
+        lines = [f"{self.count} commands, {self.bytes} bytes over "
+                 f"{self.duration:.3f} s",
+                 f"{self.searches} searches ({self.search_rate:.1f}/s, peak "
+                 f"{self.peak_search_rate}/s)"]
+        endpoints = (self.servers + self.clients +
+                     self._busiest(None))
+        for endpoint in endpoints:
+            role = endpoint.role.name if endpoint.role is not None else '?'
+            lines.append('')
+            lines.append(f"{role} {endpoint.host}: {endpoint.count} "
+                         f"commands, {endpoint.bytes} bytes, "
+                         f"{endpoint.searches} searches")
+            for name, count in endpoint.commands.most_common():
+                lines.append(f"    {name} {count}")
+            if endpoint.pvs:
+                pvs = ', '.join(f'{pv} ({count})' for pv, count
+                                in endpoint.pvs.most_common(top))
+                lines.append(f"    top PVs: {pvs}")
+        if self.pvs:
+            lines.append('')
+            lines.append('Top PVs:')
+            for pv, count in self.top_pvs(top):
+                lines.append(f"    {pv} {count} commands, "
+                             f"{self.pv_searches[pv]} searches")
+        return '\n'.join(lines)
+
+
+def summarize(file, *, start=None, stop=None, index=None):
+    """
+    Aggregate the CA traffic in pcap (tcpdump) output, per host and role.
+
+    Unlike :func:`shark`, this does not build command objects: it reads only
+    command headers, and the PV names in searches and channel creation
+    requests. It does not require dpkt.
+
+    Parameters
+    ----------
+    file : buffer
+    start, stop : float, optional
+        Only count commands captured within this range of UNIX timestamps.
+    index : SharkIndex or str, optional
+        An index of ``file`` written by :func:`build_index`, to skip to
+        ``start``. This requires ``file`` to be seekable.
+
+    Returns
+    -------
+    summary : SharkSummary
+    """
+    summary = SharkSummary()
+    channel_names = _ChannelNames()
+    # Roles learned per (host, port) for commands that do not tell.
+    roles = {}
+    for message in _messages(file, _Sniffer(), None, start, stop, index):
+        class_ = message.class_
+        sender = (message.src, message.sport)
+        role = _SENDER_ROLES.get(class_)
+        if role is None:
+            role = roles.get(sender)
+            if role is None:
+                peer_role = roles.get((message.dst, message.dport))
+                if peer_role is not None:
+                    role = CLIENT if peer_role is SERVER else SERVER
+        else:
+            roles[sender] = role
+        size = len(message.payload) + ctypes.sizeof(message.header)
+        if summary.start is None:
+            summary.start = message.timestamp
+        summary.end = message.timestamp
+        summary.count += 1
+        summary.bytes += size
+        endpoint = summary.endpoint(message.src, role)
+        endpoint.commands[class_.__name__] += 1
+        endpoint.bytes += size
+        name = channel_names.name(message)
+        if name is not None:
+            summary.pvs[name] += 1
+            endpoint.pvs[name] += 1
+        if class_ is SearchRequest:
+            summary.searches += 1
+            summary.searches_per_second[int(message.timestamp)] += 1
+            summary.pv_searches[name] += 1
+            endpoint.searches += 1
+        elif class_ is SearchResponse:
+            endpoint.searches += 1
+    return summary
+
+
+# Indexes
+#
+# An index file starts with the 8 bytes ``CAIDX001``, followed by the length
+# (u4) of JSON metadata and the metadata itself. Then follow little-endian
+# arrays: for every ``time_step``-th packet, the latest timestamp of the
+# packets before it (f8) and then its offset (u8); and for each PV in the
+# order listed in the metadata, the offsets (u8) of the packets where the
+# commands concerning it start, and then their positions in the packet
+# payloads (u4).
+
+INDEX_SUFFIX = '.idx'
+_INDEX_MAGIC = b'CAIDX001'
+
+
+def _file_size(file):
+    position = file.tell()
+    size = file.seek(0, os.SEEK_END)
+    file.seek(position)
+    return size
+
+
+def _read_array(file, typecode, count):
+    values = array(typecode)
+    values.frombytes(file.read(count * values.itemsize))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+def _write_array(file, values):
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    file.write(values.tobytes())
+
+
+class SharkIndex:
+    """
+    An index of a pcap file by PV name and time, written by
+    :func:`build_index`.
+
+    Parameters
+    ----------
+    path : str
+
+    Attributes
+    ----------
+    pcap_size : int
+        Size in bytes of the pcap file indexed.
+    time_step : int
+        Number of packets between indexed times.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as file:
+            if file.read(len(_INDEX_MAGIC)) != _INDEX_MAGIC:
+                raise CaprotoValueError(f"{path} is not a caproto-shark index")
+            size, = struct.unpack('<I', file.read(4))
+            metadata = json.loads(file.read(size))
+            self.pcap_size = metadata['pcap_size']
+            self.time_step = metadata['time_step']
+            count = metadata['times']
+            self._latest = _read_array(file, 'd', count)
+            self._offsets = _read_array(file, 'Q', count)
+            position = file.tell()
+        self._pvs = {}
+        for name, count in metadata['pvs']:
+            self._pvs[name] = (position, count)
+            position += count * 12
+
+    def __repr__(self):
+        return f"<SharkIndex {self.path!r} pvs={len(self._pvs)}>"
+
+    @property
+    def pvs(self):
+        "The names of the PVs indexed."
+        return list(self._pvs)
+
+    def locations(self, name):
+        """
+        Where the commands concerning a PV are, in file order.
+
+        Returns
+        -------
+        locations : list
+            ``(offset, position)`` pairs: the offset of the packet in which
+            a command starts, and its position in the packet's payload.
+        """
+        try:
+            position, count = self._pvs[name]
+        except KeyError:
+            return []
+        with open(self.path, 'rb') as file:
+            file.seek(position)
+            offsets = _read_array(file, 'Q', count)
+            positions = _read_array(file, 'I', count)
+        return list(zip(offsets, positions))
+
+    def seek_time(self, timestamp):
+        "The offset of a packet before which all are timestamped earlier."
+        i = bisect.bisect_left(self._latest, timestamp) - 1
+        if i < 0:
+            return _PCAP_HEADER_SIZE
+        return self._offsets[i]
+
+    def check(self, file):
+        "Raise CaprotoValueError if ``file`` is not the one indexed."
+        if _file_size(file) != self.pcap_size:
+            raise CaprotoValueError(f"The index {self.path!r} does not "
+                                    f"match this pcap file")
+
+
+def build_index(file, path=None, *, time_step=1000):
+    """
+    Index pcap (tcpdump) output by PV name and time.
+
+    Pass the index to :func:`shark` or :func:`summarize` to read only the
+    relevant parts of the file.
+
+    Parameters
+    ----------
+    file : str or buffer
+        A path, or a seekable file opened for binary reading.
+    path : str, optional
+        Where to write the index. By default, the path of ``file`` with
+        ``INDEX_SUFFIX`` (``'.idx'``) appended.
+    time_step : int, optional
+        Index the time of every ``time_step``-th packet.
+
+    Returns
+    -------
+    index : SharkIndex
+    """
+    if isinstance(file, str):
+        with open(file, 'rb') as f:
+            return build_index(f, path or file + INDEX_SUFFIX,
+                               time_step=time_step)
+    if path is None:
+        path = file.name + INDEX_SUFFIX
+    pcap_size = _file_size(file)
+    latest_times = array('d')
+    time_offsets = array('Q')
+
+    def timed(packets):
+        latest = float('-inf')
+        for i, (offset, timestamp, frame) in enumerate(packets):
+            if not i % time_step:
+                latest_times.append(latest)
+                time_offsets.append(offset)
+            latest = max(latest, timestamp)
+            yield offset, timestamp, frame
+
+    locations = collections.defaultdict(lambda: (array('Q'), array('I')))
+    channel_names = _ChannelNames()
+    pcap = _PcapFile(file)
+    for message in _Sniffer().sniff(timed(pcap.packets())):
+        name = channel_names.name(message)
+        if name is not None:
+            offsets, positions = locations[name]
+            offsets.append(message.offset)
+            positions.append(message.position)
+
+    metadata = json.dumps({
+        'pcap_size': pcap_size,
+        'time_step': time_step,
+        'times': len(time_offsets),
+        'pvs': [[name, len(offsets)]
+                for name, (offsets, _) in locations.items()],
+    }).encode()
+    with open(path, 'wb') as index_file:
+        index_file.write(_INDEX_MAGIC)
+        index_file.write(struct.pack('<I', len(metadata)))
+        index_file.write(metadata)
+        _write_array(index_file, latest_times)
+        _write_array(index_file, time_offsets)
+        for offsets, positions in locations.values():
+            _write_array(index_file, offsets)
+            _write_array(index_file, positions)
+    return SharkIndex(path)
@@ -0,0 +1,183 @@
+import asyncio
+import getpass
+
+import pytest
+
+import caproto as ca
+from caproto import AccessRights, ChannelDouble
+from caproto.server.access_security import (AccessSecurityConfig,
+                                            load_access_security, parse_acf)
+
+from .conftest import new_prefix, wait_for
+
+ACF = '''
+# Comments are ignored
+UAG(operators) {alice, "bob"}
+UAG(admins) {carol}
+HAG(control_room) {OPI1, opi2}
+
+ASG(DEFAULT) {
+    RULE(1, READ)
+    RULE(1, WRITE, TRAPWRITE) {
+        UAG(operators, admins)
+        HAG(control_room)
+    }
+    RULE(1, WRITE) {
+        UAG(admins)
+    }
+}
+
+ASG(READONLY) {
+    RULE(1, READ)
+}
+
+ASG(CALC) {
+    INPA(some:pv)
+    RULE(1, WRITE) {
+        CALC("A=1")
+    }
+}
+'''
+
+READ_WRITE = AccessRights.READ | AccessRights.WRITE
+
+
+@pytest.mark.parametrize(
+    'group, hostname, username, expected',
+    [('DEFAULT', 'opi1', 'alice', READ_WRITE),
+     ('DEFAULT', 'opi2', 'bob', READ_WRITE),
+     ('DEFAULT', 'other', 'alice', AccessRights.READ),
+     ('DEFAULT', 'opi1', 'mallory', AccessRights.READ),
+     ('DEFAULT', 'other', 'carol', READ_WRITE),
+     ('DEFAULT', None, None, AccessRights.READ),
+     ('READONLY', 'opi1', 'carol', AccessRights.READ),
+     ('CALC', 'opi1', 'carol', AccessRights.NO_ACCESS),
+     # Undefined groups use DEFAULT
+     ('UNDEFINED', 'opi1', 'alice', READ_WRITE),
+     ]
+)
+def test_acf_rules(group, hostname, username, expected):
+    config = parse_acf(ACF)
+    assert config.get_access(group, hostname, username) == expected
+    # And from the cache:
+    assert config.get_access(group, hostname, username) == expected
+
+
+def test_acf_no_default():
+    config = parse_acf('ASG(OTHER) { RULE(1, READ) }')
+    assert config.get_access('DEFAULT', 'host', 'user') == (
+        AccessRights.NO_ACCESS
+    )
+
+
+@pytest.mark.parametrize(
+    'text',
+    ['ASG(DEFAULT) { RULE(1, EXECUTE) }',
+     'ASG(DEFAULT) { RULE(1) }',
+     'ASG(DEFAULT) { RULE(1, READ) { UAG(undefined) } }',
+     'ASG(DEFAULT) { RULE(1, READ)',
+     'BOGUS(DEFAULT)',
+     ]
+)
+def test_acf_invalid(text):
+    with pytest.raises(ca.CaprotoValueError):
+        parse_acf(text)
+
+
+def test_acf_from_file(tmp_path):
+    filename = tmp_path / 'test.acf'
+    filename.write_text(ACF)
+    config = load_access_security(str(filename))
+    assert isinstance(config, AccessSecurityConfig)
+    assert load_access_security(config) is config
+    assert load_access_security(None) is None
+
+    filename.write_text('ASG(DEFAULT) { RULE(1, WRITE) }')
+    reloaded = config.reload()
+    assert reloaded.get_access('READONLY', None, None) == READ_WRITE
+
+
+def test_access_security_server():
+    from caproto.asyncio.server import Context as ServerContext
+    from caproto.threading.client import Context as ClientContext
+
+    prefix = new_prefix()
+    user = getpass.getuser()
+    pvdb = {
+        f'{prefix}default': ChannelDouble(value=1.0),
+        f'{prefix}readonly': ChannelDouble(
+            value=2.0, access_security_group='READONLY'),
+    }
+    initial_config = parse_acf(f'''
+UAG(writers) {{"{user}"}}
+ASG(DEFAULT) {{
+    RULE(1, READ)
+    RULE(1, WRITE) {{ UAG(writers) }}
+}}
+ASG(READONLY) {{
+    RULE(1, READ)
+}}
+''')
+    reloaded_config = parse_acf('''
+ASG(DEFAULT) {
+    RULE(1, READ)
+}
+ASG(READONLY) {
+    RULE(1, WRITE)
+}
+''')
+
+    client_context = None
+    pvs = {}
+
+    def connect_and_check_initial():
+        nonlocal client_context
+        client_context = ClientContext()
+        default, readonly = client_context.get_pvs(
+            f'{prefix}default', f'{prefix}readonly')
+        pvs.update(default=default, readonly=readonly)
+        for pv in pvs.values():
+            pv.wait_for_connection(timeout=5)
+
+        assert default.access_rights == READ_WRITE
+        assert readonly.access_rights == AccessRights.READ
+
+        default.write([5.0], wait=True, timeout=5)
+        assert default.read(timeout=5).data[0] == 5.0
+
+        response = readonly.write([5.0], wait=True, timeout=5)
+        assert response.status == ca.CAStatus.ECA_NOWTACCESS.value
+        assert readonly.read(timeout=5).data[0] == 2.0
+
+    def check_reloaded():
+        wait_for(
+            lambda: pvs['default'].access_rights == AccessRights.READ,
+            timeout=5)
+        wait_for(
+            lambda: pvs['readonly'].access_rights == READ_WRITE,
+            timeout=5)
+        pvs['readonly'].write([3.0], wait=True, timeout=5)
+        assert pvs['readonly'].read(timeout=5).data[0] == 3.0
+
+    async def test():
+        started = asyncio.Event()
+
+        async def startup_hook(async_lib):
+            started.set()
+
+        ctx = ServerContext(pvdb)
+        ctx.access_security = initial_config
+        server_task = asyncio.create_task(ctx.run(startup_hook=startup_hook))
+        loop = asyncio.get_running_loop()
+        try:
+            await started.wait()
+            await loop.run_in_executor(None, connect_and_check_initial)
+            await ctx.set_access_security(reloaded_config)
+            await loop.run_in_executor(None, check_reloaded)
+        finally:
+            if client_context is not None:
+                client_context.disconnect()
+            server_task.cancel()
+            await asyncio.wait((server_task, ))
+
+    asyncio.run(test())
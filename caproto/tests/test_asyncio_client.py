@@ -0,0 +1,132 @@
+import asyncio
+import gc
+import threading
+
+import pytest
+
+from caproto.asyncio.client import Context
+
+
+def run_with_context(test):
+    async def main():
+        ctx = Context()
+        try:
+            await test(ctx)
+        finally:
+            await ctx.disconnect()
+            await ctx.broadcaster.disconnect()
+
+    asyncio.run(main())
+
+
+async def wait_for(predicate, timeout):
+    for _ in range(int(timeout / 0.1)):
+        if predicate():
+            return
+        await asyncio.sleep(0.1)
+    assert predicate()
+
+
+@pytest.mark.parametrize('dispatch', ['latest', 3])
+@pytest.mark.parametrize('kind', ['sync', 'async'])
+def test_subscriptions_dispatch(ioc, dispatch, kind):
+    monitor_values = []
+    if kind == 'sync':
+        # Sync callbacks run in the executor, so blocking is fine.
+        release = threading.Event()
+
+        def callback(sub, command):
+            # Block on the initial update while more arrive.
+            release.wait(timeout=10)
+            monitor_values.append(command.data[0])
+    else:
+        release = asyncio.Event()
+
+        async def callback(sub, command):
+            await release.wait()
+            monitor_values.append(command.data[0])
+
+    async def test(ctx):
+        pv, = await ctx.get_pvs(ioc.pvs['int'])
+        await pv.wait_for_connection(timeout=10)
+
+        sub = pv.subscribe(dispatch=dispatch)
+        assert sub is pv.subscribe(dispatch=dispatch)
+        assert sub is not pv.subscribe()
+        sub.add_callback(callback)
+        await wait_for(lambda: sub._dispatch_task is not None, timeout=2)
+        # A single task dispatches all updates.
+        task = sub._dispatch_task
+        for value in range(1, 11):
+            await pv.write((value, ), wait=True)
+        await asyncio.sleep(0.2)  # Wait for the last update to be processed.
+        assert sub._dispatch_task is task
+
+        maxlen = 1 if dispatch == 'latest' else dispatch
+        assert len(sub._dispatch_queue) == maxlen
+        release.set()
+        await wait_for(lambda: len(monitor_values) == 1 + maxlen, timeout=2)
+        await wait_for(lambda: sub._dispatch_task is None, timeout=2)
+        await sub.clear()
+
+        # The initial update, followed by the most recent ones.
+        assert monitor_values[1:] == list(range(11 - maxlen, 11))
+        assert sub.dropped == 10 - maxlen
+
+    run_with_context(test)
+
+
+def test_subscriptions_dispatch_prunes_dead_callbacks(ioc):
+    monitor_values = []
+
+    def callback(sub, command):
+        monitor_values.append(command.data[0])
+
+    def dead_callback(sub, command):
+        ...
+
+    async def test(ctx):
+        nonlocal dead_callback
+        pv, = await ctx.get_pvs(ioc.pvs['int'])
+        await pv.wait_for_connection(timeout=10)
+
+        sub = pv.subscribe(dispatch='latest')
+        sub.add_callback(callback)
+        dead_id = sub.add_callback(dead_callback)
+        await wait_for(lambda: monitor_values, timeout=2)
+        del dead_callback
+        gc.collect()
+
+        await pv.write((1, ), wait=True)
+        await wait_for(lambda: monitor_values[-1:] == [1], timeout=2)
+        await wait_for(lambda: sub._dispatch_task is None, timeout=2)
+        assert dead_id not in sub.callbacks
+        await sub.clear()
+
+    run_with_context(test)
+
+
+def test_subscriptions_dispatch_aiter(ioc):
+    async def test(ctx):
+        pv, = await ctx.get_pvs(ioc.pvs['int'])
+        await pv.wait_for_connection(timeout=10)
+
+        sub = pv.subscribe(dispatch='latest')
+        values = sub.__aiter__()
+        await values.__anext__()  # The initial update
+        assert len(sub._iter_callbacks) == 1
+        # The consumer is not iterating; the updates are coalesced.
+        for value in range(1, 11):
+            await pv.write((value, ), wait=True)
+        await asyncio.sleep(0.2)  # Wait for the last update to be processed.
+        # Bounded iterators are fed directly, not by the dispatch task.
+        assert sub._dispatch_task is None
+
+        command = await values.__anext__()
+        assert command.data[0] == 10
+        assert sub.dropped == 9
+        await values.aclose()
+        assert not sub._iter_callbacks
+        assert not sub.callbacks
+
+    run_with_context(test)
@@ -0,0 +1,212 @@
+import asyncio
+import json
+
+import pytest
+
+from caproto.server import PVGroup, SubGroup, pvproperty
+from caproto.server.autosave import (AutosaveHelper, RotatingFileManager,
+                                     autosaved, get_journal_filename)
+
+
+def make_ioc(tmp_path, journal_compact_count=0):
+    class Helper(AutosaveHelper):
+        ...
+
+    Helper.journal_compact_count = journal_compact_count
+
+    class IOC(PVGroup):
+        autosave_helper = SubGroup(
+            Helper,
+            file_manager=RotatingFileManager(tmp_path / 'autosave.json'),
+        )
+        a = autosaved(pvproperty(value=1, record='ao'))
+        b = autosaved(pvproperty(value=[1, 2, 3]))
+        c = pvproperty(value=2.0)
+
+    return IOC(prefix='test:')
+
+
+async def save_and_wait(helper):
+    await helper.save()
+    if helper._pending_write is not None:
+        helper._pending_write.result()
+
+
+def load(filename):
+    with open(filename, 'rt') as f:
+        return json.load(f)
+
+
+def test_autosave_skips_unchanged(tmp_path):
+    ioc = make_ioc(tmp_path)
+    helper = ioc.autosave_helper
+
+    async def test():
+        helper.track_changes()
+        await save_and_wait(helper)
+        assert load(helper.filename)['test:a']['value'] == 1
+        mtime = helper.filename.stat().st_mtime_ns
+
+        # Nothing changed: no write should happen
+        await save_and_wait(helper)
+        assert helper.filename.stat().st_mtime_ns == mtime
+
+        # Non-autosaved properties do not mark anything as dirty
+        await ioc.c.write(5.0)
+        assert not helper._dirty
+
+        await ioc.a.write(10)
+        await ioc.a.field_inst.description.write('new desc')
+        assert helper._dirty == {'test:a'}
+        await save_and_wait(helper)
+        data = load(helper.filename)
+        assert data['test:a'] == {'value': 10,
+                                  'fields': {'description': 'new desc'}}
+        assert data['test:b']['value'] == [1, 2, 3]
+
+    asyncio.run(test())
+
+
+@pytest.mark.parametrize('journal_compact_count', [0, 3])
+def test_autosave_journal_restore(tmp_path, journal_compact_count):
+    ioc = make_ioc(tmp_path, journal_compact_count=journal_compact_count)
+    helper = ioc.autosave_helper
+    journal = get_journal_filename(helper.filename)
+
+    async def save_values():
+        helper.track_changes()
+        await save_and_wait(helper)
+        for value in range(2, 5):
+            await ioc.a.write(value)
+            await save_and_wait(helper)
+
+        assert journal.exists() == bool(journal_compact_count)
+        if journal_compact_count:
+            # The snapshot only has the initial value; changes are journaled
+            assert load(helper.filename)['test:a']['value'] == 1
+            await ioc.b.write([4, 5, 6])
+            # Compaction
+            await save_and_wait(helper)
+            assert not journal.exists()
+            await ioc.a.write(5)
+            await save_and_wait(helper)
+            assert journal.exists()
+        else:
+            await ioc.b.write([4, 5, 6])
+            await ioc.a.write(5)
+            await save_and_wait(helper)
+
+    asyncio.run(save_values())
+
+    restored = make_ioc(tmp_path, journal_compact_count=journal_compact_count)
+
+    async def restore():
+        await restored.autosave_helper.restore_from_file(helper.filename)
+
+    asyncio.run(restore())
+    assert restored.a.value == 5
+    assert list(restored.b.value) == [4, 5, 6]
+
+
+def test_autosave_corrupt_journal(tmp_path):
+    ioc = make_ioc(tmp_path, journal_compact_count=10)
+    helper = ioc.autosave_helper
+
+    async def test():
+        helper.track_changes()
+        await save_and_wait(helper)
+        await ioc.a.write(3)
+        await save_and_wait(helper)
+
+    asyncio.run(test())
+
+    with open(get_journal_filename(helper.filename), 'at') as f:
+        f.write('{"test:a": {"val')
+
+    restored = make_ioc(tmp_path)
+    asyncio.run(restored.autosave_helper.restore_from_file(helper.filename))
+    assert restored.a.value == 3
+
+
+@pytest.mark.parametrize('journal_compact_count', [0, 3])
+def test_autosave_failed_write_retried(tmp_path, journal_compact_count):
+    ioc = make_ioc(tmp_path, journal_compact_count=journal_compact_count)
+    helper = ioc.autosave_helper
+
+    def fail(*args):
+        raise OSError('disk full')
+
+    async def test():
+        helper.track_changes()
+        await save_and_wait(helper)
+        await ioc.a.write(7)
+        # Snapshots are written with a journal_compact_count of 0
+        write_name = ('_append_journal' if journal_compact_count
+                      else '_write_snapshot')
+        setattr(helper, write_name, fail)
+        await save_and_wait(helper)
+        assert helper._dirty == {'test:a'}
+        assert helper._journal_entries == 0
+
+        delattr(helper, write_name)
+        await save_and_wait(helper)
+        assert not helper._dirty
+
+    asyncio.run(test())
+
+    restored = make_ioc(tmp_path)
+    asyncio.run(restored.autosave_helper.restore_from_file(helper.filename))
+    assert restored.a.value == 7
+
+
+def test_autosave_explicit_data_queued(tmp_path):
+    ioc = make_ioc(tmp_path)
+    helper = ioc.autosave_helper
+
+    async def test():
+        helper.track_changes()
+        await helper.save()
+        # Not skipped, although the first write may still be in progress
+        await helper.save({'test:a': {'value': 9}})
+        helper._pending_write.result()
+
+    asyncio.run(test())
+    assert load(helper.filename) == {'test:a': {'value': 9}}
+
+
+def test_autosave_failed_snapshot_cleaned_up(tmp_path):
+    ioc = make_ioc(tmp_path)
+    helper = ioc.autosave_helper
+
+    async def test():
+        helper.track_changes()
+        # Not serializable as JSON
+        await helper.save({'test:a': {'value': object()}})
+        helper._pending_write.result()
+
+    asyncio.run(test())
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_autosave_hook_shutdown(tmp_path):
+    from caproto.asyncio.server import AsyncioAsyncLayer
+
+    ioc = make_ioc(tmp_path)
+    helper = ioc.autosave_helper
+    helper.period = 0.01
+    hook = type(helper).autosave_hook.pvspec.startup
+
+    async def test():
+        task = asyncio.create_task(
+            hook(helper, helper.autosave_hook, AsyncioAsyncLayer()))
+        while helper._executor is None:
+            await asyncio.sleep(0.01)
+        executor = helper._executor
+        task.cancel()
+        await asyncio.wait((task, ))
+        return executor
+
+    executor = asyncio.run(test())
+    assert helper._executor is None
+    assert all(not thread.is_alive() for thread in executor._threads)
+    assert load(helper.filename)['test:a']['value'] == 1
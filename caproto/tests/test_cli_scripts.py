@@ -1,9 +1,14 @@
+import socket
 import subprocess
 import sys
 
 import pytest
 
-from caproto.sync.client import block, read, subscribe, write
+import caproto as ca
+import caproto.sync.client
+from caproto.sync.client import (ChannelPool, block, read, read_many,
+                                 read_write_read, read_write_read_many,
+                                 sockets, subscribe, write)
 
 from .conftest import dump_process_output
 
@@ -58,6 +63,84 @@ def test_options(func, args, kwargs, more_kwargs, ioc):
     func(*args, **kwargs)
 
 
+def test_channel_pool(ioc):
+    float_name, int_name = ioc.pvs['float'], ioc.pvs['int']
+    with ChannelPool() as pool:
+        read(float_name, pool=pool)
+        chan, _ = pool.channels[(float_name, 0)]
+        write(float_name, 3.15, notify=True, pool=pool)
+        assert read(float_name, pool=pool).data[0] == pytest.approx(3.15)
+        # The channel stays open across calls.
+        assert pool.channels[(float_name, 0)][0] is chan
+        assert chan.circuit in sockets
+
+        read_write_read(int_name, 3, notify=True, pool=pool)
+        assert len(pool.channels) == 2
+        assert len(pool.circuits) == 1
+
+        # Least recently used channels are evicted.
+        pool.max_channels = 1
+        read(int_name, pool=pool)
+        assert list(pool.channels) == [(int_name, 0)]
+        assert chan.circuit in sockets
+
+        # As are idle ones, and their circuits.
+        pool.idle_timeout = 0
+        pool.evict_idle()
+        assert not pool.channels
+        assert chan.circuit not in sockets
+
+    with pytest.raises(TimeoutError):
+        read('__does_not_exist', pool=pool, timeout=0.5)
+
+
+def test_read_many(ioc):
+    float_name, int_name = ioc.pvs['float'], ioc.pvs['int']
+    names = [int_name, '__does_not_exist', float_name]
+    open_circuits = set(sockets)
+    results = read_many(names, timeout=1)
+    assert [type(res) for res in results[::2]] == [ca.ReadNotifyResponse] * 2
+    assert results[0].data[0] == read(int_name).data[0]
+    assert results[2].data[0] == read(float_name).data[0]
+    assert isinstance(results[1], TimeoutError)
+
+    results = read_write_read_many([float_name, int_name], [3.14, 5],
+                                   notify=True)
+    (initial, _, final), (_, _, int_final) = results
+    assert final.data[0] == pytest.approx(3.14)
+    assert int_final.data[0] == 5
+    assert set(sockets) == open_circuits
+
+
+def test_read_many_connect_failures(ioc, monkeypatch):
+    search_many = caproto.sync.client.search_many
+    int_name = ioc.pvs['int']
+    with socket.socket() as refusing, socket.socket() as silent:
+        # One server refuses the connection, another never responds.
+        refusing.bind(('127.0.0.1', 0))
+        silent.bind(('127.0.0.1', 0))
+        silent.listen(1)
+        fake_addresses = {'__refused': refusing.getsockname(),
+                          '__silent': silent.getsockname()}
+
+        def search_with_fakes(pv_names, udp_sock, timeout, **kwargs):
+            addresses = search_many(
+                [name for name in pv_names if name not in fake_addresses],
+                udp_sock, timeout, **kwargs)
+            addresses.update(fake_addresses)
+            return addresses
+
+        monkeypatch.setattr(caproto.sync.client, 'search_many',
+                            search_with_fakes)
+        open_circuits = set(sockets)
+        results = read_many(['__refused', int_name, '__silent'], timeout=1)
+
+    assert isinstance(results[0], ConnectionRefusedError)
+    assert results[1].data[0] == read(int_name).data[0]
+    assert isinstance(results[2], TimeoutError)
+    assert set(sockets) == open_circuits
+
+
 @pytest.mark.parametrize('more_kwargs,',
                          [{'repeater': False},
                           {'timeout': 3},
@@ -83,6 +166,7 @@ fmt3 = '{response.data}'
                           ('caproto-get', ('--list-types',)),
                           ('caproto-get', ('float',)),
                           ('caproto-get', ('float', 'str')),
+                          ('caproto-get', ('float', 'str', 'int', 'enum')),
                           # data_type as int, enum name, class on type
                           ('caproto-get', ('float', '-d', '0')),
                           ('caproto-get', ('float', '-d', 'STRING')),
@@ -120,6 +204,8 @@ fmt3 = '{response.data}'
                           ('caproto-put', ('float', '3.16', '-l')),
                           ('caproto-put', ('float', '3.16', '-v')),
                           ('caproto-put', ('float', '3.16', '-vvv')),
+                          ('caproto-put', ('float', '3.16', 'int', '3')),
+                          ('caproto-put', ('float', '3.16', 'enum', 'b', '-t')),
                           # Tests for output formatting arguments:
                           #    floating point -e -f -g -s -lx -lo -lb
                           ('caproto-get', ('float', '-e5')),
@@ -113,6 +113,33 @@ def test_mismatched_event_add_responses(circuit_pair):
         circuit.send(req)
 
 
+def test_fragmented_large_command(circuit_pair):
+    cli_circuit, srv_circuit = circuit_pair
+    cli_channel, srv_channel = make_channels(*circuit_pair, 6, 10000)
+    req = cli_channel.write(list(range(10000)), data_type=6,
+                            data_count=10000)
+    buf = bytes(req)
+
+    # The bytes still needed count down as the payload arrives in pieces.
+    commands, num_bytes_needed = srv_circuit.recv(buf[:100])
+    assert not commands
+    assert num_bytes_needed == len(buf) - 100
+    for start in range(100, len(buf) - 1000, 1000):
+        commands, num_bytes_needed = srv_circuit.recv(buf[start:start + 1000])
+        assert not commands
+        assert num_bytes_needed == len(buf) - start - 1000
+
+    # Completing the command along with the start of the next one parses
+    # the first and caches the remainder.
+    start += 1000
+    commands, num_bytes_needed = srv_circuit.recv(buf[start:] + buf[:50])
+    (command,) = commands
+    assert list(command.data) == list(range(10000))
+    assert num_bytes_needed == len(buf) - 50
+    (command,), _ = srv_circuit.recv(buf[50:])
+    assert list(command.data) == list(range(10000))
+
+
 def test_empty_datagram():
     broadcaster = ca.Broadcaster(ca.CLIENT)
     commands = broadcaster.recv(b'', ('127.0.0.1', 6666))
@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from caproto.server import PVGroup, SubGroup, instrumentation, pvproperty
+from caproto.server.stats import InstrumentationHelper
+
+
+@pytest.fixture
+def instrumented():
+    stats = instrumentation.enable()
+    yield stats
+    instrumentation.disable()
+
+
+def test_histogram():
+    hist = instrumentation.Histogram([1, 2, 4, 8])
+    assert hist.percentile(50) == 0.0
+    for value in [0.5, 1.5, 1.5, 3, 100]:
+        hist.record(value)
+
+    assert hist.counts == [1, 2, 1, 0, 1]
+    assert hist.count == 5
+    assert hist.maximum == 100
+    assert hist.mean == pytest.approx(106.5 / 5)
+    assert hist.percentile(50) == 2
+    assert hist.percentile(100) == 100
+
+    hist.reset()
+    assert hist.count == 0
+    assert hist.counts == [0] * 5
+
+
+def test_enable_disable():
+    assert instrumentation.active is None
+    stats = instrumentation.enable()
+    try:
+        assert instrumentation.enable() is stats
+    finally:
+        instrumentation.disable()
+    assert instrumentation.active is None
+
+
+class InstrumentedIOC(PVGroup):
+    instr = SubGroup(InstrumentationHelper, prefix='stats:')
+    value = pvproperty(value=1.0)
+
+    @value.putter
+    async def value(self, instance, value):
+        return value * 2
+
+    @value.getter
+    async def value(self, instance):
+        ...
+
+
+def test_handler_statistics(instrumented):
+    ioc = InstrumentedIOC(prefix='instr:')
+
+    async def test():
+        await ioc.value.write(3)
+        await ioc.value.write(4)
+        await ioc.value.read(ioc.value.data_type)
+        await ioc.instr._update(instrumented)
+
+    asyncio.run(test())
+    assert ioc.value.value == 8
+    assert instrumented.putter_times['instr:value'].count == 2
+    assert instrumented.getter_times['instr:value'].count == 1
+    assert instrumented.write_to_publish.count == 2
+
+    # The helper's own PVs are not instrumented:
+    assert ioc.instr.handler_pvs.value == 'instr:value'
+    assert list(ioc.instr.write_to_publish_hist.value) == (
+        instrumented.write_to_publish.counts
+    )
+    assert ioc.instr.write_to_publish_p99.value > 0
+
+
+def test_enable_pv():
+    ioc = InstrumentedIOC(prefix='instr:')
+
+    async def test():
+        await ioc.instr.enable.write('Enable')
+        assert instrumentation.active is not None
+        await ioc.value.write(3)
+        assert instrumentation.active.putter_times
+        await ioc.instr.reset.write('Reset')
+        assert not instrumentation.active.putter_times
+        await ioc.instr.enable.write('Disable')
+
+    try:
+        asyncio.run(test())
+    finally:
+        instrumentation.disable()
+    assert instrumentation.active is None
@@ -0,0 +1,26 @@
+import pytest
+
+from caproto.benchmarking.load import run_load
+
+
+@pytest.mark.parametrize('workload, client_kind',
+                         [('connect', 'raw'),
+                          ('mixed', 'raw'),
+                          ('mixed', 'threading'),
+                          ('mixed', 'asyncio')])
+def test_run_load(workload, client_kind):
+    report = run_load(workload, client_kind, 2, scalars=3, waveforms=1,
+                      length=10, rate=20, duration=1.0)
+    assert report.failed == 0
+    if workload == 'connect':
+        # Every scalar, waveform and setpoint
+        assert len(report.connect_latencies) == 2 * 7
+        assert report.connections_per_second > 0
+    else:
+        # One client monitors the scalars and waveform, the other reads
+        # scalars and writes setpoints.
+        assert len(report.connect_latencies) == 4 + 6
+        assert report.updates > 0
+        assert report.requests > 0
+        assert report.errors == 0
+    assert 'connections' in report.format()
@@ -1,4 +1,8 @@
+import io
 import logging
+import threading
+
+import caproto as ca
 from caproto._log import PVFilter, validate_level
 
 
@@ -105,3 +109,95 @@ def test_noninterfering_handlers():
     assert len(info_handler.records) == 1
     assert len(debug_handler.records) == 2
     assert set(info_handler.records).issubset(debug_handler.records)
+
+
+class _RecordingHandler(logging.Handler):
+    def __init__(self):
+        self.records = []
+        super().__init__()
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_circuit_debug_logging_follows_level(circuit_pair):
+    cli_circuit, _ = circuit_pair
+    handler = _RecordingHandler()
+    log = logging.getLogger('caproto.circ')
+    log.addHandler(handler)
+    level = log.level
+    try:
+        log.setLevel('DEBUG')
+        cli_circuit.send(ca.EchoRequest(), extra={'pv': 'a'})
+        record, = handler.records
+        assert record.pv == 'a'
+        assert record.direction == '--->>>'
+        assert record.bytesize == 16
+
+        # Changing the level takes effect immediately.
+        handler.records.clear()
+        log.setLevel('INFO')
+        cli_circuit.send(ca.EchoRequest())
+        assert handler.records == []
+    finally:
+        log.setLevel(level)
+        log.removeHandler(handler)
+
+
+def test_message_trace(circuit_pair):
+    cli_circuit, srv_circuit = circuit_pair
+    trace = ca.start_message_trace(capacity=3)
+    try:
+        assert ca.get_message_trace() is trace
+        buffers = cli_circuit.send(ca.EchoRequest())
+        srv_circuit.recv(*buffers)
+    finally:
+        assert ca.stop_message_trace() is trace
+    assert ca.get_message_trace() is None
+
+    sent, received = trace.records()
+    assert sent.direction == '--->>>'
+    assert sent.our_role is ca.CLIENT
+    assert received.direction == '<<<---'
+    assert received.our_role is ca.SERVER
+    assert sent.command == received.command == 'EchoRequest'
+    assert sent.address == cli_circuit.address
+
+    # Not recorded: the trace was stopped.
+    cli_circuit.send(ca.EchoRequest())
+    assert len(trace) == trace.count == 2
+
+    # The oldest messages are overwritten.
+    for _ in range(4):
+        trace.record(True, ca.CLIENT, None, ca.EchoRequest())
+    assert len(trace) == 3
+    assert trace.count == 6
+    assert [record.address for record in trace.records()] == [None] * 3
+
+    stream = io.StringIO()
+    trace.dump(file=stream)
+    assert stream.getvalue().count('EchoRequest') == 3
+
+
+def test_message_trace_threads():
+    trace = ca.MessageTrace(capacity=100000)
+    num_threads = 8
+    per_thread = 2000
+
+    def record():
+        for i in range(per_thread):
+            # Every thread records each address, so as to race on new ones.
+            trace.record(True, ca.CLIENT, ('127.0.0.1', i % 50),
+                         ca.EchoRequest())
+
+    threads = [threading.Thread(target=record) for _ in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert trace.count == len(trace) == num_threads * per_thread
+    records = trace.records()
+    assert len(records) == trace.count
+    assert len(trace._addresses) == 50
+    assert {record.address for record in records} == set(trace._addresses)
@@ -9,7 +9,9 @@ import sys
 import pytest
 
 from caproto.threading.client import Context, SharedBroadcaster
-from caproto.threading.pyepics_compat import caget, caput, get_pv
+from caproto.threading.pyepics_compat import (caget, caget_many, camonitor,
+                                              camonitor_clear, caput,
+                                              caput_many, get_pv)
 
 from .conftest import default_setup_module as setup_module  # noqa
 from .conftest import default_teardown_module as teardown_module  # noqa
@@ -97,3 +99,35 @@ def test_native_endianess(context, ioc):
     ret = pv.get(use_monitor=False)
     assert list(ret) == [1, 2, 3]
     assert ret.dtype.isnative
+
+
+@pytest.mark.parametrize('wait', ['all', 'each', False])
+def test_caget_many_caput_many(context, ioc, wait):
+    names = [ioc.pvs['int2'], ioc.pvs['float'], ioc.pvs['str'],
+             ioc.pvs['enum'], 'does_not_exist']
+    values = [5, 3.15, 'hi', 'c', 1]
+    success = caput_many(names, values, wait=wait, connection_timeout=2,
+                         context=context)
+    assert success == [1, 1, 1, 1, -1]
+
+    def new_values():
+        # Each name twice, to check that the values are in order.
+        got = caget_many(names + names[::-1], as_string=True, timeout=2,
+                         context=context)
+        assert got[:5] == got[5:][::-1]
+        return got[:5] == [5, 3.15, 'hi', 'c', None]
+
+    wait_for(new_values, timeout=10)
+    assert caget_many(names[:2], context=context) == [5, 3.15]
+
+
+def test_camonitor(context, ioc):
+    messages = []
+    camonitor(ioc.pvs['int3'], writer=messages.append, context=context)
+    try:
+        caput(ioc.pvs['int3'], 7, wait=True, context=context)
+        wait_for(lambda: any(message.endswith(' 7')
+                             for message in messages), timeout=2)
+        assert messages[-1].startswith(ioc.pvs['int3'][:32])
+    finally:
+        camonitor_clear(ioc.pvs['int3'])
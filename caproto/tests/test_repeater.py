@@ -32,3 +32,55 @@ def test_sync_repeater(ioc):
 
     with curio.Kernel() as kernel:
         kernel.run(check_repeater)
+
+
+def test_asyncio_repeater():
+    import asyncio
+    import socket
+    import threading
+    from caproto._commands import read_datagram
+    from caproto.asyncio.repeater import AsyncioRepeater
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(('127.0.0.1', 0))
+    address = sock.getsockname()
+    repeater = AsyncioRepeater(sock)
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_until_complete,
+                              args=(repeater.run(),))
+    thread.start()
+    clients = []
+    server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        for _ in range(3):
+            client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+            client.bind(('127.0.0.1', 0))
+            client.settimeout(2)
+            clients.append(client)
+            client.sendto(bytes(ca.RepeaterRegisterRequest('127.0.0.1')),
+                          address)
+            data = client.recv(ca.MAX_UDP_RECV)
+            confirmation, = read_datagram(data, address, ca.SERVER)
+            assert isinstance(confirmation, ca.RepeaterConfirmResponse)
+        assert len(repeater.clients) == 3
+
+        # The address is filled in when left empty, and otherwise forwarded
+        # as sent.
+        empty = ca.Beacon(13, 5064, 1, '0.0.0.0')
+        full = ca.Beacon(13, 5065, 2, '10.0.0.1')
+        server.sendto(bytes(empty) + bytes(full), address)
+        for client in clients:
+            data = client.recv(ca.MAX_UDP_RECV)
+            first, second = read_datagram(data, address, ca.SERVER)
+            assert first.address == '127.0.0.1'
+            assert first.beacon_id == 1
+            assert bytes(second) == bytes(full)
+        assert set(repeater.servers) == {5064, 5065}
+    finally:
+        loop.call_soon_threadsafe(repeater.stop)
+        thread.join()
+        loop.close()
+        for client in clients:
+            client.close()
+        server.close()
+        sock.close()
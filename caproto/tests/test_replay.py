@@ -0,0 +1,83 @@
+import io
+
+import caproto as ca
+from caproto.sync.client import read, write
+from caproto.sync.replay import replay_to_client, replay_to_server
+
+from .test_core import make_channels
+
+
+def test_capture_round_trip(circuit_pair):
+    cli_circuit, srv_circuit = circuit_pair
+    file = io.BytesIO()
+    capture = ca.start_traffic_capture(file)
+    try:
+        assert ca.get_traffic_capture() is capture
+        buffers = cli_circuit.send(ca.EchoRequest())
+        srv_circuit.recv(*buffers)
+    finally:
+        assert ca.stop_traffic_capture() is capture
+    assert ca.get_traffic_capture() is None
+    # Not captured: the capture was stopped.
+    cli_circuit.send(ca.EchoRequest())
+
+    file.seek(0)
+    (cli_stream, sent, srv_stream, received) = ca.read_capture(file)
+    assert cli_stream.transport == srv_stream.transport == 'tcp'
+    assert cli_stream.our_role is ca.CLIENT
+    assert srv_stream.our_role is ca.SERVER
+    assert cli_stream.their_address == cli_circuit.address
+    assert sent.stream is cli_stream and sent.sent
+    assert received.stream is srv_stream and not received.sent
+    assert sent.data == received.data == bytes(ca.EchoRequest())
+
+
+def test_replay_to_client(circuit_pair, tmp_path):
+    path = str(tmp_path / 'capture')
+    ca.start_traffic_capture(path)
+    try:
+        cli_circuit = ca.VirtualCircuit(ca.CLIENT, ('127.0.0.1', 5555), 1)
+        srv_circuit = ca.VirtualCircuit(ca.SERVER, ('127.0.0.1', 5555), None)
+        for sender, receiver, command in [
+                (cli_circuit, srv_circuit, ca.VersionRequest(version=13,
+                                                             priority=1)),
+                (srv_circuit, cli_circuit, ca.VersionResponse(version=13))]:
+            commands, _ = receiver.recv(*sender.send(command))
+            receiver.process_command(*commands)
+        cli_channel, srv_channel = make_channels(cli_circuit, srv_circuit,
+                                                 5, 1)
+        for i in range(10):
+            request = cli_channel.read(ioid=i)
+            commands, _ = srv_circuit.recv(*cli_circuit.send(request))
+            srv_circuit.process_command(*commands)
+            response = srv_channel.read(data=[i], data_type=5, data_count=1,
+                                        ioid=i, status=1)
+            commands, _ = cli_circuit.recv(*srv_circuit.send(response))
+            cli_circuit.process_command(*commands)
+    finally:
+        ca.stop_traffic_capture()
+
+    report = replay_to_client(path)
+    assert report.skipped == 0
+    # VersionRequest, CreateChanRequest and the reads
+    assert report.messages_sent == 12
+    assert report.messages_received == 12
+
+
+def test_replay_to_server(type_varieties_ioc, tmp_path):
+    pv = type_varieties_ioc.pvs['int']
+    path = str(tmp_path / 'capture')
+    ca.start_traffic_capture(path)
+    try:
+        for i in range(5):
+            write(pv, [i], notify=True)
+            read(pv)
+    finally:
+        ca.stop_traffic_capture()
+
+    report = replay_to_server(path, speed=None)
+    assert report.skipped == 0
+    assert report.unanswered == 0
+    assert report.messages_received > 0
+    assert report.latencies
+    assert 'latency' in report.format()
@@ -375,3 +375,205 @@ def test_process_field(request, prefix, async_lib):
     write(f'{prefix}record.PROC', [1], notify=True)
     write(f'{prefix}record.PROC', [1], notify=True)
     assert read(f'{prefix}count').data[0] == 2
+
+
+def test_buffered_stream_protocol():
+    from caproto.asyncio.utils import _BufferedStreamProtocol
+
+    async def test():
+        received = bytearray()
+        server_protocols = []
+
+        def connected(protocol):
+            protocol.set_receiver(received.extend)
+            server_protocols.append(protocol)
+
+        server = await asyncio.get_running_loop().create_server(
+            lambda: _BufferedStreamProtocol(16, connected_callback=connected),
+            host='127.0.0.1', port=0)
+        host, port = server.sockets[0].getsockname()
+        reader, writer = await asyncio.open_connection(host, port)
+        # More than one buffer's worth arrives in order.
+        writer.write(bytes(range(100)))
+        await writer.drain()
+        while len(received) < 100:
+            await asyncio.sleep(0.01)
+        assert received == bytes(range(100))
+
+        protocol, = server_protocols
+        header = ca.VersionResponse(13).header
+        await protocol.send(memoryview(header), b'', b'abc')
+        assert await reader.readexactly(19) == bytes(header) + b'abc'
+
+        writer.close()
+        await asyncio.wait_for(protocol.wait_closed(), 5)
+        with pytest.raises(ca.CaprotoNetworkError):
+            await protocol.send(b'abc')
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(test())
+
+
+def test_buffered_stream_protocol_large_message():
+    from caproto.asyncio.utils import _BufferedStreamProtocol
+
+    async def test():
+        chunks = []
+        server_protocols = []
+        # As claimed by a header, far more than is ever sent.
+        claimed = 2 ** 32
+
+        def receive(data):
+            chunks.append(bytes(data))
+            return claimed - sum(map(len, chunks))
+
+        def connected(protocol):
+            protocol.set_receiver(receive)
+            server_protocols.append(protocol)
+
+        server = await asyncio.get_running_loop().create_server(
+            lambda: _BufferedStreamProtocol(16, max_buffer_size=1000,
+                                            connected_callback=connected),
+            host='127.0.0.1', port=0)
+        host, port = server.sockets[0].getsockname()
+        reader, writer = await asyncio.open_connection(host, port)
+        data = bytes(range(256)) * 20
+        writer.write(data)
+        await writer.drain()
+        # Received into buffers of at most max_buffer_size, as it arrives;
+        # each is passed on once full.
+        while sum(map(len, chunks)) <= len(data) - 1000:
+            await asyncio.sleep(0.01)
+        received = b''.join(chunks)
+        assert received == data[:len(received)]
+        assert max(map(len, chunks)) <= 1000
+        protocol, = server_protocols
+        assert len(protocol._large_buffer) == 1000
+
+        writer.close()
+        await asyncio.wait_for(protocol.wait_closed(), 5)
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(test())
+
+
+def test_subscription_queue_wait_for_item():
+    from caproto.asyncio.server import _SubscriptionQueue
+
+    async def test():
+        queue = _SubscriptionQueue()
+        assert not await queue.wait_for_item(0.01)
+        asyncio.get_running_loop().call_later(0.01, queue.put_nowait, 1)
+        assert await queue.wait_for_item(5)
+        # The item is not taken.
+        assert await queue.wait_for_item(0)
+        assert queue.get_nowait() == 1
+
+    asyncio.run(test())
+
+
+def test_pipelined_requests(type_varieties_ioc):
+    from caproto.sync import client
+
+    udp_sock = ca.bcast_socket()
+    udp_sock.bind(('', 0))
+    try:
+        chan = client.make_channel(type_varieties_ioc.pvs['int'], udp_sock,
+                                   0, 2)
+    finally:
+        udp_sock.close()
+    circuit = chan.circuit
+    sock = client.sockets[circuit]
+    # The IOC logs every request verbosely.
+    sock.settimeout(30)
+    try:
+        requests = [chan.read(notify=True) for _ in range(200)]
+        write = chan.write([7], notify=True)
+        requests += [write] + [chan.read(notify=True) for _ in range(200)]
+        # All sent in one go, so they are received together.
+        sock.sendall(b''.join(circuit.send(*requests)))
+
+        responses = {}
+        while len(responses) < len(requests):
+            data = sock.recv(65536)
+            commands, _ = circuit.recv(data)
+            for command in commands:
+                circuit.process_command(command)
+                responses[command.ioid] = command
+        assert isinstance(responses[write.ioid], ca.WriteNotifyResponse)
+        # Reads after the write see its value.
+        assert all(responses[request.ioid].data[0] == 7
+                   for request in requests[201:])
+    finally:
+        client._close_channels([chan])
+
+
+def test_pipelined_requests_beyond_backlog(monkeypatch):
+    from caproto.sync import client
+
+    from .conftest import asyncio_runner, new_prefix
+
+    # More requests in one burst than the server queues: it should stop
+    # reading until it catches up, rather than disconnect.
+    monkeypatch.setattr(ca, 'MAX_COMMAND_BACKLOG', 50)
+    pv_name = f'{new_prefix()}int'
+    pvdb = {pv_name: ca.ChannelInteger(value=7)}
+
+    def client_test():
+        udp_sock = ca.bcast_socket()
+        udp_sock.bind(('', 0))
+        try:
+            chan = client.make_channel(pv_name, udp_sock, 0, 2)
+        finally:
+            udp_sock.close()
+        circuit = chan.circuit
+        sock = client.sockets[circuit]
+        sock.settimeout(10)
+        try:
+            requests = [chan.read(notify=True) for _ in range(2000)]
+            sock.sendall(b''.join(circuit.send(*requests)))
+            responses = {}
+            while len(responses) < len(requests):
+                data = sock.recv(65536)
+                assert data, 'Disconnected by the server'
+                commands, _ = circuit.recv(data)
+                for command in commands:
+                    circuit.process_command(command)
+                    responses[command.ioid] = command
+            assert all(response.data[0] == 7
+                       for response in responses.values())
+        finally:
+            client._close_channels([chan])
+
+    asyncio_runner(pvdb, client_test, threaded_client=True)
+
+
+def test_subscription_fan_out_while_subscribing():
+    from caproto.asyncio.server import Context
+
+    ctx = None
+    sent = []
+
+    async def send(sub_spec, sub, **kwargs):
+        sent.append(sub)
+        # As if a client subscribed or cleared a subscription while the
+        # update was being sent to others.
+        await asyncio.sleep(0)
+        if sub == 'first':
+            ctx.subscriptions[sub_spec].append('added')
+        elif sub == 'second':
+            ctx.subscriptions[sub_spec].remove('first')
+
+    async def test():
+        nonlocal ctx
+        ctx = Context({'fan_out:int': ca.ChannelInteger(value=1)})
+        ctx._subscription_queue_send = send
+        ctx.subscriptions['spec'].extend(['first', 'second'])
+        await ctx._subscription_queue_iteration(
+            ('spec', ), metadata=None, values=[1], flags=0, sub=None)
+
+    asyncio.run(test())
+    # Those subscribed when the update was fanned out.
+    assert sent == ['first', 'second']
@@ -23,3 +23,92 @@ def test_udp_traffic():
     # tcpdump -U -w example_udp_data.pcap port 5064
     with open(data_dir / 'example_udp_data.pcap', 'rb') as file:
         list(shark(file))
+
+
+def write_tcp_pcap(file, segments):
+    "Write (timestamp, seq, data) segments sent from 10.0.0.1:4000."
+    from socket import inet_aton
+    from dpkt.ethernet import Ethernet
+    from dpkt.ip import IP
+    from dpkt.pcap import Writer
+    from dpkt.tcp import TCP, TH_ACK
+
+    writer = Writer(file)
+    for timestamp, seq, data in segments:
+        tcp = TCP(sport=4000, dport=5064, seq=seq, flags=TH_ACK, data=data)
+        ip = IP(src=inet_aton('10.0.0.1'), dst=inet_aton('10.0.0.2'), p=6,
+                data=tcp)
+        writer.writepkt(bytes(Ethernet(data=ip)), ts=timestamp)
+    file.seek(0)
+
+
+def test_tcp_reassembly():
+    import io
+    import caproto as ca
+    from ..sync.shark import shark
+
+    commands = [ca.VersionRequest(priority=0, version=13),
+                ca.CreateChanRequest(name='a' * 40, cid=1, version=13),
+                ca.ReadNotifyRequest(data_type=0, data_count=1, sid=1,
+                                     ioid=2)]
+    data = b''.join(bytes(command) for command in commands)
+    file = io.BytesIO()
+    # Commands split across segments, with a partial retransmission.
+    write_tcp_pcap(file, [(1, 100, data[:5]),
+                          (2, 105, data[5:30]),
+                          (3, 103, data[3:20]),
+                          (4, 130, data[30:])])
+    parsed = list(shark(file))
+    assert [item.timestamp for item in parsed] == [2, 4, 4]
+    assert [item.command for item in parsed] == commands
+
+
+def test_summarize():
+    from caproto import CLIENT, SERVER
+    from ..sync.shark import summarize
+
+    with open(data_dir / 'example_udp_data.pcap', 'rb') as file:
+        summary = summarize(file)
+    assert summary.count == 16
+    assert summary.searches == 4
+    assert summary.pv_searches == {'rpi:color': 4}
+    client, = summary.clients
+    assert client.role is CLIENT and client.host == '192.168.86.21'
+    assert client.commands['SearchRequest'] == 4
+    server, = summary.servers
+    assert server.role is SERVER and server.searches == 4
+    assert 'rpi:color' in summary.format()
+
+    with open(data_dir / 'example_tcp_data.pcap', 'rb') as file:
+        summary = summarize(file)
+    server, = summary.servers
+    assert server.commands['EventAddResponse'] == 4
+    # Every command after the channel creation concerns the one PV.
+    assert summary.top_pvs() == [('rpi:color', 18)]
+
+
+def test_index(tmp_path):
+    from ..sync.shark import build_index, shark
+
+    path = str(tmp_path / 'example.pcap')
+    with open(data_dir / 'example_tcp_data.pcap', 'rb') as source:
+        with open(path, 'wb') as file:
+            file.write(source.read())
+    index = build_index(path, time_step=1)
+    assert index.path == path + '.idx'
+    assert index.pvs == ['rpi:color']
+
+    with open(path, 'rb') as file:
+        everything = list(shark(file))
+    start = everything[5].timestamp
+    stop = everything[15].timestamp
+    for kwargs in [dict(pv='rpi:color'),
+                   dict(pv=['rpi:color', 'unknown']),
+                   dict(start=start, stop=stop),
+                   dict(pv='rpi:color', start=start, stop=stop)]:
+        with open(path, 'rb') as file:
+            expected = [item.command for item in shark(file, **kwargs)]
+        with open(path, 'rb') as file:
+            indexed = [item.command for item in shark(file, index=index,
+                                                      **kwargs)]
+        assert expected and indexed == expected
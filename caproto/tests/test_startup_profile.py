@@ -0,0 +1,83 @@
+import pytest
+
+from caproto.server import PVGroup, SubGroup, pvproperty, startup_profile
+
+
+class Axis(PVGroup):
+    setpoint = pvproperty(value=0.0, record='ao', name='{axis}:SP')
+    readback = pvproperty(value=0.0, read_only=True, name='{axis}:RBV')
+
+    @setpoint.putter
+    async def setpoint(self, instance, value):
+        ...
+
+    @setpoint.fields.description.putter
+    async def setpoint(fields, instance, value):
+        ...
+
+
+class Stage(PVGroup):
+    x = SubGroup(Axis, macros={'axis': 'x'}, prefix='')
+    y = SubGroup(Axis, macros={'axis': 'y'}, prefix='')
+    enabled = pvproperty(value=False)
+
+
+@pytest.fixture
+def profiler():
+    profiler = startup_profile.enable()
+    yield profiler
+    startup_profile.disable()
+
+
+def test_class_construction_recorded():
+    name = f'{__name__}.Stage'
+    assert name in startup_profile.class_construction_times
+    assert startup_profile.class_construction_times[name] >= 0.0
+
+
+def test_startup_profile(profiler):
+    stages = [Stage(prefix=f'stage{idx}:') for idx in range(3)]
+
+    axis = profiler.groups[f'{__name__}.Axis']
+    stage = profiler.groups[f'{__name__}.Stage']
+    assert axis.count == 6
+    assert axis.channels == 12
+    assert stage.count == 3
+    assert stage.channels == 3
+    assert stage.inclusive >= stage.exclusive
+    assert stage.inclusive >= axis.inclusive
+    assert profiler.phases['PVGroup instantiation'] >= stage.inclusive
+
+    # Record fields are counted as well:
+    assert profiler.object_counts['PvpropertyDouble'] > 6
+    assert sum(profiler.object_counts.values()) > len(stages[0].pvdb) * 3
+
+    report = profiler.report()
+    assert 'PVGroup instantiation' in report
+    assert f'{__name__}.Axis' in report
+
+
+def test_cached_instantiation():
+    first = Stage(prefix='a:')
+    second = Stage(prefix='b:')
+    assert 'a:x:SP' in first.pvdb
+    assert 'b:y:RBV' in second.pvdb
+    assert first.x.setpoint is not second.x.setpoint
+    assert first.x.setpoint.group is first.x
+    assert first.x.setpoint.alarm is not second.x.setpoint.alarm
+
+    # Customized record field classes are generated once per pvproperty
+    assert type(first.x.setpoint.field_inst) is type(
+        second.y.setpoint.field_inst)
+    assert first.x.setpoint.field_inst is not second.y.setpoint.field_inst
+    assert first.x.setpoint.field_inst.parent is first.x.setpoint
+
+
+def test_cached_instantiation_subclass_override():
+    class CustomAxis(Axis):
+        readback = pvproperty(value=1, name='{axis}:RBV')
+
+    axis = Axis(prefix='', macros={'axis': 'a'})
+    custom = CustomAxis(prefix='', macros={'axis': 'a'})
+    assert axis.readback.value == 0.0
+    assert custom.readback.value == 1
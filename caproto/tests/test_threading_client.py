@@ -15,8 +15,12 @@ import caproto as ca
 import caproto._utils
 import caproto.threading.client
 from caproto import ChannelType
+from caproto.client.common import METADATA_CACHE_MASK, TokenBucket
+from caproto.client.recorder import MonitorRecorder
+from caproto.client.search_results import SearchResultCache
 from caproto.threading.client import (Batch, Context, ContextDisconnectedError,
-                                      SharedBroadcaster)
+                                      SelectorThreadPool, SharedBroadcaster,
+                                      VirtualCircuitManager)
 
 from .conftest import default_setup_module as setup_module  # noqa
 from .conftest import default_teardown_module as teardown_module  # noqa
@@ -141,7 +145,10 @@ def context(request, shared_broadcaster):
     assert not sb._retry_unanswered_searches_thread.is_alive()
 
 
-def test_server_crash(context, ioc_factory):
+@pytest.mark.parametrize('reconnect_jitter', [0, 0.5])
+def test_server_crash(context, ioc_factory, monkeypatch, reconnect_jitter):
+    monkeypatch.setattr(caproto.client.common, 'RECONNECT_JITTER',
+                        reconnect_jitter)
     first_ioc = ioc_factory()
     # The factory function does not return until readiness is confirmed.
 
@@ -185,12 +192,33 @@ def test_server_crash(context, ioc_factory):
     # Wait to confirm that the subscription produced a new response.
     while not collector:
         time.sleep(0.05)
+    # The recovery was recorded.
+    wait_for(lambda: len(context.recoveries) == 1, timeout=2)
+    recovery, = context.recoveries
+    assert recovery.pvs == len(pvs)
+    assert recovery.subscriptions == 1
+    assert recovery.duration > 0
 
     # Clean up.
     second_ioc.process.terminate()
     second_ioc.process.wait()
 
 
+def test_request_rate_limit(ioc, context, monkeypatch):
+    bucket = TokenBucket(rate=10, burst=2)
+    assert bucket.take(3) == 2
+    assert bucket.take(1) == 0
+    assert 0 < bucket.delay() <= 0.1
+
+    monkeypatch.setattr(caproto.client.common, 'REQUEST_RATE', 20)
+    monkeypatch.setattr(caproto.client.common, 'REQUEST_BURST', 2)
+    pvs = context.get_pvs(*ioc.pvs.values())
+    for pv in pvs:
+        pv.wait_for_connection(timeout=10)
+    bucket, = context._request_buckets.values()
+    assert bucket.rate == 20
+
+
 def test_subscriptions(ioc, context):
     cntx = context
 
@@ -223,6 +251,279 @@ def test_subscriptions(ioc, context):
     assert monitor_values[1:] == [1, 2, 3]
 
 
+@pytest.mark.parametrize('dispatch', ['latest', 2])
+def test_subscriptions_dispatch(ioc, context, dispatch):
+    pv, = context.get_pvs(ioc.pvs['int'])
+    pv.wait_for_connection(timeout=10)
+
+    monitor_values = []
+    release = threading.Event()
+
+    def callback(sub, command):
+        # Block on the initial update while more arrive.
+        release.wait(timeout=10)
+        monitor_values.append(command.data[0])
+
+    sub = pv.subscribe(dispatch=dispatch)
+    assert sub is pv.subscribe(dispatch=dispatch)
+    assert sub is not pv.subscribe()
+    sub.add_callback(callback)
+    time.sleep(0.2)  # Wait for EventAddRequest to be sent and processed.
+    for value in range(1, 11):
+        pv.write((value, ), wait=True)
+    time.sleep(0.2)  # Wait for the last update to be processed.
+    release.set()
+
+    maxlen = 1 if dispatch == 'latest' else dispatch
+    for _ in range(20):
+        if len(monitor_values) == 1 + maxlen:
+            break
+        time.sleep(0.1)
+    sub.clear()
+
+    # The initial update, followed by the most recent ones.
+    assert monitor_values[1:] == list(range(11 - maxlen, 11))
+    assert sub.dropped == 10 - maxlen
+
+
+def test_monitor_recorder(ioc, context, tmp_path):
+    pytest.importorskip('numpy')
+    pv, = context.get_pvs(ioc.pvs['int'])
+    pv.wait_for_connection(timeout=10)
+    initial = pv.read().data[0]
+
+    recorder = MonitorRecorder(capacity=4, spill_dir=str(tmp_path))
+    sub = pv.subscribe(data_type='time')
+    buffer = recorder.add(sub)
+    assert sub.recorders == [buffer]
+    for _ in range(20):
+        if buffer.count:
+            break
+        time.sleep(0.1)
+    for value in range(1, 11):
+        pv.write((value, ), wait=True)
+    for _ in range(20):
+        if buffer.count == 11:
+            break
+        time.sleep(0.1)
+    recorder.remove(pv.name)
+    assert sub.subscriptionid is None  # No callbacks, so it went dormant.
+
+    records = recorder.snapshot()[pv.name]
+    assert list(records['value']) == [7, 8, 9, 10]
+    assert (records['timestamp'][1:] >= records['timestamp'][:-1]).all()
+    assert len(buffer.spilled) == 2
+    records = buffer.snapshot(include_spilled=True)
+    assert list(records['value']) == [initial] + list(range(1, 11))
+    window = buffer.snapshot(start=records['timestamp'][3],
+                             include_spilled=True)
+    assert list(window['value']) == list(range(3, 11))
+
+
+def test_monitor_recorder_remove_then_add(ioc, context):
+    pytest.importorskip('numpy')
+    pv, = context.get_pvs(ioc.pvs['int'])
+    pv.wait_for_connection(timeout=10)
+
+    recorder = MonitorRecorder(capacity=16)
+    sub = pv.subscribe(data_type='time')
+    buffer = recorder.add(sub)
+    with pytest.raises(ca.CaprotoValueError):
+        recorder.add(sub)
+    wait_for(lambda: buffer.count == 1, timeout=2)
+    recorder.remove(pv.name)
+    with pytest.raises(ca.CaprotoKeyError):
+        recorder.remove(pv.name)
+    pv.write((1, ), wait=True)  # Not recorded
+
+    # Recording resumes into the same buffer.
+    assert recorder.add(sub) is buffer
+    assert sub.recorders == [buffer]
+    wait_for(lambda: buffer.count == 2, timeout=2)
+    pv.write((2, ), wait=True)
+    wait_for(lambda: buffer.count == 3, timeout=2)
+    recorder.remove(pv.name)
+    assert list(recorder.snapshot()[pv.name]['value'][1:]) == [1, 2]
+
+
+def test_read_metadata(ioc, context):
+    pv, = context.get_pvs(ioc.pvs['float'])
+    pv.wait_for_connection(timeout=10)
+    expected = pv.read(data_type='control').metadata
+
+    metadata = pv.read_metadata()
+    assert metadata.units == expected.units
+    assert metadata.upper_ctrl_limit == expected.upper_ctrl_limit
+    assert pv.metadata_cache.info()[:2] == (0, 1)
+    # The cache is now refreshed by a subscription, and served locally.
+    sub = pv.subscribe(data_type='control', mask=METADATA_CACHE_MASK)
+    assert len(sub.recorders) == 1
+    for _ in range(20):
+        if pv.metadata_cache.info().refreshes:
+            break
+        time.sleep(0.1)
+    assert pv.read_metadata().units == expected.units
+    assert pv.read_metadata().units == expected.units
+    hits, misses, refreshes, size = pv.metadata_cache.info()
+    assert (hits, misses, refreshes, size) == (2, 1, 1, 1)
+
+    pv.read_metadata(use_cache=False)
+    assert len(sub.recorders) == 1
+    assert pv.metadata_cache.info()[:2] == (2, 1)
+
+    with pytest.raises(ca.CaprotoValueError):
+        pv.read_metadata('time')
+
+
+def test_subscriptions_dispatch_invalid(ioc, context):
+    pv, = context.get_pvs(ioc.pvs['int'])
+    for dispatch in ('oldest', 0, -1):
+        with pytest.raises(ca.CaprotoValueError):
+            pv.subscribe(dispatch=dispatch)
+
+
+def test_selector_thread_pool():
+    class Receiver:
+        log = ca.threading.client.ch_logger
+
+        def __init__(self):
+            self.received_data = []
+            self.threads = set()
+
+        def received(self, bytes_recv, address):
+            self.received_data.append(bytes_recv)
+            self.threads.add(threading.current_thread().name)
+
+    pool = SelectorThreadPool(2)
+    pool.start()
+    socket_pairs = [socket.socketpair() for _ in range(4)]
+    receivers = [Receiver() for _ in socket_pairs]
+    try:
+        for (sock, _), receiver in zip(socket_pairs, receivers):
+            pool.add_socket(sock, receiver)
+
+        # Sockets are distributed evenly among the threads:
+        assert [selector.socket_count for selector in pool.selectors] == [2, 2]
+
+        for idx in range(10):
+            for _, peer in socket_pairs:
+                peer.sendall(bytes([idx]))
+            time.sleep(0.01)
+
+        for receiver in receivers:
+            wait_for(lambda: len(b''.join(receiver.received_data)) == 10,
+                     timeout=2)
+            assert b''.join(receiver.received_data) == bytes(range(10))
+            # Each socket is only serviced by a single thread
+            assert len(receiver.threads) == 1
+
+        sock, _ = socket_pairs[0]
+        pool.remove_socket(sock)
+        assert sorted(selector.socket_count
+                      for selector in pool.selectors) == [1, 2]
+    finally:
+        pool.stop()
+        pool.join()
+        for sock, peer in socket_pairs:
+            sock.close()
+            peer.close()
+
+    assert not any(thread.is_alive() for thread in pool.threads)
+
+
+def test_subscriptions_selector_threads(ioc, shared_broadcaster):
+    context = Context(broadcaster=shared_broadcaster, selector_threads=2)
+    assert isinstance(context.selector, SelectorThreadPool)
+    try:
+        pv, = context.get_pvs(ioc.pvs['int'])
+        pv.wait_for_connection(timeout=10)
+
+        monitor_values = []
+
+        def callback(sub, command):
+            monitor_values.append(command.data[0])
+
+        sub = pv.subscribe()
+        sub.add_callback(callback)
+        time.sleep(0.2)  # Wait for EventAddRequest to be sent and processed.
+        for value in range(1, 4):
+            pv.write((value, ), wait=True)
+        wait_for(lambda: monitor_values[-1:] == [3], timeout=2)
+        assert monitor_values[1:] == [1, 2, 3]
+    finally:
+        context.disconnect()
+
+    assert not any(thread.is_alive() for thread in context.selector.threads)
+
+
+def test_circuit_connection_refused(context, ioc):
+    # Find a port with nothing listening on it
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        address = sock.getsockname()
+
+    context.broadcaster.server_protocol_versions[address] = 13
+    cm = context.get_circuit_manager(address, 0)
+    assert cm.connecting
+    # Commands are held until the circuit is ready:
+    cm.send(ca.EchoRequest())
+    wait_for(lambda: cm.dead.is_set(), timeout=2)
+    assert not cm.connecting
+    assert not cm.connected
+
+    # Other circuits are unaffected
+    pv, = context.get_pvs(ioc.pvs['float'])
+    pv.wait_for_connection(timeout=10)
+    pv.read()
+
+
+def test_circuit_connect_does_not_block(context, ioc):
+    # A server which accepts the connection but never completes the handshake
+    # should not hold up connections to other servers.
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_sock:
+        server_sock.bind(('127.0.0.1', 0))
+        server_sock.listen(1)
+        address = server_sock.getsockname()
+        context.broadcaster.server_protocol_versions[address] = 13
+
+        t0 = time.monotonic()
+        cm = context.get_circuit_manager(address, 0)
+        assert time.monotonic() - t0 < 0.5
+        assert cm.connecting
+
+        pv, = context.get_pvs(ioc.pvs['float'])
+        pv.wait_for_connection(timeout=10)
+        pv.read()
+        assert pv.circuit_manager is not cm
+        assert pv.circuit_manager.connected
+        assert cm.connecting
+
+        context.circuit_managers.pop((address, 0))
+        cm.disconnect()
+
+
+def test_unresponsive_check_with_connecting_circuit(context):
+    # A circuit which has not completed its handshake has received nothing
+    # yet; the unresponsive-server check must cope with that.
+    broadcaster = context.broadcaster
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_sock:
+        server_sock.bind(('127.0.0.1', 0))
+        server_sock.listen(1)
+        address = server_sock.getsockname()
+        broadcaster.server_protocol_versions[address] = 13
+
+        cm = context.get_circuit_manager(address, 0)
+        try:
+            assert cm.connecting
+            assert cm.last_tcp_receipt is None
+            wait_for(lambda: address in broadcaster._last_heard, timeout=2)
+            assert broadcaster._check_for_unresponsive_servers_thread.is_alive()
+        finally:
+            context.circuit_managers.pop((address, 0))
+            cm.disconnect()
+        assert not cm.connecting
+
+
 def test_deprecated_callback_signature(ioc, context):
     cntx = context
 
@@ -310,6 +611,105 @@ def test_client_and_host_name(shared_broadcaster):
     assert ctx.client_name == getpass.getuser()
 
 
+def test_search_result_cache(tmp_path):
+    path = str(tmp_path / 'search_cache.json')
+    cache = SearchResultCache(path, max_age=60)
+    cache.update('a', ('127.0.0.1', 5064), 13)
+    cache.update('b', ('127.0.0.1', 5065), 12)
+    cache.save()
+
+    # Another process updated 'b' in the meantime.
+    other = SearchResultCache(path, max_age=60)
+    other.update('b', ('127.0.0.1', 5066), 13)
+    other.save()
+
+    cache.update('c', ('127.0.0.1', 5067), 13)
+    cache.save()
+
+    loaded = SearchResultCache(path, max_age=60)
+    assert loaded.get('a') == (('127.0.0.1', 5064), 13)
+    assert loaded.get('b') == (('127.0.0.1', 5066), 13)
+    assert loaded.get('c') == (('127.0.0.1', 5067), 13)
+
+    loaded.max_age = 0
+    with pytest.raises(KeyError):
+        loaded.get('a')
+    assert 'a' not in loaded
+
+    with open(path, 'w') as f:
+        f.write('not json')
+    assert len(SearchResultCache(path)) == 0
+
+
+def test_search_cache_connect(ioc, tmp_path):
+    path = str(tmp_path / 'search_cache.json')
+    pv_name = ioc.pvs['int']
+
+    broadcaster = SharedBroadcaster(search_cache=path)
+    ctx = Context(broadcaster)
+    pv, = ctx.get_pvs(pv_name)
+    pv.wait_for_connection(timeout=10)
+    address = pv.circuit_manager.circuit.address
+    ctx.disconnect()
+    broadcaster.disconnect()
+    assert SearchResultCache(path).get(pv_name)[0] == address
+
+    # Entries for a server which is not there, and a name which the server
+    # does not have, fall back to searching.
+    bad_name = pv_name + '_does_not_exist'
+    cache = SearchResultCache(path)
+    cache.update(ioc.pvs['float'], ('127.0.0.1', 1), 13)
+    cache.update(bad_name, address, 13)
+    cache.save()
+
+    broadcaster = SharedBroadcaster(search_cache=path)
+    searched = []
+    search = broadcaster.search
+
+    def record_search(results_queue, names, **kwargs):
+        searched.extend(names)
+        return search(results_queue, names, **kwargs)
+
+    broadcaster.search = record_search
+    ctx = Context(broadcaster)
+    try:
+        pv, float_pv, bad_pv = ctx.get_pvs(pv_name, ioc.pvs['float'],
+                                           bad_name)
+        pv.wait_for_connection(timeout=10)
+        float_pv.wait_for_connection(timeout=10)
+        wait_for(lambda: bad_name in searched, timeout=10)
+        assert pv_name not in searched
+        assert ioc.pvs['float'] in searched
+        assert bad_name not in broadcaster.search_cache
+        assert (broadcaster.search_cache.get(ioc.pvs['float'])[0] ==
+                float_pv.circuit_manager.circuit.address)
+    finally:
+        ctx.disconnect()
+        broadcaster.disconnect()
+
+
+def test_search_cache_connection_refused(tmp_path):
+    path = str(tmp_path / 'search_cache.json')
+    name = 'search_cache_refused:does_not_exist'
+    with socket.socket() as sock:
+        # A port with nothing listening on it
+        sock.bind(('127.0.0.1', 0))
+        address = sock.getsockname()
+    cache = SearchResultCache(path)
+    cache.update(name, address, 13)
+    cache.save()
+
+    broadcaster = SharedBroadcaster(search_cache=path)
+    ctx = Context(broadcaster)
+    try:
+        ctx.get_pvs(name)
+        wait_for(lambda: name not in broadcaster.search_cache, timeout=5)
+    finally:
+        ctx.disconnect()
+        broadcaster.disconnect()
+    assert name not in SearchResultCache(path)
+
+
 def test_many_priorities_same_name(ioc, context):
     pv_name, *_others = ioc.pvs.values()
     pvs = {}
@@ -685,6 +1085,69 @@ def test_batch_read(context, ioc):
     assert set(results) == set(pv.name for pv in pvs)
 
 
+def test_read_many(context, ioc):
+    np = pytest.importorskip('numpy')
+    names = [ioc.pvs['int'], ioc.pvs['int2'], ioc.pvs['float']]
+    pvs = context.get_pvs(*names)
+    for pv in pvs:
+        pv.wait_for_connection(timeout=10)
+    pvs[0].write((7, ), wait=True)
+
+    result = context.read_many(pvs)
+    assert result.names == names
+    assert result.values.dtype == np.float64
+    assert result.values[0] == 7
+    np.testing.assert_allclose(result.values, [pv.read().data[0] for pv in pvs])
+    assert not result.error.any()
+    assert (result.timestamps > 0).all()
+    readings = [pv.read(data_type='time') for pv in pvs]
+    assert list(result.severity) == [r.metadata.severity for r in readings]
+    assert list(result.status) == [r.metadata.status for r in readings]
+
+    # Non-scalars, and a PV which never connects
+    missing, = context.get_pvs(ioc.pvs['int'] + '_does_not_exist')
+    pvs = context.get_pvs(ioc.pvs['str'], ioc.pvs['waveform'])
+    for pv in pvs:
+        pv.wait_for_connection(timeout=10)
+    result = context.read_many(pvs + [missing], data_type='native',
+                               timeout=1)
+    assert result.values.dtype == object
+    assert isinstance(result.values[0], str)
+    assert len(result.values[1]) > 1
+    assert result.values[2] is None
+    assert list(result.error) == [False, False, True]
+    assert np.isnan(result.timestamps).all()
+
+
+def test_read_many_failures(context, ioc, monkeypatch):
+    pytest.importorskip('numpy')
+    pvs = context.get_pvs(ioc.pvs['int'], ioc.pvs['int2'])
+    for pv in pvs:
+        pv.wait_for_connection(timeout=10)
+    cm = pvs[0].circuit_manager
+    ioids = set(cm.ioids)
+
+    # Requests which go unanswered are flagged and forgotten.
+    monkeypatch.setattr(VirtualCircuitManager, 'send',
+                        lambda self, *commands, **kwargs: None)
+    result = context.read_many(pvs, timeout=0.2)
+    monkeypatch.undo()
+    assert list(result.error) == [True, True]
+    assert set(cm.ioids) == ioids
+    pvs[0].read()
+
+    # Responses with a failure status are flagged.
+    collector = caproto.threading.client._ReadManyCollector(2)
+    response = pvs[0].read(data_type='native')
+    collector.received(0, response)
+    collector.received(1, ca.ReadNotifyResponse(
+        data=[0], data_type=response.data_type, data_count=1,
+        status=ca.CAStatus.ECA_NORDACCESS, ioid=0))
+    result = collector.to_result(pvs)
+    assert list(result.error) == [False, True]
+    assert result.values[0] == response.data[0]
+
+
 def test_batch_write(context, ioc):
     pvs = context.get_pvs(ioc.pvs['int'], ioc.pvs['int2'], ioc.pvs['int3'])
     for pv in pvs:
@@ -274,3 +274,42 @@ def test_timeout_fixture():
 
     with pytest.raises(RuntimeError):
         conftest.asyncio_runner({}, client, timeout=2.0)
+
+
+@pytest.mark.parametrize(
+    'event_loops, requested, expected',
+    [
+        pytest.param({'asyncio': None}, 'asyncio', 'asyncio', id='stdlib'),
+        pytest.param({'asyncio': None, 'fast': 'not_a_real_loop_module'},
+                     'fast', 'asyncio', id='fallback'),
+        pytest.param({'asyncio': None}, 'ASYNCIO', 'asyncio', id='case'),
+    ]
+)
+def test_event_loop_policy(monkeypatch, event_loops, requested, expected):
+    import asyncio
+
+    from caproto.asyncio import utils
+    monkeypatch.setattr(utils, 'EVENT_LOOPS', event_loops)
+    name, policy = utils.get_event_loop_policy(requested)
+    assert name == expected
+    assert isinstance(policy, asyncio.AbstractEventLoopPolicy)
+
+
+def test_event_loop_policy_unknown():
+    from caproto.asyncio import utils
+    with pytest.raises(ca.CaprotoValueError):
+        utils.get_event_loop_policy('not-a-loop')
+
+
+def test_event_loop_run():
+    import asyncio
+
+    from caproto.asyncio import utils
+
+    async def main():
+        return 'ok'
+
+    try:
+        assert utils.run(main(), event_loop='asyncio') == 'ok'
+    finally:
+        asyncio.set_event_loop_policy(None)
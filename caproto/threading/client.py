@@ -5,27 +5,36 @@
 # - forever retrying search requests for disconnected PV
 # The Context has:
 # - process search results
-# - TCP socket SelectorThread
+# - TCP socket SelectorThread(s), see selector_threads
 # - restart subscriptions
 # The VirtualCircuit has:
 # - ThreadPoolExecutor for processing user callbacks on read, write, subscribe
 import array
+import atexit
 import concurrent.futures
 import errno
 import functools
 import getpass
+import heapq
 import inspect
+import itertools
 import logging
+import os
 import random
 import selectors
 import socket
 import threading
 import time
 import weakref
-from collections import defaultdict, deque
+from collections import defaultdict, deque, namedtuple
 from inspect import Parameter, Signature
 from queue import Empty, Queue
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 import caproto as ca
 
 from .._constants import (MAX_ID, RESPONSIVENESS_TIMEOUT,
@@ -36,6 +45,7 @@ from .._utils import (CaprotoError, CaprotoKeyError, CaprotoNetworkError,
                       adapt_old_callback_signature, batch_requests,
                       safe_getsockname, socket_bytes_available)
 from ..client import common
+from ..client.search_results import SearchResultCache
 
 ch_logger = logging.getLogger('caproto.ch')
 search_logger = logging.getLogger('caproto.bcast.search')
@@ -146,8 +156,9 @@ class SelectorThread:
     """
     This is used internally by the Context and the VirtualCircuitManager.
     """
-    def __init__(self, *, parent=None):
+    def __init__(self, *, parent=None, name='selector'):
         self.thread = None  # set by the `start` method
+        self.name = name
         self._close_event = threading.Event()
         self.selector = selectors.DefaultSelector()
 
@@ -158,6 +169,7 @@ class SelectorThread:
 
         self._register_sockets = {}  # {socket: object_id}
         self._unregister_sockets = set()
+        self._connecting = {}  # {socket: deadline}
         self._object_id = 0
         self._socket_count = 0
 
@@ -180,16 +192,42 @@ class SelectorThread:
         if self._close_event.is_set():
             raise CaprotoRuntimeError("Cannot be restarted once stopped.")
         self.thread = threading.Thread(target=self, daemon=True,
-                                       name='selector')
+                                       name=self.name)
         self.thread.start()
 
-    def add_socket(self, sock, target_obj):
+    def join(self, timeout=None):
+        '''Wait for the selector thread to exit after `stop`'''
+        if self.thread is not None:
+            self.thread.join(timeout=timeout)
+
+    @property
+    def socket_count(self):
+        '''The number of sockets handled by this selector'''
+        with self._socket_map_lock:
+            return len(self.socket_to_id)
+
+    def add_socket(self, sock, target_obj, *, connecting=False,
+                   connect_timeout=None):
+        '''
+        Add a socket to be serviced by the selector thread.
+
+        ``target_obj.received(bytes, address)`` is called with received data.
+        If ``connecting`` is set, the socket has a non-blocking connection in
+        progress, and ``target_obj.connection_complete(error)`` is called once
+        it succeeds (error=0) or fails (including after ``connect_timeout``
+        seconds, with error=ETIMEDOUT).
+        '''
         assert isinstance(sock, socket.socket)
         with self._socket_map_lock:
             if sock in self.socket_to_id:
                 raise CaprotoValueError('Socket already added')
 
             sock.setblocking(False)
+            if connecting:
+                self._connecting[sock] = (
+                    time.monotonic() + connect_timeout
+                    if connect_timeout is not None else None
+                )
 
             # assumption: only one sock per object
             self._object_id += 1
@@ -205,6 +243,7 @@ class SelectorThread:
             if sock not in self.socket_to_id:
                 return
             obj_id = self.socket_to_id.pop(sock)
+            self._connecting.pop(sock, None)
             obj = self.objects.pop(obj_id, None)
             if obj is not None:
                 obj.received(b'', None)
@@ -230,8 +269,11 @@ class SelectorThread:
                 self._unregister_sockets.clear()
 
                 for sock, obj_id in self._register_sockets.items():
-                    self.selector.register(sock, selectors.EVENT_READ,
-                                           data=obj_id)
+                    # Connecting sockets become writable once connected
+                    events = (selectors.EVENT_WRITE
+                              if sock in self._connecting
+                              else selectors.EVENT_READ)
+                    self.selector.register(sock, events, data=obj_id)
                 self._socket_count += len(self._register_sockets)
                 self._register_sockets.clear()
 
@@ -249,11 +291,26 @@ class SelectorThread:
                 object_and_socket = [(self.objects[key.data], key.fileobj)
                                      for key, mask in events]
 
+                if self._connecting:
+                    now = time.monotonic()
+                    timed_out = [
+                        sock for sock, deadline in self._connecting.items()
+                        if deadline is not None and deadline < now
+                    ]
+                else:
+                    timed_out = []
+
+            for sock in timed_out:
+                self._connection_complete(sock, errno.ETIMEDOUT)
+
             for obj, sock in object_and_socket:
                 if sock in self._unregister_sockets:
                     continue
 
-                # TODO: consider thread pool for recv and command_loop
+                if sock in self._connecting:
+                    self._connection_complete(sock, common.get_connect_error(sock))
+                    continue
+
                 try:
                     bytes_available = socket_bytes_available(
                         sock, available_buffer=avail_buf)
@@ -301,9 +358,93 @@ class SelectorThread:
                             'new data: %s', obj, ex)
                         self.remove_socket(sock)
 
+    def _connection_complete(self, sock, error):
+        '''A non-blocking connection attempt has succeeded or failed'''
+        with self._socket_map_lock:
+            if self._connecting.pop(sock, False) is False:
+                # Removed in the meantime
+                return
+            obj_id = self.socket_to_id[sock]
+            obj = self.objects.get(obj_id)
+            if not error and sock not in self._register_sockets:
+                self.selector.modify(sock, selectors.EVENT_READ, data=obj_id)
+
+        if obj is None:
+            return
+
+        try:
+            if obj.connection_complete(error) is ca.DISCONNECTED or error:
+                self.remove_socket(sock)
+        except Exception as ex:
+            obj.log.exception('Removing %s due to an internal error on '
+                              'connection: %s', obj, ex)
+            self.remove_socket(sock)
+
+
+class SelectorThreadPool:
+    """
+    A pool of SelectorThreads which shard sockets among themselves.
+
+    Each socket is serviced by exactly one thread for its lifetime, such that
+    data from any given circuit is received, parsed, and processed in order.
+    New sockets are assigned to the thread handling the fewest sockets.
+
+    This has the same interface as SelectorThread and is used internally by
+    the Context when ``selector_threads`` is greater than 1.
+    """
+    def __init__(self, num_threads, *, parent=None):
+        if num_threads < 1:
+            raise CaprotoValueError('At least one selector thread is required')
+        self.selectors = [
+            SelectorThread(parent=parent, name=f'selector-{idx}')
+            for idx in range(num_threads)
+        ]
+        self._lock = threading.Lock()
+
+    @property
+    def threads(self):
+        '''The selector threads'''
+        return [selector.thread for selector in self.selectors]
+
+    @property
+    def running(self):
+        '''Selector threads are running'''
+        return any(selector.running for selector in self.selectors)
+
+    def start(self):
+        for selector in self.selectors:
+            selector.start()
+
+    def stop(self):
+        for selector in self.selectors:
+            selector.stop()
+
+    def join(self, timeout=None):
+        '''Wait for all selector threads to exit after `stop`'''
+        for selector in self.selectors:
+            selector.join(timeout=timeout)
+
+    def add_socket(self, sock, target_obj, **kwargs):
+        with self._lock:
+            selector = min(self.selectors,
+                           key=lambda selector: selector.socket_count)
+            selector.add_socket(sock, target_obj, **kwargs)
+
+    def remove_socket(self, sock):
+        with self._lock:
+            for selector in self.selectors:
+                with selector._socket_map_lock:
+                    if sock in selector.socket_to_id:
+                        break
+            else:
+                return
+        # Outside of the lock, as removal notifies the socket's object, which
+        # may add a new socket.
+        selector.remove_socket(sock)
+
 
 class SharedBroadcaster:
-    def __init__(self, *, registration_retry_time=10.0):
+    def __init__(self, *, registration_retry_time=10.0, search_cache=None):
         '''
         A broadcaster client which can be shared among multiple Contexts
 
@@ -312,6 +453,12 @@ class SharedBroadcaster:
         registration_retry_time : float, optional
             The time, in seconds, between attempts made to register with the
             repeater. Default is 10.
+        search_cache : SearchResultCache or str, optional
+            A persistent cache of search results (or the path of its file),
+            used by Contexts to connect to known servers without searching.
+            It is saved on disconnection and at exit. Defaults to the
+            environment variable ``CAPROTO_CLIENT_SEARCH_CACHE``, or no cache
+            if unset.
         '''
         self.environ = ca.get_environment_variables()
         self.ca_server_port = self.environ['EPICS_CA_SERVER_PORT']
@@ -335,6 +482,14 @@ class SharedBroadcaster:
         self.unanswered_searches = {}
         self.server_protocol_versions = {}  # map address to protocol version
 
+        if search_cache is None:
+            search_cache = common.SEARCH_CACHE
+        if isinstance(search_cache, str):
+            search_cache = SearchResultCache(search_cache)
+        self.search_cache = search_cache
+        if search_cache is not None:
+            atexit.register(search_cache.save)
+
         self._id_counter = ThreadsafeCounter(
             initial_value=random.randint(0, MAX_ID),
             dont_clash_with=self.unanswered_searches,
@@ -448,6 +603,8 @@ class SharedBroadcaster:
         self._close_event.set()
         with self._search_lock:
             self.search_results.clear()
+        if self.search_cache is not None:
+            self.search_cache.save()
         self._registration_last_sent = 0
         self._searching_enabled.clear()
         self.broadcaster.disconnect()
@@ -757,7 +914,9 @@ class SharedBroadcaster:
             # Beacon or from TCP packets related to user activity or any
             # circuit?
             for address, circuit_managers in servers.items():
-                last_tcp_receipt = (cm.last_tcp_receipt for cm in circuit_managers)
+                # Circuits still connecting have received nothing yet.
+                last_tcp_receipt = (cm.last_tcp_receipt for cm in circuit_managers
+                                    if cm.last_tcp_receipt is not None)
                 last_heard[address] = max((last_beacon.get(address, 0),
                                            *last_tcp_receipt))
 
@@ -906,6 +1065,26 @@ class SharedBroadcaster:
             pass
 
 
+RecoveryRecord = namedtuple('RecoveryRecord',
+                            'address pvs subscriptions duration')
+
+
+class _Recovery:
+    "Progress of reconnecting the PVs of a lost circuit."
+    def __init__(self, address, pvs):
+        self.address = address
+        self.started = time.monotonic()
+        self.num_pvs = len(pvs)
+        self.num_subscriptions = 0
+        # PVs not yet connected, and Subscriptions not yet restored
+        self.pending = set(pvs)
+
+
+def _restore_priority(pv):
+    "Sort key to reconnect PVs with user callbacks on subscriptions first."
+    return not any(sub.callbacks for sub in list(pv.subscriptions.values()))
+
+
 class Context:
     """
     Encapsulates the state and connections of a client
@@ -935,10 +1114,19 @@ class Context:
         the lines are ordered properly is to use only one worker. If ordering
         matters for your application, think carefully before increasing this
         value from 1.
+    selector_threads : integer, optional
+        Number of threads used to receive, parse, and process data from the
+        TCP circuits of this Context. Circuits are distributed among the
+        threads, each circuit being handled by a single thread, so the order
+        in which updates from any one circuit are processed is unchanged.
+        Values greater than 1 may increase aggregate throughput when
+        receiving from many servers at once. Defaults to the environment
+        variable ``CAPROTO_CLIENT_SELECTOR_THREADS``, or 1 if unset.
     """
     def __init__(self, broadcaster=None, *,
                  timeout=common.GLOBAL_DEFAULT_TIMEOUT,
-                 host_name=None, client_name=None, max_workers=1):
+                 host_name=None, client_name=None, max_workers=1,
+                 selector_threads=None):
         if broadcaster is None:
             broadcaster = SharedBroadcaster()
         self.broadcaster = broadcaster
@@ -965,6 +1153,25 @@ class Context:
         self.subscriptions_lock = threading.RLock()
         self.subscriptions_to_activate = defaultdict(set)
         self.activate_subscriptions_now = threading.Event()
+        # Names tried on a server from the persistent search cache, mapped to
+        # (address, deadline) until the channel is created there.
+        self._search_cache_lock = threading.RLock()
+        self._search_cache_pending = {}
+        self._search_cache_tried = set()
+        # Rate limiting of CreateChanRequests and EventAddRequests, per
+        # server address, and CreateChanRequests held back by it.
+        self._request_buckets = {}
+        self._deferred_creates = defaultdict(list)  # cm -> [chan, ...]
+        # Progress of reconnecting after circuits are lost, and the record of
+        # completed recoveries.
+        self._recovery_lock = threading.Lock()
+        self._recoveries_pending = []
+        self.recoveries = deque(maxlen=100)
+        # Searches for reconnection delayed by jitter, sent by the
+        # search-results thread: a heap of (deadline, sequence, names).
+        self._reconnect_searches_lock = threading.Lock()
+        self._reconnect_searches = []
+        self._reconnect_search_sequence = itertools.count()
 
         self._process_search_results_thread = threading.Thread(
             target=self._process_search_results_loop,
@@ -976,7 +1183,13 @@ class Context:
             daemon=True, name='activate_subscriptions')
         self._activate_subscriptions_thread.start()
 
-        self.selector = SelectorThread(parent=self)
+        if selector_threads is None:
+            selector_threads = common.SELECTOR_THREADS
+        self.selector_threads = selector_threads
+        if selector_threads > 1:
+            self.selector = SelectorThreadPool(selector_threads, parent=self)
+        else:
+            self.selector = SelectorThread(parent=self)
         self.selector.start()
         self._user_disconnected = False
 
@@ -1057,19 +1270,223 @@ class Context:
         # Ask the Broadcaster to search for every PV for which we do not
         # already have an instance. It might already have a cached search
         # result, but that is the concern of broadcaster.search.
+        if names_to_search:
+            names_to_search = self._connect_from_search_cache(names_to_search)
         if names_to_search:
             self.broadcaster.search(self._search_results_queue,
                                     names_to_search)
         return pvs
 
-    def reconnect(self, keys):
+    def _connect_from_search_cache(self, names):
+        """
+        Connect to servers known from the persistent search cache directly.
+
+        The circuits are opened and channels created at once. Cached results
+        are verified by successful channel creation; if the server responds
+        with CreateChFailResponse or times out, the names are searched for
+        instead.
+
+        Returns
+        -------
+        needs_search : list
+            Names which need a search.
+        """
+        cache = self.broadcaster.search_cache
+        if cache is None:
+            return names
+
+        needs_search = []
+        use_cached_search = defaultdict(list)
+        deadline = time.monotonic() + common.SEARCH_CACHE_TIMEOUT
+        with self._search_cache_lock:
+            for name in names:
+                # Recent results from this session take precedence, and cached
+                # results are only tried once.
+                if (name in self.broadcaster.search_results or
+                        name in self._search_cache_tried):
+                    needs_search.append(name)
+                    continue
+                try:
+                    address, version = cache.get(name)
+                except KeyError:
+                    needs_search.append(name)
+                    continue
+
+                self._search_cache_tried.add(name)
+                self._search_cache_pending[name] = (address, deadline)
+                use_cached_search[address].append(name)
+                self.broadcaster.server_protocol_versions.setdefault(
+                    address, version)
+
+        for address, cached_names in use_cached_search.items():
+            search_logger.debug('Trying %d cached search results for %s:%d',
+                                len(cached_names), *address)
+            self._search_results_queue.put((address, cached_names))
+        return needs_search
+
+    def _channel_created(self, name, address):
+        'Channel was created with {name} at {address}'
+        cache = self.broadcaster.search_cache
+        if cache is None:
+            return
+        with self._search_cache_lock:
+            self._search_cache_pending.pop(name, None)
+        version = self.broadcaster.server_protocol_versions.get(
+            address, ca.DEFAULT_PROTOCOL_VERSION)
+        cache.update(name, address, version)
+
+    def _search_cache_fallback(self, names):
+        """
+        Search for names which a server from the persistent search cache
+        failed to create channels for.
+        """
+        addresses = {}
+        with self._search_cache_lock:
+            for name in names:
+                try:
+                    addresses[name], _ = self._search_cache_pending.pop(name)
+                except KeyError:
+                    ...
+        if not addresses:
+            return
+
+        search_logger.debug('Cached search results failed for %d PVs; '
+                            'searching', len(addresses))
+        self.broadcaster.search_cache.discard(*addresses)
+        # Detach the PVs from the circuits on which channel creation was
+        # attempted.
+        for cm in list(self.circuit_managers.values()):
+            for cid, pv in list(cm.pvs.items()):
+                if (addresses.get(pv.name) == cm.circuit.address and
+                        not pv.channel_ready.is_set()):
+                    cm.pvs.pop(cid, None)
+                    cm.channels.pop(cid, None)
+                    pv.circuit_ready.clear()
+                    with self.pv_cache_lock:
+                        self.pvs_needing_circuits[pv.name].add(pv)
+
+        self.broadcaster.search(self._search_results_queue, list(addresses))
+
+    def _check_search_cache_timeouts(self):
+        'Fall back to searching for names which timed out on cached servers'
+        if not self._search_cache_pending:
+            return
+        now = time.monotonic()
+        with self._search_cache_lock:
+            timed_out = [
+                name
+                for name, (_, deadline) in self._search_cache_pending.items()
+                if deadline < now
+            ]
+        if timed_out:
+            self._search_cache_fallback(timed_out)
+
+    def read_many(self, pvs, *, data_type='time', data_count=None,
+                  timeout=common.CONTEXT_DEFAULT_TIMEOUT):
+        """
+        Read many PVs at once, returning columnar results.
+
+        Requests are pipelined on each circuit, and responses are collected
+        without invoking any per-PV callbacks. PVs which are not connected,
+        time out, fail to be read, or are on a circuit which dies are flagged
+        in the ``error`` mask rather than raising.
+
+        This requires numpy.
+
+        Parameters
+        ----------
+        pvs : list of PV
+        data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+            Request specific data type or a class of data types, matched to
+            each channel's native data type. Default is 'time'.
+        data_count : integer, optional
+            Requested number of values. Default is each channel's native data
+            count.
+        timeout : number or None, optional
+            Seconds to wait for all responses. Default is ``Context.timeout``.
+            If None, wait indefinitely.
+
+        Returns
+        -------
+        result : ReadManyResult
+            With arrays ``values``, ``timestamps``, ``status``, ``severity``
+            and ``error``, each in the order of ``pvs``. ``values`` is a
+            float64 array if every value read is a numeric scalar (NaN marking
+            errors), and otherwise an object array of scalars, strings and
+            arrays (None marking errors). ``timestamps`` are NaN where not
+            available for the requested data type.
+        """
+        if np is None:
+            raise RuntimeError('Context.read_many requires numpy')
+        if timeout is common.CONTEXT_DEFAULT_TIMEOUT:
+            timeout = self.timeout
+
+        pvs = list(pvs)
+        collector = _ReadManyCollector(len(pvs))
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        commands = defaultdict(list)  # map each circuit to commands
+        requested = []  # (circuit_manager, ioid) pairs
+        for index, pv in enumerate(pvs):
+            cm, chan = pv.circuit_manager, pv.channel
+            if cm is None or chan is None or not pv.connected:
+                collector.received(index, None)
+                continue
+            ioid = cm._ioid_counter()
+            try:
+                command = chan.read(ioid=ioid, data_type=data_type,
+                                    data_count=data_count, notify=True)
+            except CaprotoError:
+                collector.received(index, None)
+                continue
+            cm.ioids[ioid] = dict(collector=collector, index=index, pv=pv,
+                                  request=command, deadline=deadline)
+            commands[cm].append(command)
+            requested.append((cm, ioid))
+
+        for cm, cm_commands in commands.items():
+            try:
+                cm.send(*cm_commands)
+            except Exception:
+                if not cm.dead.is_set():
+                    raise
+                for command in cm_commands:
+                    ioid_info = cm.ioids.pop(command.ioid, None)
+                    if ioid_info is not None:
+                        collector.received(ioid_info['index'], None)
+
+        collector.done.wait(timeout=timeout)
+        # Forget unanswered requests; late responses to them are ignored.
+        for cm, ioid in requested:
+            cm.ioids.pop(ioid, None)
+        return collector.to_result(pvs)
+
+    def reconnect(self, keys, *, address=None):
+        """
+        Search for and reconnect PVs, after a random delay of up to
+        ``CAPROTO_CLIENT_RECONNECT_JITTER_SEC`` (no delay by default).
+
+        The jitter spreads out the requests of the many clients which lose a
+        server at the same time, as when it restarts. PVs with subscriptions
+        that have user callbacks are searched for first.
+
+        Parameters
+        ----------
+        keys : iterable
+            Of ``(name, priority)``.
+        address : tuple, optional
+            The address of the server which was lost, if any, for tracking
+            the time to recover (see :attr:`recoveries`).
+        """
         # We will reuse the same PV object but use a new cid.
         names = []
         pvs = []
+        # Names for which the lost server came from the search cache.
+        cached_names = []
 
-        for key in keys:
-            with self.pv_cache_lock:
-                pv = self.pvs[key]
+        with self.pv_cache_lock:
+            keyed_pvs = [(key, self.pvs[key]) for key in keys]
+        keyed_pvs.sort(key=lambda item: _restore_priority(item[1]))
+        for key, pv in keyed_pvs:
             pvs.append(pv)
             name, _ = key
             names.append(name)
@@ -1078,8 +1495,112 @@ class Context:
                 self.broadcaster.search_results.pop(name, None)
             with self.pv_cache_lock:
                 self.pvs_needing_circuits[name].add(pv)
+            with self._search_cache_lock:
+                cached = self._search_cache_pending.pop(name, None)
+            if cached is not None and cached[0] == address:
+                cached_names.append(name)
+
+        if cached_names:
+            search_logger.debug('Cached server %s:%d was lost; discarding %d '
+                                'cached search results', *address,
+                                len(cached_names))
+            self.broadcaster.search_cache.discard(*cached_names)
+
+        if address is not None and pvs:
+            with self._recovery_lock:
+                self._recoveries_pending.append(_Recovery(address, pvs))
+
+        jitter = random.uniform(0, common.RECONNECT_JITTER)
+        if jitter > 0:
+            with self._reconnect_searches_lock:
+                heapq.heappush(self._reconnect_searches,
+                               (time.monotonic() + jitter,
+                                next(self._reconnect_search_sequence), names))
+            # Wake the search-results thread to schedule the search.
+            self._search_results_queue.put(None)
+        else:
+            self.broadcaster.search(self._search_results_queue, names)
 
-        self.broadcaster.search(self._search_results_queue, names)
+    def _send_reconnect_searches(self):
+        """
+        Search for PVs to reconnect whose jitter delay is over.
+
+        Returns the number of seconds until the next search is due.
+        """
+        now = time.monotonic()
+        names = []
+        with self._reconnect_searches_lock:
+            while (self._reconnect_searches and
+                   self._reconnect_searches[0][0] <= now):
+                names.extend(heapq.heappop(self._reconnect_searches)[2])
+            if self._reconnect_searches:
+                wait = self._reconnect_searches[0][0] - now
+            else:
+                wait = float('inf')
+        if names:
+            with self.pv_cache_lock:
+                # Skip any PVs connected in the meantime.
+                names = [name for name in names
+                         if self.pvs_needing_circuits.get(name)]
+        if names:
+            self.broadcaster.search(self._search_results_queue, names)
+        return wait
+
+    def _take_request_tokens(self, address, count):
+        """
+        Take tokens for ``count`` CreateChanRequests or EventAddRequests to
+        the server at ``address``, and return how many may be sent now.
+        """
+        if common.REQUEST_RATE <= 0:
+            return count
+        bucket = self._request_buckets.get(address)
+        if bucket is None:
+            bucket = self._request_buckets.setdefault(
+                address,
+                common.TokenBucket(common.REQUEST_RATE, common.REQUEST_BURST))
+        return bucket.take(count)
+
+    def _pv_reconnected(self, pv):
+        """
+        Track recovery: the PV is connected, and its active subscriptions
+        are about to be restored.
+        """
+        with self._recovery_lock:
+            if not self._recoveries_pending:
+                return
+            subs = [sub for sub in list(pv.subscriptions.values())
+                    if sub.callbacks or sub.recorders]
+            for recovery in self._recoveries_pending:
+                if pv in recovery.pending:
+                    recovery.pending.discard(pv)
+                    recovery.pending.update(subs)
+                    recovery.num_subscriptions += len(subs)
+            self._finish_recoveries()
+
+    def _subscriptions_restored(self, subs):
+        "Track recovery: EventAddRequests have been sent for subs."
+        with self._recovery_lock:
+            if not self._recoveries_pending:
+                return
+            for recovery in self._recoveries_pending:
+                recovery.pending.difference_update(subs)
+            self._finish_recoveries()
+
+    def _finish_recoveries(self):
+        "Record recoveries which are complete. Call with _recovery_lock held."
+        now = time.monotonic()
+        for recovery in list(self._recoveries_pending):
+            if recovery.pending:
+                continue
+            self._recoveries_pending.remove(recovery)
+            record = RecoveryRecord(recovery.address, recovery.num_pvs,
+                                    recovery.num_subscriptions,
+                                    now - recovery.started)
+            self.recoveries.append(record)
+            self.log.info('Recovered %d PVs and %d subscriptions from '
+                          '%s:%d in %.3f seconds.', record.pvs,
+                          record.subscriptions, *record.address,
+                          record.duration)
 
     def _process_search_results_loop(self):
         # Receive (address, (name1, name2, ...)). The sending side of this
@@ -1087,13 +1608,20 @@ class Context:
         self.log.debug('Context search-results processing loop has '
                        'started.')
         while not self._close_event.is_set():
+            self._check_search_cache_timeouts()
+            timeout = min(self._send_deferred_creates(),
+                          self._send_reconnect_searches())
             try:
-                address, names = self._search_results_queue.get(timeout=0.5)
+                item = self._search_results_queue.get(timeout=timeout)
             except Empty:
                 # By restarting the loop, we will first check that we are not
                 # supposed to shut down the thread before we go back to
                 # waiting on the queue again.
                 continue
+            if item is None:
+                # Woken up to schedule a search for reconnection.
+                continue
+            address, names = item
 
             channels_grouped_by_circuit = defaultdict(list)
             # Assign each PV a VirtualCircuitManager for managing a socket
@@ -1115,7 +1643,8 @@ class Context:
                     pvs = self.pvs_needing_circuits.pop(name, set())
                 for pv in pvs:
                     # Get (make if necessary) a VirtualCircuitManager. This
-                    # is where TCP socket creation happens.
+                    # is where TCP socket creation happens, though the
+                    # connection completes in the background.
                     cm = self.get_circuit_manager(address, pv.priority)
                     circuit = cm.circuit
 
@@ -1130,30 +1659,71 @@ class Context:
                     channels_grouped_by_circuit[cm].append(chan)
                     pv.circuit_ready.set()
 
-            # Initiate channel creation with the server.
+            # Initiate channel creation with the server, for PVs with
+            # active subscriptions first, as fast as rate limits allow.
             for cm, channels in channels_grouped_by_circuit.items():
-                commands = [chan.create() for chan in channels]
-                try:
-                    cm.send(*commands)
-                except Exception:
-                    if cm.dead.is_set():
-                        self.log.debug("Circuit died while we were trying "
-                                       "to create the channel. We will "
-                                       "keep attempting this until it "
-                                       "works.")
-                        # When the Context creates a new circuit, we will end
-                        # up here again. No big deal.
-                        continue
-                    raise
+                channels.sort(
+                    key=lambda chan: _restore_priority(cm.pvs[chan.cid]))
+                deferred = self._deferred_creates.get(cm)
+                if deferred:
+                    # Queue up behind those already held back.
+                    deferred.extend(channels)
+                    continue
+                allowed = self._take_request_tokens(cm.circuit.address,
+                                                    len(channels))
+                if allowed:
+                    self._send_creates(cm, channels[:allowed])
+                if allowed < len(channels):
+                    self._deferred_creates[cm].extend(channels[allowed:])
 
         self.log.debug('Context search-results processing thread has exited.')
 
+    def _send_creates(self, cm, channels):
+        commands = [chan.create() for chan in channels]
+        try:
+            cm.send(*commands)
+        except Exception:
+            if cm.dead.is_set():
+                self.log.debug("Circuit died while we were trying "
+                               "to create the channel. We will "
+                               "keep attempting this until it "
+                               "works.")
+                # When the Context creates a new circuit, we will end
+                # up here again. No big deal.
+                return
+            raise
+
+    def _send_deferred_creates(self):
+        """
+        Send CreateChanRequests held back by rate limiting, as allowed.
+
+        Returns the number of seconds to wait before trying again.
+        """
+        wait = 0.5
+        for cm, channels in list(self._deferred_creates.items()):
+            if cm.dead.is_set():
+                # These PVs will be reconnected on a new circuit.
+                del self._deferred_creates[cm]
+                continue
+            address = cm.circuit.address
+            allowed = self._take_request_tokens(address, len(channels))
+            if allowed:
+                self._send_creates(cm, channels[:allowed])
+                del channels[:allowed]
+            if channels:
+                wait = min(wait, self._request_buckets[address].delay())
+            else:
+                del self._deferred_creates[cm]
+        return wait
+
     def get_circuit_manager(self, address, priority):
         """
         Return a VirtualCircuitManager for this address, priority. (It manages
         a caproto.VirtualCircuit and a TCP socket.)
 
-        Make a new one if necessary.
+        Make a new one if necessary. This does not block: the new circuit
+        connects in the background, and commands sent on it in the meantime
+        are held until it is ready.
         """
         with self._lock_during_get_circuit_manager:
             cm = self.circuit_managers.get((address, priority), None)
@@ -1175,6 +1745,20 @@ class Context:
                 items = list(self.subscriptions_to_activate.items())
                 self.subscriptions_to_activate.clear()
             for cm, subs in items:
+                # Restore subscriptions with user callbacks first; if rate
+                # limited, hold back the rest until the next pass.
+                subs = sorted((sub for sub in subs
+                               if sub.callbacks or sub.recorders),
+                              key=lambda sub: not sub.callbacks)
+                allowed = self._take_request_tokens(cm.circuit.address,
+                                                    len(subs))
+                if allowed < len(subs):
+                    with self.subscriptions_lock:
+                        self.subscriptions_to_activate[cm].update(
+                            subs[allowed:])
+                    subs = subs[:allowed]
+                sent = []
+
                 def requests():
                     "Yield EventAddRequest commands."
                     for sub in subs:
@@ -1185,6 +1769,7 @@ class Context:
                         # EventAddRequest on its own if/when the user does
                         # add any callbacks, so we can skip it here.
                         if command is not None:
+                            sent.append(sub)
                             yield command
 
                 for batch in batch_requests(requests(),
@@ -1201,6 +1786,8 @@ class Context:
                         # When the Context creates a new circuit, we will
                         # end up here again. No big deal.
                         break
+                else:
+                    self._subscriptions_restored(sent)
 
             wait_time = max(0, (common.RESTART_SUBS_PERIOD -
                                 (time.monotonic() - t)))
@@ -1218,7 +1805,7 @@ class Context:
             total_circuits = len(circuits)
             disconnected = False
             for idx, circuit in enumerate(circuits, 1):
-                if circuit.connected:
+                if circuit.connected or circuit.connecting:
                     self.log.debug('Disconnecting circuit %d/%d: %s',
                                    idx, total_circuits, circuit)
                     circuit.disconnect()
@@ -1239,7 +1826,7 @@ class Context:
             if wait:
                 self._process_search_results_thread.join()
                 self._activate_subscriptions_thread.join()
-                self.selector.thread.join()
+                self.selector.join()
 
             self.log.debug('Context disconnection complete')
 
@@ -1263,7 +1850,8 @@ class VirtualCircuitManager:
     this is rarely necessary.
     """
     __slots__ = ('context', 'circuit', 'channels', 'ioids', '_ioid_counter',
-                 'subscriptions', '_ready', 'log',
+                 'subscriptions', '_ready', 'log', '_pending_commands',
+                 '_send_lock',
                  'socket', 'selector', 'pvs', 'all_created_pvnames',
                  'dead', 'process_queue', 'processing',
                  '_subscriptionid_counter', 'user_callback_executor',
@@ -1291,38 +1879,36 @@ class VirtualCircuitManager:
         self._ioid_counter = ThreadsafeCounter()
         self._subscriptionid_counter = ThreadsafeCounter()
         self._ready = threading.Event()
-
-        # Connect.
+        # Commands sent before the circuit is ready are held here, and sent
+        # in order once it is: [(commands, extra), ...]
+        self._pending_commands = []
+        self._send_lock = threading.Lock()
+
+        # Connect.  The connection is made asynchronously, such that a slow or
+        # unreachable server does not hold up connections to other servers.
+        # The selector calls `connection_complete` once it is established or
+        # has failed (including after ``timeout`` seconds).
         if self.circuit.states[ca.SERVER] is ca.IDLE:
-            self.socket = socket.create_connection(self.circuit.address)
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
             self.socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.socket.setblocking(False)
+            error = self.socket.connect_ex(self.circuit.address)
+            if error not in common.CONNECT_IN_PROGRESS:
+                # The selector will report the failure.
+                self.log.debug('Connection to %s:%d failed immediately: %s',
+                               *self.circuit.address, os.strerror(error))
             self.circuit.our_address = self.socket.getsockname()
             # This dict is passed to the loggers.
             self._tags = {'their_address': self.circuit.address,
                           'our_address': self.circuit.our_address,
                           'direction': '<<<---',
                           'role': repr(self.circuit.our_role)}
-            self.selector.add_socket(self.socket, self)
-            self.send(ca.VersionRequest(self.circuit.priority,
-                                        ca.DEFAULT_PROTOCOL_VERSION),
-                      ca.HostNameRequest(self.context.host_name),
-                      ca.ClientNameRequest(self.context.client_name),
-                      extra=self._tags)
+            self.selector.add_socket(self.socket, self, connecting=True,
+                                     connect_timeout=timeout)
         else:
             raise CaprotoRuntimeError("Cannot connect. States are {} "
                                       "".format(self.circuit.states))
-        # Old versions of the protocol do not send a VersionResponse at TCP
-        # connection time, so set this Event manually rather than waiting for
-        # it to be set by receipt of a VersionResponse.
-        if self.context.broadcaster.server_protocol_versions[self.circuit.address] < 12:
-            self._ready.set()
-        ready = self._ready.wait(timeout=timeout)
-        if not ready:
-            host, port = self.circuit.address
-            raise CaprotoTimeoutError(f"Circuit with server at {host}:{port} "
-                                      f"did not connect within "
-                                      f"{float(timeout):.3}-second timeout.")
 
     def __repr__(self):
         return (f"<VirtualCircuitManager circuit={self.circuit} "
@@ -1333,13 +1919,67 @@ class VirtualCircuitManager:
     def connected(self):
         return self.circuit.states[ca.CLIENT] is ca.CONNECTED
 
+    @property
+    def connecting(self):
+        '''The circuit is still being established with the server'''
+        return self._pending_commands is not None and not self.dead.is_set()
+
     def send(self, *commands, extra=None):
+        sock = self.socket
+        if sock is None:
+            return
+        with self._send_lock:
+            if self._pending_commands is not None:
+                # Not yet connected; send these once ready.
+                self._pending_commands.append((commands, extra))
+                return
         # Turn the crank: inform the VirtualCircuit that these commands will
         # be send, and convert them to buffers.
+        buffers_to_send = self.circuit.send(*commands, extra=extra)
+        sock.sendall(b"".join(buffers_to_send))
+
+    def connection_complete(self, error):
+        """The TCP connection has been established or has failed.
+
+        This will be run on the recv thread"""
+        address = self.circuit.address
+        if error:
+            self.log.warning('Failed to connect to server at %s:%d: %s',
+                             *address, os.strerror(error), extra=self._tags)
+            # Tell the selector to remove our socket
+            return ca.DISCONNECTED
+
         sock = self.socket
-        if sock is not None:
-            buffers_to_send = self.circuit.send(*commands, extra=extra)
-            sock.sendall(b"".join(buffers_to_send))
+        if sock is None:
+            return ca.DISCONNECTED
+
+        self.log.debug('Connected to server at %s:%d', *address,
+                       extra=self._tags)
+        buffers_to_send = self.circuit.send(
+            ca.VersionRequest(self.circuit.priority,
+                              ca.DEFAULT_PROTOCOL_VERSION),
+            ca.HostNameRequest(self.context.host_name),
+            ca.ClientNameRequest(self.context.client_name),
+            extra=self._tags)
+        sock.sendall(b"".join(buffers_to_send))
+
+        # Old versions of the protocol do not send a VersionResponse at TCP
+        # connection time, so consider the circuit ready now rather than
+        # waiting for receipt of a VersionResponse.
+        if self.context.broadcaster.server_protocol_versions[address] < 12:
+            self._circuit_ready()
+
+    def _circuit_ready(self):
+        """Send any commands held while the circuit was connecting."""
+        with self._send_lock:
+            pending, self._pending_commands = self._pending_commands, None
+            if pending and self.socket is not None:
+                buffers_to_send = []
+                for commands, extra in pending:
+                    buffers_to_send.extend(
+                        self.circuit.send(*commands, extra=extra))
+                self.socket.sendall(b"".join(buffers_to_send))
+        self._ready.set()
 
     def received(self, bytes_recv, address):
         """Receive and process and next command from the virtual circuit.
@@ -1391,19 +2031,24 @@ class VirtualCircuitManager:
                 return
 
         tags = self._tags
+        pv_name = None
         if command is ca.DISCONNECTED:
             self._disconnected()
         elif isinstance(command, (ca.VersionResponse,)):
             assert self.connected  # double check that the state machine agrees
-            self._ready.set()
+            self._circuit_ready()
         elif isinstance(command, (ca.ReadNotifyResponse,
                                   ca.ReadResponse,
                                   ca.WriteNotifyResponse)):
-            ioid_info = self.ioids.pop(command.ioid)
+            ioid_info = self.ioids.pop(command.ioid, None)
+            if ioid_info is None:
+                # Context.read_many() has stopped waiting for this response.
+                self.log.warning("Ignoring late response with ioid=%d.",
+                                 command.ioid)
+                return
             deadline = ioid_info['deadline']
             pv = ioid_info['pv']
-            tags = tags.copy()
-            tags['pv'] = pv.name
+            pv_name = pv.name
             if deadline is not None and time.monotonic() > deadline:
                 self.log.warning("Ignoring late response with ioid=%d regarding "
                                  "PV named %s because "
@@ -1412,6 +2057,10 @@ class VirtualCircuitManager:
                                  pv.name, time.monotonic() - deadline)
                 return
 
+            collector = ioid_info.get('collector')
+            if collector is not None:
+                # Context.read_many() is collecting this response.
+                collector.received(ioid_info['index'], command)
             event = ioid_info.get('event')
             if event is not None:
                 # If PV.read() or PV.write() are waiting on this response,
@@ -1447,40 +2096,55 @@ class VirtualCircuitManager:
                 # This method submits jobs to the Contexts's
                 # ThreadPoolExecutor for user callbacks.
                 sub.process(command)
-                tags = tags.copy()
-                tags['pv'] = sub.pv.name
+                pv_name = sub.pv.name
         elif isinstance(command, ca.AccessRightsResponse):
             pv = self.pvs[command.cid]
             pv.access_rights_changed(command.access_rights)
-            tags = tags.copy()
-            tags['pv'] = pv.name
+            pv_name = pv.name
         elif isinstance(command, ca.EventCancelResponse):
             # TODO Any way to add the pv name to tags here?
             ...
         elif isinstance(command, ca.CreateChanResponse):
-            pv = self.pvs[command.cid]
+            try:
+                pv = self.pvs[command.cid]
+            except KeyError:
+                # The PV timed out on this server, which was tried from the
+                # persistent search cache, and was since searched for.
+                self.log.debug('Ignoring late response %r', command,
+                               extra=tags)
+                return
             chan = self.channels[command.cid]
             self.all_created_pvnames.append(pv.name)
+            self.context._channel_created(pv.name, self.circuit.address)
+            self.context._pv_reconnected(pv)
             with pv.component_lock:
                 pv.channel = chan
                 pv.channel_ready.set()
             pv.connection_state_changed('connected', chan)
-            tags = tags.copy()
-            tags['pv'] = pv.name
+            pv_name = pv.name
+        elif isinstance(command, ca.CreateChFailResponse):
+            pv = self.pvs.get(command.cid)
+            if pv is not None:
+                self.log.warning('Server at %s:%d failed to create channel '
+                                 'for %s', *self.circuit.address, pv.name,
+                                 extra=tags)
+                self.context._search_cache_fallback([pv.name])
         elif isinstance(command, (ca.ServerDisconnResponse,
                                   ca.ClearChannelResponse)):
             pv = self.pvs[command.cid]
             pv.connection_state_changed('disconnected', None)
-            tags = tags.copy()
-            tags['pv'] = pv.name
+            pv_name = pv.name
             # NOTE: pv remains valid until server goes down
         elif isinstance(command, ca.EchoResponse):
             # The important effect here is that it will have updated
             # self.last_tcp_receipt when the bytes flowed through
             # self.received.
             ...
-        if isinstance(command, ca.Message):
-            tags['bytesize'] = len(command)
+        if (isinstance(command, ca.Message) and
+                self.log.isEnabledFor(logging.DEBUG)):
+            tags = {**tags, 'bytesize': len(command)}
+            if pv_name is not None:
+                tags['pv'] = pv_name
             self.log.debug("%r", command, extra=tags)
 
     def _disconnected(self, *, reconnect=True):
@@ -1504,6 +2168,9 @@ class VirtualCircuitManager:
             event = ioid_info.get('event')
             if event is not None:
                 event.set()
+            collector = ioid_info.get('collector')
+            if collector is not None:
+                collector.received(ioid_info['index'], None)
 
         with self.context.broadcaster._search_lock:
             for n in self.all_created_pvnames:
@@ -1535,7 +2202,8 @@ class VirtualCircuitManager:
                            'disconnected from %s:%d....',
                            len(self.channels), *self.circuit.address, extra=tags)
             self.context.reconnect(((chan.name, chan.circuit.priority)
-                                    for chan in self.channels.values()))
+                                    for chan in self.channels.values()),
+                                   address=self.circuit.address)
         else:
             self.log.debug('Not attempting reconnection', extra=tags)
 
@@ -1574,7 +2242,7 @@ class PV:
                  'access_rights_callback', 'subscriptions',
                  'command_bundle_queue', 'component_lock', '_idle', '_in_use',
                  '_usages', 'connection_state_callback', 'log',
-                 '_timeout',
+                 '_timeout', 'metadata_cache',
                  '__weakref__')
 
     def __init__(self, name, priority, context, timeout):
@@ -1596,6 +2264,7 @@ class PV:
         self._circuit_manager = None
         self._channel = None
         self.subscriptions = {}
+        self.metadata_cache = common.MetadataCache()
         self._idle = False
         self._in_use = threading.Condition()
         self._usages = 0
@@ -1645,9 +2314,12 @@ class PV:
         self.log.info('connection state changed to %s.', state)
         self.connection_state_callback.process(self, state)
         if state == 'disconnected':
+            # The cache is filled again by the metadata subscriptions, once
+            # they are reactivated.
+            self.metadata_cache.clear()
             for sub in self.subscriptions.values():
                 with sub.callback_lock:
-                    if sub.callbacks:
+                    if sub.callbacks or sub.recorders:
                         sub.needs_reactivation = True
         if state == 'connected':
             cm = self.circuit_manager
@@ -1731,7 +2403,7 @@ class PV:
         request will be processed when they are complete.
         """
         for sub in self.subscriptions.values():
-            if sub.callbacks:
+            if sub.callbacks or sub.recorders:
                 return
         with self._in_use:
             if not self.channel_ready.is_set():
@@ -1825,6 +2497,51 @@ class PV:
             raise DeadCircuitError()
         return ioid_info['response']
 
+    def read_metadata(self, data_type='control', *,
+                      timeout=common.PV_DEFAULT_TIMEOUT, use_cache=True):
+        """
+        Read metadata such as units, limits and enum strings, from a cache.
+
+        On the first read of each ``data_type``, the metadata is read from the
+        server and a subscription is made to keep the cached copy up to date
+        when the server reports changes to properties or alarm state. Later
+        reads are served locally. Hit and miss statistics are available from
+        ``pv.metadata_cache.info()``.
+
+        Parameters
+        ----------
+        data_type : {'control', 'graphic'} or ChannelType or int ID, optional
+            A class of data types, matched to the channel's native data type,
+            or a specific CTRL or GR type. Default is 'control'.
+        timeout : number or None, optional
+            Seconds to wait before a CaprotoTimeoutError is raised. Default is
+            ``PV.timeout``, which falls back to ``PV.context.timeout`` if not
+            set. If None, never timeout.
+        use_cache : boolean, optional
+            If False, read from the server and refresh the cache regardless.
+            True by default.
+
+        Returns
+        -------
+        metadata : ctypes.BigEndianStructure
+            The metadata of the response, as in ``PV.read(...).metadata``.
+        """
+        self.metadata_cache.check_data_type(data_type)
+        if timeout is common.PV_DEFAULT_TIMEOUT:
+            timeout = self.timeout
+        if use_cache:
+            metadata = self.metadata_cache.get(data_type)
+            if metadata is not None:
+                return metadata
+        response = self.read(data_type=data_type, timeout=timeout)
+        self.metadata_cache.store(data_type, response.metadata)
+        recorder, created = self.metadata_cache.recorder(data_type)
+        if created:
+            sub = self.subscribe(data_type=data_type,
+                                 mask=common.METADATA_CACHE_MASK)
+            sub.add_recorder(recorder)
+        return response.metadata
+
     @ensure_connected
     def write(self, data, *, wait=True, callback=None,
               timeout=common.PV_DEFAULT_TIMEOUT,
@@ -1913,7 +2630,7 @@ class PV:
         return ioid_info['response']
 
     def subscribe(self, data_type=None, data_count=None,
-                  low=0.0, high=0.0, to=0.0, mask=None):
+                  low=0.0, high=0.0, to=0.0, mask=None, *, dispatch='all'):
         """
         Start a new subscription to which user callback may be added.
 
@@ -1929,6 +2646,14 @@ class PV:
             deprecated by Channel Access, not yet implemented by caproto
         mask :  SubscriptionType, optional
             Subscribe to selective updates.
+        dispatch : {'all', 'latest'} or int, optional
+            How updates are dispatched to user callbacks. The default, 'all',
+            submits every update to every callback. If callbacks may be slower
+            than the update rate, 'latest' coalesces pending updates such that
+            callbacks receive the most recent one once they are done with the
+            previous one, and an integer N keeps at most N pending updates,
+            dropping the oldest. Dropped updates are counted in
+            :attr:`Subscription.dropped`.
 
         Returns
         -------
@@ -1957,12 +2682,14 @@ class PV:
         # args and kwargs.
         bound = SUBSCRIBE_SIG.bind(data_type, data_count, low, high, to, mask)
         key = tuple(bound.arguments.items())
+        if dispatch != 'all':
+            key += (('dispatch', dispatch), )
         try:
             sub = self.subscriptions[key]
         except KeyError:
             sub = Subscription(self,
                                data_type, data_count,
-                               low, high, to, mask)
+                               low, high, to, mask, dispatch=dispatch)
             self.subscriptions[key] = sub
         # The actual EPICS messages will not be sent until the user adds
         # callbacks via sub.add_callback(user_func).
@@ -2081,8 +2808,20 @@ class Subscription(CallbackHandler):
 
     This object should never be instantiated directly by user code; rather
     it should be made by calling the ``subscribe()`` method on a ``PV`` object.
+
+    Attributes
+    ----------
+    dispatch : {'all', 'latest'} or int
+        The dispatch policy; see :meth:`PV.subscribe`.
+    dropped : int
+        The number of updates not dispatched to callbacks due to the dispatch
+        policy.
+    recorders : list
+        Recorders, such as :class:`~caproto.client.recorder.RingBuffer`, fed
+        with every update; see :meth:`add_recorder`.
     """
-    def __init__(self, pv, data_type, data_count, low, high, to, mask):
+    def __init__(self, pv, data_type, data_count, low, high, to, mask, *,
+                 dispatch='all'):
         super().__init__(pv)
         # Stash everything, but do not send any EPICS messages until the first
         # user callback is attached.
@@ -2098,6 +2837,13 @@ class Subscription(CallbackHandler):
         # This is related to back-compat for user callbacks that have the old
         # signature, f(response).
         self.__wrapper_weakrefs = set()
+        self.dispatch = dispatch
+        self.dropped = 0
+        self.recorders = []
+        # Updates pending dispatch, if the policy is not 'all'
+        self._dispatch_queue = deque(
+            maxlen=common.get_dispatch_queue_size(dispatch))
+        self._dispatch_scheduled = False
 
     @property
     def log(self):
@@ -2128,7 +2874,7 @@ class Subscription(CallbackHandler):
     def compose_command(self, timeout=common.PV_DEFAULT_TIMEOUT):
         "This is used by the Context to re-subscribe in bulk after dropping."
         with self.callback_lock:
-            if not self.callbacks:
+            if not self.callbacks and not self.recorders:
                 return None
             cm, chan = self.pv._circuit_manager, self.pv._channel
             subscriptionid = cm._subscriptionid_counter()
@@ -2176,15 +2922,79 @@ class Subscription(CallbackHandler):
                 self.pv.circuit_manager.send(command, extra={'pv': self.pv.name})
 
     def process(self, command):
-        # TODO here i think we can decouple PV update rates and callback
-        # handling rates, if desirable, to not bog down performance.
-        # As implemented below, updates are blocking further messages from
-        # the CA servers from processing. (-> ThreadPool, etc.)
         pv = self.pv
-        super().process(self, command)
+        for recorder in self.recorders:
+            try:
+                recorder.append(command)
+            except Exception:
+                self.log.exception('Exception raised by recorder %r '
+                                   'processing response %r',
+                                   recorder, command)
+        if self._dispatch_queue.maxlen is None:
+            super().process(self, command)
+        else:
+            self._enqueue(command)
         self.log.debug("%r: %r", pv.name, command)
         self.most_recent_response = command
 
+    def _enqueue(self, command):
+        """
+        Queue an update for dispatch to callbacks, dropping the oldest pending
+        one if the queue is full.
+
+        At most one dispatch job per Subscription is submitted to the
+        executor at a time, such that pending updates can be coalesced.
+        """
+        with self.callback_lock:
+            self._last_call_values = ((self, command), {})
+            queue = self._dispatch_queue
+            if len(queue) == queue.maxlen:
+                self.dropped += 1
+            queue.append(command)
+            if self._dispatch_scheduled:
+                return
+            self._dispatch_scheduled = True
+        self._submit_dispatch()
+
+    def _submit_dispatch(self):
+        try:
+            self.pv.circuit_manager.user_callback_executor.submit(
+                self._dispatch)
+        except RuntimeError:
+            with self.callback_lock:
+                self._dispatch_scheduled = False
+            if self.pv.circuit_manager.dead.is_set():
+                # if the circuit is dead, so is the executor
+                return
+            raise
+
+    def _dispatch(self):
+        """Dispatch the oldest pending update to all callbacks."""
+        with self.callback_lock:
+            if not self._dispatch_queue:
+                self._dispatch_scheduled = False
+                return
+            command = self._dispatch_queue.popleft()
+            callbacks = list(self.callbacks.values())
+
+        for ref in callbacks:
+            callback = ref()
+            if callback is None:
+                continue
+            try:
+                callback(self, command)
+            except Exception:
+                self.log.exception('Exception raised by callback %r '
+                                   'processing response %r',
+                                   callback, command)
+
+        with self.callback_lock:
+            if not self._dispatch_queue:
+                self._dispatch_scheduled = False
+                return
+        # Yield the executor to other jobs between updates
+        self._submit_dispatch()
+
     def add_callback(self, func):
         """
         Add a callback to receive responses.
@@ -2212,7 +3022,7 @@ class Subscription(CallbackHandler):
         func = adapt_old_callback_signature(func, self.__wrapper_weakrefs)
 
         with self.callback_lock:
-            was_empty = not self.callbacks
+            was_empty = not self.callbacks and not self.recorders
             cb_id = super().add_callback(func)
             most_recent_response = self.most_recent_response
         if was_empty:
@@ -2248,7 +3058,41 @@ class Subscription(CallbackHandler):
         """
         with self.callback_lock:
             super().remove_callback(token)
-            if not self.callbacks:
+            if not self.callbacks and not self.recorders:
+                # Go dormant.
+                self._unsubscribe()
+                self.most_recent_response = None
+                self.needs_reactivation = False
+
+    def add_recorder(self, recorder):
+        """
+        Feed every update to a recorder, bypassing the callback machinery.
+
+        The recorder's ``append(response)`` method is called directly by the
+        thread that receives the update, so it must be fast and must not
+        block. The subscription is activated if it was not already.
+
+        Parameters
+        ----------
+        recorder : object
+            For example, a :class:`~caproto.client.recorder.RingBuffer`.
+        """
+        with self.callback_lock:
+            was_empty = not self.callbacks and not self.recorders
+            self.recorders.append(recorder)
+            most_recent_response = self.most_recent_response
+        if was_empty:
+            self._subscribe()
+        elif most_recent_response is not None:
+            recorder.append(most_recent_response)
+
+    def remove_recorder(self, recorder):
+        """
+        Stop feeding updates to a recorder added by :meth:`add_recorder`.
+        """
+        with self.callback_lock:
+            self.recorders.remove(recorder)
+            if not self.callbacks and not self.recorders:
                 # Go dormant.
                 self._unsubscribe()
                 self.most_recent_response = None
@@ -2368,6 +3212,98 @@ class Batch:
             circuit_manager.send(*commands)
 
 
+ReadManyResult = namedtuple(
+    'ReadManyResult',
+    ['names', 'values', 'timestamps', 'status', 'severity', 'error']
+)
+ReadManyResult.__doc__ = """
+Columnar results of :meth:`Context.read_many`, each in the order of the PVs.
+"""
+
+
+class _ReadManyCollector:
+    """
+    Collects the responses to the requests of :meth:`Context.read_many`.
+
+    Responses are stashed by index as they are received, possibly from
+    multiple selector threads, and ``done`` is set once all have arrived. A
+    response of None marks a failed request.
+    """
+    def __init__(self, count):
+        self.responses = [None] * count
+        self.done = threading.Event()
+        self._remaining = count
+        self._lock = threading.Lock()
+        if not count:
+            self.done.set()
+
+    def received(self, index, response):
+        with self._lock:
+            self.responses[index] = response
+            self._remaining -= 1
+            if self._remaining == 0:
+                self.done.set()
+
+    def to_result(self, pvs):
+        count = len(pvs)
+        responses = list(self.responses)
+        error = np.array([response is None or not response.status.success
+                          for response in responses],
+                         dtype=bool)
+        timestamps = np.full(count, np.nan)
+        status = np.zeros(count, dtype=np.int16)
+        severity = np.zeros(count, dtype=np.int16)
+
+        values = [None] * count
+        numeric = True
+        for index, (pv, response) in enumerate(zip(pvs, responses)):
+            if error[index]:
+                continue
+            data = response.data
+            if response.data_type in ca.char_types or (
+                    response.data_type in ca.string_types):
+                numeric = False
+                if len(data) == 1 and response.data_type in ca.string_types:
+                    value = data[0]
+                    if isinstance(value, bytes):
+                        value = value.decode(pv.channel.string_encoding)
+                else:
+                    value = data
+            elif response.data_count == 1:
+                value = data[0]
+            else:
+                numeric = False
+                value = data
+            values[index] = value
+
+            metadata = response.metadata
+            if metadata is None:
+                continue
+            timestamp = getattr(metadata, 'timestamp', None)
+            if timestamp is not None:
+                timestamps[index] = timestamp
+            status[index] = getattr(metadata, 'status', 0)
+            severity[index] = getattr(metadata, 'severity', 0)
+
+        if numeric:
+            values = np.array(
+                [np.nan if value is None else value for value in values],
+                dtype=np.float64)
+        else:
+            array = np.empty(count, dtype=object)
+            array[:] = values
+            values = array
+
+        return ReadManyResult(
+            names=[pv.name for pv in pvs],
+            values=values,
+            timestamps=timestamps,
+            status=status,
+            severity=severity,
+            error=error,
+        )
+
+
 # The signature of caproto._circuit.ClientChannel.subscribe, which is used to
 # resolve the (args, kwargs) of a Subscription into a unique key.
 SUBSCRIBE_SIG = Signature([
@@ -13,10 +13,11 @@ from caproto import (AccessRights, CaprotoNotImplementedError,
                      CaprotoValueError, ChannelType, SubscriptionType,
                      field_types)
 
-from ..client.common import AUTOMONITOR_MAXLENGTH, STR_ENC
-from .client import Context, SharedBroadcaster
+from ..client.common import AUTOMONITOR_MAXLENGTH, METADATA_CACHE, STR_ENC
+from .client import Batch, Context, SharedBroadcaster, _ReadManyCollector
 
-__all__ = ('PV', 'get_pv', 'caget', 'caput')
+__all__ = ('PV', 'get_pv', 'caget', 'caput', 'caget_many', 'caput_many',
+           'camonitor', 'camonitor_many', 'camonitor_clear')
 
 
 @functools.lru_cache(1)
@@ -99,24 +100,29 @@ def _read_response_to_pyepics(full_type, command, enum_strings=None):
         info['char_value'] = value
     elif full_type in ca.enum_types:
         enum_strings = info.get('enum_strs', None) or enum_strings
-        if enum_strings is None:
-            # This None marker will allow get_ctrlvars to be automatically
-            # called later through `_getarg()` magic.
-            char_value = [None] * len(value)
-        else:
-            char_value = [
-                enum_strings[idx] if 0 <= idx < len(enum_strings) else ''
-                for idx in value
-            ]
-        if len(char_value) == 1:
-            char_value = char_value[0]
-        info['char_value'] = char_value
+        info['char_value'] = _enum_char_value(value, enum_strings)
     else:
         info['char_value'] = None
 
     return info
 
 
+def _enum_char_value(value, enum_strings):
+    'Enum indices -> pyepics char_value'
+    if enum_strings is None:
+        # This None marker will allow get_ctrlvars to be automatically
+        # called later through `_getarg()` magic.
+        char_value = [None] * len(value)
+    else:
+        char_value = [
+            enum_strings[idx] if 0 <= idx < len(enum_strings) else ''
+            for idx in value
+        ]
+    if len(char_value) == 1:
+        char_value = char_value[0]
+    return char_value
+
+
 def _scalarify(data, ntype, count):
     if count == 1 and ntype not in (ChannelType.CHAR, ChannelType.STRING):
         return data[0]
@@ -589,9 +595,22 @@ class PV:
     @ensure_connection
     def get_ctrlvars(self, timeout=5, warn=True):
         "get control values for variable"
-        _, info = self._read_and_update(
-            field_types['control'][self.type], timeout
-        )
+        dtype = field_types['control'][self.type]
+        if not METADATA_CACHE:
+            _, info = self._read_and_update(dtype, timeout)
+            self.force_read_access_rights()
+            return info
+
+        # Served from the metadata cache of the caproto PV, which is kept up
+        # to date by a subscription, but may briefly lag behind changes made
+        # elsewhere.
+        metadata = self._caproto_pv.read_metadata(dtype, timeout=timeout)
+        info = _parse_dbr_metadata(metadata)
+        self._args.update(**info)
+        raw_value = self._args.get('raw_value')
+        if raw_value is not None and self.type in ca.enum_types:
+            self._args['char_value'] = _enum_char_value(
+                raw_value, info.get('enum_strs', None))
         self.force_read_access_rights()
         return info
 
@@ -1032,52 +1051,104 @@ def cainfo(pvname, print_out=True):
             return thispv.info
 
 
+def _connect_many(context, pvlist, timeout):
+    """
+    Connect to many PVs at once, waiting up to ``timeout`` in all.
+
+    Returns the caproto PVs in the order of ``pvlist``, connected or not.
+    """
+    pvs = context.get_pvs(*pvlist)
+    deadline = time.monotonic() + timeout
+    for pv in pvs:
+        try:
+            pv.wait_for_connection(
+                timeout=max(deadline - time.monotonic(), 0))
+        except TimeoutError:
+            pass
+    return pvs
+
+
+def _can_request(pv):
+    'Whether a request may be sent now, as part of a Batch.'
+    return (pv.connected and pv.circuit_manager is not None and
+            pv.channel is not None)
+
+
+def _put_args(value, native_type):
+    'Convert a value as PV.put() does, returning (data, data_type).'
+    data_type = None
+    if isinstance(value, str):
+        if native_type in ca.char_types:
+            # have to add a null-terminator char
+            return value.encode(STR_ENC) + b'\0', data_type
+        if native_type in ca.enum_types:
+            # The enum strings may not be known yet: let the server look up
+            # the string.
+            data_type = ChannelType.STRING
+        value = (value, )
+    elif not isinstance(value, Iterable):
+        value = (value, )
+
+    if len(value) and isinstance(value[0], str):
+        value = tuple(v.encode(STR_ENC) for v in value)
+    return value, data_type
+
+
 def caget_many(pvlist, as_string=False, count=None, as_numpy=True, timeout=5.0,
                context=None, raises=False):
     """get values for a list of PVs
 
     This does not maintain PV objects, and works as fast
-    as possible to fetch many values.
+    as possible to fetch many values: all the PVs are connected
+    at once, within the timeout, then those connected are read
+    with one pipelined batch of requests per circuit, again
+    within the timeout.
+
+    Returns the values in the order of pvlist, with None for each
+    PV which did not connect or respond in time. With raises=True,
+    raise CaprotoTimeoutError instead.
     """
     if context is None:
         context = PV.default_context()
 
-    pvs = context.get_pvs(*pvlist)
+    pvs = _connect_many(context, pvlist, timeout)
+    collector = _ReadManyCollector(len(pvs))
+    with Batch(timeout=timeout) as batch:
+        for index, pv in enumerate(pvs):
+            if _can_request(pv):
+                # Use "DBR_CTRL_*" so that we can get enum strings, if
+                # necessary.
+                batch.read(pv, functools.partial(collector.received, index),
+                           data_type='control')
+            else:
+                collector.received(index, None)
+    collector.done.wait(timeout=timeout)
+    readings = list(collector.responses)
 
-    readings = {}
-    pending_pvs = list(pvs)
-    t = time.monotonic()
-    while pending_pvs and time.monotonic() - t < timeout:
-        for pv in list(pending_pvs):
-            if pv.connected:
-                readings[pv] = pv.read(data_type='control')
-                pending_pvs.remove(pv)
-        time.sleep(0.01)
-
-    if raises and pending_pvs:
-        raise CaprotoTimeoutError(f'{pending_pvs[0].name} failed to connect within '
-                                  f'{timeout} seconds '
-                                  f'(caproto={pending_pvs[0]})')
+    if raises and None in readings:
+        pv = pvs[readings.index(None)]
+        raise CaprotoTimeoutError(f'{pv.name} failed to connect or respond '
+                                  f'within {timeout} seconds '
+                                  f'(caproto={pv})')
 
     get_kw = dict(as_string=as_string,
                   as_numpy=as_numpy,
                   requested_count=count,
                   )
 
-    def final_get(pv):
-        if pv in pending_pvs:
+    def final_get(pv, reading):
+        if reading is None:
             return None
 
-        # Use "DBR_CTRL_*" so that we can get enum strings, if necessary.
         full_type = field_types['control'][pv.channel.native_data_type]
-        enum_strings = getattr(readings[pv].metadata, "enum_strings", None)
+        enum_strings = getattr(reading.metadata, "enum_strings", None)
         if enum_strings:
             enum_strings = [
                 enum_str.decode(STR_ENC) for enum_str in enum_strings
             ]
         info = _read_response_to_pyepics(
             full_type=full_type,
-            command=readings[pv],
+            command=reading,
             enum_strings=enum_strings,
         )
         return _pyepics_get_value(value=info['raw_value'],
@@ -1086,58 +1157,160 @@ def caget_many(pvlist, as_string=False, count=None, as_numpy=True, timeout=5.0,
                                   native_count=pv.channel.native_data_count,
                                   enum_strings=enum_strings,
                                   **get_kw)
-    return [final_get(pv) for pv in pvs]
+    return [final_get(pv, reading) for pv, reading in zip(pvs, readings)]
 
 
 def caput_many(pvlist, values, wait=False, connection_timeout=None,
-               put_timeout=60):
+               put_timeout=60, context=None):
     """put values to a list of PVs, as fast as possible
 
-    This does not maintain the PV objects it makes.
+    This does not maintain the PV objects it makes. All the PVs
+    are connected at once, within connection_timeout (default 1
+    second).
 
     If wait is 'each', *each* put operation will block until
-    it is complete or until the put_timeout duration expires.
+    it is complete or until the put_timeout duration expires,
+    before the next is sent. Use this if the puts must complete
+    in order.
 
-    If wait is 'all', this method will block until *all*
-    put operations are complete, or until the put_timeout
-    duration expires.
+    Otherwise, the puts are sent in one pipelined batch per
+    circuit. If wait is 'all' (or True), this method will block
+    until *all* put operations are complete, or until the
+    put_timeout duration expires.
 
     Note that the behavior of 'wait' only applies to the
     put timeout, not the connection timeout.
 
-    Returns a list of integers for each PV, 1 if the put
-    was successful, or a negative number if the timeout
-    was exceeded.
+    Returns a list of integers for each PV, in the order of
+    pvlist: 1 if the put was successful, or a negative number
+    if the PV did not connect, could not be written, or the
+    timeout was exceeded.
     """
     if len(pvlist) != len(values):
         raise CaprotoValueError("List of PV names must be equal to list of values.")
+    if context is None:
+        context = PV.default_context()
+    if connection_timeout is None:
+        connection_timeout = 1
+
+    pvs = _connect_many(context, pvlist, connection_timeout)
+    out = [-1] * len(pvs)
+    writable = []
+    for index, pv in enumerate(pvs):
+        if not _can_request(pv):
+            continue
+        access_rights = pv.channel.access_rights
+        if access_rights is not None and AccessRights.WRITE not in access_rights:
+            continue
+        writable.append(index)
+
+    if wait == 'each':
+        for index in writable:
+            pv = pvs[index]
+            data, data_type = _put_args(values[index],
+                                        pv.channel.native_data_type)
+            try:
+                response = pv.write(data, wait=True, timeout=put_timeout,
+                                    data_type=data_type)
+            except TimeoutError:
+                continue
+            if response.status.success:
+                out[index] = 1
+        return out
+
+    wait_all = wait in ('all', True)
+    collector = _ReadManyCollector(len(writable))
+    with Batch(timeout=put_timeout) as batch:
+        for position, index in enumerate(writable):
+            pv = pvs[index]
+            data, data_type = _put_args(values[index],
+                                        pv.channel.native_data_type)
+            if wait_all:
+                callback = functools.partial(collector.received, position)
+            else:
+                # Without a callback, no completion is requested.
+                callback = None
+            batch.write(pv, data, callback=callback, data_type=data_type)
+
+    if not wait_all:
+        for index in writable:
+            out[index] = 1
+        return out
+
+    collector.done.wait(timeout=put_timeout)
+    for index, response in zip(writable, list(collector.responses)):
+        if response is not None and response.status.success:
+            out[index] = 1
+    return out
+
+
+_monitors = {}
+
+
+def _format_time(timestamp):
+    'Format a timestamp as pyepics does for camonitor.'
+    if timestamp is None:
+        timestamp = time.time()
+    fraction = timestamp % 1
+    return (time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp)) +
+            f'.{int(fraction * 1e6):06d}')
 
-    # context = PV.default_context()
-    # TODO: context.get_pvs(...)
 
-    out = []
-    pvs = [PV(name, auto_monitor=False, connection_timeout=connection_timeout)
-           for name in pvlist]
+def camonitor_many(pvlist, writer=None, callback=None, timeout=5.0,
+                   context=None):
+    """camonitor_many(pvlist, writer=None, callback=None, timeout=5.0)
 
-    wait_all = (wait == 'all')
-    wait_each = (wait == 'each')
-    for p, v in zip(pvs, values):
+    sets a monitor on each of the named PVs, as camonitor() does,
+    connecting to them all at once rather than one at a time.
+
+    Returns a list of booleans, in the order of pvlist: whether
+    each PV connected within the timeout and is monitored.
+    """
+    if writer is None:
+        writer = print
+    if callback is None:
+        def callback(pvname=None, value=None, char_value=None,
+                     timestamp=None, **kwargs):
+            "generic monitor callback"
+            if char_value is None:
+                char_value = str(value)
+            writer(f'{pvname:.32s} {_format_time(timestamp)} {char_value}')
+
+    pvs = [get_pv(pvname, context=context) for pvname in pvlist]
+    deadline = time.monotonic() + timeout
+    monitored = []
+    for pvname, pv in zip(pvlist, pvs):
         try:
-            p.wait_for_connection(connection_timeout)
-            p.put(v, wait=wait_each, timeout=put_timeout,
-                  use_complete=wait_all)
+            pv.wait_for_connection(
+                timeout=max(deadline - time.monotonic(), 0))
         except TimeoutError:
-            out.append(-1)
-        else:
-            out.append(1)
+            monitored.append(False)
+            continue
+        camonitor_clear(pvname)
+        pv.add_callback(callback, with_ctrlvars=True)
+        _monitors[pvname] = pv
+        monitored.append(True)
+    return monitored
 
-    if not wait_all:
-        return [o if o == 1 else -1 for o in out]
 
-    start_time = time.time()
-    while not all([(p.connected and p.put_complete) for p in pvs]):
-        elapsed_time = time.time() - start_time
-        if elapsed_time > put_timeout:
-            break
-    return [1 if (p.connected and p.put_complete) else -1
-            for p in pvs]
+def camonitor(pvname, writer=None, callback=None, context=None):
+    """camonitor(pvname, writer=None, callback=None)
+
+    sets a monitor on the named PV, which will print a message
+    with its name, timestamp and value on each change, or pass
+    the message to writer, if given.
+
+    To run your own function on each change instead, pass it as
+    callback; it is called as a PV callback is.
+
+    Use camonitor_clear() to remove the monitor.
+    """
+    camonitor_many([pvname], writer=writer, callback=callback,
+                   context=context)
+
+
+def camonitor_clear(pvname):
+    """clear a monitor on a PV"""
+    pv = _monitors.pop(pvname, None)
+    if pv is not None:
+        pv.clear_callbacks()
@@ -8,6 +8,7 @@ import caproto as ca
 
 from .._utils import safe_getsockname
 from ..server import AsyncLibraryLayer
+from ..server.access_security import load_access_security
 from ..server.common import Context as _Context
 from ..server.common import DisconnectedCircuit, LoopExit
 from ..server.common import VirtualCircuit as _VirtualCircuit
@@ -113,6 +114,9 @@ class TrioSocketStreamCompat:
     def getsockname(self, *args, **kwargs):
         return self._sock.getsockname()
 
+    def fileno(self):
+        return self._sock.fileno()
+
     async def send_all(self, data):
         try:
             async with self._send_lock:
@@ -178,6 +182,10 @@ class VirtualCircuit(_VirtualCircuit):
         task_status.started()
         await super().subscription_queue_loop()
 
+    def _sub_queue_depth(self):
+        _, recv = self.subscription_chan
+        return recv.statistics().current_buffer_used
+
     async def get_from_sub_queue(self, timeout=None):
         # Timeouts work very differently between our server implementations,
         # so we do this little stub in its own method.
@@ -368,16 +376,18 @@ class Context(_Context):
 
 
 async def start_server(pvdb, *, interfaces=None, log_pv_names=False,
-                       startup_hook=None):
+                       startup_hook=None, access_security=None):
     '''Start a trio server with a given PV database'''
     ctx = Context(pvdb, interfaces=interfaces)
+    ctx.access_security = load_access_security(access_security)
     return await ctx.run(
         log_pv_names=log_pv_names,
         startup_hook=startup_hook
     )
 
 
-def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None):
+def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None,
+        access_security=None):
     """
     Run an IOC, given its PV database dictionary.
 
@@ -396,6 +406,9 @@ def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None):
 
     startup_hook : coroutine, optional
         Hook to call at startup with the ``async_lib`` shim.
+
+    access_security : str, pathlib.Path, or AccessSecurityConfig, optional
+        Access security configuration (or ACF filename) to apply to all PVs.
     """
     try:
         return trio.run(
@@ -405,6 +418,7 @@ def run(pvdb, *, interfaces=None, log_pv_names=False, startup_hook=None):
                 interfaces=interfaces,
                 log_pv_names=log_pv_names,
                 startup_hook=startup_hook,
+                access_security=access_security,
             ))
     except KeyboardInterrupt:
         return
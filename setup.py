@@ -65,7 +65,9 @@ setup(name='caproto',
               'caproto-put = caproto.commandline.put:main',
               'caproto-monitor = caproto.commandline.monitor:main',
               'caproto-repeater = caproto.commandline.repeater:main',
+              'caproto-replay = caproto.commandline.replay:main',
               'caproto-shark = caproto.commandline.shark:main',
+              'caproto-bench = caproto.commandline.bench:main',
               'caproto-defaultdict-server = caproto.ioc_examples.pathological.defaultdict_server:main',
               'caproto-spoof-beamline = caproto.ioc_examples.pathological.spoof_beamline:main',
           ],